@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['system_entry_wizard', 'Beta_VH_Map'],
+    hiddenimports=['system_entry_wizard', 'Beta_VH_Map', 'jsonschema'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -312,47 +312,35 @@ class ArchiveSystem(commands.Cog):
     
     async def _execute_advanced_search(self, params: Dict) -> List[Dict]:
         """Execute advanced search with multiple parameters."""
-        query = "SELECT * FROM discoveries WHERE 1=1"
-        query_params = []
-        
-        # Search terms in description/significance
-        if params.get('search_terms'):
-            search_terms = params['search_terms'].strip()
-            query += " AND (description LIKE ? OR significance LIKE ?)"
-            query_params.extend([f"%{search_terms}%", f"%{search_terms}%"])
+        # Text, location and explorer filters go through the FTS5 index; any
+        # of them that can't (no FTS5, or no searchable words) uses LIKE
+        match, query, query_params = self.db.search_filters(
+            text=params.get('search_terms'),
+            location=params.get('location_filter'),
+            username=params.get('user_filter')
+        )
+        order = (" ORDER BY bm25(discoveries_fts), d.submission_timestamp DESC" if match
+                 else " ORDER BY d.submission_timestamp DESC")
         
         # Date range filter
         if params.get('date_range'):
             date_filter = self._parse_date_range(params['date_range'])
             if date_filter:
-                query += " AND submission_timestamp >= ?"
+                query += " AND d.submission_timestamp >= ?"
                 query_params.append(date_filter.isoformat())
         
-        # Location filter
-        if params.get('location_filter'):
-            location = params['location_filter'].strip()
-            query += " AND (location LIKE ? OR system_name LIKE ? OR location_name LIKE ?)"
-            location_pattern = f"%{location}%"
-            query_params.extend([location_pattern, location_pattern, location_pattern])
-        
-        # User filter
-        if params.get('user_filter'):
-            username = params['user_filter'].strip()
-            query += " AND username LIKE ?"
-            query_params.append(f"%{username}%")
-        
         # Pattern/tier filter
         if params.get('pattern_filter'):
             pattern_filter = params['pattern_filter'].strip()
             if pattern_filter.isdigit():
                 # Filter by mystery tier
-                query += " AND mystery_tier = ?"
+                query += " AND d.mystery_tier = ?"
                 query_params.append(int(pattern_filter))
             else:
                 # Filter by pattern matches
-                query += " AND pattern_matches > 0"
+                query += " AND d.pattern_matches > 0"
         
-        query += " ORDER BY submission_timestamp DESC LIMIT 100"
+        query += order + " LIMIT 100"
         
         cursor = await self.db.connection.execute(query, query_params)
         rows = await cursor.fetchall()
@@ -6,6 +6,7 @@ Falls back to direct database/JSON access when running locally.
 
 import json
 import os
+import sys
 import logging
 import sqlite3
 import aiohttp
@@ -15,6 +16,9 @@ from pathlib import Path
 
 logger = logging.getLogger('keeper.haven_integration')
 
+# Systems requested per /api/systems page when loading over HTTP
+SYSTEMS_PAGE_SIZE = 2000
+
 class HavenIntegrationHTTP:
     """Handles integration with Haven_mdev via HTTP API or direct database access."""
 
@@ -49,6 +53,7 @@ class HavenIntegrationHTTP:
         self.haven_data = {}
         self.last_loaded = None
         self._db_connection = None
+        self._writer_unavailable = False
         self._http_session = None
 
     async def _get_http_session(self):
@@ -60,9 +65,12 @@ class HavenIntegrationHTTP:
         return self._http_session
 
     async def close(self):
-        """Close HTTP session if open."""
+        """Close HTTP session and database connection if open."""
         if self._http_session and not self._http_session.closed:
             await self._http_session.close()
+        if self._db_connection is not None:
+            self._db_connection.close()
+            self._db_connection = None
 
     def _find_haven_data(self) -> Optional[str]:
         """Attempt to find Haven data.json file."""
@@ -129,26 +137,61 @@ class HavenIntegrationHTTP:
             return False
 
     async def _load_from_http(self) -> bool:
-        """Load Haven data from HTTP API."""
+        """Load Haven data from HTTP API, streaming systems page by page."""
         try:
             session = await self._get_http_session()
 
-            async with session.get(f"{self.api_url}/systems") as resp:
-                if resp.status != 200:
-                    logger.error(f"HTTP API returned status {resp.status}")
-                    return False
-
-                data = await resp.json()
-                self.haven_data = data.get('systems', {})
-                self.last_loaded = datetime.utcnow()
+            systems = {}
+            after = None
+            while True:
+                params = {'format': 'ndjson', 'limit': str(SYSTEMS_PAGE_SIZE)}
+                if after:
+                    params['after'] = after
+
+                async with session.get(f"{self.api_url}/systems", params=params) as resp:
+                    if resp.status != 200:
+                        logger.error(f"HTTP API returned status {resp.status}")
+                        return False
+
+                    if resp.content_type != 'application/x-ndjson':
+                        # Older sync API: the whole galaxy in one JSON object
+                        data = await resp.json()
+                        systems = data.get('systems', {})
+                        break
+
+                    after = None
+                    async for record in self._iter_ndjson(resp):
+                        if '_next_after' in record:
+                            after = record['_next_after']
+                        else:
+                            systems[record['name']] = record
+
+                if not after:
+                    break
+
+            self.haven_data = systems
+            self.last_loaded = datetime.utcnow()
 
-                logger.info(f"Loaded {len(self.haven_data)} Haven systems from HTTP API")
-                return True
+            logger.info(f"Loaded {len(self.haven_data)} Haven systems from HTTP API")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to load Haven data from HTTP API: {e}")
             return False
 
+    @staticmethod
+    async def _iter_ndjson(resp):
+        """Yield one decoded record per NDJSON line as the response arrives."""
+        buffer = b''
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+
     async def _load_from_database(self) -> bool:
         """Load Haven data from SQLite database."""
         if not self.db_path or not os.path.exists(self.db_path):
@@ -355,6 +398,132 @@ class HavenIntegrationHTTP:
             logger.error(f"Failed to write discovery via HTTP API: {e}")
             return None
 
+    def _get_discovery_writer(self):
+        """
+        Haven's shared discovery writer, or None to use the built-in INSERT.
+
+        Imported from HAVEN_SRC_PATH, or else from the src directory of the
+        Haven checkout that holds the database. The path is appended to
+        sys.path so Haven's packages never shadow the bot's own.
+        """
+        if self._writer_unavailable:
+            return None
+        haven_src = os.getenv('HAVEN_SRC_PATH') or str(Path(self.db_path).resolve().parent.parent / 'src')
+        if haven_src not in sys.path:
+            sys.path.append(haven_src)
+        try:
+            from common.discovery_writer import get_discovery_writer
+        except ImportError as e:
+            self._writer_unavailable = True
+            logger.warning(f"Haven's discovery writer not found in {haven_src} ({e}); "
+                           f"using the built-in INSERT (set HAVEN_SRC_PATH to Haven's src directory)")
+            return None
+        return get_discovery_writer(self.db_path)
+
+    @staticmethod
+    def _insert_discovery(conn: sqlite3.Connection, discovery_data: Dict) -> int:
+        """Resolve the location and INSERT the discovery without Haven's writer."""
+        cursor = conn.cursor()
+
+        # Resolve system_id
+        system_name = discovery_data.get('system_name')
+        system_id = None
+        if system_name:
+            cursor.execute("SELECT id FROM systems WHERE name = ?", (system_name,))
+            result = cursor.fetchone()
+            if result:
+                system_id = result[0]
+
+        # Resolve planet_id and moon_id
+        planet_id = None
+        moon_id = None
+        location_type = discovery_data.get('location_type', 'space')
+        location_name = discovery_data.get('location_name')
+
+        if location_type == 'planet' and location_name and system_id:
+            cursor.execute(
+                "SELECT id FROM planets WHERE system_id = ? AND name = ?",
+                (system_id, location_name)
+            )
+            result = cursor.fetchone()
+            if result:
+                planet_id = result[0]
+
+        elif location_type == 'moon' and location_name and system_id:
+            cursor.execute("""
+                SELECT m.id, m.planet_id
+                FROM moons m
+                JOIN planets p ON m.planet_id = p.id
+                WHERE p.system_id = ? AND m.name = ?
+            """, (system_id, location_name))
+            result = cursor.fetchone()
+            if result:
+                moon_id = result[0]
+                planet_id = result[1]
+
+        cursor.execute("""
+            INSERT INTO discoveries (
+                discovery_type, discovery_name, system_id, planet_id, moon_id,
+                location_type, location_name, description, coordinates, condition,
+                time_period, significance, photo_url, evidence_urls,
+                discovered_by, discord_user_id, discord_guild_id,
+                pattern_matches, mystery_tier, analysis_status, tags, metadata,
+                species_type, size_scale, preservation_quality, estimated_age,
+                language_status, completeness, author_origin, key_excerpt,
+                structure_type, architectural_style, structural_integrity, purpose_function,
+                tech_category, operational_status, power_source, reverse_engineering,
+                species_name, behavioral_notes, habitat_biome, threat_level,
+                resource_type, deposit_richness, extraction_method, economic_value,
+                ship_class, hull_condition, salvageable_tech, pilot_status,
+                hazard_type, severity_level, duration_frequency, protection_required,
+                update_name, feature_category, gameplay_impact, first_impressions,
+                story_type, lore_connections, creative_elements, collaborative_work
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            discovery_data.get('type') or discovery_data.get('discovery_type'),
+            discovery_data.get('discovery_name'),
+            system_id, planet_id, moon_id,
+            location_type, location_name,
+            discovery_data.get('description'),
+            discovery_data.get('coordinates'),
+            discovery_data.get('condition'),
+            discovery_data.get('time_period'),
+            discovery_data.get('significance'),
+            discovery_data.get('photo_url') or discovery_data.get('evidence_url'),
+            discovery_data.get('evidence_urls'),
+            discovery_data.get('username') or discovery_data.get('discovered_by'),
+            discovery_data.get('user_id') or discovery_data.get('discord_user_id'),
+            discovery_data.get('guild_id') or discovery_data.get('discord_guild_id'),
+            discovery_data.get('pattern_matches', 0),
+            discovery_data.get('mystery_tier', 0),
+            discovery_data.get('analysis_status', 'pending'),
+            discovery_data.get('tags'), discovery_data.get('metadata'),
+            discovery_data.get('species_type'), discovery_data.get('size_scale'),
+            discovery_data.get('preservation_quality'), discovery_data.get('estimated_age'),
+            discovery_data.get('language_status'), discovery_data.get('completeness'),
+            discovery_data.get('author_origin'), discovery_data.get('key_excerpt'),
+            discovery_data.get('structure_type'), discovery_data.get('architectural_style'),
+            discovery_data.get('structural_integrity'), discovery_data.get('purpose_function'),
+            discovery_data.get('tech_category'), discovery_data.get('operational_status'),
+            discovery_data.get('power_source'), discovery_data.get('reverse_engineering'),
+            discovery_data.get('species_name'), discovery_data.get('behavioral_notes'),
+            discovery_data.get('habitat_biome'), discovery_data.get('threat_level'),
+            discovery_data.get('resource_type'), discovery_data.get('deposit_richness'),
+            discovery_data.get('extraction_method'), discovery_data.get('economic_value'),
+            discovery_data.get('ship_class'), discovery_data.get('hull_condition'),
+            discovery_data.get('salvageable_tech'), discovery_data.get('pilot_status'),
+            discovery_data.get('hazard_type'), discovery_data.get('severity_level'),
+            discovery_data.get('duration_frequency'), discovery_data.get('protection_required'),
+            discovery_data.get('update_name'), discovery_data.get('feature_category'),
+            discovery_data.get('gameplay_impact'), discovery_data.get('first_impressions'),
+            discovery_data.get('story_type'), discovery_data.get('lore_connections'),
+            discovery_data.get('creative_elements'), discovery_data.get('collaborative_work')
+        ))
+        conn.commit()
+        return cursor.lastrowid
+
     def _write_discovery_directly(self, discovery_data: Dict) -> Optional[int]:
         """Write discovery directly to local database."""
         if not self.use_database or not self.db_path:
@@ -362,111 +531,15 @@ class HavenIntegrationHTTP:
             return None
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("PRAGMA foreign_keys = ON")
-            cursor = conn.cursor()
-
-            # Resolve system_id
-            system_name = discovery_data.get('system_name')
-            system_id = None
-            if system_name:
-                cursor.execute("SELECT id FROM systems WHERE name = ?", (system_name,))
-                result = cursor.fetchone()
-                if result:
-                    system_id = result[0]
-
-            # Resolve planet_id and moon_id
-            planet_id = None
-            moon_id = None
-            location_type = discovery_data.get('location_type', 'space')
-            location_name = discovery_data.get('location_name')
-
-            if location_type == 'planet' and location_name and system_id:
-                cursor.execute(
-                    "SELECT id FROM planets WHERE system_id = ? AND name = ?",
-                    (system_id, location_name)
-                )
-                result = cursor.fetchone()
-                if result:
-                    planet_id = result[0]
-
-            elif location_type == 'moon' and location_name and system_id:
-                cursor.execute("""
-                    SELECT m.id, m.planet_id
-                    FROM moons m
-                    JOIN planets p ON m.planet_id = p.id
-                    WHERE p.system_id = ? AND m.name = ?
-                """, (system_id, location_name))
-                result = cursor.fetchone()
-                if result:
-                    moon_id = result[0]
-                    planet_id = result[1]
-
-            # Insert discovery (same as before)
-            cursor.execute("""
-                INSERT INTO discoveries (
-                    discovery_type, discovery_name, system_id, planet_id, moon_id,
-                    location_type, location_name, description, coordinates, condition,
-                    time_period, significance, photo_url, evidence_urls,
-                    discovered_by, discord_user_id, discord_guild_id,
-                    pattern_matches, mystery_tier, analysis_status, tags, metadata,
-                    species_type, size_scale, preservation_quality, estimated_age,
-                    language_status, completeness, author_origin, key_excerpt,
-                    structure_type, architectural_style, structural_integrity, purpose_function,
-                    tech_category, operational_status, power_source, reverse_engineering,
-                    species_name, behavioral_notes, habitat_biome, threat_level,
-                    resource_type, deposit_richness, extraction_method, economic_value,
-                    ship_class, hull_condition, salvageable_tech, pilot_status,
-                    hazard_type, severity_level, duration_frequency, protection_required,
-                    update_name, feature_category, gameplay_impact, first_impressions,
-                    story_type, lore_connections, creative_elements, collaborative_work
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                          ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                          ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                discovery_data.get('type') or discovery_data.get('discovery_type'),
-                discovery_data.get('discovery_name'),
-                system_id, planet_id, moon_id,
-                location_type, location_name,
-                discovery_data.get('description'),
-                discovery_data.get('coordinates'),
-                discovery_data.get('condition'),
-                discovery_data.get('time_period'),
-                discovery_data.get('significance'),
-                discovery_data.get('photo_url') or discovery_data.get('evidence_url'),
-                discovery_data.get('evidence_urls'),
-                discovery_data.get('username') or discovery_data.get('discovered_by'),
-                discovery_data.get('user_id') or discovery_data.get('discord_user_id'),
-                discovery_data.get('guild_id') or discovery_data.get('discord_guild_id'),
-                discovery_data.get('pattern_matches', 0),
-                discovery_data.get('mystery_tier', 0),
-                discovery_data.get('analysis_status', 'pending'),
-                discovery_data.get('tags'), discovery_data.get('metadata'),
-                discovery_data.get('species_type'), discovery_data.get('size_scale'),
-                discovery_data.get('preservation_quality'), discovery_data.get('estimated_age'),
-                discovery_data.get('language_status'), discovery_data.get('completeness'),
-                discovery_data.get('author_origin'), discovery_data.get('key_excerpt'),
-                discovery_data.get('structure_type'), discovery_data.get('architectural_style'),
-                discovery_data.get('structural_integrity'), discovery_data.get('purpose_function'),
-                discovery_data.get('tech_category'), discovery_data.get('operational_status'),
-                discovery_data.get('power_source'), discovery_data.get('reverse_engineering'),
-                discovery_data.get('species_name'), discovery_data.get('behavioral_notes'),
-                discovery_data.get('habitat_biome'), discovery_data.get('threat_level'),
-                discovery_data.get('resource_type'), discovery_data.get('deposit_richness'),
-                discovery_data.get('extraction_method'), discovery_data.get('economic_value'),
-                discovery_data.get('ship_class'), discovery_data.get('hull_condition'),
-                discovery_data.get('salvageable_tech'), discovery_data.get('pilot_status'),
-                discovery_data.get('hazard_type'), discovery_data.get('severity_level'),
-                discovery_data.get('duration_frequency'), discovery_data.get('protection_required'),
-                discovery_data.get('update_name'), discovery_data.get('feature_category'),
-                discovery_data.get('gameplay_impact'), discovery_data.get('first_impressions'),
-                discovery_data.get('story_type'), discovery_data.get('lore_connections'),
-                discovery_data.get('creative_elements'), discovery_data.get('collaborative_work')
-            ))
-
-            conn.commit()
-            discovery_id = cursor.lastrowid
-            conn.close()
+            if self._db_connection is None:
+                # Kept open so the writer's prepared INSERT is reused across writes
+                self._db_connection = sqlite3.connect(self.db_path, timeout=10.0)
+                self._db_connection.execute("PRAGMA foreign_keys = ON")
+            writer = self._get_discovery_writer()
+            if writer is not None:
+                discovery_id = writer.write(self._db_connection, discovery_data)['discovery_id']
+            else:
+                discovery_id = self._insert_discovery(self._db_connection, discovery_data)
 
             logger.info(f"Successfully wrote discovery #{discovery_id} to VH-Database")
             return discovery_id
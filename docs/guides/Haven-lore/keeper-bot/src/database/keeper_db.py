@@ -6,12 +6,30 @@ Handles persistent storage of discoveries, patterns, and investigations.
 import aiosqlite
 import json
 import logging
+import re
+import sqlite3
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import os
 
 logger = logging.getLogger('keeper.database')
 
+# Columns indexed by the discoveries_fts full-text table
+SEARCH_TEXT_COLUMNS = ('description', 'significance')
+SEARCH_LOCATION_COLUMNS = ('location', 'system_name', 'planet_name', 'galaxy_name')
+
+
+def build_fts_query(text: str, columns: Optional[Tuple[str, ...]] = None) -> Optional[str]:
+    """Turn user text into a safe FTS5 MATCH expression (prefix match on every word)."""
+    tokens = re.findall(r'\w+', text or '', re.UNICODE)
+    if not tokens:
+        return None
+
+    terms = ' '.join(f'"{token}"*' for token in tokens)
+    if columns:
+        return f"({{{' '.join(columns)}}} : ({terms}))"
+    return f"({terms})"
+
 class KeeperDatabase:
     """Main database interface for The Keeper."""
     
@@ -19,6 +37,7 @@ class KeeperDatabase:
         """Initialize with path relative to src/ directory pointing to docs/guides/Haven-lore/keeper-bot/data/keeper.db"""
         self.db_path = db_path
         self.connection = None
+        self.fts_enabled = False
         
     async def initialize(self):
         """Initialize the database and create tables."""
@@ -283,7 +302,60 @@ class KeeperDatabase:
         """)
 
         await self.connection.commit()
+        await self.create_search_index()
         logger.info("📊 Database tables created/verified (Phase 4 Community Features included)")
+
+    async def create_search_index(self):
+        """Create the FTS5 discovery index and its sync triggers."""
+        cursor = await self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'discoveries_fts'"
+        )
+        index_exists = await cursor.fetchone() is not None
+        columns = ', '.join(SEARCH_TEXT_COLUMNS + SEARCH_LOCATION_COLUMNS + ('username',))
+        new_values = ', '.join(f"NEW.{c}" for c in columns.split(', '))
+        old_values = ', '.join(f"OLD.{c}" for c in columns.split(', '))
+
+        try:
+            await self.connection.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS discoveries_fts USING fts5(
+                    {columns},
+                    content = 'discoveries', content_rowid = 'id',
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+            await self.connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_insert
+                AFTER INSERT ON discoveries
+                BEGIN
+                    INSERT INTO discoveries_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+                END
+            """)
+            await self.connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_delete
+                AFTER DELETE ON discoveries
+                BEGIN
+                    INSERT INTO discoveries_fts (discoveries_fts, rowid, {columns})
+                    VALUES ('delete', OLD.id, {old_values});
+                END
+            """)
+            await self.connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_update
+                AFTER UPDATE ON discoveries
+                BEGIN
+                    INSERT INTO discoveries_fts (discoveries_fts, rowid, {columns})
+                    VALUES ('delete', OLD.id, {old_values});
+                    INSERT INTO discoveries_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+                END
+            """)
+            if not index_exists:
+                await self.connection.execute(
+                    "INSERT INTO discoveries_fts (discoveries_fts) VALUES ('rebuild')"
+                )
+            await self.connection.commit()
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            self.fts_enabled = False
+            logger.warning(f"Full-text search unavailable, using LIKE queries: {e}")
     
     async def add_discovery(self, discovery_data: Dict) -> int:
         """Add a new discovery to the database."""
@@ -367,29 +439,30 @@ class KeeperDatabase:
                                location: Optional[str] = None,
                                time_period: Optional[str] = None,
                                user_id: Optional[str] = None,
+                               text: Optional[str] = None,
                                limit: int = 50) -> List[Dict]:
-        """Search discoveries with filters."""
-        query = "SELECT * FROM discoveries WHERE 1=1"
-        params = []
-        
+        """Search discoveries with filters.
+
+        ``text`` and ``location`` use the FTS5 index (prefix match, ranked
+        by bm25) when it is available.
+        """
+        match, query, params = self.search_filters(text=text, location=location)
+        order = (" ORDER BY bm25(discoveries_fts), d.submission_timestamp DESC" if match
+                 else " ORDER BY d.submission_timestamp DESC")
+
         if discovery_type:
-            query += " AND discovery_type = ?"
+            query += " AND d.discovery_type = ?"
             params.append(discovery_type)
         
-        if location:
-            query += " AND (location LIKE ? OR planet_name LIKE ? OR galaxy_name LIKE ?)"
-            location_pattern = f"%{location}%"
-            params.extend([location_pattern, location_pattern, location_pattern])
-        
         if time_period:
-            query += " AND time_period = ?"
+            query += " AND d.time_period = ?"
             params.append(time_period)
         
         if user_id:
-            query += " AND user_id = ?"
+            query += " AND d.user_id = ?"
             params.append(user_id)
         
-        query += " ORDER BY submission_timestamp DESC LIMIT ?"
+        query += order + " LIMIT ?"
         params.append(limit)
         
         cursor = await self.connection.execute(query, params)
@@ -397,6 +470,63 @@ class KeeperDatabase:
         
         return [self._row_to_discovery_dict(row) for row in rows]
     
+    @staticmethod
+    def build_match(text: Optional[str] = None,
+                    location: Optional[str] = None,
+                    username: Optional[str] = None) -> Optional[str]:
+        """Combine per-field searches into one discoveries_fts MATCH expression."""
+        parts = [
+            build_fts_query(text, SEARCH_TEXT_COLUMNS) if text else None,
+            build_fts_query(location, SEARCH_LOCATION_COLUMNS) if location else None,
+            build_fts_query(username, ('username',)) if username else None,
+        ]
+        parts = [part for part in parts if part]
+        return ' AND '.join(parts) if parts else None
+
+    def search_filters(self, text: Optional[str] = None,
+                       location: Optional[str] = None,
+                       username: Optional[str] = None) -> Tuple[Optional[str], str, List]:
+        """Build the discoveries query for text, location and explorer filters.
+
+        Each filter uses the FTS5 index when it is available and the text
+        makes a MATCH term; otherwise (no FTS5, or text with no words, such
+        as punctuation) that filter falls back to LIKE, so no filter is
+        silently dropped. Discoveries are aliased ``d``.
+
+        Returns:
+            (match or None, "SELECT ... WHERE ..." to extend with AND clauses, params)
+        """
+        like_columns = {
+            'text': SEARCH_TEXT_COLUMNS,
+            'location': SEARCH_LOCATION_COLUMNS,
+            'username': ('username',),
+        }
+        values = {'text': text, 'location': location, 'username': username}
+
+        fragments, clauses, params = [], [], []
+        for field, value in values.items():
+            value = (value or '').strip()
+            if not value:
+                continue
+            fragment = self.build_match(**{field: value}) if self.fts_enabled else None
+            if fragment:
+                fragments.append(fragment)
+            else:
+                columns = like_columns[field]
+                clauses.append("(" + " OR ".join(f"d.{column} LIKE ?" for column in columns) + ")")
+                params.extend([f"%{value}%"] * len(columns))
+
+        match = ' AND '.join(fragments) if fragments else None
+        if match:
+            query = ("SELECT d.* FROM discoveries_fts JOIN discoveries d ON d.id = discoveries_fts.rowid "
+                     "WHERE discoveries_fts MATCH ?")
+            params.insert(0, match)
+        else:
+            query = "SELECT d.* FROM discoveries d WHERE 1=1"
+        for clause in clauses:
+            query += f" AND {clause}"
+        return match, query, params
+
     async def find_similar_discoveries(self, discovery_id: int, threshold: float = 0.6) -> List[Dict]:
         """Find discoveries similar to the given one for pattern detection."""
         # Get the source discovery
@@ -6,21 +6,33 @@ This creates an HTTP API that the Discord bot on Railway can access
 to read system data and write discoveries to your local database.
 
 Usage:
-    python local_sync_api.py
+    python local_sync_api.py                 # pooled multi-threaded server
+    python local_sync_api.py --threads 16
+    python local_sync_api.py --dev           # Flask development server
 
 Then use ngrok to expose it:
     ngrok http 5000
 """
 
 import os
+import hmac
 import json
+import time
+import zlib
 import sqlite3
 import logging
-from datetime import datetime
-from flask import Flask, jsonify, request
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
 from pathlib import Path
 from dotenv import load_dotenv
+from werkzeug.serving import BaseWSGIServer
+
+from src.common.database import HavenDatabase, read_table_counts
+from src.common.discovery_writer import get_discovery_writer
 
 # Load environment variables from .env file
 load_dotenv()
@@ -54,72 +66,457 @@ def verify_api_key():
     return True
 
 
+# Read-only token for the progressive map's /api/map/* requests. The map
+# viewer asks for it when it first loads a region; it is never written into
+# generated map files, and it does not authorize any other endpoint.
+MAP_TOKEN = os.getenv('HAVEN_MAP_TOKEN')
+
+
+def verify_map_access():
+    """Verify read access to the map endpoints (map token or API key)."""
+    provided_token = request.headers.get('X-Map-Token')
+    if MAP_TOKEN and provided_token and hmac.compare_digest(provided_token, MAP_TOKEN):
+        return True
+    return verify_api_key()
+
+
+# Milliseconds a request waits for another writer's lock before failing
+DB_BUSY_TIMEOUT_MS = 5000
+
+# Worker threads for the production server
+DEFAULT_THREADS = 8
+
+# Accepted connections allowed to wait for a worker; beyond this the server
+# stops accepting and new connections wait in the socket's listen backlog
+MAX_QUEUED_REQUESTS = 64
+
+# Requests slower than this are logged as warnings
+SLOW_REQUEST_MS = 500
+
+# Each server worker thread keeps one open connection and reuses it
+_thread_local = threading.local()
+
+
+def _open_db_connection(path: str) -> sqlite3.Connection:
+    """Open a connection configured for concurrent readers and writers."""
+    conn = sqlite3.connect(path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
 def get_db_connection():
-    """Get a connection to VH-Database.db"""
+    """Get this worker thread's connection to VH-Database.db (opened once, then reused)"""
     if not os.path.exists(VH_DATABASE_PATH):
         raise FileNotFoundError(f"VH-Database not found at {VH_DATABASE_PATH}")
 
-    conn = sqlite3.connect(VH_DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is None or _thread_local.path != VH_DATABASE_PATH:
+        if conn is not None:
+            conn.close()
+        conn = _open_db_connection(VH_DATABASE_PATH)
+        _thread_local.conn = conn
+        _thread_local.path = VH_DATABASE_PATH
     return conn
 
 
+@app.after_request
+def close_unpooled_connection(response):
+    """Outside the pooled server (--dev, thread per request) the thread exits
+    after this request, so close its connection once the response is sent."""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None and not getattr(_thread_local, 'pooled', False):
+        _thread_local.conn = None
+        response.call_on_close(conn.close)
+    return response
+
+
+@app.teardown_request
+def release_db_connection(exc):
+    """Roll back anything a failed request left open on the cached connection."""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+    if conn is not None and not getattr(_thread_local, 'pooled', False):
+        conn.close()
+        _thread_local.conn = None
+
+
+# ========== REQUEST TIMING ==========
+
+# endpoint -> {'count', 'total_ms', 'max_ms'}
+REQUEST_METRICS = {}
+_metrics_lock = threading.Lock()
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_timing(response):
+    """Log each request's duration and expose it as a Server-Timing header."""
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.headers['Server-Timing'] = f"app;dur={elapsed_ms:.1f}"
+
+    key = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+    with _metrics_lock:
+        entry = REQUEST_METRICS.setdefault(key, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+
+    log = logger.warning if elapsed_ms >= SLOW_REQUEST_MS else logger.debug
+    log(f"{request.method} {request.path} {response.status_code} {elapsed_ms:.1f} ms")
+    return response
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'healthy',
         'database_accessible': os.path.exists(VH_DATABASE_PATH),
-        'timestamp': datetime.now(datetime.UTC).isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat()
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Get per-endpoint request counts and timings since the server started."""
+    if not verify_api_key():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    with _metrics_lock:
+        metrics = {
+            key: {
+                'count': entry['count'],
+                'avg_ms': round(entry['total_ms'] / entry['count'], 2),
+                'max_ms': round(entry['max_ms'], 2),
+            }
+            for key, entry in REQUEST_METRICS.items()
+        }
+    return jsonify({'endpoints': metrics})
+
+
+# Systems fetched per set-based batch while streaming /api/systems
+SYSTEMS_STREAM_BATCH = 500
+
+# Encoded output buffered before each chunk is written (and gzip-flushed)
+STREAM_CHUNK_BYTES = 64 * 1024
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def parse_system_fields(conn, fields: str = None):
+    """
+    Parse a ?fields= projection
+
+    Args:
+        conn: Open connection (used to read the systems columns)
+        fields: Comma-separated system columns, plus 'planets' for nested planets/moons
+
+    Returns:
+        (system columns, include planets); name is always included
+
+    Raises:
+        ValueError: If a field is not a systems column or 'planets'
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(systems)")]
+    if not fields:
+        return columns, True
+
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = sorted(set(requested) - set(columns) - {'planets'})
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    selected = [column for column in columns if column in requested or column == 'name']
+    return selected, 'planets' in requested
+
+
+def _attach_planets(conn, systems: list):
+    """Attach planets and moons to a batch of systems with one query each"""
+    by_id = {system['id']: system for system in systems}
+    for system in systems:
+        system['planets'] = []
+
+    placeholders = ','.join('?' * len(by_id))
+    params = list(by_id)
+
+    planets = {}
+    for row in conn.execute(
+            f"SELECT * FROM planets WHERE system_id IN ({placeholders})", params):
+        planet = dict(row)
+        planet['moons'] = []
+        planets[planet['id']] = planet
+        by_id[planet['system_id']]['planets'].append(planet)
+
+    for row in conn.execute(f"""
+        SELECT * FROM moons
+        WHERE planet_id IN (SELECT id FROM planets WHERE system_id IN ({placeholders}))
+    """, params):
+        planets[row['planet_id']]['moons'].append(dict(row))
+
+
+def iter_systems(conn, columns: list, include_planets: bool = True, region: str = None,
+                 after: str = None, limit: int = None):
+    """
+    Yield systems in name order from set-based batches
+
+    Each batch is one keyset query on systems (name > last name) plus one
+    query each for its planets and moons, so memory is bounded by
+    SYSTEMS_STREAM_BATCH rather than the size of the galaxy.
+
+    Args:
+        conn: Open connection with row_factory = sqlite3.Row
+        columns: System columns to return (from parse_system_fields)
+        include_planets: Nest planets (with moons) under each system
+        region: Only systems in this region
+        after: Keyset cursor - only systems whose name sorts after this
+        limit: Maximum systems to yield (None for all)
+    """
+    query_columns = list(dict.fromkeys(['id', *columns] if include_planets else columns))
+    select = ', '.join(f'"{column}"' for column in query_columns)
+    drop_id = 'id' not in columns
+
+    remaining = limit
+    while remaining is None or remaining > 0:
+        batch = SYSTEMS_STREAM_BATCH if remaining is None else min(SYSTEMS_STREAM_BATCH, remaining)
+
+        conditions, params = [], []
+        if region:
+            conditions.append("region = ?")
+            params.append(region)
+        if after is not None:
+            conditions.append("name > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = conn.execute(
+            f"SELECT {select} FROM systems {where} ORDER BY name LIMIT ?", params + [batch]
+        ).fetchall()
+        if not rows:
+            return
+
+        systems = [dict(row) for row in rows]
+        if include_planets:
+            _attach_planets(conn, systems)
+        for system in systems:
+            if drop_id:
+                system.pop('id', None)
+            yield system
+
+        after = systems[-1]['name']
+        if remaining is not None:
+            remaining -= len(systems)
+        if len(systems) < batch:
+            return
+
+
+def _encode_systems(systems, limit: int, ndjson: bool):
+    """
+    Encode systems as NDJSON lines or one {"systems": {...}} object
+
+    systems yields up to limit + 1 rows; the extra row only signals that
+    another page exists, reported as next_after (a trailing {"_next_after"}
+    line in NDJSON).
+    """
+    served = 0
+    next_after = None
+    last_name = None
+
+    if not ndjson:
+        yield '{"systems": {'
+    for system in systems:
+        if limit is not None and served == limit:
+            next_after = last_name
+            break
+        if ndjson:
+            yield json.dumps(system) + '\n'
+        else:
+            yield f"{', ' if served else ''}{json.dumps(system['name'])}: {json.dumps(system)}"
+        served += 1
+        last_name = system['name']
+
+    if ndjson:
+        if next_after is not None:
+            yield json.dumps({'_next_after': next_after}) + '\n'
+    else:
+        yield '}'
+        if next_after is not None:
+            yield f', "next_after": {json.dumps(next_after)}'
+        yield '}'
+
+    logger.info(f"Served {served} systems to client")
+
+
+def _chunked(pieces, gzip_output: bool):
+    """Group encoded pieces into chunks, gzip-compressing each one when asked"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip_output else None
+    buffer, size = [], 0
+
+    def flush():
+        data = ''.join(buffer).encode('utf-8')
+        buffer.clear()
+        if compressor:
+            # Sync flush so the client can decode every chunk as it arrives
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_BYTES:
+            yield flush()
+            size = 0
+    tail = flush()
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
 @app.route('/api/systems', methods=['GET'])
 def get_systems():
-    """Get all Haven star systems."""
+    """
+    Stream Haven star systems.
+
+    Query parameters:
+        fields: Comma-separated system columns, plus 'planets' for nested
+                planets/moons (default: every column and planets)
+        region: Only systems in this region
+        after: Keyset cursor - the last system name of the previous page
+        limit: Maximum systems to return (default: all)
+        format: 'ndjson' for one system per line (also selected by
+                Accept: application/x-ndjson); default is {"systems": {name: system}}
+
+    Responses are gzip-compressed when the client accepts it. A truncated
+    page reports the cursor for the next one as next_after (NDJSON: a
+    trailing {"_next_after": name} line).
+    """
     if not verify_api_key():
         return jsonify({'error': 'Unauthorized'}), 401
 
+    try:
+        limit = request.args.get('limit')
+        limit = int(limit) if limit else None
+        if limit is not None and limit < 1:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
+        columns, include_planets = parse_system_fields(conn, request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error getting systems: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        # Load all systems
-        cursor.execute("SELECT * FROM systems")
-        systems_rows = cursor.fetchall()
+    ndjson = (request.args.get('format') == 'ndjson'
+              or request.accept_mimetypes.best == NDJSON_MIMETYPE)
+    gzip_output = request.accept_encodings['gzip'] > 0
 
-        systems = {}
-        for system_row in systems_rows:
-            system = dict(system_row)
-            system_id = system['id']
-            system_name = system['name']
+    systems = iter_systems(
+        conn, columns, include_planets,
+        region=request.args.get('region'),
+        after=request.args.get('after'),
+        limit=limit + 1 if limit is not None else None,
+    )
+    body = _chunked(_encode_systems(systems, limit, ndjson), gzip_output)
 
-            # Load planets for this system
-            cursor.execute("SELECT * FROM planets WHERE system_id = ?", (system_id,))
-            planets_rows = cursor.fetchall()
+    response = Response(stream_with_context(body),
+                        mimetype=NDJSON_MIMETYPE if ndjson else 'application/json')
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    if gzip_output:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
 
-            planets = []
-            for planet_row in planets_rows:
-                planet = dict(planet_row)
-                planet_id = planet['id']
 
-                # Load moons for this planet
-                cursor.execute("SELECT * FROM moons WHERE planet_id = ?", (planet_id,))
-                moons_rows = cursor.fetchall()
+# Fields sent to the progressive map for each system marker
+MAP_SYSTEM_FIELDS = ('id', 'name', 'region', 'x', 'y', 'z')
 
-                planet['moons'] = [dict(moon) for moon in moons_rows]
-                planets.append(planet)
+# Upper bound on systems returned by one /api/map/systems request
+MAP_SYSTEMS_LIMIT = 5000
 
-            system['planets'] = planets
-            systems[system_name] = system
 
-        conn.close()
+def get_haven_database():
+    """Get a HavenDatabase for VH-Database.db (spatial and aggregate queries)"""
+    if not os.path.exists(VH_DATABASE_PATH):
+        raise FileNotFoundError(f"VH-Database not found at {VH_DATABASE_PATH}")
+
+    return HavenDatabase(VH_DATABASE_PATH)
+
 
-        logger.info(f"Served {len(systems)} systems to client")
-        return jsonify({'systems': systems})
+@app.route('/api/map/regions', methods=['GET'])
+def get_map_regions():
+    """Get per-region aggregates (count, centroid, bounding box) for the galaxy overview."""
+    if not verify_map_access():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        with get_haven_database() as db:
+            regions = db.get_region_aggregates()
+
+        return jsonify({'regions': regions})
 
     except Exception as e:
-        logger.error(f"Error getting systems: {e}")
+        logger.error(f"Error getting map regions: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/map/systems', methods=['GET'])
+def get_map_systems():
+    """
+    Get the systems for the part of the map being viewed.
+
+    Query parameters:
+        region: Only systems in this region
+        x, y, z, radius: Only systems inside this sphere
+        limit: Maximum systems to return (capped at MAP_SYSTEMS_LIMIT)
+    """
+    if not verify_map_access():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    region = request.args.get('region')
+    try:
+        limit = min(int(request.args.get('limit', MAP_SYSTEMS_LIMIT)), MAP_SYSTEMS_LIMIT)
+        sphere = None
+        if 'radius' in request.args:
+            sphere = tuple(float(request.args.get(key, 0)) for key in ('x', 'y', 'z', 'radius'))
+    except ValueError:
+        return jsonify({'error': 'x, y, z, radius and limit must be numbers'}), 400
+
+    if not region and not sphere:
+        return jsonify({'error': 'Provide a region or x, y, z and radius'}), 400
+
+    try:
+        with get_haven_database() as db:
+            if sphere:
+                cx, cy, cz, radius = sphere
+                rows = db.get_systems_in_region_sphere(cx, cy, cz, radius, limit=limit + 1, region=region)
+                truncated = len(rows) > limit
+            else:
+                page = db.get_systems_paginated(page=1, per_page=limit, region=region)
+                rows = page['systems']
+                truncated = page['total'] > limit
+
+        systems = [{key: row.get(key) for key in MAP_SYSTEM_FIELDS} for row in rows[:limit]]
+
+        logger.info(f"Served {len(systems)} map systems (region={region}, sphere={sphere})")
+        return jsonify({'systems': systems, 'truncated': truncated})
+
+    except Exception as e:
+        logger.error(f"Error getting map systems: {e}")
         return jsonify({'error': str(e)}), 500
 
 
@@ -160,7 +557,6 @@ def get_system(system_name):
             planets.append(planet)
 
         system['planets'] = planets
-        conn.close()
 
         return jsonify({'system': system})
 
@@ -179,148 +575,11 @@ def create_discovery():
         discovery_data = request.json
 
         conn = get_db_connection()
-        conn.execute("PRAGMA foreign_keys = ON")
-        cursor = conn.cursor()
-
-        # Resolve system_id from system_name
-        system_name = discovery_data.get('system_name')
-        system_id = None
-        if system_name:
-            cursor.execute("SELECT id FROM systems WHERE name = ?", (system_name,))
-            result = cursor.fetchone()
-            if result:
-                system_id = result[0]
-
-        # Resolve planet_id and moon_id from location
-        planet_id = None
-        moon_id = None
-        location_type = discovery_data.get('location_type', 'space')
-        location_name = discovery_data.get('location_name')
-
-        if location_type == 'planet' and location_name and system_id:
-            cursor.execute(
-                "SELECT id FROM planets WHERE system_id = ? AND name = ?",
-                (system_id, location_name)
-            )
-            result = cursor.fetchone()
-            if result:
-                planet_id = result[0]
-                logger.info(f"Resolved planet_id={planet_id} for planet '{location_name}'")
-
-        elif location_type == 'moon' and location_name and system_id:
-            # Get both moon_id and parent planet_id
-            cursor.execute("""
-                SELECT m.id, m.planet_id
-                FROM moons m
-                JOIN planets p ON m.planet_id = p.id
-                WHERE p.system_id = ? AND m.name = ?
-            """, (system_id, location_name))
-            result = cursor.fetchone()
-            if result:
-                moon_id = result[0]
-                planet_id = result[1]
-                logger.info(f"Resolved moon_id={moon_id}, planet_id={planet_id} for moon '{location_name}'")
-
-        # Insert discovery
-        cursor.execute("""
-            INSERT INTO discoveries (
-                discovery_type, discovery_name, system_id, planet_id, moon_id,
-                location_type, location_name, description, coordinates, condition,
-                time_period, significance, photo_url, evidence_urls,
-                discovered_by, discord_user_id, discord_guild_id,
-                pattern_matches, mystery_tier, analysis_status, tags, metadata,
-                species_type, size_scale, preservation_quality, estimated_age,
-                language_status, completeness, author_origin, key_excerpt,
-                structure_type, architectural_style, structural_integrity, purpose_function,
-                tech_category, operational_status, power_source, reverse_engineering,
-                species_name, behavioral_notes, habitat_biome, threat_level,
-                resource_type, deposit_richness, extraction_method, economic_value,
-                ship_class, hull_condition, salvageable_tech, pilot_status,
-                hazard_type, severity_level, duration_frequency, protection_required,
-                update_name, feature_category, gameplay_impact, first_impressions,
-                story_type, lore_connections, creative_elements, collaborative_work
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            discovery_data.get('type') or discovery_data.get('discovery_type'),
-            discovery_data.get('discovery_name'),
-            system_id,
-            planet_id,
-            moon_id,
-            location_type,
-            location_name,
-            discovery_data.get('description'),
-            discovery_data.get('coordinates'),
-            discovery_data.get('condition'),
-            discovery_data.get('time_period'),
-            discovery_data.get('significance'),
-            discovery_data.get('photo_url') or discovery_data.get('evidence_url'),
-            discovery_data.get('evidence_urls'),
-            discovery_data.get('username') or discovery_data.get('discovered_by'),
-            discovery_data.get('user_id') or discovery_data.get('discord_user_id'),
-            discovery_data.get('guild_id') or discovery_data.get('discord_guild_id'),
-            discovery_data.get('pattern_matches', 0),
-            discovery_data.get('mystery_tier', 0),
-            discovery_data.get('analysis_status', 'pending'),
-            discovery_data.get('tags'),
-            discovery_data.get('metadata'),
-            # Type-specific fields
-            discovery_data.get('species_type'),
-            discovery_data.get('size_scale'),
-            discovery_data.get('preservation_quality'),
-            discovery_data.get('estimated_age'),
-            discovery_data.get('language_status'),
-            discovery_data.get('completeness'),
-            discovery_data.get('author_origin'),
-            discovery_data.get('key_excerpt'),
-            discovery_data.get('structure_type'),
-            discovery_data.get('architectural_style'),
-            discovery_data.get('structural_integrity'),
-            discovery_data.get('purpose_function'),
-            discovery_data.get('tech_category'),
-            discovery_data.get('operational_status'),
-            discovery_data.get('power_source'),
-            discovery_data.get('reverse_engineering'),
-            discovery_data.get('species_name'),
-            discovery_data.get('behavioral_notes'),
-            discovery_data.get('habitat_biome'),
-            discovery_data.get('threat_level'),
-            discovery_data.get('resource_type'),
-            discovery_data.get('deposit_richness'),
-            discovery_data.get('extraction_method'),
-            discovery_data.get('economic_value'),
-            discovery_data.get('ship_class'),
-            discovery_data.get('hull_condition'),
-            discovery_data.get('salvageable_tech'),
-            discovery_data.get('pilot_status'),
-            discovery_data.get('hazard_type'),
-            discovery_data.get('severity_level'),
-            discovery_data.get('duration_frequency'),
-            discovery_data.get('protection_required'),
-            discovery_data.get('update_name'),
-            discovery_data.get('feature_category'),
-            discovery_data.get('gameplay_impact'),
-            discovery_data.get('first_impressions'),
-            discovery_data.get('story_type'),
-            discovery_data.get('lore_connections'),
-            discovery_data.get('creative_elements'),
-            discovery_data.get('collaborative_work')
-        ))
-
-        conn.commit()
-        discovery_id = cursor.lastrowid
-        conn.close()
+        result = get_discovery_writer(VH_DATABASE_PATH).write(conn, discovery_data)
 
-        logger.info(f"✅ Discovery #{discovery_id} written to VH-Database from Railway bot")
+        logger.info(f"✅ Discovery #{result['discovery_id']} written to VH-Database from Railway bot")
 
-        return jsonify({
-            'success': True,
-            'discovery_id': discovery_id,
-            'system_id': system_id,
-            'planet_id': planet_id,
-            'moon_id': moon_id
-        }), 201
+        return jsonify({'success': True, **result}), 201
 
     except Exception as e:
         logger.error(f"Error creating discovery: {e}")
@@ -339,7 +598,6 @@ def get_discovery(discovery_id):
 
         cursor.execute("SELECT * FROM discoveries WHERE id = ?", (discovery_id,))
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return jsonify({'error': 'Discovery not found'}), 404
@@ -360,31 +618,15 @@ def get_stats():
 
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Count systems
-        cursor.execute("SELECT COUNT(*) FROM systems")
-        system_count = cursor.fetchone()[0]
-
-        # Count planets
-        cursor.execute("SELECT COUNT(*) FROM planets")
-        planet_count = cursor.fetchone()[0]
 
-        # Count moons
-        cursor.execute("SELECT COUNT(*) FROM moons")
-        moon_count = cursor.fetchone()[0]
-
-        # Count discoveries
-        cursor.execute("SELECT COUNT(*) FROM discoveries")
-        discovery_count = cursor.fetchone()[0]
-
-        conn.close()
+        # Trigger-maintained counters (falls back to COUNT(*) on old databases)
+        counts = read_table_counts(conn)
 
         return jsonify({
-            'systems': system_count,
-            'planets': planet_count,
-            'moons': moon_count,
-            'discoveries': discovery_count,
+            'systems': counts['systems'],
+            'planets': counts['planets'],
+            'moons': counts['moons'],
+            'discoveries': counts['discoveries'],
             'database_path': VH_DATABASE_PATH,
             'database_size_mb': os.path.getsize(VH_DATABASE_PATH) / 1024 / 1024 if os.path.exists(VH_DATABASE_PATH) else 0
         })
@@ -394,17 +636,82 @@ def get_stats():
         return jsonify({'error': str(e)}), 500
 
 
-if __name__ == '__main__':
+# ========== SERVER ==========
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug WSGI server that handles requests on a fixed pool of threads.
+
+    Unlike thread-per-request serving, worker threads live as long as the
+    server, so each keeps its cached database connection between requests.
+    At most threads + max_queued requests are in flight: when they are all
+    taken the accept loop waits for a worker, leaving new connections in the
+    listen backlog instead of an unbounded queue.
+    """
+
+    def __init__(self, host: str, port: int, wsgi_app, threads: int = DEFAULT_THREADS,
+                 max_queued: int = MAX_QUEUED_REQUESTS):
+        super().__init__(host, port, wsgi_app)
+        self.threads = threads
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='sync-api',
+                                        initializer=self._init_worker)
+        self._slots = threading.BoundedSemaphore(threads + max_queued)
+
+    @staticmethod
+    def _init_worker():
+        _thread_local.pooled = True
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        try:
+            self._pool.submit(self._process_request_thread, request, client_address)
+        except RuntimeError:
+            # Pool shut down while we waited for a slot
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        self._pool.shutdown(wait=True)
+        super().server_close()
+
+
+def create_server(host: str = '0.0.0.0', port: int = 5000, threads: int = DEFAULT_THREADS,
+                  max_queued: int = MAX_QUEUED_REQUESTS) -> PooledWSGIServer:
+    """Create the production server (port 0 picks a free port)."""
+    return PooledWSGIServer(host, port, app, threads, max_queued)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Haven Local Sync API Server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help=f"Worker threads (default: {DEFAULT_THREADS})")
+    parser.add_argument('--max-queued', type=int, default=MAX_QUEUED_REQUESTS,
+                        help=f"Connections allowed to wait for a worker (default: {MAX_QUEUED_REQUESTS})")
+    parser.add_argument('--dev', action='store_true', help="Use the Flask development server")
+    args = parser.parse_args(argv)
+
     logger.info("=" * 60)
     logger.info("Haven Local Sync API Server")
     logger.info("=" * 60)
     logger.info(f"Database: {VH_DATABASE_PATH}")
     logger.info(f"Database exists: {os.path.exists(VH_DATABASE_PATH)}")
     logger.info(f"API Key: {API_KEY[:10]}... (use this in Railway environment)")
+    if not MAP_TOKEN:
+        logger.info("Map token: not set (set HAVEN_MAP_TOKEN to serve progressive maps)")
     logger.info("")
     logger.info("Next steps:")
     logger.info("1. Keep this server running on your computer")
-    logger.info("2. Run: ngrok http 5000")
+    logger.info(f"2. Run: ngrok http {args.port}")
     logger.info("3. Copy the ngrok URL (e.g., https://abc123.ngrok.io)")
     logger.info("4. Set HAVEN_SYNC_API_URL in Railway to: <ngrok_url>/api")
     logger.info("5. Set HAVEN_API_KEY in Railway to match the key above")
@@ -412,4 +719,20 @@ if __name__ == '__main__':
     logger.info("")
 
     # Run the server
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    if args.dev:
+        app.run(host=args.host, port=args.port, debug=False)
+        return 0
+
+    server = create_server(args.host, args.port, args.threads, args.max_queued)
+    logger.info(f"Serving on {args.host}:{server.server_port} with {args.threads} worker threads")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
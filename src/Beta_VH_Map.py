@@ -7,10 +7,19 @@ Creates two views:
 - Galaxy View: Shows region centroids, click to explore
 - System View: Shows individual systems within a region
 
+Large galaxies are written as octree LOD tiles (<output stem>_tiles/*.js) that the viewer
+streams as point clouds instead of embedding every system in the page.
+
+Progressive mode (large databases): the Galaxy View embeds only per-region
+aggregates; systems are fetched from local_sync_api when a region is opened.
+
 Usage:
     python Beta_VH_Map.py            # generate plot.html and open it
     python Beta_VH_Map.py --out my.html
     python Beta_VH_Map.py --no-open
+    python Beta_VH_Map.py --lod                # force octree tiles for the Galaxy View
+    python Beta_VH_Map.py --no-discoveries     # skip discoveries from VH-Database.db
+    python Beta_VH_Map.py --data-file data/VH-Database.db --progressive
 """
 from __future__ import annotations
 
@@ -41,14 +50,17 @@ def _setup_logging() -> None:
 _setup_logging()
 
 import argparse
+import base64
 import json
 import math
+import os
 import shutil
 import subprocess
 import webbrowser
 from typing import List, Optional
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from typing import Tuple, Dict, Any
 
@@ -66,14 +78,16 @@ try:
         from config.settings_user import (
             USE_DATABASE,
             get_data_provider,
-            get_current_backend
+            get_current_backend,
+            should_use_progressive_maps
         )
         logging.info("[Phase 4] User Edition: Using settings_user configuration")
     else:
         from config.settings import (
             USE_DATABASE,
             get_data_provider,
-            get_current_backend
+            get_current_backend,
+            should_use_progressive_maps
         )
         logging.info("Master Edition: Using settings configuration")
 
@@ -81,6 +95,10 @@ try:
 except ImportError as e:
     # Fallback if database modules not available - map will use JSON directly
     USE_DATABASE = False
+
+    def should_use_progressive_maps(system_count: int) -> bool:
+        return False
+
     logging.warning(f"Database integration disabled - using JSON fallback: {e}")
 
 
@@ -90,6 +108,28 @@ except ImportError as e:
 
 DATA_FILE = data_path("data.json")
 
+# local_sync_api base URL the progressive Galaxy View fetches region systems from
+MAP_API_URL = os.getenv('HAVEN_MAP_API_URL', 'http://localhost:5000/api')
+
+# Most regions the progressive viewer keeps loaded before unloading the oldest
+MAP_MAX_LOADED_REGIONS = 8
+
+# Galaxy views with at least this many systems are written as octree LOD tiles
+MAP_LOD_THRESHOLD = 2000
+
+# Octree shape: leaf capacity, representative points per interior node, depth cap
+LOD_TILE_POINTS = 4096
+LOD_SAMPLE_POINTS = 1024
+LOD_MAX_DEPTH = 8
+
+# Marks a tiles directory as written by write_octree_tiles and lists its files;
+# only those files are ever deleted when the tiles are rewritten
+LOD_TILES_MARKER = ".haven-tiles.json"
+
+# Loaded galaxies kept in memory (by source file) for repeat builds in the
+# persistent map worker (common.map_worker)
+GALAXY_CACHE_SIZE = 2
+
 
 # ============================================================================
 # DATA LOADING AND NORMALIZATION (Same as before)
@@ -136,7 +176,57 @@ def normalize_record(record: dict, region: Optional[str] = None) -> dict:
     return r
 
 
+_galaxy_cache: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
+
+
+def _file_stamp(path: Path) -> tuple:
+    try:
+        stat = Path(path).stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (None, None)
+
+
+def source_signature(path: Path) -> Optional[tuple]:
+    """Stamp of every file a galaxy load reads, or None if it cannot be cached.
+
+    Database sources include their -wal file, which is where SQLite writes
+    land until a checkpoint.
+    """
+    files = [Path(path)]
+    if not str(path).endswith('.db') and USE_DATABASE and Path(path).resolve() == Path(DATA_FILE).resolve():
+        try:
+            db_path = getattr(get_data_provider(), 'db_path', None)
+        except Exception:
+            return None
+        if db_path:
+            files.append(Path(db_path))
+    files += [Path(f"{f}-wal") for f in files if str(f).endswith('.db')]
+    return tuple(_file_stamp(f) for f in files)
+
+
 def load_systems(path: Path = DATA_FILE) -> pd.DataFrame:
+    """Load systems, reusing the last load of this source while its files are unchanged.
+
+    See load_systems_uncached for the supported sources and formats.
+    """
+    key = str(Path(path).resolve())
+    signature = source_signature(path)
+    cached = _galaxy_cache.get(key)
+    if signature is not None and cached is not None and cached[0] == signature:
+        logging.info(f"Using cached galaxy for {path} ({len(cached[1])} systems)")
+        return cached[1].copy(deep=False)
+
+    df = load_systems_uncached(path)
+    if signature is not None:
+        _galaxy_cache.pop(key, None)
+        while len(_galaxy_cache) >= GALAXY_CACHE_SIZE:
+            _galaxy_cache.pop(next(iter(_galaxy_cache)))
+        _galaxy_cache[key] = (signature, df)
+    return df.copy(deep=False)
+
+
+def load_systems_uncached(path: Path = DATA_FILE) -> pd.DataFrame:
     """
     Load systems from the data file or database, supporting new and legacy formats.
     
@@ -299,8 +389,12 @@ def cartesian_to_orbital(x: float, y: float, z: float) -> Tuple[float, float, fl
 # TEMPLATE AND STATIC FILE MANAGEMENT
 # ============================================================================
 
+_template_cache: Dict[str, Any] = {}
+_static_copies: Dict[str, tuple] = {}
+
+
 def load_template() -> str:
-    """Load the HTML template from external file.
+    """Load the HTML template from external file (re-read only when it changes).
 
     Returns:
         HTML template string with placeholders for data injection.
@@ -316,7 +410,11 @@ def load_template() -> str:
 
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found: {template_path}")
-    return template_path.read_text(encoding='utf-8')
+    stamp = (str(template_path), _file_stamp(template_path))
+    if _template_cache.get('stamp') != stamp:
+        _template_cache['text'] = template_path.read_text(encoding='utf-8')
+        _template_cache['stamp'] = stamp
+    return _template_cache['text']
 
 
 def copy_static_files(output_dir: Path) -> None:
@@ -338,9 +436,18 @@ def copy_static_files(output_dir: Path) -> None:
         logging.warning(f"Static source directory not found: {src_static}")
         return
 
+    # Skip the copy when this output already has the current assets
+    stamp = tuple((str(f.relative_to(src_static)), _file_stamp(f))
+                  for f in sorted(src_static.rglob('*')) if f.is_file())
+    dest_key = str(dest_static.resolve())
+    if _static_copies.get(dest_key) == stamp and dest_static.exists():
+        logging.debug(f"Static files in {dest_static} are current")
+        return
+
     # Copy files, overwriting if they exist (dirs_exist_ok available in Python 3.8+)
     try:
         shutil.copytree(src_static, dest_static, dirs_exist_ok=True)
+        _static_copies[dest_key] = stamp
         logging.info(f"Copied static files from {src_static} to {dest_static}")
     except Exception as e:
         logging.error(f"Error copying static files: {e}")
@@ -571,14 +678,270 @@ def prepare_system_data(df: pd.DataFrame, region_filter: Optional[str] = None) -
 
 
 
+def progressive_database_path(path: Path) -> Optional[Path]:
+    """Return the database a progressive map can be served from, if any.
+
+    Progressive maps need the SQL backend: either an explicit .db data file
+    or the configured database provider for the default data path.
+    """
+    if str(path).endswith('.db'):
+        return Path(path)
+    if USE_DATABASE and Path(path).resolve() == Path(DATA_FILE).resolve():
+        try:
+            db_path = getattr(get_data_provider(), 'db_path', None)
+        except Exception as e:
+            logging.warning(f"Could not resolve database provider: {e}")
+            return None
+        if db_path and Path(db_path).exists():
+            return Path(db_path)
+    return None
+
+
+def count_systems(db_path: Path) -> int:
+    """Total systems in a database (trigger-maintained counter, no table scan)."""
+    from src.common.database import HavenDatabase
+    with HavenDatabase(str(db_path)) as db:
+        return db.get_total_count()
+
+
+def load_region_aggregates(db_path: Path) -> List[dict]:
+    """Load per-region count, centroid and bounding box computed in SQL."""
+    from src.common.database import HavenDatabase
+    with HavenDatabase(str(db_path)) as db:
+        regions = db.get_region_aggregates()
+    logging.info(f"Loaded {len(regions)} region aggregates from {db_path}")
+    return regions
+
+
+def prepare_region_overview_data(regions: List[dict]) -> List[dict]:
+    """Prepare one marker per region for the progressive Galaxy Overview."""
+    items: List[dict] = []
+    for region in regions:
+        x, y, z = cartesian_to_orbital(
+            float(region.get("cx") or 0),
+            float(region.get("cy") or 0),
+            float(region.get("cz") or 0)
+        )
+        items.append({
+            "type": "region",
+            "name": region.get("region"),
+            "region": region.get("region"),
+            "count": region.get("count", 0),
+            "x": x,
+            "y": z,  # Swap y and z for Three.js coordinate system
+            "z": y,
+            "bbox": {
+                "min": [region.get("min_x"), region.get("min_y"), region.get("min_z")],
+                "max": [region.get("max_x"), region.get("max_y"), region.get("max_z")],
+            },
+        })
+    return items
+
+
+# ============================================================================
+# OCTREE LOD TILES
+# ============================================================================
+
+def galaxy_positions(df: pd.DataFrame) -> Tuple[np.ndarray, List[list]]:
+    """Vectorised Galaxy View positions plus the system table tiles refer to.
+
+    Returns:
+        (positions, systems): float32 array of shape (n, 3) in Three.js
+        coordinates (y and z swapped, as prepare_galaxy_systems_data does),
+        and one [name, region, planet_count, moon_count] entry per row; a
+        tile's uint32 ids index into this table.
+    """
+    if "type" in df.columns:
+        df = df[df["type"] != "region"]
+    xyz = np.column_stack([
+        pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        for c in ("x", "y", "z")
+    ]) if len(df) else np.zeros((0, 3))
+    # Match cartesian_to_orbital(): points at the origin are nudged off it
+    at_origin = np.sqrt((xyz ** 2).sum(axis=1)) < 0.01
+    xyz[at_origin] = (0.1, 0.0, 0.0)
+    positions = xyz[:, [0, 2, 1]].astype(np.float32)
+
+    systems = []
+    for name, region, planets in zip(df["name"], df["region"], df["planets"]):
+        planets = planets if isinstance(planets, list) else []
+        moons = sum(len(p.get("moons") or []) for p in planets if isinstance(p, dict))
+        systems.append([name, region, len(planets), moons])
+    return positions, systems
+
+
+def build_octree(positions: np.ndarray, max_points: int = LOD_TILE_POINTS,
+                 sample_points: int = LOD_SAMPLE_POINTS,
+                 max_depth: int = LOD_MAX_DEPTH) -> Tuple[List[dict], Dict[str, np.ndarray]]:
+    """Partition points into an octree of LOD tiles.
+
+    Leaves hold every point in their cube; interior nodes hold a fixed-seed
+    random sample of the points beneath them, so zoomed-out views draw a
+    representative subset and refine into children on approach.
+
+    Args:
+        positions: float array of shape (n, 3)
+        max_points: Split nodes holding more points than this
+        sample_points: Points kept on each interior node
+        max_depth: Never split below this depth
+
+    Returns:
+        (nodes, tiles): node dicts {key, min, max, count, points, children}
+        in breadth-first order (root key 'r'), and key -> point indices.
+    """
+    rng = np.random.default_rng(0)
+    nodes: List[dict] = []
+    tiles: Dict[str, np.ndarray] = {}
+    if len(positions) == 0:
+        return nodes, tiles
+
+    # Cubic root bounds keep every octant a cube
+    lo = positions.min(axis=0).astype(np.float64)
+    hi = positions.max(axis=0).astype(np.float64)
+    center = (lo + hi) / 2
+    half = max(float((hi - lo).max()) / 2, 1e-3)
+    queue = [("r", np.arange(len(positions)), center - half, center + half, 0)]
+
+    while queue:
+        key, idx, lo, hi, depth = queue.pop(0)
+        node = {"key": key, "min": lo.tolist(), "max": hi.tolist(),
+                "count": int(len(idx)), "children": []}
+        if len(idx) <= max_points or depth >= max_depth:
+            tiles[key] = idx
+        else:
+            mid = (lo + hi) / 2
+            upper = positions[idx] >= mid
+            octant = upper[:, 0] | (upper[:, 1] << 1) | (upper[:, 2] << 2)
+            for o in range(8):
+                sub = idx[octant == o]
+                if len(sub) == 0:
+                    continue
+                bits = np.array([o & 1, o & 2, o & 4], dtype=bool)
+                child = f"{key}{o}"
+                node["children"].append(child)
+                queue.append((child, sub, np.where(bits, mid, lo), np.where(bits, hi, mid), depth + 1))
+            tiles[key] = np.sort(rng.choice(idx, size=min(sample_points, len(idx)), replace=False))
+        node["points"] = int(len(tiles[key]))
+        nodes.append(node)
+    return nodes, tiles
+
+
+def encode_tile(positions: np.ndarray, ids: np.ndarray) -> bytes:
+    """Binary tile: n Float32 xyz triples followed by n uint32 system ids."""
+    return (positions[ids].astype("<f4").tobytes()
+            + ids.astype("<u4").tobytes())
+
+
+def tiles_dir_for(output: Path) -> Path:
+    """The octree tiles directory owned by one Galaxy View page (<stem>_tiles/)."""
+    return output.parent / f"{output.stem}_tiles"
+
+
+def _clear_tiles_dir(tiles_dir: Path):
+    """Delete the files a previous write_octree_tiles left in tiles_dir.
+
+    Raises:
+        FileExistsError: tiles_dir holds files but was not written by us
+    """
+    marker = tiles_dir / LOD_TILES_MARKER
+    if not tiles_dir.exists():
+        return
+    if not marker.exists():
+        if any(tiles_dir.iterdir()):
+            raise FileExistsError(f"{tiles_dir} exists and was not written by the map generator")
+        return
+    try:
+        written = json.loads(marker.read_text(encoding="utf-8")).get("files", [])
+    except (OSError, ValueError, AttributeError):
+        written = []
+    for name in written:
+        # Names come from our own marker; never follow one out of the directory
+        if Path(name).name == name:
+            (tiles_dir / name).unlink(missing_ok=True)
+    marker.unlink()
+
+
+def write_octree_tiles(df: pd.DataFrame, tiles_dir: Path) -> Dict[str, Any]:
+    """Write the Galaxy View as octree tiles and return the viewer config.
+
+    Tiles are base64 inside small scripts (HavenTiles.tile(...)) because
+    browsers block fetch() of local files when the map is opened from disk.
+    Each tile carries the [name, region, planets, moons] of its own points,
+    so the viewer never downloads metadata for tiles it does not draw.
+
+    Returns:
+        MAP_TILES config for the template.
+    """
+    positions, systems = galaxy_positions(df)
+    nodes, tiles = build_octree(positions)
+
+    # Stale tiles from a previous, differently shaped octree must not linger
+    _clear_tiles_dir(tiles_dir)
+    tiles_dir.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for key, ids in tiles.items():
+        payload = base64.b64encode(encode_tile(positions, ids)).decode("ascii")
+        meta = json.dumps([systems[i] for i in ids.tolist()], separators=(",", ":"), default=str)
+        (tiles_dir / f"{key}.js").write_text(f'HavenTiles.tile("{key}","{payload}",{meta});\n',
+                                             encoding="utf-8")
+        written.append(f"{key}.js")
+    index = {"root": "r", "nodes": nodes, "count": len(systems)}
+    (tiles_dir / "index.js").write_text(
+        f"HavenTiles.index({json.dumps(index, separators=(',', ':'), default=str)});\n", encoding="utf-8")
+    written.append("index.js")
+    (tiles_dir / LOD_TILES_MARKER).write_text(json.dumps({"files": written}), encoding="utf-8")
+
+    logging.info(f"Wrote {len(tiles)} octree tiles for {len(systems)} systems to {tiles_dir}")
+    return {"index": f"{tiles_dir.name}/index.js"}
+
+
 # ============================================================================
 # RENDERING AND EXPORTING
 # ============================================================================
-def write_galaxy_and_system_views(df: pd.DataFrame, output: Path):
+def write_progressive_galaxy_view(db_path: Path, output: Path, api_url: str = MAP_API_URL):
+    """Generate a Galaxy Overview that embeds region aggregates only.
+
+    Systems are fetched per region from local_sync_api (/api/map/systems)
+    when the user opens a region, so generation cost and page size depend on
+    the number of regions rather than the number of systems. No credential is
+    written into the page: the viewer asks for the read-only map token
+    (HAVEN_MAP_TOKEN) when it first needs one.
+    """
+    template = load_template()
+    copy_static_files(output.parent)
+
+    galaxy_data = prepare_region_overview_data(load_region_aggregates(db_path))
+    map_api = {
+        "progressive": True,
+        "url": api_url.rstrip('/'),
+        "maxRegions": MAP_MAX_LOADED_REGIONS,
+    }
+
+    html = template.replace("{{SYSTEMS_DATA}}", json.dumps(galaxy_data, indent=2))
+    html = html.replace("{{VIEW_MODE}}", "galaxy")
+    html = html.replace("{{REGION_NAME}}", "")
+    html = html.replace("{{SYSTEM_META}}", json.dumps({}, indent=2))
+    html = html.replace("{{DISCOVERIES_DATA}}", json.dumps([], indent=2))
+    html = html.replace("{{MAP_API}}", json.dumps(map_api, indent=2))
+    html = html.replace("{{MAP_TILES}}", "null")
+    output.write_text(html, encoding="utf-8")
+    logging.info(f"Wrote progressive Galaxy Overview ({len(galaxy_data)} regions): {output}")
+
+
+def write_galaxy_and_system_views(df: pd.DataFrame, output: Path, lod: Optional[bool] = None,
+                                  discoveries: bool = True):
     """Generate Galaxy Overview (one point per system) and System View for each system.
 
     This function now uses external template files and copies static assets.
     Also includes discoveries from the database if available.
+
+    Args:
+        df: Systems to render
+        output: Galaxy Overview HTML path
+        lod: Write the Galaxy View as octree LOD tiles (default: when df has
+             at least MAP_LOD_THRESHOLD systems)
+        discoveries: Include discoveries from VH-Database.db
     """
     # Load the HTML template from external file
     template = load_template()
@@ -587,16 +950,25 @@ def write_galaxy_and_system_views(df: pd.DataFrame, output: Path):
     copy_static_files(output.parent)
 
     # Load discoveries from database
-    discoveries_data = load_discoveries()
+    discoveries_data = load_discoveries() if discoveries else []
     logging.info(f"Including {len(discoveries_data)} discoveries in map generation")
 
     # Galaxy overview
-    galaxy_data = prepare_galaxy_systems_data(df)
+    if lod is None:
+        lod = len(df) >= MAP_LOD_THRESHOLD
+    if lod:
+        map_tiles = write_octree_tiles(df, tiles_dir_for(output))
+        galaxy_data = []
+    else:
+        map_tiles = None
+        galaxy_data = prepare_galaxy_systems_data(df)
     html = template.replace("{{SYSTEMS_DATA}}", json.dumps(galaxy_data, indent=2))
     html = html.replace("{{VIEW_MODE}}", "galaxy")
     html = html.replace("{{REGION_NAME}}", "")
     html = html.replace("{{SYSTEM_META}}", json.dumps({}, indent=2))
     html = html.replace("{{DISCOVERIES_DATA}}", json.dumps(discoveries_data, indent=2))
+    html = html.replace("{{MAP_API}}", "null")
+    html = html.replace("{{MAP_TILES}}", json.dumps(map_tiles))
     output.write_text(html, encoding="utf-8")
     logging.info(f"Wrote Galaxy Overview: {output}")
 
@@ -626,6 +998,8 @@ def write_galaxy_and_system_views(df: pd.DataFrame, output: Path):
         html = html.replace("{{REGION_NAME}}", system_name)
         html = html.replace("{{SYSTEM_META}}", json.dumps(meta, indent=2))
         html = html.replace("{{DISCOVERIES_DATA}}", json.dumps(system_discoveries, indent=2))
+        html = html.replace("{{MAP_API}}", "null")
+        html = html.replace("{{MAP_TILES}}", "null")
         system_file.write_text(html, encoding="utf-8")
         logging.info(f"Wrote System View for {system_name}: {system_file.name}")
 
@@ -677,6 +1051,13 @@ def main(argv=None) -> int:
     p.add_argument("--only", nargs="*", help="Only include systems with these names (case-sensitive)")
     p.add_argument("--limit", type=int, help="Limit to first N systems after filtering")
     p.add_argument("--data-file", default=str(DATA_FILE), help="Path to data JSON file (default: data/data.json)")
+    p.add_argument("--progressive", action="store_true",
+                   help="Embed region aggregates only and load systems from the local API")
+    p.add_argument("--api-url", default=MAP_API_URL, help="local_sync_api base URL for progressive maps")
+    p.add_argument("--lod", action="store_true", default=None,
+                   help=f"Write the Galaxy View as octree LOD tiles (default above {MAP_LOD_THRESHOLD} systems)")
+    p.add_argument("--no-discoveries", action="store_true",
+                   help="Don't read discoveries from data/VH-Database.db")
     args = p.parse_args(argv)
 
     data_file_path = Path(args.data_file)
@@ -684,6 +1065,20 @@ def main(argv=None) -> int:
         print("Data file not found:", data_file_path)
         return 1
 
+    out = Path(args.out)
+
+    # Progressive mode: never load every system, only region aggregates
+    db_path = None if (args.only or args.limit) else progressive_database_path(data_file_path)
+    if db_path and (args.progressive or should_use_progressive_maps(count_systems(db_path))):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        write_progressive_galaxy_view(db_path, out, args.api_url)
+        if not args.no_open:
+            if not open_in_edge(out, debug=args.debug):
+                print("Could not open in Edge; try opening", out)
+        return 0
+    if args.progressive:
+        logging.warning("Progressive maps need a database source; generating a static map")
+
     df = load_systems(data_file_path)
     # Optional filtering
     if args.only:
@@ -693,10 +1088,9 @@ def main(argv=None) -> int:
             pass
     if args.limit and args.limit > 0:
         df = df.head(args.limit)
-    out = Path(args.out)
     # Ensure output directory exists
     out.parent.mkdir(parents=True, exist_ok=True)
-    write_galaxy_and_system_views(df, out)
+    write_galaxy_and_system_views(df, out, lod=args.lod, discoveries=not args.no_discoveries)
 
     if not args.no_open:
         opened = open_in_edge(out, debug=args.debug)
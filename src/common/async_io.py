@@ -0,0 +1,307 @@
+"""
+Background I/O executor for the Haven Tk apps
+
+Database and JSON loads run on a small, bounded pool of worker threads
+instead of the Tk main thread, and their results are handed back to Tk
+through a queue drained by an after() poll on the main thread (Tk widgets
+must only be touched from the thread that created them).
+
+- BackgroundExecutor: a named, bounded ThreadPoolExecutor whose tasks are
+  cancellable and log their queue wait and run time
+- TaskHandle: the caller's handle; cancel() drops a queued task and
+  suppresses the callbacks of a running one
+- keyed submits: submitting with the same key cancels the previous task
+  and drops its callback even if it already finished, so only the latest
+  load for a widget (e.g. a reloaded list) is applied
+- progress: with on_progress, fn gets a progress= reporter whose calls are
+  delivered on the Tk thread through the same queue as the results
+
+Usage:
+    handle = run_in_background(window, db_load, system_id,
+                               on_done=window.show_rows, on_error=window.show_error,
+                               name="load discoveries", key="discoveries")
+    ...
+    handle.cancel()
+"""
+import queue
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per executor
+DEFAULT_WORKERS = 4
+
+# How often the Tk main thread checks for finished tasks
+POLL_INTERVAL_MS = 25
+
+# Default executor for data loading
+IO_EXECUTOR = 'io'
+
+
+class TaskHandle:
+    """A submitted task: cancellable, with its timings once finished"""
+
+    def __init__(self, name: str, key: Optional[str] = None):
+        self.name = name
+        self.key = key
+        self.future = None
+        self.submitted_at = time.perf_counter()
+        self.queued_ms: Optional[float] = None
+        self.run_ms: Optional[float] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task
+
+        A queued task never runs; a running one finishes but its callbacks
+        are not called.
+
+        Returns:
+            True if the task had not started yet
+        """
+        self._cancelled.set()
+        return self.future.cancel() if self.future is not None else True
+
+    def cancelled(self) -> bool:
+        """True once cancel() was called (long tasks may poll this to stop early)"""
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Block for the task's result (for scripts and tests, never the Tk thread)"""
+        return self.future.result(timeout)
+
+
+class _TkDispatcher:
+    """Runs callbacks on a Tk root's main thread, polling a queue with after()"""
+
+    def __init__(self, root):
+        self.root = root
+        # (callback, settles): progress reports do not settle their task's slot
+        self.queue: "queue.Queue[Tuple[Callable[[], None], bool]]" = queue.Queue()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.polling = False
+
+    def expect(self):
+        """Register a task whose callback will arrive (called on the Tk thread)"""
+        with self.lock:
+            self.pending += 1
+        if not self.polling:
+            self.polling = True
+            self._schedule()
+
+    def post(self, callback: Callable[[], None], settles: bool = True):
+        """Queue a callback from a worker thread (settles: it is the task's last)"""
+        self.queue.put((callback, settles))
+
+    def _schedule(self):
+        try:
+            self.root.after(POLL_INTERVAL_MS, self._drain)
+        except Exception:
+            # Root destroyed: nothing left to deliver to
+            self.polling = False
+
+    def _drain(self):
+        while True:
+            try:
+                callback, settles = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if settles:
+                with self.lock:
+                    self.pending -= 1
+            try:
+                callback()
+            except Exception:
+                logger.exception("Background task callback failed")
+
+        with self.lock:
+            idle = self.pending <= 0
+        if idle:
+            self.polling = False
+        else:
+            self._schedule()
+
+
+class BackgroundExecutor:
+    """
+    Bounded worker pool with cancellable, timed tasks
+
+    Thread-safe; callbacks are delivered on the Tk thread of the widget
+    passed to submit(), or on the worker thread when no widget is given.
+    """
+
+    def __init__(self, name: str = IO_EXECUTOR, max_workers: int = DEFAULT_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"haven-{name}")
+        self._lock = threading.Lock()
+        self._keyed: Dict[str, TaskHandle] = {}
+        self._generations: Dict[str, int] = {}
+        self._dispatchers: Dict[int, _TkDispatcher] = {}
+
+    def _dispatcher(self, widget) -> _TkDispatcher:
+        # One poll loop per application root, shared by all its windows
+        root = widget._root() if hasattr(widget, '_root') else widget
+        with self._lock:
+            dispatcher = self._dispatchers.get(id(root))
+            if dispatcher is None or dispatcher.root is not root:
+                dispatcher = self._dispatchers[id(root)] = _TkDispatcher(root)
+            return dispatcher
+
+    def submit(self, fn: Callable, *args, widget=None, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[..., None]] = None,
+               name: Optional[str] = None, key: Optional[str] = None, **kwargs) -> TaskHandle:
+        """
+        Run fn(*args, **kwargs) on a worker thread
+
+        When a widget is given, call this from its Tk thread.
+
+        Args:
+            fn: Function to run
+            widget: Tk widget whose main thread receives the callbacks
+            on_done: Called with fn's result (skipped if cancelled or the widget is gone)
+            on_error: Called with the exception fn raised (logged if not given)
+            on_progress: Called with the arguments of each call fn makes to the
+                reporter passed to it as progress= (same rules as on_done)
+            name: Label for timing logs (defaults to fn's name)
+            key: Cancels any unfinished task submitted with the same key and
+                drops the callbacks of earlier tasks with this key that are
+                still waiting to be delivered
+
+        Returns:
+            TaskHandle
+        """
+        handle = TaskHandle(name or getattr(fn, '__name__', 'task'), key)
+        dispatcher = self._dispatcher(widget) if widget is not None else None
+
+        generation = None
+        if key is not None:
+            with self._lock:
+                previous = self._keyed.get(key)
+                self._keyed[key] = handle
+                generation = self._generations[key] = self._generations.get(key, 0) + 1
+            if previous is not None and not previous.done():
+                previous.cancel()
+                logger.debug(f"[{self.name}] superseded {previous.name}")
+
+        def deliver(callback, *values):
+            if callback is None or handle.cancelled():
+                return
+            if key is not None:
+                # A later submit with this key replaced us after we finished
+                with self._lock:
+                    if self._generations.get(key) != generation:
+                        return
+            if widget is not None:
+                try:
+                    if not widget.winfo_exists():
+                        return
+                except Exception:
+                    return
+            callback(*values)
+
+        if on_progress is not None:
+            def report(*values):
+                if handle.cancelled():
+                    return
+                if dispatcher is not None:
+                    dispatcher.post(lambda: deliver(on_progress, *values), settles=False)
+                else:
+                    deliver(on_progress, *values)
+            kwargs['progress'] = report
+
+        def run():
+            started = time.perf_counter()
+            handle.queued_ms = (started - handle.submitted_at) * 1000
+            outcome, value = None, None
+            try:
+                if handle.cancelled():
+                    raise CancelledError()
+                value = fn(*args, **kwargs)
+                outcome = on_done
+                return value
+            except CancelledError:
+                raise
+            except Exception as e:
+                value = e
+                outcome = on_error
+                if on_error is None:
+                    logger.exception(f"[{self.name}] {handle.name} failed")
+                raise
+            finally:
+                handle.run_ms = (time.perf_counter() - started) * 1000
+                logger.info(f"[{self.name}] {handle.name}: {handle.run_ms:.1f} ms "
+                            f"(queued {handle.queued_ms:.1f} ms)"
+                            + (" [cancelled]" if handle.cancelled() else ""))
+                if key is not None:
+                    with self._lock:
+                        if self._keyed.get(key) is handle:
+                            del self._keyed[key]
+                if dispatcher is not None:
+                    dispatcher.post(lambda: deliver(outcome, value))
+                else:
+                    deliver(outcome, value)
+
+        if dispatcher is not None:
+            dispatcher.expect()
+        try:
+            handle.future = self._pool.submit(run)
+        except RuntimeError:
+            # Executor shut down (application closing)
+            handle.cancel()
+            if dispatcher is not None:
+                dispatcher.post(lambda: None)
+            return handle
+
+        if dispatcher is not None:
+            def dropped(future):
+                # A task cancelled while queued never runs, so settle its slot
+                if future.cancelled():
+                    dispatcher.post(lambda: None)
+            handle.future.add_done_callback(dropped)
+        return handle
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting tasks and drop queued ones"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executors: Dict[str, BackgroundExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str = IO_EXECUTOR, max_workers: int = DEFAULT_WORKERS) -> BackgroundExecutor:
+    """Get the process-wide executor with this name (created on first use)"""
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = BackgroundExecutor(name, max_workers)
+        return executor
+
+
+def run_in_background(widget, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+                      on_error: Optional[Callable[[BaseException], None]] = None,
+                      on_progress: Optional[Callable[..., None]] = None,
+                      name: Optional[str] = None, key: Optional[str] = None, **kwargs) -> TaskHandle:
+    """Run fn on the shared I/O executor and deliver the result on widget's Tk thread"""
+    return get_executor().submit(fn, *args, widget=widget, on_done=on_done, on_error=on_error,
+                                 on_progress=on_progress, name=name, key=key, **kwargs)
+
+
+def shutdown_executors(wait: bool = False):
+    """Shut down every executor (call when the application exits)"""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -15,7 +15,7 @@ import os
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -177,3 +177,55 @@ def atomic_write_text(text: str, target_path: str | Path, encoding: str = 'utf-8
 
         logger.error(f"Atomic write failed for {target_path}: {e}")
         raise
+
+
+def atomic_write_stream(chunks: Iterable[str | bytes], target_path: str | Path,
+                        encoding: Optional[str] = 'utf-8') -> int:
+    """
+    Atomically write text (or bytes) produced piece by piece (e.g. a large JSON export).
+
+    The chunks go straight to a temporary file in the target's directory,
+    which then replaces the target, so the whole document is never held in
+    memory and readers see either the old file or the complete new one.
+
+    Args:
+        chunks: Text pieces, written in order
+        target_path: Path to target file
+        encoding: Text encoding (default: utf-8); None writes bytes chunks
+
+    Returns:
+        Number of characters (bytes when encoding is None) written
+
+    Raises:
+        Exception: If write fails (original file remains intact)
+    """
+    target_path = Path(target_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=target_path.parent,
+        prefix=f".{target_path.name}.",
+        suffix=".tmp"
+    )
+    temp_path = Path(temp_path)
+
+    try:
+        written = 0
+        mode = 'w' if encoding is not None else 'wb'
+        with os.fdopen(temp_fd, mode, encoding=encoding) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # os.replace is atomic on POSIX and Windows, even when the target exists
+        os.replace(temp_path, target_path)
+        unit = 'characters' if encoding is not None else 'bytes'
+        logger.info(f"Atomically wrote {written} {unit} to: {target_path}")
+        return written
+
+    except BaseException as e:
+        if temp_path.exists():
+            temp_path.unlink()
+        logger.error(f"Atomic write failed for {target_path}: {e}")
+        raise
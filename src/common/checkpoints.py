@@ -0,0 +1,189 @@
+"""
+Import Checkpoints - resumable imports and migrations
+
+Long imports record their progress in the target database's _metadata
+table, one row per job and source file:
+
+    checkpoint:<job>:<source path> -> {"hash": ..., "position": 1500,
+                                       "system_key": "...", "batches": 3,
+                                       "complete": false, ...}
+
+The checkpoint is written in the same transaction as the batch it
+describes, so after a crash it names exactly the systems that were
+committed and the job resumes with the next batch. The source file's
+content hash is part of the checkpoint: a changed file starts over, and a
+file whose checkpoint is complete can be skipped without parsing it.
+
+Usage:
+    checkpoint = ImportCheckpoint(db, "import", path)
+    if checkpoint.complete:
+        return                                     # unchanged since last import
+    for start in range(checkpoint.position, len(systems), batch_size):
+        ... write the batch without committing ...
+        checkpoint.advance(start + len(batch), last_key)
+        db.conn.commit()
+    checkpoint.finish()
+
+commit_batch() does the write-advance-commit step for a batch and, if the
+batch fails, rolls it back and retries it one item at a time, so one bad
+system does not block the rest of its batch.
+"""
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+# _metadata key prefix for checkpoint rows
+CHECKPOINT_PREFIX = "checkpoint:"
+
+# Bytes read at a time when hashing a source file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_content_hash(path) -> str:
+    """SHA-256 of a file's content (hex)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checkpoint_key(job: str, source) -> str:
+    """The _metadata key for one job's checkpoint on one source file"""
+    return f"{CHECKPOINT_PREFIX}{job}:{Path(source).resolve()}"
+
+
+def completed_hashes(db, job: str) -> Dict[str, str]:
+    """Content hashes of the files a job has completed, by checkpoint key"""
+    prefix = f"{CHECKPOINT_PREFIX}{job}:"
+    completed = {}
+    for key, value in db.conn.execute(
+            "SELECT key, value FROM _metadata WHERE key LIKE ?", (prefix + '%',)):
+        if not key.startswith(prefix):   # '_' and '%' in the prefix are LIKE wildcards
+            continue
+        try:
+            state = json.loads(value)
+        except (TypeError, ValueError):
+            continue
+        if state.get('complete'):
+            completed[key] = state.get('hash')
+    return completed
+
+
+class ImportCheckpoint:
+    """
+    Progress of one job over one source file, kept in _metadata
+
+    position counts the systems (or records) of the file, in file order,
+    whose batches are committed; system_key is the last of them.
+    """
+
+    def __init__(self, db, job: str, source, content_hash: Optional[str] = None):
+        """
+        Args:
+            db: Open HavenDatabase holding the checkpoint
+            job: Job name ("import", "migration", ...)
+            source: Source file
+            content_hash: The file's hash, if already computed
+        """
+        self.db = db
+        self.key = checkpoint_key(job, source)
+        self.source = str(source)
+        self.content_hash = content_hash or file_content_hash(source)
+
+        try:
+            state = json.loads(db.get_metadata(self.key) or '{}')
+        except ValueError:
+            state = {}
+        if state.get('hash') != self.content_hash:
+            state = {}   # new or changed file: start over
+        self.position = state.get('position', 0)
+        self.system_key = state.get('system_key')
+        self.batches = state.get('batches', 0)
+        self.complete = state.get('complete', False)
+
+    @property
+    def resuming(self) -> bool:
+        """True if an earlier run committed part of this file"""
+        return self.position > 0 and not self.complete
+
+    def advance(self, position: int, system_key: Optional[str] = None):
+        """Record a batch as done (in the caller's open transaction; not committed)"""
+        self.position = position
+        self.system_key = system_key
+        self.batches += 1
+        self._save()
+
+    def finish(self):
+        """Mark the file as fully imported (committed)"""
+        self.complete = True
+        self._save()
+        self.db.conn.commit()
+
+    def reset(self):
+        """Forget this checkpoint (committed)"""
+        self.position, self.system_key, self.batches, self.complete = 0, None, 0, False
+        self.db.conn.execute("DELETE FROM _metadata WHERE key = ?", (self.key,))
+        self.db.conn.commit()
+
+    def _save(self):
+        self.db.set_metadata(self.key, json.dumps({
+            'source': self.source,
+            'hash': self.content_hash,
+            'position': self.position,
+            'system_key': self.system_key,
+            'batches': self.batches,
+            'complete': self.complete,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }), commit=False)
+
+
+def commit_batch(conn, batch: Sequence, apply: Callable[[Sequence], list],
+                 checkpoint: Optional[ImportCheckpoint] = None, position: int = 0,
+                 on_failure: Optional[Callable] = None) -> list:
+    """
+    Write a batch in one transaction; if it fails, retry it item by item
+
+    Args:
+        conn: Connection the batch is written (and committed) on
+        batch: Items to write; (system_key, ...) tuples when checkpointed
+        apply: apply(items) writes items without committing and returns
+            a list of results (one per item, or whatever the caller counts)
+        checkpoint: Moved past each committed part in the same transaction
+        position: Offset of batch[0] in its file, for the checkpoint
+        on_failure: on_failure(item, error) for each item that fails alone
+
+    Returns:
+        apply's results for the committed items only, so callers count
+        from them rather than undoing counters after a rollback
+    """
+    try:
+        results = apply(batch)
+        if checkpoint is not None:
+            checkpoint.advance(position + len(batch), batch[-1][0])
+        conn.commit()
+        return results
+    except Exception as e:
+        conn.rollback()
+        if len(batch) == 1:
+            if on_failure is not None:
+                on_failure(batch[0], e)
+            return []
+
+    # Isolate the failing items
+    results: List = []
+    for index, item in enumerate(batch, position + 1):
+        try:
+            item_results = apply([item])
+            if checkpoint is not None:
+                checkpoint.advance(index, item[0])
+            conn.commit()
+            results.extend(item_results)
+        except Exception as item_error:
+            conn.rollback()
+            if on_failure is not None:
+                on_failure(item, item_error)
+    return results
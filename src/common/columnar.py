@@ -0,0 +1,393 @@
+"""
+Columnar Galaxy Format (.hvcol)
+
+A compact binary alternative to pretty-printed data.json for exchanging
+galaxies (User Edition exports, database exports). Systems are written in
+blocks of BLOCK_SIZE; within a block every field is stored as one column:
+
+- float / int fields as packed little-endian float64 / int64 arrays
+- repetitive strings (region, fauna, sentinel, ...) dictionary-encoded as
+  one small string table plus an array of codes
+- planets and their moons as nested child tables (per-row counts plus the
+  children's own columns), so planet fields are columnar too
+- anything else (mixed types, nested objects) as a JSON list
+
+The whole stream is gzip-compressed (or zstd when the optional zstandard
+package is installed), written and read incrementally, so neither side
+holds more than one block in memory.
+
+Decompressed layout: MAGIC, then frames of
+    <uint32 header length> <JSON header> <uint32 payload length> <payload>
+with a "meta" frame first (data.json's _meta), "block" frames, and an
+"end" frame carrying the system count (a missing end frame means the file
+was truncated).
+
+Usage:
+    write_columnar("export.hvcol", systems, meta={"version": "1.0.0"})
+    for key, system in iter_columnar("export.hvcol"):
+        ...
+    data = read_columnar("export.hvcol")   # same dict json.load(data.json) gives
+"""
+
+import sys
+import json
+import gzip
+import zlib
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .atomic_write import atomic_write_stream
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is always available
+    zstandard = None
+
+COLUMNAR_SUFFIX = ".hvcol"
+MAGIC = b"HVNCOL\x00\x01"
+FORMAT_VERSION = 1
+
+# Systems per block (the unit of streaming and of dictionary encoding)
+BLOCK_SIZE = 2000
+
+# Nested lists of objects stored as child tables
+NESTED_TABLES = {"planets": {"moons": {}}}
+
+# Dictionary-encode a string column when values repeat at least this often on average
+DICTIONARY_MIN_REPEAT = 2
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_LENGTH = struct.Struct("<I")
+_ABSENT = object()
+_MAX_EXACT_INT = 2 ** 53
+
+
+class ColumnarFormatError(ValueError):
+    """The file is not a valid (or complete) columnar galaxy file"""
+
+
+def is_columnar_file(path) -> bool:
+    """True if path has the .hvcol suffix or starts like a columnar file"""
+    path = Path(path)
+    if path.suffix == COLUMNAR_SUFFIX:
+        return True
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4)
+    except OSError:
+        return False
+    if head.startswith(_GZIP_MAGIC):
+        try:
+            with gzip.open(path, "rb") as f:
+                return f.read(len(MAGIC)) == MAGIC
+        except (OSError, EOFError):
+            return False
+    return head == _ZSTD_MAGIC
+
+
+# ========== ENCODING ==========
+
+def _packed(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpacked(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _code_type(size: int) -> str:
+    return "B" if size <= 0xFF else "H" if size <= 0xFFFF else "I"
+
+
+def _encode_column(name: str, values: List[Any], absent: List[int], payload: bytearray) -> dict:
+    """Column header for one field; binary data is appended to payload"""
+    column = {"name": name}
+    if absent:
+        column["absent"] = absent
+    present = [v for v in values if v is not _ABSENT]
+    filled = [None if v is _ABSENT else v for v in values]
+
+    def binary(kind, typecode, data):
+        column.update(kind=kind, type=typecode, offset=len(payload), length=len(data))
+        payload.extend(data)
+        return column
+
+    types = {type(v) for v in present}
+    if types and types <= {int, float}:
+        if all(abs(v) < _MAX_EXACT_INT for v in present) or types == {float}:
+            zero = 0 if types == {int} else 0.0
+            numbers = [zero if v is None else v for v in filled]
+            if types == {int}:
+                return binary("int", "q", _packed("q", numbers))
+            if int in types:
+                column["int_rows"] = [i for i, v in enumerate(filled) if type(v) is int]
+            return binary("float", "d", _packed("d", numbers))
+
+    if types and types <= {str, type(None)}:
+        table = list(dict.fromkeys(present))
+        if len(present) >= DICTIONARY_MIN_REPEAT * len(table):
+            index = {value: code for code, value in enumerate(table)}
+            codes = [0 if v is _ABSENT else index[v] for v in values]
+            typecode = _code_type(len(table))
+            column["dictionary"] = table
+            return binary("dict", typecode, _packed(typecode, codes))
+        column.update(kind="str", values=filled)
+        return column
+
+    column.update(kind="json", values=filled)
+    return column
+
+
+def _encode_table(rows: List[dict], nested: Dict[str, dict], payload: bytearray) -> dict:
+    """Table header for a list of objects (columns in first-seen key order)"""
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    columns = []
+    for name in names:
+        values = [row.get(name, _ABSENT) for row in rows]
+        absent = [i for i, v in enumerate(values) if v is _ABSENT]
+        present = [v for v in values if v is not _ABSENT]
+
+        if name in nested and all(isinstance(v, list) and all(isinstance(child, dict) for child in v)
+                                  for v in present):
+            counts = [0 if v is _ABSENT else len(v) for v in values]
+            children = [child for v in present for child in v]
+            column = {"name": name, "kind": "table", "type": "I",
+                      "offset": len(payload), "length": 4 * len(counts)}
+            if absent:
+                column["absent"] = absent
+            payload.extend(_packed("I", counts))
+            column["table"] = _encode_table(children, nested[name], payload)
+            columns.append(column)
+        else:
+            columns.append(_encode_column(name, values, absent, payload))
+    return {"rows": len(rows), "columns": columns}
+
+
+def _frame(header: dict, payload: bytes = b"") -> bytes:
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"".join((_LENGTH.pack(len(head)), head, _LENGTH.pack(len(payload)), payload))
+
+
+def _compressor(compression: str):
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    raise ValueError(f"Unknown compression: {compression!r} (use 'gzip' or 'zstd')")
+
+
+def encode_columnar(systems: Iterable[Tuple[str, dict]], meta: Optional[dict] = None,
+                    compression: str = "gzip", block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Encode (key, system) pairs as compressed columnar chunks
+
+    Args:
+        systems: (data.json key, system dict) pairs, consumed lazily
+        meta: The _meta object to store
+        compression: 'gzip' or 'zstd'
+        block_size: Systems per block
+
+    Yields:
+        Compressed bytes, in order
+    """
+    compressor = _compressor(compression)
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data)
+
+    yield emit(MAGIC + _frame({"type": "meta", "format": FORMAT_VERSION, "meta": meta or {}}))
+
+    total = 0
+    block: List[Tuple[str, dict]] = []
+
+    def encode_block() -> bytes:
+        payload = bytearray()
+        keys = [key for key, _ in block]
+        rows = [system for _, system in block]
+        header = {"type": "block", "table": _encode_table(rows, NESTED_TABLES, payload)}
+        # Keys are usually the system names; only store them when they differ
+        if any(key != row.get("name") for key, row in block):
+            header["keys"] = keys
+        return _frame(header, bytes(payload))
+
+    for pair in systems:
+        block.append(pair)
+        if len(block) >= block_size:
+            total += len(block)
+            yield emit(encode_block())
+            block = []
+    if block:
+        total += len(block)
+        yield emit(encode_block())
+
+    yield emit(_frame({"type": "end", "systems": total}))
+    yield compressor.flush()
+
+
+def write_columnar(path, systems: Iterable[Tuple[str, dict]], meta: Optional[dict] = None,
+                   compression: str = "gzip", block_size: int = BLOCK_SIZE) -> int:
+    """
+    Atomically write a columnar galaxy file
+
+    Returns:
+        Compressed size in bytes
+    """
+    return atomic_write_stream(encode_columnar(systems, meta, compression, block_size), path,
+                               encoding=None)
+
+
+# ========== DECODING ==========
+
+def _decode_column(column: dict, rows: int, payload: memoryview) -> List[Any]:
+    kind = column["kind"]
+    if kind in ("str", "json"):
+        return column["values"]
+
+    data = payload[column["offset"]:column["offset"] + column["length"]]
+    values = _unpacked(column["type"], data)
+    if kind == "dict":
+        table = column["dictionary"]
+        return [table[code] for code in values] if table else [None] * rows
+    if kind == "int":
+        return values.tolist()
+    if kind == "float":
+        values = values.tolist()
+        for i in column.get("int_rows", ()):
+            values[i] = int(values[i])
+        return values
+    raise ColumnarFormatError(f"Unknown column kind: {kind!r}")
+
+
+def _decode_table(table: dict, payload: memoryview) -> List[dict]:
+    count = table["rows"]
+    rows = [{} for _ in range(count)]
+    for column in table["columns"]:
+        name = column["name"]
+        absent = set(column.get("absent", ()))
+        if column["kind"] == "table":
+            data = payload[column["offset"]:column["offset"] + column["length"]]
+            counts = _unpacked(column["type"], data)
+            children = _decode_table(column["table"], payload)
+            start = 0
+            for i, n in enumerate(counts):
+                if i not in absent:
+                    rows[i][name] = children[start:start + n]
+                start += n
+            continue
+        values = _decode_column(column, count, payload)
+        for i, value in enumerate(values):
+            if i not in absent:
+                rows[i][name] = value
+    return rows
+
+
+def _open_stream(path: Path):
+    with open(path, "rb") as f:
+        head = f.read(4)
+    if head.startswith(_GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if head == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ColumnarFormatError(f"{path.name} is zstd-compressed; install the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    raise ColumnarFormatError(f"{path.name} is not a columnar galaxy file")
+
+
+def _read_exact(stream, size: int) -> bytes:
+    # Decompressing readers may return short reads before the end of the stream
+    parts, remaining = [], size
+    while remaining:
+        data = stream.read(remaining)
+        if not data:
+            raise ColumnarFormatError("Columnar file is truncated")
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def _read_frame(stream) -> Tuple[dict, bytes]:
+    (head_length,) = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+    header = json.loads(_read_exact(stream, head_length).decode("utf-8"))
+    (payload_length,) = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+    return header, _read_exact(stream, payload_length)
+
+
+class ColumnarReader:
+    """
+    Streaming reader for a columnar galaxy file
+
+        with ColumnarReader(path) as reader:
+            print(reader.meta)
+            for block in reader.blocks():   # lists of (key, system)
+                ...
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._stream = _open_stream(self.path)
+        try:
+            if self._stream.read(len(MAGIC)) != MAGIC:
+                raise ColumnarFormatError(f"{self.path.name} is not a columnar galaxy file")
+            header, _ = _read_frame(self._stream)
+            if header.get("type") != "meta" or header.get("format", 0) > FORMAT_VERSION:
+                raise ColumnarFormatError(f"Unsupported columnar format in {self.path.name}")
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            self.close()
+            if isinstance(e, ColumnarFormatError):
+                raise
+            raise ColumnarFormatError(f"Could not read {self.path.name}: {e}") from e
+        self.meta: dict = header.get("meta", {})
+        self.systems_read = 0
+
+    def blocks(self) -> Iterator[List[Tuple[str, dict]]]:
+        """Decoded blocks of (key, system) pairs"""
+        try:
+            while True:
+                header, payload = _read_frame(self._stream)
+                if header["type"] == "end":
+                    if header["systems"] != self.systems_read:
+                        raise ColumnarFormatError("Columnar file system count does not match")
+                    return
+                rows = _decode_table(header["table"], memoryview(payload))
+                keys = header.get("keys") or [row.get("name") for row in rows]
+                self.systems_read += len(rows)
+                yield list(zip(keys, rows))
+        except (OSError, EOFError, zlib.error) as e:
+            raise ColumnarFormatError(f"Could not read {self.path.name}: {e}") from e
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_columnar(path) -> Iterator[Tuple[str, dict]]:
+    """(key, system) pairs from a columnar file, one block in memory at a time"""
+    with ColumnarReader(path) as reader:
+        for block in reader.blocks():
+            yield from block
+
+
+def read_columnar(path) -> Dict[str, Any]:
+    """The whole file as a data.json-style dict ({"_meta": ..., key: system, ...})"""
+    with ColumnarReader(path) as reader:
+        data: Dict[str, Any] = {"_meta": reader.meta}
+        for block in reader.blocks():
+            data.update(block)
+    return data
@@ -13,6 +13,8 @@ import json
 from pathlib import Path
 import logging
 
+from .name_index import SystemNameIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,11 @@ class DataProvider(Protocol):
         """Search systems"""
         ...
 
+    def get_system_names(self, prefix: str = '', after: Optional[str] = None,
+                         limit: Optional[int] = 100) -> List[str]:
+        """Get a page of system names by prefix (keyset continuation via after)"""
+        ...
+
     def add_system(self, system_data: Dict) -> str:
         """Add new system"""
         ...
@@ -84,6 +91,8 @@ class JSONDataProvider:
             json_path: Path to data.json file
         """
         self.json_path = Path(json_path)
+        self._name_index = None
+        self._name_index_stamp = None
         logger.info(f"Initialized JSON data provider: {self.json_path}")
 
     def _load_data(self) -> Dict:
@@ -171,6 +180,26 @@ class JSONDataProvider:
 
         return None
 
+    def _names(self) -> SystemNameIndex:
+        """Sorted name index, rebuilt only when the JSON file changes"""
+        try:
+            stat = self.json_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if self._name_index is None or stamp != self._name_index_stamp:
+            data = self._load_data()
+            self._name_index = SystemNameIndex(
+                value.get('name', key) for key, value in data.items()
+                if key != "_meta" and isinstance(value, dict))
+            self._name_index_stamp = stamp
+        return self._name_index
+
+    def get_system_names(self, prefix: str = '', after: Optional[str] = None,
+                         limit: Optional[int] = 100) -> List[str]:
+        """Get a page of system names by prefix (same order as the database backend)"""
+        return self._names().page(prefix, after, limit)
+
     def search_systems(self, query: str, limit: int = 50) -> List[Dict]:
         """Search systems by name, materials, or attributes"""
         query_lower = query.lower()
@@ -323,15 +352,21 @@ class DatabaseDataProvider:
         with self.db_class(self.db_path) as db:
             return db.search_systems(query, limit)
 
+    def get_system_names(self, prefix: str = '', after: Optional[str] = None,
+                         limit: Optional[int] = 100) -> List[str]:
+        """Get a page of system names by prefix"""
+        with self.db_class(self.db_path) as db:
+            return db.get_system_names(prefix, after, limit)
+
     def add_system(self, system_data: Dict) -> str:
         """Add new system"""
         with self.db_class(self.db_path) as db:
             return db.add_system(system_data)
 
-    def update_system(self, system_id: str, updates: Dict):
-        """Update system"""
+    def update_system(self, system_id: str, updates: Dict) -> Dict[str, Dict[str, int]]:
+        """Update system (returns the row changes made)"""
         with self.db_class(self.db_path) as db:
-            db.update_system(system_id, updates)
+            return db.update_system(system_id, updates)
 
     def delete_system(self, system_id: str):
         """Delete system"""
@@ -56,27 +56,37 @@ class DataSourceManager:
     _current_source_name: str = "production"
     _initialized: bool = False
     
-    def __new__(cls):
+    def __new__(cls, defer_counts: bool = False):
         """Singleton pattern: ensure only one instance exists"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """Initialize on first instantiation"""
+    def __init__(self, defer_counts: bool = False):
+        """
+        Initialize on first instantiation
+
+        Args:
+            defer_counts: Register sources without counting their systems;
+                the caller runs refresh_counts() later (e.g. off the UI
+                thread once the window is up)
+        """
         if self._initialized:
             return
         
         self._initialized = True
+        self.counts_loaded = False
         self._register_sources()
-        self._cache_system_counts()
+        if not defer_counts:
+            self._cache_system_counts()
         logger.info("DataSourceManager initialized with sources: %s", 
                     ", ".join(self._sources.keys()))
     
     def _register_sources(self):
         """
         Register all available data sources.
-        Called once on initialization to populate _sources dict.
+        Called once on initialization to populate _sources dict; counts
+        start at 0 and are filled in by _cache_system_counts().
         """
         try:
             from config.settings import PROJECT_ROOT, DATABASE_PATH, USE_DATABASE
@@ -89,59 +99,63 @@ class DataSourceManager:
         # ==================== PRODUCTION SOURCE (MASTER DATABASE) ====================
         # The MASTER production database - VH-Database.db
         # EXE and Mobile versions export JSON files which get imported here
-        prod_path = DATABASE_PATH  # Points to VH-Database.db
-        prod_count = self._count_database_systems(prod_path)
-        prod_size = self._get_file_size_mb(prod_path)
-
-        self._sources["production"] = DataSourceInfo(
-            name="production",
-            display_name="Production (Master Database)",
-            path=prod_path,
-            backend_type="database",
-            system_count=prod_count,
-            description=f"Master production database ({prod_count:,} systems)"
-                       if prod_count > 0 else "Master production database (empty - ready for data)",
-            size_mb=prod_size,
-            icon="📊"
-        )
+        self._sources["production"] = self._build_source(
+            "production", DATABASE_PATH, "database", None)  # Points to VH-Database.db
         
         # ==================== TEST SOURCE ====================
-        test_path = PROJECT_ROOT / "tests" / "stress_testing" / "TESTING.json"
-        test_count = self._count_json_systems(test_path)
-        test_size = self._get_file_size_mb(test_path)
-        
-        self._sources["testing"] = DataSourceInfo(
-            name="testing",
-            display_name="Test Data",
-            path=test_path,
-            backend_type="json",
-            system_count=test_count,
-            description=f"Stress test data ({test_count:,} systems)" 
-                       if test_count > 0 else "Test data (file not found)",
-            size_mb=test_size,
-            icon="🧪"
-        )
+        self._sources["testing"] = self._build_source(
+            "testing", PROJECT_ROOT / "tests" / "stress_testing" / "TESTING.json", "json", None)
         
         # ==================== LOAD TEST SOURCE ====================
-        loadtest_path = PROJECT_ROOT / "data" / "haven_load_test.db"
-        loadtest_count = self._count_database_systems(loadtest_path)
-        loadtest_size = self._get_file_size_mb(loadtest_path)
-        
-        self._sources["load_test"] = DataSourceInfo(
-            name="load_test",
-            display_name="Load Test Database",
-            path=loadtest_path,
-            backend_type="database",
-            system_count=loadtest_count,
-            description="Billion-scale load test database" 
-                       if loadtest_count > 0 else "Load test database (not found)",
-            size_mb=loadtest_size,
-            icon="🔬"
-        )
+        self._sources["load_test"] = self._build_source(
+            "load_test", PROJECT_ROOT / "data" / "haven_load_test.db", "database", None)
         
         # NOTE: "yh_database" source removed - it's now the "production" source above
         # VH-Database.db is THE master production database
     
+    def _build_source(self, name: str, path: Path, backend_type: str,
+                      count: Optional[int]) -> DataSourceInfo:
+        """
+        Build the DataSourceInfo for a source.
+
+        Args:
+            count: Number of systems, or None while not yet counted
+        """
+        counted = count or 0
+        pending = count is None
+        if name == "production":
+            display_name, icon = "Production (Master Database)", "📊"
+            if pending:
+                description = "Master production database (counting systems...)"
+            else:
+                description = (f"Master production database ({counted:,} systems)" if counted > 0
+                               else "Master production database (empty - ready for data)")
+        elif name == "testing":
+            display_name, icon = "Test Data", "🧪"
+            if pending:
+                description = "Stress test data (counting systems...)"
+            else:
+                description = (f"Stress test data ({counted:,} systems)" if counted > 0
+                               else "Test data (file not found)")
+        else:
+            display_name, icon = "Load Test Database", "🔬"
+            if pending:
+                description = "Billion-scale load test database"
+            else:
+                description = ("Billion-scale load test database" if counted > 0
+                               else "Load test database (not found)")
+
+        return DataSourceInfo(
+            name=name,
+            display_name=display_name,
+            path=path,
+            backend_type=backend_type,
+            system_count=counted,
+            description=description,
+            size_mb=self._get_file_size_mb(path),
+            icon=icon
+        )
+    
     @staticmethod
     def _get_file_size_mb(path: Path) -> float:
         """Get file size in megabytes"""
@@ -215,16 +229,9 @@ class DataSourceManager:
                 count = 0
             
             # Create new immutable object with updated count
-            self._sources[source_name] = DataSourceInfo(
-                name=source_info.name,
-                display_name=source_info.display_name,
-                path=source_info.path,
-                backend_type=source_info.backend_type,
-                system_count=count,
-                description=source_info.description,
-                size_mb=source_info.size_mb,
-                icon=source_info.icon
-            )
+            self._sources[source_name] = self._build_source(
+                source_name, source_info.path, source_info.backend_type, count)
+        self.counts_loaded = True
     
     # ==================== PUBLIC API ====================
     
@@ -338,13 +345,17 @@ class DataSourceManager:
 _manager_instance = None
 
 
-def get_data_source_manager() -> DataSourceManager:
+def get_data_source_manager(defer_counts: bool = False) -> DataSourceManager:
     """
     Get the singleton DataSourceManager instance.
     
     This is the main entry point. Call this from any part of the code
     to get access to the unified data source manager.
     
+    Args:
+        defer_counts: On first creation, skip counting systems (see
+            DataSourceManager); ignored once the manager exists
+    
     Returns:
         DataSourceManager singleton instance
     
@@ -366,7 +377,7 @@ def get_data_source_manager() -> DataSourceManager:
     """
     global _manager_instance
     if _manager_instance is None:
-        _manager_instance = DataSourceManager()
+        _manager_instance = DataSourceManager(defer_counts=defer_counts)
     return _manager_instance
 
 
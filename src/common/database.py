@@ -4,7 +4,13 @@ Provides SQLite-based storage for billion-scale system datasets
 
 This module is part of the Master version of Haven, designed to handle
 massive datasets that the public EXE version (JSON-based) cannot manage.
+
+Run as a script for maintenance (python src/common/database.py --help):
+    --recompute-stats DB_PATH     verify and repair the statistics counters
+    --build-search-index DB_PATH  build or upgrade the full-text search index
 """
+import re
+import sys
 import sqlite3
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
@@ -12,8 +18,119 @@ import json
 import logging
 from datetime import datetime
 
+if __package__:
+    from .discovery_writer import discovery_missing_fields, ensure_location_version, get_discovery_writer
+    from .undo_redo import SystemTreeDiff
+else:
+    # Run as a script: import from src/ and the project root, not src/common/
+    _src = Path(__file__).resolve().parent.parent
+    sys.path[0:1] = [str(_src), str(_src.parent)]
+    from common.discovery_writer import discovery_missing_fields, ensure_location_version, get_discovery_writer
+    from common.undo_redo import SystemTreeDiff
+
 logger = logging.getLogger(__name__)
 
+# Tables whose row counts are maintained by triggers in the _statistics table
+STATISTICS_TABLES = ('systems', 'planets', 'moons', 'space_stations', 'discoveries')
+
+# Sync triggers of a complete search index: systems (insert, update, rekey,
+# delete) + planets and moons (insert, delete, rename); discoveries (3)
+SYSTEMS_FTS_TRIGGERS = 10
+DISCOVERIES_FTS_TRIGGERS = 3
+
+
+# Index design (name, table, columns). Composite indexes are ordered so the
+# hot queries can filter and sort without a temp B-tree:
+# - systems(region, name): get_all_systems(region=...) / get_systems_paginated
+# - systems(name COLLATE NOCASE, name): covering index for get_system_names
+#   (case-insensitive prefix pages with keyset continuation)
+# - planets are looked up via the UNIQUE(system_id, name) autoindex
+# - moons(planet_id, name): moon-name resolution when writing discoveries
+# - discoveries(system_id|discovery_type, submission_timestamp): get_discoveries
+# - discoveries(discord_guild_id, discord_user_id, ...): covering index for the
+#   Keeper leaderboards, which GROUP BY user within a guild
+INDEXES = (
+    ('idx_systems_region_name', 'systems', 'region, name'),
+    ('idx_systems_coords', 'systems', 'x, y, z'),
+    ('idx_systems_name', 'systems', 'name'),
+    ('idx_systems_name_nocase', 'systems', 'name COLLATE NOCASE, name'),
+    ('idx_planets_system', 'planets', 'system_id'),
+    ('idx_moons_planet_name', 'moons', 'planet_id, name'),
+    ('idx_space_stations_system', 'space_stations', 'system_id'),
+    ('idx_discoveries_system_time', 'discoveries', 'system_id, submission_timestamp'),
+    ('idx_discoveries_planet', 'discoveries', 'planet_id'),
+    ('idx_discoveries_moon', 'discoveries', 'moon_id'),
+    ('idx_discoveries_type_time', 'discoveries', 'discovery_type, submission_timestamp'),
+    ('idx_discoveries_location_type', 'discoveries', 'location_type'),
+    ('idx_discoveries_timestamp', 'discoveries', 'submission_timestamp'),
+    ('idx_discoveries_guild_user', 'discoveries',
+     'discord_guild_id, discord_user_id, submission_timestamp, discovered_by, discovery_type'),
+)
+
+# Single-column indexes made redundant by a composite index above
+SUPERSEDED_INDEXES = (
+    'idx_systems_region',
+    'idx_moons_planet',
+    'idx_discoveries_system',
+    'idx_discoveries_type',
+)
+
+
+def read_table_counts(conn: sqlite3.Connection,
+                      tables: Tuple[str, ...] = STATISTICS_TABLES) -> Dict[str, int]:
+    """
+    Read row counts for the given tables
+
+    Uses the trigger-maintained _statistics table when it is present (O(1)),
+    and falls back to COUNT(*) for databases that predate it.
+
+    Args:
+        conn: Open SQLite connection
+        tables: Table names to count
+
+    Returns:
+        {table_name: row_count}
+    """
+    counts = {}
+    try:
+        rows = conn.execute("SELECT table_name, row_count FROM _statistics").fetchall()
+        counts = {row[0]: row[1] for row in rows if row[0] in tables}
+    except sqlite3.OperationalError:
+        pass  # No statistics table yet
+
+    for table in tables:
+        if table not in counts:
+            try:
+                counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            except sqlite3.OperationalError:
+                counts[table] = 0  # Table doesn't exist in this database
+
+    return counts
+
+
+def build_fts_query(text: str, columns: Optional[Tuple[str, ...]] = None) -> Optional[str]:
+    """
+    Turn free-form user text into a safe FTS5 MATCH expression
+
+    Every word becomes a quoted prefix term, so FTS5 operators typed by
+    users are treated as plain text. Terms are ANDed together.
+
+    Args:
+        text: User search text, e.g. "ootle gold"
+        columns: Optional FTS column names to restrict the match to
+
+    Returns:
+        MATCH expression like '"ootle"* "gold"*', or None if text has no words
+    """
+    tokens = re.findall(r'\w+', text or '', re.UNICODE)
+    if not tokens:
+        return None
+
+    terms = ' '.join(f'"{token}"*' for token in tokens)
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({terms})"
+    return terms
+
 
 class HavenDatabase:
     """
@@ -38,6 +155,8 @@ class HavenDatabase:
         """
         self.db_path = Path(db_path)
         self.conn = None
+        self._stats_enabled = False
+        self._fts_enabled = False
         self._ensure_database_exists()
 
     def __enter__(self):
@@ -52,6 +171,7 @@ class HavenDatabase:
             self.conn.execute("PRAGMA journal_mode=WAL")
         except:
             pass  # WAL mode might already be set
+        self._ensure_derived_tables()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -67,8 +187,19 @@ class HavenDatabase:
             with sqlite3.connect(str(self.db_path)) as conn:
                 self._create_schema(conn)
                 self._create_indexes(conn)
+                try:
+                    # Empty tables, so this is instant; existing databases get
+                    # the index only from build_search_index()
+                    self._create_search_index(conn, self._table_names(conn))
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    logger.warning(f"Full-text search unavailable, using LIKE queries: {e}")
                 logger.info("Database schema created successfully")
 
+    @staticmethod
+    def _table_names(conn: sqlite3.Connection) -> set:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
     def _create_schema(self, conn: sqlite3.Connection):
         """Create database tables"""
         cursor = conn.cursor()
@@ -241,32 +372,362 @@ class HavenDatabase:
         conn.commit()
 
     def _create_indexes(self, conn: sqlite3.Connection):
-        """Create performance indexes"""
+        """Create performance indexes and drop the ones they supersede"""
         cursor = conn.cursor()
 
-        # Systems indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_systems_region ON systems(region)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_systems_coords ON systems(x, y, z)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_systems_name ON systems(name)")
+        existing_tables = {row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
 
-        # Planets indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_planets_system ON planets(system_id)")
+        for name, table, columns in INDEXES:
+            if table in existing_tables:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
 
-        # Moons indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_moons_planet ON moons(planet_id)")
+        for name in SUPERSEDED_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
 
-        # Space stations indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_space_stations_system ON space_stations(system_id)")
+        conn.commit()
 
-        # Discoveries indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_system ON discoveries(system_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_planet ON discoveries(planet_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_moon ON discoveries(moon_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_type ON discoveries(discovery_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_location_type ON discoveries(location_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_timestamp ON discoveries(submission_timestamp)")
+    def _ensure_derived_tables(self):
+        """
+        Install trigger-maintained statistics and search tables if missing
 
-        conn.commit()
+        This is a single sqlite_master lookup on already-upgraded databases.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT type, name FROM sqlite_master
+            WHERE type IN ('table', 'trigger', 'index')
+        """)
+        objects = cursor.fetchall()
+        tables = {name for obj_type, name in objects if obj_type == 'table'}
+        triggers = {name for obj_type, name in objects if obj_type == 'trigger'}
+        indexes = {name for obj_type, name in objects if obj_type == 'index'}
+
+        missing = [name for name, table, _ in INDEXES if table in tables and name not in indexes]
+        if missing or indexes & set(SUPERSEDED_INDEXES):
+            try:
+                self._create_indexes(self.conn)
+                logger.info(f"Upgraded indexes in {self.db_path}: {', '.join(missing)}")
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.warning(f"Could not upgrade indexes: {e}")
+
+        self._ensure_statistics(tables, triggers)
+        self._detect_search_index(tables, triggers)
+        ensure_location_version(self.conn, triggers)
+
+    def _ensure_statistics(self, tables: set, triggers: set):
+        """
+        Install the trigger-maintained statistics tables if missing
+
+        Counters are seeded from COUNT(*) only when a table has no counter row,
+        so upgraded databases never pay for a full count on open.
+        """
+        existing = {table for table in STATISTICS_TABLES if table in tables}
+
+        stats_triggers = {name for name in triggers if name.startswith('trg_stats_')}
+        expected_triggers = 2 * len(existing) + (3 if 'systems' in existing else 0)
+        if len(stats_triggers) >= expected_triggers:
+            self._stats_enabled = True
+            return
+
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._create_statistics(self.conn, existing)
+            self.conn.commit()
+            self._stats_enabled = True
+            logger.info(f"Installed statistics counters in {self.db_path}")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            self._stats_enabled = False
+            logger.warning(f"Statistics counters unavailable, using live counts: {e}")
+
+    def _create_statistics(self, conn: sqlite3.Connection, tables: set):
+        """Create statistics tables and triggers, seeding counters for new tables"""
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _statistics (
+                table_name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _region_statistics (
+                region TEXT PRIMARY KEY,
+                system_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        for table in STATISTICS_TABLES:
+            if table not in tables:
+                continue
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    UPDATE _statistics SET row_count = row_count + 1
+                    WHERE table_name = '{table}';
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    UPDATE _statistics SET row_count = row_count - 1
+                    WHERE table_name = '{table}';
+                END
+            """)
+
+            # Seed the counter in the same transaction as the triggers
+            cursor.execute("SELECT 1 FROM _statistics WHERE table_name = ?", (table,))
+            if cursor.fetchone() is None:
+                cursor.execute(f"""
+                    INSERT INTO _statistics (table_name, row_count)
+                    SELECT ?, COUNT(*) FROM {table}
+                """, (table,))
+
+        if 'systems' not in tables:
+            return
+
+        # Per-region system counters (rows are removed when a region empties)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_region_insert
+            AFTER INSERT ON systems
+            BEGIN
+                INSERT INTO _region_statistics (region, system_count)
+                VALUES (NEW.region, 1)
+                ON CONFLICT(region) DO UPDATE SET system_count = system_count + 1;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_region_delete
+            AFTER DELETE ON systems
+            BEGIN
+                UPDATE _region_statistics SET system_count = system_count - 1
+                WHERE region = OLD.region;
+                DELETE FROM _region_statistics
+                WHERE region = OLD.region AND system_count <= 0;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_region_update
+            AFTER UPDATE OF region ON systems
+            WHEN OLD.region IS NOT NEW.region
+            BEGIN
+                UPDATE _region_statistics SET system_count = system_count - 1
+                WHERE region = OLD.region;
+                DELETE FROM _region_statistics
+                WHERE region = OLD.region AND system_count <= 0;
+                INSERT INTO _region_statistics (region, system_count)
+                VALUES (NEW.region, 1)
+                ON CONFLICT(region) DO UPDATE SET system_count = system_count + 1;
+            END
+        """)
+
+        cursor.execute("SELECT 1 FROM _region_statistics LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute("""
+                INSERT INTO _region_statistics (region, system_count)
+                SELECT region, COUNT(*) FROM systems GROUP BY region
+            """)
+
+    def _detect_search_index(self, tables: set, triggers: set):
+        """
+        Use the FTS5 search tables if they are fully installed
+
+        Only detects: building the index scans every system and discovery
+        under a write lock, so it is never done on open (see
+        build_search_index). Without it searches fall back to LIKE queries.
+        """
+        wanted = {'systems_fts', 'systems_fts_keys'}
+        expected_triggers = SYSTEMS_FTS_TRIGGERS
+        if 'discoveries' in tables:
+            wanted.add('discoveries_fts')
+            expected_triggers += DISCOVERIES_FTS_TRIGGERS
+        fts_triggers = {name for name in triggers if name.startswith('trg_fts_')}
+        self._fts_enabled = wanted <= tables and len(fts_triggers) >= expected_triggers
+        if not self._fts_enabled and 'systems' in tables:
+            logger.debug(f"No full-text search index in {self.db_path}, using LIKE queries "
+                        f"(build it with: python -m common.database --build-search-index <db>)")
+
+    def build_search_index(self) -> bool:
+        """
+        Build (or upgrade) the FTS5 search tables and their sync triggers
+
+        A maintenance step: it reads every system and discovery inside one
+        write transaction, blocking other writers until it finishes. Run it
+        once per database, e.g. with --build-search-index.
+
+        Returns:
+            True if full-text search is now available
+        """
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._create_search_index(self.conn, self._table_names(self.conn))
+            self.conn.commit()
+            self._fts_enabled = True
+            logger.info(f"Built full-text search index in {self.db_path}")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            self._fts_enabled = False
+            logger.warning(f"Full-text search unavailable, using LIKE queries: {e}")
+        return self._fts_enabled
+
+    def _create_search_index(self, conn: sqlite3.Connection, tables: set):
+        """
+        Create FTS5 tables and sync triggers, populating them from existing rows
+
+        systems_fts indexes the system name, materials and attributes plus
+        the names of all its planets and moons (the 'bodies' column). Its
+        rowid comes from systems_fts_keys, which maps it to systems.id: the
+        implicit rowid of systems (TEXT primary key) can be renumbered by
+        VACUUM, so it is never used as the key. discoveries_fts is an
+        external-content index over discoveries (INTEGER primary key).
+        """
+        cursor = conn.cursor()
+        if 'systems' not in tables:
+            return
+
+        # Indexes from before systems_fts_keys were keyed on systems.rowid: rebuild them
+        if 'systems_fts_keys' not in tables:
+            for (name,) in cursor.execute("""
+                    SELECT name FROM sqlite_master WHERE type = 'trigger'
+                    AND (name LIKE 'trg^_fts^_systems^_%' ESCAPE '^'
+                         OR name LIKE 'trg^_fts^_planets^_%' ESCAPE '^'
+                         OR name LIKE 'trg^_fts^_moons^_%' ESCAPE '^')""").fetchall():
+                cursor.execute(f"DROP TRIGGER {name}")
+            cursor.execute("DROP TABLE IF EXISTS systems_fts")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS systems_fts_keys (
+                fts_rowid INTEGER PRIMARY KEY,
+                system_id TEXT NOT NULL UNIQUE
+            )
+        """)
+        fts_rowid = "(SELECT fts_rowid FROM systems_fts_keys WHERE system_id = {sid})"
+
+        # Planet and moon names of one system, space separated
+        bodies_sql = """
+            (SELECT group_concat(body, ' ') FROM (
+                SELECT p.name AS body FROM planets p WHERE p.system_id = {sid}
+                UNION ALL
+                SELECT m.name FROM moons m JOIN planets p ON m.planet_id = p.id
+                WHERE p.system_id = {sid}))
+        """
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'systems_fts'")
+        systems_fts_exists = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS systems_fts USING fts5(
+                name, materials, attributes, bodies,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_systems_insert
+            AFTER INSERT ON systems
+            BEGIN
+                INSERT INTO systems_fts_keys (system_id) VALUES (NEW.id);
+                INSERT INTO systems_fts (rowid, name, materials, attributes, bodies)
+                VALUES ({fts_rowid.format(sid='NEW.id')}, NEW.name, NEW.materials, NEW.attributes, '');
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_systems_update
+            AFTER UPDATE OF name, materials, attributes ON systems
+            BEGIN
+                UPDATE systems_fts
+                SET name = NEW.name, materials = NEW.materials, attributes = NEW.attributes
+                WHERE rowid = {fts_rowid.format(sid='NEW.id')};
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_systems_rekey
+            AFTER UPDATE OF id ON systems
+            WHEN OLD.id IS NOT NEW.id
+            BEGIN
+                UPDATE systems_fts_keys SET system_id = NEW.id WHERE system_id = OLD.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_systems_delete
+            AFTER DELETE ON systems
+            BEGIN
+                DELETE FROM systems_fts WHERE rowid = {fts_rowid.format(sid='OLD.id')};
+                DELETE FROM systems_fts_keys WHERE system_id = OLD.id;
+            END
+        """)
+
+        # Planet/moon changes refresh the owning system's 'bodies' column
+        for table, event, ref in (('planets', 'INSERT', 'NEW'), ('planets', 'DELETE', 'OLD'),
+                                  ('planets', 'UPDATE OF name', 'NEW'),
+                                  ('moons', 'INSERT', 'NEW'), ('moons', 'DELETE', 'OLD'),
+                                  ('moons', 'UPDATE OF name', 'NEW')):
+            if table == 'planets':
+                sid = f"{ref}.system_id"
+            else:
+                sid = f"(SELECT system_id FROM planets WHERE id = {ref}.planet_id)"
+            trigger_name = f"trg_fts_{table}_{event.split()[0].lower()}"
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {trigger_name}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE systems_fts SET bodies = COALESCE({bodies_sql.format(sid=sid)}, '')
+                    WHERE rowid = {fts_rowid.format(sid=sid)};
+                END
+            """)
+
+        if not systems_fts_exists:
+            cursor.execute("DELETE FROM systems_fts_keys")
+            cursor.execute("INSERT INTO systems_fts_keys (system_id) SELECT id FROM systems")
+            cursor.execute(f"""
+                INSERT INTO systems_fts (rowid, name, materials, attributes, bodies)
+                SELECT k.fts_rowid, s.name, s.materials, s.attributes,
+                       COALESCE({bodies_sql.format(sid='s.id')}, '')
+                FROM systems_fts_keys k JOIN systems s ON s.id = k.system_id
+            """)
+
+        if 'discoveries' not in tables:
+            return
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'discoveries_fts'")
+        discoveries_fts_exists = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS discoveries_fts USING fts5(
+                discovery_name, description, significance, location_name,
+                content = 'discoveries', content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_insert
+            AFTER INSERT ON discoveries
+            BEGIN
+                INSERT INTO discoveries_fts (rowid, discovery_name, description, significance, location_name)
+                VALUES (NEW.id, NEW.discovery_name, NEW.description, NEW.significance, NEW.location_name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_delete
+            AFTER DELETE ON discoveries
+            BEGIN
+                INSERT INTO discoveries_fts (discoveries_fts, rowid, discovery_name, description, significance, location_name)
+                VALUES ('delete', OLD.id, OLD.discovery_name, OLD.description, OLD.significance, OLD.location_name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_fts_discoveries_update
+            AFTER UPDATE OF discovery_name, description, significance, location_name ON discoveries
+            BEGIN
+                INSERT INTO discoveries_fts (discoveries_fts, rowid, discovery_name, description, significance, location_name)
+                VALUES ('delete', OLD.id, OLD.discovery_name, OLD.description, OLD.significance, OLD.location_name);
+                INSERT INTO discoveries_fts (rowid, discovery_name, description, significance, location_name)
+                VALUES (NEW.id, NEW.discovery_name, NEW.description, NEW.significance, NEW.location_name);
+            END
+        """)
+        if not discoveries_fts_exists:
+            cursor.execute("INSERT INTO discoveries_fts (discoveries_fts) VALUES ('rebuild')")
 
     # ========== QUERY METHODS ==========
 
@@ -382,7 +843,8 @@ class HavenDatabase:
         }
 
     def get_systems_in_region_sphere(self, cx: float, cy: float, cz: float,
-                                     radius: float, limit: int = 1000) -> List[Dict]:
+                                     radius: float, limit: int = 1000,
+                                     region: Optional[str] = None) -> List[Dict]:
         """
         Get systems within spherical region (for map viewing)
 
@@ -392,6 +854,7 @@ class HavenDatabase:
             cx, cy, cz: Center coordinates
             radius: Radius in same units as coordinates
             limit: Maximum systems to return
+            region: Optional region filter
 
         Returns:
             List of systems within sphere, sorted by distance
@@ -399,18 +862,25 @@ class HavenDatabase:
         cursor = self.conn.cursor()
 
         # Use bounding box query first (fast with spatial index)
-        cursor.execute("""
+        params = [
+            cx - radius, cx + radius,
+            cy - radius, cy + radius,
+            cz - radius, cz + radius,
+        ]
+        region_clause = ""
+        if region:
+            region_clause = "AND region = ?"
+            params.append(region)
+        params.append(limit * 2)  # Get extra for sphere filtering
+
+        cursor.execute(f"""
             SELECT * FROM systems
             WHERE x BETWEEN ? AND ?
               AND y BETWEEN ? AND ?
               AND z BETWEEN ? AND ?
+              {region_clause}
             LIMIT ?
-        """, (
-            cx - radius, cx + radius,
-            cy - radius, cy + radius,
-            cz - radius, cz + radius,
-            limit * 2  # Get extra for sphere filtering
-        ))
+        """, params)
 
         systems = []
         for row in cursor.fetchall():
@@ -493,17 +963,34 @@ class HavenDatabase:
 
     def search_systems(self, query: str, limit: int = 50) -> List[Dict]:
         """
-        Search systems by name, materials, or attributes
+        Search systems by name, materials, attributes, or planet/moon names
+
+        Uses the systems_fts index with prefix matching on every word,
+        ranked by bm25 with name matches weighted highest.
 
         Args:
             query: Search query
             limit: Maximum results
 
         Returns:
-            List of matching systems
+            List of matching systems, best match first
         """
         cursor = self.conn.cursor()
 
+        if self._fts_enabled:
+            match = build_fts_query(query)
+            if match is None:
+                return []
+            cursor.execute("""
+                SELECT s.* FROM systems_fts
+                JOIN systems_fts_keys k ON k.fts_rowid = systems_fts.rowid
+                JOIN systems s ON s.id = k.system_id
+                WHERE systems_fts MATCH ?
+                ORDER BY bm25(systems_fts, 10.0, 2.0, 2.0, 5.0), s.name
+                LIMIT ?
+            """, (match, limit))
+            return [dict(row) for row in cursor.fetchall()]
+
         search_pattern = f"%{query}%"
         cursor.execute("""
             SELECT * FROM systems
@@ -516,17 +1003,92 @@ class HavenDatabase:
 
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_system_names(self, prefix: str = '', after: Optional[str] = None,
+                         limit: Optional[int] = 100) -> List[str]:
+        """
+        Get system names starting with prefix (case-insensitive), one page at a time
+
+        Names are ordered by name COLLATE NOCASE, then name, and read from
+        idx_systems_name_nocase without touching the table. Pass the last
+        name of a page as after to get the next page.
+
+        Args:
+            prefix: Name prefix ('' for all systems)
+            after: Last name of the previous page (keyset continuation)
+            limit: Maximum names to return (None for all)
+
+        Returns:
+            List of system names
+        """
+        # Every name starting with prefix sorts below prefix + the highest code point
+        upper = prefix + '\U0010ffff'
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT name FROM systems
+            WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE
+              AND (name COLLATE NOCASE, name) > (?, ?)
+            ORDER BY name COLLATE NOCASE, name
+            LIMIT ?
+        """, (prefix, upper, after or '', after or '', -1 if limit is None else limit))
+        return [row[0] for row in cursor.fetchall()]
+
     def get_regions(self) -> List[str]:
         """Get list of all unique regions"""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT DISTINCT region FROM systems ORDER BY region")
+        if self._stats_enabled:
+            cursor.execute("""
+                SELECT region FROM _region_statistics
+                WHERE system_count > 0
+                ORDER BY region
+            """)
+        else:
+            cursor.execute("SELECT DISTINCT region FROM systems ORDER BY region")
         return [row[0] for row in cursor.fetchall()]
 
+    def get_region_counts(self) -> Dict[str, int]:
+        """Get number of systems per region"""
+        cursor = self.conn.cursor()
+        if self._stats_enabled:
+            cursor.execute("""
+                SELECT region, system_count FROM _region_statistics
+                WHERE system_count > 0
+                ORDER BY region
+            """)
+        else:
+            cursor.execute("""
+                SELECT region, COUNT(*) FROM systems
+                GROUP BY region ORDER BY region
+            """)
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def get_region_aggregates(self) -> List[Dict]:
+        """
+        Get one summary row per region for the progressive galaxy overview
+
+        Centroid and bounding box are computed in SQL, so the overview never
+        has to load individual systems.
+
+        Returns:
+            List of {'region', 'count', 'cx', 'cy', 'cz',
+                     'min_x', 'max_x', 'min_y', 'max_y', 'min_z', 'max_z'}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT region,
+                   COUNT(*) AS count,
+                   AVG(x) AS cx, AVG(y) AS cy, AVG(z) AS cz,
+                   MIN(x) AS min_x, MAX(x) AS max_x,
+                   MIN(y) AS min_y, MAX(y) AS max_y,
+                   MIN(z) AS min_z, MAX(z) AS max_z
+            FROM systems
+            GROUP BY region
+            ORDER BY region
+        """)
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_total_count(self) -> int:
         """Get total number of systems"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM systems")
-        return cursor.fetchone()[0]
+        return read_table_counts(self.conn, ('systems',))['systems']
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -538,29 +1100,23 @@ class HavenDatabase:
                 'total_planets': 5000000,
                 'total_moons': 10000000,
                 'total_stations': 500000,
+                'total_discoveries': 1200,
                 'regions': ['Adam', 'Star', ...],
                 'database_size_mb': 1024.5
             }
-        """
-        cursor = self.conn.cursor()
-
-        stats = {}
-
-        # Count systems
-        cursor.execute("SELECT COUNT(*) FROM systems")
-        stats['total_systems'] = cursor.fetchone()[0]
-
-        # Count planets
-        cursor.execute("SELECT COUNT(*) FROM planets")
-        stats['total_planets'] = cursor.fetchone()[0]
-
-        # Count moons
-        cursor.execute("SELECT COUNT(*) FROM moons")
-        stats['total_moons'] = cursor.fetchone()[0]
 
-        # Count space stations
-        cursor.execute("SELECT COUNT(*) FROM space_stations")
-        stats['total_stations'] = cursor.fetchone()[0]
+        Counts come from the trigger-maintained _statistics table, so this
+        is constant-time regardless of database size.
+        """
+        counts = read_table_counts(self.conn)
+
+        stats = {
+            'total_systems': counts['systems'],
+            'total_planets': counts['planets'],
+            'total_moons': counts['moons'],
+            'total_stations': counts['space_stations'],
+            'total_discoveries': counts['discoveries'],
+        }
 
         # Get regions
         stats['regions'] = self.get_regions()
@@ -573,14 +1129,80 @@ class HavenDatabase:
 
         return stats
 
+    def recompute_statistics(self, repair: bool = True) -> Dict[str, Any]:
+        """
+        Verify the statistics counters against live COUNT(*) queries
+
+        Maintenance command for counters that drifted (e.g. rows written
+        while triggers were dropped, or REPLACE conflicts). This is a full
+        scan of every counted table - don't call it on a hot path.
+
+        Args:
+            repair: If True, overwrite drifted counters with the live values
+
+        Returns:
+            {
+                'tables': {'planets': {'stored': 10, 'actual': 12}},
+                'regions': {'Adam': {'stored': 3, 'actual': 4}},
+                'repaired': True
+            }
+            Only mismatched entries are listed.
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT table_name, row_count FROM _statistics")
+        stored_tables = {row[0]: row[1] for row in cursor.fetchall()}
+        cursor.execute("SELECT region, system_count FROM _region_statistics")
+        stored_regions = {row[0]: row[1] for row in cursor.fetchall()}
+
+        table_drift = {}
+        for table in stored_tables:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            actual = cursor.fetchone()[0]
+            if actual != stored_tables[table]:
+                table_drift[table] = {'stored': stored_tables[table], 'actual': actual}
+
+        cursor.execute("SELECT region, COUNT(*) FROM systems GROUP BY region")
+        actual_regions = {row[0]: row[1] for row in cursor.fetchall()}
+        region_drift = {}
+        for region in set(stored_regions) | set(actual_regions):
+            stored = stored_regions.get(region, 0)
+            actual = actual_regions.get(region, 0)
+            if stored != actual:
+                region_drift[region] = {'stored': stored, 'actual': actual}
+
+        repaired = False
+        if repair and (table_drift or region_drift):
+            try:
+                for table, drift in table_drift.items():
+                    cursor.execute("""
+                        UPDATE _statistics SET row_count = ? WHERE table_name = ?
+                    """, (drift['actual'], table))
+                cursor.execute("DELETE FROM _region_statistics")
+                cursor.executemany("""
+                    INSERT INTO _region_statistics (region, system_count) VALUES (?, ?)
+                """, actual_regions.items())
+                self.conn.commit()
+                repaired = True
+                logger.info(f"Repaired statistics: {len(table_drift)} tables, "
+                            f"{len(region_drift)} regions")
+            except Exception as e:
+                self.conn.rollback()
+                logger.error(f"Failed to repair statistics, rolled back transaction: {e}")
+                raise
+
+        return {'tables': table_drift, 'regions': region_drift, 'repaired': repaired}
+
     # ========== WRITE METHODS ==========
 
-    def add_system(self, system_data: Dict) -> str:
+    def add_system(self, system_data: Dict, commit: bool = True) -> str:
         """
         Add new system to database with transaction safety
 
         Args:
             system_data: System dictionary (same format as JSON)
+            commit: If False, leave the transaction open for the caller to
+                    commit or roll back (batched imports)
 
         Returns:
             System ID
@@ -626,9 +1248,12 @@ class HavenDatabase:
             if 'space_station' in system_data and system_data['space_station'] is not None:
                 self._add_space_station(cursor, system_id, system_data['space_station'])
 
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return system_id
         except Exception as e:
+            if not commit:
+                raise
             self.conn.rollback()
             logger.error(f"Failed to add system, rolled back transaction: {e}")
             raise
@@ -703,56 +1328,49 @@ class HavenDatabase:
             race, sell_percent, buy_percent
         ))
 
-    def update_system(self, system_id: str, updates: Dict):
+    def update_system(self, system_id: str, updates: Dict,
+                      commit: bool = True) -> Dict[str, Dict[str, int]]:
         """
         Update system fields with transaction safety
 
+        Planets (with their moons) and the space station are diffed against
+        the stored rows by name rather than deleted and re-added, so
+        unchanged rows are not touched, matched rows keep their IDs and
+        discoveries stay linked to them. Only discoveries on a removed
+        planet or moon lose their link.
+
         Args:
             system_id: System ID
-            updates: Dictionary of fields to update
-        """
-        try:
-            cursor = self.conn.cursor()
-
-            # Build dynamic UPDATE query for simple fields
-            simple_fields = ['name', 'x', 'y', 'z', 'region', 'fauna', 'flora',
-                            'sentinel', 'materials', 'base_location', 'photo', 'attributes']
+            updates: Dictionary of fields to update; 'planets' and
+                     'space_station', when present, replace the stored ones
+            commit: If False, leave the transaction open (see add_system)
 
-            fields = []
-            values = []
-            for key, value in updates.items():
-                if key in simple_fields:
-                    fields.append(f"{key} = ?")
-                    values.append(value)
-
-            if fields:
-                values.append(system_id)
-                cursor.execute(f"""
-                    UPDATE systems
-                    SET {', '.join(fields)}, modified_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, values)
-
-            # Handle planets separately if provided
-            if 'planets' in updates:
-                # Delete existing planets (cascade will delete moons)
-                cursor.execute("DELETE FROM planets WHERE system_id = ?", (system_id,))
-                # Add new planets
-                for planet in updates['planets']:
-                    self._add_planet(cursor, system_id, planet)
-
-            # Handle space station if provided
-            if 'space_station' in updates:
-                cursor.execute("DELETE FROM space_stations WHERE system_id = ?", (system_id,))
-                if updates['space_station']:
-                    self._add_space_station(cursor, system_id, updates['space_station'])
+        Returns:
+            Row changes made, as {table: {'insert'|'update'|'delete': count}}
+        """
+        # Simple fields that may be updated on the system row itself
+        simple_fields = ['name', 'x', 'y', 'z', 'region', 'fauna', 'flora',
+                        'sentinel', 'materials', 'base_location', 'photo', 'attributes']
+        tree = {key: value for key, value in updates.items()
+                if key in simple_fields or key in ('planets', 'space_station')}
 
-            self.conn.commit()
+        try:
+            diff = SystemTreeDiff(self.conn, complete_rows=True)
+            diff.diff_system(system_id, tree)
+            if commit:
+                self.conn.commit()
         except Exception as e:
+            if not commit:
+                raise
             self.conn.rollback()
             logger.error(f"Failed to update system, rolled back transaction: {e}")
             raise
 
+        changes = diff.report()
+        if changes:
+            logger.debug(f"Updated system {system_id}: {changes}")
+        return changes
+
     def delete_system(self, system_id: str):
         """
         Delete system and all related data with transaction safety
@@ -798,6 +1416,8 @@ class HavenDatabase:
                 - discovery_name, coordinates, condition, time_period, significance
                 - photo_url, evidence_urls, discovered_by, discord_user_id, discord_guild_id
                 - pattern_matches, mystery_tier, analysis_status, tags, metadata
+                - type-specific fields, when the database has those columns
+                  (see common.discovery_writer.DISCOVERY_FIELDS)
 
         Returns:
             Discovery ID
@@ -805,52 +1425,53 @@ class HavenDatabase:
         Raises:
             ValueError: If required fields are missing
         """
-        required_fields = ['discovery_type', 'description', 'location_type']
-        for field in required_fields:
-            if field not in discovery_data:
-                raise ValueError(f"Missing required field: {field}")
+        missing = discovery_missing_fields(discovery_data)
+        if missing:
+            raise ValueError(f"Missing required field: {missing[0]}")
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO discoveries (
-                    discovery_type, discovery_name, system_id, planet_id, moon_id,
-                    location_type, location_name, description, coordinates, condition,
-                    time_period, significance, photo_url, evidence_urls,
-                    discovered_by, discord_user_id, discord_guild_id,
-                    pattern_matches, mystery_tier, analysis_status, tags, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                discovery_data['discovery_type'],
-                discovery_data.get('discovery_name'),
-                discovery_data.get('system_id'),
-                discovery_data.get('planet_id'),
-                discovery_data.get('moon_id'),
-                discovery_data['location_type'],
-                discovery_data.get('location_name'),
-                discovery_data['description'],
-                discovery_data.get('coordinates'),
-                discovery_data.get('condition'),
-                discovery_data.get('time_period'),
-                discovery_data.get('significance'),
-                discovery_data.get('photo_url'),
-                discovery_data.get('evidence_urls'),
-                discovery_data.get('discovered_by'),
-                discovery_data.get('discord_user_id'),
-                discovery_data.get('discord_guild_id'),
-                discovery_data.get('pattern_matches', 0),
-                discovery_data.get('mystery_tier', 0),
-                discovery_data.get('analysis_status', 'pending'),
-                discovery_data.get('tags'),
-                discovery_data.get('metadata')
-            ))
+            discovery_id = get_discovery_writer(self.db_path).insert(self.conn, discovery_data)
             self.conn.commit()
-            return cursor.lastrowid
+            return discovery_id
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Failed to add discovery, rolled back transaction: {e}")
             raise
 
+    def add_discoveries(self, discoveries: List[Dict], commit: bool = True) -> int:
+        """
+        Add several discoveries in one batched insert
+
+        Location IDs must already be set on each discovery (see
+        add_discovery for the fields).
+
+        Args:
+            discoveries: Discovery dictionaries
+            commit: If False, leave the transaction open (see add_system)
+
+        Returns:
+            Number of discoveries added
+
+        Raises:
+            ValueError: If any discovery is missing a required field
+        """
+        for discovery_data in discoveries:
+            missing = discovery_missing_fields(discovery_data)
+            if missing:
+                raise ValueError(f"Missing required field: {missing[0]}")
+
+        try:
+            count = get_discovery_writer(self.db_path).insert_many(self.conn, discoveries)
+            if commit:
+                self.conn.commit()
+            return count
+        except Exception as e:
+            if not commit:
+                raise
+            self.conn.rollback()
+            logger.error(f"Failed to add discoveries, rolled back transaction: {e}")
+            raise
+
     def get_discoveries(
         self,
         system_id: Optional[str] = None,
@@ -895,6 +1516,121 @@ class HavenDatabase:
         cursor.execute(query, params)
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_discoveries_page(
+        self,
+        system_id: Optional[str] = None,
+        planet_id: Optional[int] = None,
+        moon_id: Optional[int] = None,
+        type_contains: Optional[str] = None,
+        after: Optional[Tuple[Optional[str], int]] = None,
+        limit: int = 25
+    ) -> List[Dict]:
+        """
+        Get one page of discoveries, newest first, with keyset pagination
+
+        Pages are ordered by (submission_timestamp DESC, id DESC), with
+        undated discoveries last; pass the previous page's last row as
+        after=(submission_timestamp, id) for the next one.
+
+        Args:
+            system_id: Filter by system
+            planet_id: Filter by planet
+            moon_id: Filter by moon
+            type_contains: Only discovery types containing this text (case-insensitive)
+            after: (submission_timestamp, id) of the last row already shown
+            limit: Page size
+
+        Returns:
+            List of discovery dictionaries
+        """
+        query = "SELECT * FROM discoveries WHERE 1=1"
+        params: List[Any] = []
+
+        if system_id:
+            query += " AND system_id = ?"
+            params.append(system_id)
+        if planet_id:
+            query += " AND planet_id = ?"
+            params.append(planet_id)
+        if moon_id:
+            query += " AND moon_id = ?"
+            params.append(moon_id)
+        if type_contains:
+            escaped = type_contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query += " AND discovery_type LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        if after is not None:
+            timestamp, last_id = after
+            if timestamp is None:
+                query += " AND submission_timestamp IS NULL AND id < ?"
+                params.append(last_id)
+            else:
+                query += """ AND (submission_timestamp < ?
+                                  OR (submission_timestamp = ? AND id < ?)
+                                  OR submission_timestamp IS NULL)"""
+                params.extend([timestamp, timestamp, last_id])
+
+        query += " ORDER BY submission_timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def search_discoveries(
+        self,
+        query: str,
+        system_id: Optional[str] = None,
+        discovery_type: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Full-text search over discovery name, description, significance and location
+
+        Args:
+            query: Search text (every word is prefix matched)
+            system_id: Optional system filter
+            discovery_type: Optional discovery type filter
+            limit: Maximum results
+
+        Returns:
+            List of discovery dictionaries, best match first
+        """
+        cursor = self.conn.cursor()
+        params: List[Any] = []
+
+        if self._fts_enabled:
+            match = build_fts_query(query)
+            if match is None:
+                return []
+            sql = """
+                SELECT d.* FROM discoveries_fts
+                JOIN discoveries d ON d.id = discoveries_fts.rowid
+                WHERE discoveries_fts MATCH ?
+            """
+            params.append(match)
+            order = " ORDER BY bm25(discoveries_fts, 5.0, 1.0, 2.0, 3.0), d.submission_timestamp DESC"
+        else:
+            pattern = f"%{query}%"
+            sql = """
+                SELECT d.* FROM discoveries d
+                WHERE (d.discovery_name LIKE ? OR d.description LIKE ?
+                       OR d.significance LIKE ? OR d.location_name LIKE ?)
+            """
+            params.extend([pattern] * 4)
+            order = " ORDER BY d.submission_timestamp DESC"
+
+        if system_id:
+            sql += " AND d.system_id = ?"
+            params.append(system_id)
+        if discovery_type:
+            sql += " AND d.discovery_type = ?"
+            params.append(discovery_type)
+
+        params.append(limit)
+        cursor.execute(sql + order + " LIMIT ?", params)
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_discovery_by_id(self, discovery_id: int) -> Optional[Dict]:
         """Get a single discovery by ID"""
         cursor = self.conn.cursor()
@@ -969,14 +1705,15 @@ class HavenDatabase:
 
     # ========== METADATA METHODS ==========
 
-    def set_metadata(self, key: str, value: str):
-        """Set metadata key-value pair"""
+    def set_metadata(self, key: str, value: str, commit: bool = True):
+        """Set metadata key-value pair (commit=False: in the caller's transaction)"""
         cursor = self.conn.cursor()
         cursor.execute("""
             INSERT OR REPLACE INTO _metadata (key, value, updated_at)
             VALUES (?, ?, CURRENT_TIMESTAMP)
         """, (key, value))
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
 
     def get_metadata(self, key: str) -> Optional[str]:
         """Get metadata value by key"""
@@ -1019,4 +1756,31 @@ def example_usage():
 
 
 if __name__ == "__main__":
-    example_usage()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Haven database utilities")
+    parser.add_argument('--recompute-stats', metavar='DB_PATH',
+                        help='Verify and repair the statistics counters of a database')
+    parser.add_argument('--build-search-index', metavar='DB_PATH',
+                        help='Build or upgrade the full-text search index of a database')
+    args = parser.parse_args()
+
+    if args.build_search_index:
+        with HavenDatabase(args.build_search_index) as db:
+            if db.build_search_index():
+                print("Full-text search index built")
+            else:
+                print("Full-text search unavailable (this SQLite build may lack FTS5)")
+    elif args.recompute_stats:
+        with HavenDatabase(args.recompute_stats) as db:
+            result = db.recompute_statistics(repair=True)
+        if not result['tables'] and not result['regions']:
+            print("Statistics counters are consistent")
+        for table, drift in result['tables'].items():
+            print(f"  {table}: stored {drift['stored']:,}, actual {drift['actual']:,}")
+        for region, drift in result['regions'].items():
+            print(f"  region '{region}': stored {drift['stored']:,}, actual {drift['actual']:,}")
+        if result['repaired']:
+            print("Counters repaired")
+    else:
+        example_usage()
@@ -0,0 +1,369 @@
+"""
+Shared discovery writer for Haven databases
+
+Every path that writes discoveries (the local sync API, the Keeper bot's
+direct database mode and HavenDatabase.add_discovery) goes through a
+DiscoveryWriter, which:
+
+- builds the INSERT from one declarative field spec (DISCOVERY_FIELDS)
+  limited to the columns the database actually has, so the statement text
+  never changes and sqlite3's statement cache reuses the prepared statement
+- caches system/planet/moon name -> id resolutions, invalidated whenever a
+  system, planet or moon is renamed, moved or deleted (tracked by the
+  trigger-maintained 'location_version' counter in _metadata)
+
+Usage:
+    writer = get_discovery_writer("data/VH-Database.db")
+    result = writer.write(conn, discovery_data)   # resolves names, inserts, commits
+"""
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Declarative discovery field spec: (column, source keys, default).
+# The first truthy source key wins; otherwise the last key's value (or the
+# default when it is missing) is used, so ('type', 'discovery_type') behaves
+# like data.get('type') or data.get('discovery_type').
+DISCOVERY_FIELDS = (
+    ('discovery_type', ('type', 'discovery_type'), None),
+    ('discovery_name', ('discovery_name',), None),
+    ('system_id', ('system_id',), None),
+    ('planet_id', ('planet_id',), None),
+    ('moon_id', ('moon_id',), None),
+    ('location_type', ('location_type',), 'space'),
+    ('location_name', ('location_name',), None),
+    ('description', ('description',), None),
+    ('coordinates', ('coordinates',), None),
+    ('condition', ('condition',), None),
+    ('time_period', ('time_period',), None),
+    ('significance', ('significance',), None),
+    ('photo_url', ('photo_url', 'evidence_url'), None),
+    ('evidence_urls', ('evidence_urls',), None),
+    ('discovered_by', ('username', 'discovered_by'), None),
+    ('discord_user_id', ('user_id', 'discord_user_id'), None),
+    ('discord_guild_id', ('guild_id', 'discord_guild_id'), None),
+    ('pattern_matches', ('pattern_matches',), 0),
+    ('mystery_tier', ('mystery_tier',), 0),
+    ('analysis_status', ('analysis_status',), 'pending'),
+    ('tags', ('tags',), None),
+    ('metadata', ('metadata',), None),
+) + tuple((column, (column,), None) for column in (
+    # Type-specific fields (added by migration.add_discovery_type_fields)
+    'species_type', 'size_scale', 'preservation_quality', 'estimated_age',
+    'language_status', 'completeness', 'author_origin', 'key_excerpt',
+    'structure_type', 'architectural_style', 'structural_integrity', 'purpose_function',
+    'tech_category', 'operational_status', 'power_source', 'reverse_engineering',
+    'species_name', 'behavioral_notes', 'habitat_biome', 'threat_level',
+    'resource_type', 'deposit_richness', 'extraction_method', 'economic_value',
+    'ship_class', 'hull_condition', 'salvageable_tech', 'pilot_status',
+    'hazard_type', 'severity_level', 'duration_frequency', 'protection_required',
+    'update_name', 'feature_category', 'gameplay_impact', 'first_impressions',
+    'story_type', 'lore_connections', 'creative_elements', 'collaborative_work',
+))
+
+# Keys every discovery passed to HavenDatabase.add_discovery must have
+REQUIRED_DISCOVERY_FIELDS = ('discovery_type', 'description', 'location_type')
+
+# Columns filled from name resolution rather than straight from the payload
+LOCATION_COLUMNS = ('system_id', 'planet_id', 'moon_id')
+
+# Cached resolutions kept per database before the cache is reset
+MAX_CACHED_LOCATIONS = 50000
+
+# Changes that can make a cached name -> id resolution stale
+_LOCATION_TRIGGERS = (
+    ('trg_location_version_systems_update', 'AFTER UPDATE OF id, name ON systems'),
+    ('trg_location_version_systems_delete', 'AFTER DELETE ON systems'),
+    ('trg_location_version_planets_update', 'AFTER UPDATE OF id, name, system_id ON planets'),
+    ('trg_location_version_planets_delete', 'AFTER DELETE ON planets'),
+    ('trg_location_version_moons_update', 'AFTER UPDATE OF id, name, planet_id ON moons'),
+    ('trg_location_version_moons_delete', 'AFTER DELETE ON moons'),
+)
+
+
+def field_value(data: Dict, keys: Tuple[str, ...], default=None):
+    """Read one spec field from a payload (see DISCOVERY_FIELDS)"""
+    for key in keys[:-1]:
+        value = data.get(key)
+        if value:
+            return value
+    return data.get(keys[-1], default)
+
+
+def discovery_missing_fields(data: Dict) -> List[str]:
+    """Required discovery keys missing from a payload (in REQUIRED_DISCOVERY_FIELDS order)"""
+    return [field for field in REQUIRED_DISCOVERY_FIELDS if field not in data]
+
+
+def ensure_location_version(conn: sqlite3.Connection, triggers: Optional[set] = None) -> bool:
+    """
+    Install the triggers that bump _metadata.location_version
+
+    Args:
+        conn: Open connection (committed on install)
+        triggers: Existing trigger names, if the caller already read sqlite_master
+
+    Returns:
+        True if the counter is available
+    """
+    if triggers is None:
+        triggers = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    if all(name in triggers for name, _ in _LOCATION_TRIGGERS):
+        return True
+
+    tables = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not {'_metadata', 'systems', 'planets', 'moons'} <= tables:
+        return False
+
+    try:
+        conn.execute("INSERT OR IGNORE INTO _metadata (key, value) VALUES ('location_version', '0')")
+        for name, event in _LOCATION_TRIGGERS:
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {name} {event}
+                BEGIN
+                    UPDATE _metadata SET value = CAST(value AS INTEGER) + 1
+                    WHERE key = 'location_version';
+                END
+            """)
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.warning(f"Location cache invalidation unavailable, resolving names uncached: {e}")
+        return False
+
+
+class DiscoveryWriter:
+    """
+    Writes discoveries to one database with cached name resolution
+
+    Safe to share between threads; each call uses the connection passed in.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_cached: int = MAX_CACHED_LOCATIONS):
+        self.db_path = db_path
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._version = None
+        self._systems: Dict[str, str] = {}
+        self._planets: Dict[Tuple[str, str], int] = {}
+        self._moons: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._insert_sql = None
+        self._fields = None
+        self._cache_checked = False
+        self._cache_enabled = False
+
+    def invalidate(self):
+        """Forget cached resolutions and the discoveries column list"""
+        with self._lock:
+            self._systems.clear()
+            self._planets.clear()
+            self._moons.clear()
+            self._version = None
+            self._insert_sql = None
+            self._fields = None
+
+    # ========== NAME RESOLUTION ==========
+
+    def _check_cache(self, conn: sqlite3.Connection) -> bool:
+        """Drop cached resolutions if locations changed since they were cached"""
+        if not self._cache_checked:
+            self._cache_enabled = ensure_location_version(conn)
+            self._cache_checked = True
+        if not self._cache_enabled:
+            return False
+
+        row = conn.execute("SELECT value FROM _metadata WHERE key = 'location_version'").fetchone()
+        version = row[0] if row else None
+        if version is None:
+            return False
+
+        size = len(self._systems) + len(self._planets) + len(self._moons)
+        if version != self._version or size > self.max_cached:
+            with self._lock:
+                self._systems.clear()
+                self._planets.clear()
+                self._moons.clear()
+                self._version = version
+        return True
+
+    def resolve_location(self, conn: sqlite3.Connection, system_name: Optional[str],
+                         location_type: Optional[str] = None,
+                         location_name: Optional[str] = None) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """
+        Resolve names to (system_id, planet_id, moon_id)
+
+        Args:
+            conn: Open connection
+            system_name: System name (None for deep space discoveries)
+            location_type: 'planet' or 'moon' to resolve location_name
+            location_name: Planet or moon name within the system
+
+        Returns:
+            (system_id, planet_id, moon_id); unresolved parts are None
+        """
+        if not system_name:
+            return None, None, None
+
+        cached = self._check_cache(conn)
+
+        system_id = self._systems.get(system_name) if cached else None
+        if system_id is None:
+            row = conn.execute("SELECT id FROM systems WHERE name = ?", (system_name,)).fetchone()
+            if row is None:
+                return None, None, None
+            system_id = row[0]
+            if cached:
+                self._systems[system_name] = system_id
+
+        if not location_name:
+            return system_id, None, None
+
+        key = (system_id, location_name)
+        if location_type == 'planet':
+            planet_id = self._planets.get(key) if cached else None
+            if planet_id is None:
+                row = conn.execute(
+                    "SELECT id FROM planets WHERE system_id = ? AND name = ?", key).fetchone()
+                if row is None:
+                    return system_id, None, None
+                planet_id = row[0]
+                if cached:
+                    self._planets[key] = planet_id
+            return system_id, planet_id, None
+
+        if location_type == 'moon':
+            moon = self._moons.get(key) if cached else None
+            if moon is None:
+                row = conn.execute("""
+                    SELECT m.id, m.planet_id
+                    FROM moons m
+                    JOIN planets p ON m.planet_id = p.id
+                    WHERE p.system_id = ? AND m.name = ?
+                """, key).fetchone()
+                if row is None:
+                    return system_id, None, None
+                moon = (row[0], row[1])
+                if cached:
+                    self._moons[key] = moon
+            return system_id, moon[1], moon[0]
+
+        return system_id, None, None
+
+    # ========== INSERTS ==========
+
+    def _statement(self, conn: sqlite3.Connection):
+        """The INSERT for this database's discoveries columns (built once)"""
+        if self._insert_sql is None:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(discoveries)")}
+            fields = tuple(field for field in DISCOVERY_FIELDS if field[0] in columns)
+            placeholders = ', '.join('?' * len(fields))
+            self._insert_sql = (
+                f"INSERT INTO discoveries ({', '.join(field[0] for field in fields)}) "
+                f"VALUES ({placeholders})"
+            )
+            self._fields = fields
+        return self._insert_sql, self._fields
+
+    def insert(self, conn: sqlite3.Connection, data: Dict, location: Optional[Dict] = None) -> int:
+        """
+        Insert one discovery without committing
+
+        Args:
+            conn: Open connection
+            data: Discovery payload (keys per DISCOVERY_FIELDS)
+            location: Resolved system_id/planet_id/moon_id overriding the payload
+
+        Returns:
+            New discovery ID
+        """
+        sql, fields = self._statement(conn)
+        return conn.execute(sql, self._values(fields, data, location)).lastrowid
+
+    def insert_many(self, conn: sqlite3.Connection, records: List[Dict]) -> int:
+        """
+        Insert several discoveries with one executemany, without committing
+
+        Args:
+            conn: Open connection
+            records: Discovery payloads with system_id/planet_id/moon_id
+                     already resolved (nothing is looked up by name)
+
+        Returns:
+            Number of discoveries inserted
+        """
+        if not records:
+            return 0
+        sql, fields = self._statement(conn)
+        conn.executemany(sql, (self._values(fields, data) for data in records))
+        return len(records)
+
+    @staticmethod
+    def _values(fields, data: Dict, location: Optional[Dict] = None) -> List:
+        values = []
+        for column, keys, default in fields:
+            if location is not None and column in location:
+                values.append(location[column])
+            else:
+                values.append(field_value(data, keys, default))
+        return values
+
+    def write(self, conn: sqlite3.Connection, data: Dict) -> Dict:
+        """
+        Resolve a payload's system/planet/moon names and insert it (committed)
+
+        Args:
+            conn: Open connection
+            data: Discovery payload with system_name, location_type, location_name
+
+        Returns:
+            {'discovery_id', 'system_id', 'planet_id', 'moon_id'}
+        """
+        try:
+            system_id, planet_id, moon_id = self.resolve_location(
+                conn, data.get('system_name'),
+                data.get('location_type', 'space'), data.get('location_name'))
+            location = dict(zip(LOCATION_COLUMNS, (system_id, planet_id, moon_id)))
+            discovery_id = self.insert(conn, data, location)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return {'discovery_id': discovery_id, **location}
+
+    def write_many(self, conn: sqlite3.Connection, records: List[Dict]) -> List[Dict]:
+        """Write several payloads in one transaction (see write)"""
+        results = []
+        try:
+            for data in records:
+                system_id, planet_id, moon_id = self.resolve_location(
+                    conn, data.get('system_name'),
+                    data.get('location_type', 'space'), data.get('location_name'))
+                location = dict(zip(LOCATION_COLUMNS, (system_id, planet_id, moon_id)))
+                results.append({'discovery_id': self.insert(conn, data, location), **location})
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return results
+
+
+_writers: Dict[str, DiscoveryWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_discovery_writer(db_path) -> DiscoveryWriter:
+    """Get the process-wide DiscoveryWriter for a database file"""
+    key = str(Path(db_path).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = DiscoveryWriter(key)
+        return writer
@@ -0,0 +1,310 @@
+"""
+Persistent map-generation worker
+
+Generating a map in a fresh process pays for interpreter startup, the
+pandas/numpy imports, the settings import, loading the whole galaxy and
+reading the template on every click. The Control Room instead starts one
+long-lived worker on first use and sends it generate jobs; the worker keeps
+Beta_VH_Map imported, so its template, static-asset and galaxy caches stay
+warm and a repeat build only redoes what changed.
+
+Protocol: one JSON object per line over the worker's stdin/stdout
+    job:      {"id": 1, "args": ["--no-open", "--data-file", "data/data.json"]}
+    events:   {"id": 1, "event": "progress", "message": "Loaded 500 systems ..."}
+              {"id": 1, "event": "done", "code": 0, "seconds": 1.7}
+    shutdown: {"command": "shutdown"} (or closing stdin)
+
+The worker's own stdout is reserved for the protocol; prints and log output
+from the map generator go to its stderr, which the client sends to a log
+file under logs/.
+
+Usage:
+    worker = get_map_worker()
+    code = worker.generate(["--no-open", "--data-file", str(path)], on_progress=log)
+    ...
+    shutdown_map_worker()     # when the application exits
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between forwarded INFO progress lines (warnings always go through)
+PROGRESS_INTERVAL = 0.25
+
+# Seconds to wait for the worker to exit before it is killed
+SHUTDOWN_TIMEOUT = 5
+
+
+class MapWorkerError(RuntimeError):
+    """The worker process could not be started or died during a job"""
+
+
+# ========== WORKER SIDE ==========
+
+class _ProgressHandler(logging.Handler):
+    """Forwards the map generator's log records as progress events"""
+
+    def __init__(self, send: Callable[[dict], None]):
+        super().__init__(logging.INFO)
+        self.send = send
+        self.job_id = None
+        self._last = 0.0
+
+    def emit(self, record: logging.LogRecord):
+        if self.job_id is None:
+            return
+        now = time.monotonic()
+        if record.levelno < logging.WARNING and now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+        try:
+            self.send({"id": self.job_id, "event": "progress", "message": record.getMessage()})
+        except Exception:
+            self.handleError(record)
+
+
+def serve(stdin=None, stdout=None) -> int:
+    """
+    Run the worker loop until stdin closes or a shutdown command arrives
+
+    Args:
+        stdin: Job stream (default: sys.stdin)
+        stdout: Event stream (default: sys.stdout, which is then pointed at stderr)
+
+    Returns:
+        Exit code
+    """
+    stdin = stdin or sys.stdin
+    if stdout is None:
+        stdout = sys.stdout
+        # Keep stray prints and console logging from corrupting the protocol stream
+        sys.stdout = sys.stderr
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is stdout:
+                handler.setStream(sys.stderr)
+
+    lock = threading.Lock()
+
+    def send(event: dict):
+        with lock:
+            stdout.write(json.dumps(event) + "\n")
+            stdout.flush()
+
+    import Beta_VH_Map
+    handler = _ProgressHandler(send)
+    logging.getLogger().addHandler(handler)
+    send({"event": "ready", "pid": os.getpid()})
+
+    try:
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError:
+                logger.warning(f"Ignoring malformed map job: {line.strip()[:200]}")
+                continue
+            if job.get("command") == "shutdown":
+                break
+
+            job_id = job.get("id")
+            handler.job_id, handler._last = job_id, 0.0
+            started = time.perf_counter()
+            try:
+                code = Beta_VH_Map.main(list(job.get("args") or []))
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                logger.exception("Map generation failed")
+                send({"id": job_id, "event": "progress", "message": f"Map generation error: {e}"})
+                code = 1
+            finally:
+                handler.job_id = None
+            send({"id": job_id, "event": "done", "code": code or 0,
+                  "seconds": round(time.perf_counter() - started, 3)})
+    finally:
+        logging.getLogger().removeHandler(handler)
+    return 0
+
+
+# ========== CONTROL ROOM SIDE ==========
+
+def default_command() -> List[str]:
+    """Command line that starts a worker (the same EXE when frozen)"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, '--entry', 'map-worker']
+    return [sys.executable, str(Path(__file__).resolve())]
+
+
+class MapWorker:
+    """
+    Client for one worker process, started lazily and restarted if it dies
+
+    Jobs run one at a time; generate() blocks its calling thread (run it on
+    a background executor, never the Tk thread).
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, cwd: Optional[Path] = None,
+                 log_dir: Optional[Path] = None):
+        from .paths import project_root, logs_dir
+        self.command = command or default_command()
+        self.cwd = Path(cwd or project_root())
+        self.log_dir = Path(log_dir or logs_dir())
+        self._process: Optional[subprocess.Popen] = None
+        self._log_file = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.jobs_run = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self.running else None
+
+    def _start(self):
+        self._close()
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime('%Y-%m-%d_%H%M%S')
+        self._log_file = open(self.log_dir / f'map-worker-{ts}.log', 'a', encoding='utf-8')
+        try:
+            self._process = subprocess.Popen(
+                self.command, cwd=str(self.cwd), text=True, encoding='utf-8', bufsize=1,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self._log_file)
+        except OSError as e:
+            self._close()
+            raise MapWorkerError(f"Could not start map worker: {e}") from e
+
+        ready = self._read_event()
+        if ready is None or ready.get("event") != "ready":
+            log_name = self._log_file_name()
+            self._close()
+            raise MapWorkerError(f"Map worker failed to start (see {log_name})")
+        logger.info(f"Map worker started (pid {ready.get('pid')})")
+
+    def _log_file_name(self) -> str:
+        return getattr(self._log_file, 'name', 'logs/map-worker-*.log')
+
+    def _read_event(self) -> Optional[dict]:
+        while True:
+            line = self._process.stdout.readline()
+            if not line:
+                return None
+            try:
+                return json.loads(line)
+            except ValueError:
+                logger.debug(f"Map worker: {line.rstrip()}")
+
+    def _close(self):
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            for stream in (self._process.stdin, self._process.stdout):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+            self._process = None
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def generate(self, args: List[str], on_progress: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Run one map generation (Beta_VH_Map command-line arguments)
+
+        Args:
+            args: Arguments for Beta_VH_Map.main, e.g. ['--no-open', '--data-file', path]
+            on_progress: Called with each progress message (on this thread)
+
+        Returns:
+            The generator's exit code
+
+        Raises:
+            MapWorkerError: If the worker cannot be started or dies mid-job
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                if not self.running:
+                    self._start()
+                self._next_id += 1
+                job_id = self._next_id
+                try:
+                    self._process.stdin.write(json.dumps({"id": job_id, "args": list(args)}) + "\n")
+                    self._process.stdin.flush()
+                except (BrokenPipeError, OSError):
+                    # Worker exited while idle: start a fresh one and resend
+                    self._close()
+                    if attempt == 2:
+                        raise MapWorkerError("Map worker is not accepting jobs")
+                    continue
+
+                while True:
+                    event = self._read_event()
+                    if event is None:
+                        self._close()
+                        raise MapWorkerError("Map worker exited during generation "
+                                             "(see logs/map-worker-*.log)")
+                    if event.get("id") != job_id:
+                        continue
+                    if event.get("event") == "progress" and on_progress is not None:
+                        on_progress(event.get("message", ""))
+                    elif event.get("event") == "done":
+                        self.jobs_run += 1
+                        logger.info(f"Map job {job_id} finished in {event.get('seconds')}s "
+                                    f"(exit {event.get('code')})")
+                        return int(event.get("code") or 0)
+        raise MapWorkerError("Map worker is not accepting jobs")
+
+    def stop(self):
+        """Ask the worker to exit (killed if it does not within SHUTDOWN_TIMEOUT)"""
+        with self._lock:
+            if self.running:
+                try:
+                    self._process.stdin.write(json.dumps({"command": "shutdown"}) + "\n")
+                    self._process.stdin.flush()
+                    self._process.wait(timeout=SHUTDOWN_TIMEOUT)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._close()
+
+
+_worker: Optional[MapWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_map_worker() -> MapWorker:
+    """Get the process-wide map worker (the process itself starts on the first job)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = MapWorker()
+        return _worker
+
+
+def shutdown_map_worker():
+    """Stop the process-wide map worker, if one was started"""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop()
+
+
+if __name__ == '__main__':
+    # Run as a script: import from src/ and the project root, not src/common/
+    _src = Path(__file__).resolve().parent.parent
+    sys.path[0:1] = [str(_src), str(_src.parent)]
+    raise SystemExit(serve())
@@ -0,0 +1,67 @@
+"""
+Sorted in-memory system name index
+
+The JSON backend's counterpart of HavenDatabase.get_system_names: names are
+kept sorted the way SQLite's NOCASE collation sorts them (ASCII letters
+case-folded, ties broken by the exact name), so prefix pages and their
+keyset continuation behave identically on both backends.
+
+Usage:
+    index = SystemNameIndex(names)
+    page = index.page("ze", limit=50)
+    more = index.page("ze", after=page[-1], limit=50)
+"""
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+# SQLite NOCASE only folds ASCII A-Z
+_NOCASE = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def nocase(text: str) -> str:
+    """Fold text the way SQLite's NOCASE collation compares it"""
+    return text.translate(_NOCASE)
+
+
+def name_key(name: str) -> Tuple[str, str]:
+    """Sort key matching ORDER BY name COLLATE NOCASE, name"""
+    return nocase(name), name
+
+
+class SystemNameIndex:
+    """Immutable sorted index of system names with prefix paging"""
+
+    def __init__(self, names: Iterable[str]):
+        self._keys: List[Tuple[str, str]] = sorted({name_key(name) for name in names if name})
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def names(self) -> List[str]:
+        """All names in index order"""
+        return [name for _, name in self._keys]
+
+    def page(self, prefix: str = '', after: Optional[str] = None, limit: Optional[int] = 100) -> List[str]:
+        """
+        Names starting with prefix (case-insensitive), in index order
+
+        Args:
+            prefix: Name prefix ('' for all names)
+            after: Last name of the previous page (keyset continuation)
+            limit: Maximum names to return (None for all)
+
+        Returns:
+            List of names
+        """
+        folded = nocase(prefix)
+        start = bisect_left(self._keys, (folded, ''))
+        if after is not None:
+            start = max(start, bisect_right(self._keys, name_key(after)))
+
+        names = []
+        for key, name in self._keys[start:]:
+            if not key.startswith(folded) or (limit is not None and len(names) >= limit):
+                break
+            names.append(name)
+        return names
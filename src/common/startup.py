@@ -0,0 +1,243 @@
+"""
+Startup Helpers - lazy imports and startup profiling
+
+The Control Room and System Entry Wizard should put a window on screen as
+soon as possible. Modules that are only needed by some actions are imported
+lazily, and work such as counting systems, backups and sync checks runs
+after the window is up.
+
+lazy_import() returns a module whose code runs on first attribute access:
+
+    jsonschema = lazy_import("jsonschema")   # nothing executed yet
+    jsonschema.validators.validator_for(...)  # imported here
+
+Passing --profile-startup to either entry point records how long every
+module import and every init phase took, and writes the breakdown to
+logs/startup-profile-<entry>-<timestamp>.txt once the window is shown:
+
+    profiler = start_profiling("control")     # before the heavy imports
+    with startup_phase("build UI"):
+        ...
+    finish_profiling()                        # writes the report
+"""
+
+import sys
+import time
+import logging
+import importlib.util
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FLAG = "--profile-startup"
+
+# Imports listed in the report (slowest first)
+TOP_IMPORTS = 30
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module lazily (importlib.util.LazyLoader)
+
+    The module is registered in sys.modules right away but its code only
+    runs when an attribute is first accessed. Already imported and missing
+    modules are imported normally (a missing one raises ImportError here,
+    not at first use).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+        return importlib.import_module(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    """True if --profile-startup is on the command line"""
+    return PROFILE_FLAG in (sys.argv if argv is None else argv)
+
+
+class _TimedLoader:
+    """Wraps a module loader to time exec_module"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module keeps its real loader (resource readers, inspect, ...)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler._timing_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder:
+    """Meta path finder that wraps the loader the other finders pick"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Import and init-phase timings for one startup
+
+    Import times are cumulative (including the imports a module makes)
+    and self (excluding them), like ``python -X importtime``.
+    """
+
+    def __init__(self, entry: str):
+        self.entry = entry
+        self.started = time.perf_counter()
+        self.imports: Dict[str, List[float]] = {}   # name -> [cumulative, self]
+        self.import_order: List[str] = []
+        self.phases: List[Tuple[str, float, float]] = []   # (name, start offset, seconds)
+        self._stack: List[List[float]] = []
+        self._finder = _TimingFinder(self)
+
+    def install(self):
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def _timing_import(self, name: str):
+        frame = [0.0]   # time spent in nested imports
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            if name not in self.imports:
+                self.import_order.append(name)
+            self.imports[name] = [elapsed, elapsed - frame[0]]
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one init phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.started, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        """Record a point in time (a zero-length phase)"""
+        self.phases.append((name, time.perf_counter() - self.started, 0.0))
+
+    @property
+    def import_seconds(self) -> float:
+        """Total import time (sum of self times, so nothing is counted twice)"""
+        return sum(own for _, own in self.imports.values())
+
+    def report(self) -> str:
+        """The breakdown as text"""
+        total = time.perf_counter() - self.started
+        lines = [
+            f"Startup profile: {self.entry} ({datetime.now().isoformat(timespec='seconds')})",
+            f"Total since profiling started: {total * 1000:.1f} ms",
+            f"Module imports: {len(self.imports)} modules, {self.import_seconds * 1000:.1f} ms",
+            "",
+            "Init phases (start offset, duration):",
+        ]
+        for name, offset, seconds in self.phases:
+            lines.append(f"  {offset * 1000:9.1f} ms  {seconds * 1000:9.1f} ms  {name}")
+        lines += ["", f"Slowest imports (top {TOP_IMPORTS}, cumulative / self):"]
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, own) in slowest[:TOP_IMPORTS]:
+            lines.append(f"  {cumulative * 1000:9.1f} ms  {own * 1000:9.1f} ms  {name}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, log_dir: Optional[Path] = None) -> Path:
+        """Write the report under logs/ and return its path"""
+        if log_dir is None:
+            from .paths import logs_dir
+            log_dir = logs_dir()
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime('%Y-%m-%d_%H%M%S')
+        path = log_dir / f"startup-profile-{self.entry}-{ts}.txt"
+        path.write_text(self.report(), encoding="utf-8")
+        return path
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def start_profiling(entry: str, force: bool = False) -> Optional[StartupProfiler]:
+    """
+    Start profiling if --profile-startup was given (or force is set)
+
+    Call this before the entry point's heavy imports; imports made before
+    it are not timed.
+    """
+    global _profiler
+    if _profiler is None and (force or profiling_requested()):
+        _profiler = StartupProfiler(entry)
+        _profiler.install()
+    return _profiler
+
+
+def get_profiler() -> Optional[StartupProfiler]:
+    """The running profiler, if any"""
+    return _profiler
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Time an init phase when profiling (a no-op otherwise)"""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.phase(name):
+        yield
+
+
+def finish_profiling(log_dir: Optional[Path] = None) -> Optional[Path]:
+    """Stop profiling and write the report; returns its path (None if not profiling)"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.uninstall()
+    try:
+        path = profiler.write(log_dir)
+    except OSError as e:
+        logger.warning(f"Could not write startup profile: {e}")
+        return None
+    logger.info(f"Startup profile written to {path}")
+    return path
@@ -0,0 +1,478 @@
+"""
+Hash-tree (Merkle) sync status between data.json and a Haven database
+
+Each system's content (system fields, planets, moons and space station,
+without ids or timestamps) is reduced to a canonical hash. System hashes
+are rolled up per region, and region hashes into one root, so two
+backends are compared by their roots first and only regions whose hashes
+differ are drilled into system by system.
+
+- Database side: hashes are cached in _sync_hashes / _sync_regions and
+  invalidated by triggers on systems, planets, moons and space_stations,
+  so only systems changed since the last check are re-hashed (any writer
+  that touches the tables, e.g. the Keeper bot, keeps the cache honest)
+- JSON side: the tree is stored in a sidecar next to the file
+  (data.json -> data.json.hashes) keyed by the file's mtime and size, so an
+  unchanged data.json is not even parsed
+
+Usage:
+    json_tree = json_hash_tree("data/data.json")
+    with HavenDatabase("data/VH-Database.db") as db:
+        status = compare_hash_trees(json_tree, DatabaseHashTree(db.conn))
+"""
+import json
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Content that takes part in a system's hash, per level of the system tree
+SYSTEM_FIELDS = ('name', 'region', 'x', 'y', 'z', 'fauna', 'flora', 'sentinel',
+                 'materials', 'base_location', 'photo', 'attributes')
+BODY_FIELDS = ('name', 'sentinel', 'fauna', 'flora', 'properties', 'materials',
+               'base_location', 'photo', 'notes')
+STATION_FIELDS = ('name', 'race', 'sell_percent', 'buy_percent')
+
+# Compared as numbers, so 5, 5.0 and "5" hash alike
+NUMERIC_FIELDS = {'x', 'y', 'z', 'sell_percent', 'buy_percent'}
+
+# Systems loaded per query when re-hashing database rows
+HASH_BATCH_SIZE = 500
+
+# Examples kept per category in the status report
+MAX_EXAMPLES = 5
+
+SIDECAR_SUFFIX = '.hashes'
+SIDECAR_VERSION = 1
+
+_HASH_TRIGGERS = (
+    ('trg_sync_hash_systems_insert', 'AFTER INSERT ON systems', """
+        DELETE FROM _sync_hashes WHERE system_id = NEW.id;
+        DELETE FROM _sync_regions WHERE region = NEW.region;"""),
+    ('trg_sync_hash_systems_update', 'AFTER UPDATE ON systems', """
+        DELETE FROM _sync_hashes WHERE system_id IN (OLD.id, NEW.id);
+        DELETE FROM _sync_regions WHERE region IN (OLD.region, NEW.region);"""),
+    ('trg_sync_hash_systems_delete', 'AFTER DELETE ON systems', """
+        DELETE FROM _sync_hashes WHERE system_id = OLD.id;
+        DELETE FROM _sync_regions WHERE region = OLD.region;"""),
+    ('trg_sync_hash_planets_insert', 'AFTER INSERT ON planets', """
+        DELETE FROM _sync_hashes WHERE system_id = NEW.system_id;"""),
+    ('trg_sync_hash_planets_update', 'AFTER UPDATE ON planets', """
+        DELETE FROM _sync_hashes WHERE system_id IN (OLD.system_id, NEW.system_id);"""),
+    ('trg_sync_hash_planets_delete', 'AFTER DELETE ON planets', """
+        DELETE FROM _sync_hashes WHERE system_id = OLD.system_id;"""),
+    ('trg_sync_hash_moons_insert', 'AFTER INSERT ON moons', """
+        DELETE FROM _sync_hashes WHERE system_id =
+            (SELECT system_id FROM planets WHERE id = NEW.planet_id);"""),
+    ('trg_sync_hash_moons_update', 'AFTER UPDATE ON moons', """
+        DELETE FROM _sync_hashes WHERE system_id IN
+            (SELECT system_id FROM planets WHERE id IN (OLD.planet_id, NEW.planet_id));"""),
+    ('trg_sync_hash_moons_delete', 'AFTER DELETE ON moons', """
+        DELETE FROM _sync_hashes WHERE system_id =
+            (SELECT system_id FROM planets WHERE id = OLD.planet_id);"""),
+    ('trg_sync_hash_space_stations_insert', 'AFTER INSERT ON space_stations', """
+        DELETE FROM _sync_hashes WHERE system_id = NEW.system_id;"""),
+    ('trg_sync_hash_space_stations_update', 'AFTER UPDATE ON space_stations', """
+        DELETE FROM _sync_hashes WHERE system_id IN (OLD.system_id, NEW.system_id);"""),
+    ('trg_sync_hash_space_stations_delete', 'AFTER DELETE ON space_stations', """
+        DELETE FROM _sync_hashes WHERE system_id = OLD.system_id;"""),
+)
+
+
+# ========== CANONICAL HASHES ==========
+
+def _canonical_value(field: str, value):
+    """Normalize one field so equal content hashes equally on both backends"""
+    if value is None or value == '':
+        return None
+    if field in NUMERIC_FIELDS:
+        try:
+            return round(float(value), 6)
+        except (TypeError, ValueError):
+            return str(value)
+    if isinstance(value, str) and value[:1] in ('[', '{'):
+        # The database stores list/dict fields as JSON text
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return value if isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def _canonical_fields(record: Dict, fields: Tuple[str, ...]) -> List:
+    return [_canonical_value(field, record.get(field)) for field in fields]
+
+
+def _as_record(item) -> Dict:
+    # Legacy data.json files list planets and moons by name only
+    return item if isinstance(item, dict) else {'name': item}
+
+
+def _sort_key(item) -> str:
+    # Fields start with the name; None-safe, unlike comparing the lists
+    return json.dumps(item, ensure_ascii=False, default=str)
+
+
+def canonical_system(system: Dict) -> List:
+    """
+    A system tree reduced to its comparable content
+
+    Planets and moons are ordered by name, so row ids and insertion order
+    do not affect the result.
+    """
+    planets = []
+    for planet in system.get('planets') or ():
+        planet = _as_record(planet)
+        moons = sorted((_canonical_fields(_as_record(moon), BODY_FIELDS)
+                        for moon in planet.get('moons') or ()), key=_sort_key)
+        planets.append([_canonical_fields(planet, BODY_FIELDS), moons])
+    planets.sort(key=_sort_key)
+
+    station = system.get('space_station')
+    return [
+        _canonical_fields(system, SYSTEM_FIELDS),
+        planets,
+        _canonical_fields(station, STATION_FIELDS) if isinstance(station, dict) else None,
+    ]
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def system_hash(system: Dict) -> str:
+    """Content hash of one system tree (see canonical_system)"""
+    return _digest(json.dumps(canonical_system(system), ensure_ascii=False,
+                              separators=(',', ':'), default=str))
+
+
+def rollup_hash(pairs: Iterable[Tuple[str, str]]) -> str:
+    """Hash of (key, hash) pairs, e.g. a region's systems or the regions of a root"""
+    return _digest('\n'.join(f"{key}\t{value}" for key, value in sorted(map(tuple, pairs))))
+
+
+# ========== HASH TREES ==========
+
+class HashTree:
+    """
+    In-memory hash tree: systems -> regions -> root
+
+    Both backends expose the same three levels (root(), regions() and
+    systems(region)); DatabaseHashTree answers them from its cache tables.
+    """
+
+    def __init__(self, systems: Dict[str, Tuple[str, str]]):
+        """
+        Args:
+            systems: system_id -> (region, hash)
+        """
+        self._by_region: Dict[str, Dict[str, str]] = {}
+        for system_id, (region, digest) in systems.items():
+            self._by_region.setdefault(region, {})[system_id] = digest
+        self._regions = {region: (rollup_hash(members.items()), len(members))
+                         for region, members in self._by_region.items()}
+
+    @classmethod
+    def from_systems(cls, systems: Iterable[Dict]) -> 'HashTree':
+        """Hash full system trees (keyed by id, or by name when there is none)"""
+        return cls({str(system.get('id') or system.get('name')): (system.get('region') or '', system_hash(system))
+                    for system in systems})
+
+    def root(self) -> str:
+        return rollup_hash((region, digest) for region, (digest, _) in self._regions.items())
+
+    def regions(self) -> Dict[str, Tuple[str, int]]:
+        """region -> (region hash, system count)"""
+        return dict(self._regions)
+
+    def systems(self, region: str) -> Dict[str, str]:
+        """system_id -> hash for one region"""
+        return dict(self._by_region.get(region, {}))
+
+    def to_dict(self) -> Dict:
+        return {region: members for region, members in self._by_region.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HashTree':
+        return cls({system_id: (region, digest)
+                    for region, members in data.items() for system_id, digest in members.items()})
+
+
+def ensure_sync_hashes(conn: sqlite3.Connection) -> bool:
+    """
+    Create the hash cache tables and their invalidation triggers
+
+    Args:
+        conn: Open connection (committed on install)
+
+    Returns:
+        True if the cache is available
+    """
+    objects = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    wanted = [(name, event, body) for name, event, body in _HASH_TRIGGERS
+              if event.rsplit(' ', 1)[-1] in objects]
+    if {'_sync_hashes', '_sync_regions'} <= objects and all(name in objects for name, _, _ in wanted):
+        return True
+    if 'systems' not in objects:
+        return False
+
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS _sync_hashes (
+                system_id TEXT PRIMARY KEY,
+                region TEXT NOT NULL,
+                hash TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_hashes_region "
+                     "ON _sync_hashes(region, system_id, hash)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS _sync_regions (
+                region TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                system_count INTEGER NOT NULL
+            )
+        """)
+        for name, event, body in wanted:
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.warning(f"Sync hash cache unavailable, hashing every system: {e}")
+        return False
+
+
+def load_system_trees(conn: sqlite3.Connection, system_ids: List[str]) -> List[Dict]:
+    """
+    Full system trees (planets with moons, space station) for a batch of ids
+
+    Three queries per batch instead of a few per system. Rows come back
+    with all their columns, like HavenDatabase.get_all_systems(include_planets=True).
+
+    Returns:
+        Systems in the order of system_ids (missing ids are skipped)
+    """
+    conn_factory, conn.row_factory = conn.row_factory, sqlite3.Row
+    try:
+        marks = ','.join('?' * len(system_ids))
+        systems = {row['id']: dict(row) for row in conn.execute(
+            f"SELECT * FROM systems WHERE id IN ({marks})", system_ids)}
+        for system in systems.values():
+            system['planets'] = []
+
+        planets = {}
+        for row in conn.execute(f"SELECT * FROM planets WHERE system_id IN ({marks}) ORDER BY id", system_ids):
+            planet = planets[row['id']] = dict(row, moons=[])
+            systems[row['system_id']]['planets'].append(planet)
+        if planets:
+            for row in conn.execute(f"""
+                SELECT m.* FROM moons m JOIN planets p ON m.planet_id = p.id
+                WHERE p.system_id IN ({marks})
+                ORDER BY m.id
+            """, system_ids):
+                planets[row['planet_id']]['moons'].append(dict(row))
+
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'space_stations'")}
+        if tables:
+            for row in conn.execute(
+                    f"SELECT * FROM space_stations WHERE system_id IN ({marks}) ORDER BY id", system_ids):
+                systems[row['system_id']].setdefault('space_station', dict(row))
+        return [systems[system_id] for system_id in system_ids if system_id in systems]
+    finally:
+        conn.row_factory = conn_factory
+
+
+class DatabaseHashTree:
+    """
+    Hash tree of a Haven database, backed by the trigger-invalidated cache
+
+    refresh() re-hashes only systems whose cached hash was dropped since the
+    last check; if the cache cannot be written (read-only or locked
+    database) the hashes are still computed, just not kept.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.rehashed = 0
+        self._memory: Optional[HashTree] = None
+        if ensure_sync_hashes(conn):
+            self.refresh()
+        else:
+            self._memory = self._hash_everything()
+
+    def _hash_everything(self) -> HashTree:
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM systems")]
+        systems = {}
+        for start in range(0, len(ids), HASH_BATCH_SIZE):
+            for system in load_system_trees(self.conn, ids[start:start + HASH_BATCH_SIZE]):
+                systems[system['id']] = (system.get('region') or '', system_hash(system))
+        self.rehashed = len(systems)
+        return HashTree(systems)
+
+    def refresh(self):
+        """Re-hash changed systems and re-roll changed regions"""
+        conn = self.conn
+        stale = [row[0] for row in conn.execute("""
+            SELECT s.id FROM systems s
+            LEFT JOIN _sync_hashes h ON h.system_id = s.id
+            WHERE h.system_id IS NULL
+        """)]
+        try:
+            for start in range(0, len(stale), HASH_BATCH_SIZE):
+                rows = [(system['id'], system.get('region') or '', system_hash(system))
+                        for system in load_system_trees(conn, stale[start:start + HASH_BATCH_SIZE])]
+                conn.executemany("INSERT OR REPLACE INTO _sync_hashes (system_id, region, hash) "
+                                 "VALUES (?, ?, ?)", rows)
+                conn.executemany("DELETE FROM _sync_regions WHERE region = ?",
+                                 {(region,) for _, region, _ in rows})
+
+            for (region,) in conn.execute("""
+                SELECT DISTINCT h.region FROM _sync_hashes h
+                LEFT JOIN _sync_regions r ON r.region = h.region
+                WHERE r.region IS NULL
+            """).fetchall():
+                members = conn.execute("SELECT system_id, hash FROM _sync_hashes WHERE region = ?",
+                                       (region,)).fetchall()
+                conn.execute("INSERT INTO _sync_regions (region, hash, system_count) VALUES (?, ?, ?)",
+                             (region, rollup_hash(members), len(members)))
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.warning(f"Could not update sync hash cache, hashing in memory: {e}")
+            self._memory = self._hash_everything()
+            return
+        self.rehashed = len(stale)
+
+    def root(self) -> str:
+        if self._memory is not None:
+            return self._memory.root()
+        return rollup_hash(self.conn.execute("SELECT region, hash FROM _sync_regions").fetchall())
+
+    def regions(self) -> Dict[str, Tuple[str, int]]:
+        if self._memory is not None:
+            return self._memory.regions()
+        return {region: (digest, count) for region, digest, count in self.conn.execute(
+            "SELECT region, hash, system_count FROM _sync_regions")}
+
+    def systems(self, region: str) -> Dict[str, str]:
+        if self._memory is not None:
+            return self._memory.systems(region)
+        return dict(self.conn.execute(
+            "SELECT system_id, hash FROM _sync_hashes WHERE region = ?", (region,)).fetchall())
+
+
+def _sidecar_path(json_path: Path) -> Path:
+    return json_path.with_name(json_path.name + SIDECAR_SUFFIX)
+
+
+def json_hash_tree(json_path, write_sidecar: bool = True) -> HashTree:
+    """
+    Hash tree of a data.json file, reusing its sidecar when the file is unchanged
+
+    Args:
+        json_path: Path to data.json
+        write_sidecar: Store a recomputed tree next to the file
+
+    Returns:
+        HashTree (empty if the file does not exist)
+    """
+    json_path = Path(json_path)
+    if not json_path.exists():
+        return HashTree({})
+
+    stat = json_path.stat()
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    sidecar = _sidecar_path(json_path)
+    try:
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == SIDECAR_VERSION and cached.get('source') == stamp:
+            return HashTree.from_dict(cached['regions'])
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    systems = []
+    for key, value in data.items():
+        if key == '_meta' or not isinstance(value, dict):
+            continue
+        systems.append(value if 'name' in value else dict(value, name=key))
+    tree = HashTree.from_systems(systems)
+
+    if write_sidecar:
+        try:
+            from .atomic_write import atomic_write_json
+            atomic_write_json({'version': SIDECAR_VERSION, 'source': stamp, 'root': tree.root(),
+                               'regions': tree.to_dict()}, sidecar, indent=None)
+        except Exception as e:
+            logger.debug(f"Could not write sync hash sidecar {sidecar}: {e}")
+    return tree
+
+
+def compare_hash_trees(json_tree, db_tree) -> Dict:
+    """
+    Compare two hash trees top-down
+
+    Equal roots end the comparison; otherwise only regions whose hashes
+    differ are compared system by system (a system that moved region shows
+    up in both of its regions, so it is matched across them).
+
+    Returns:
+        Sync status dict (see DataSynchronizer.check_sync_status)
+    """
+    json_regions = json_tree.regions()
+    db_regions = db_tree.regions()
+    json_count = sum(count for _, count in json_regions.values())
+    db_count = sum(count for _, count in db_regions.values())
+
+    status = {
+        "in_sync": True,
+        "json_count": json_count,
+        "db_count": db_count,
+        "only_in_json": 0,
+        "only_in_db": 0,
+        "in_both": json_count,
+        "differences": 0,
+        "only_in_json_ids": [],
+        "only_in_db_ids": [],
+        "difference_details": [],
+        "regions_checked": 0,
+    }
+    if json_tree.root() == db_tree.root():
+        return status
+
+    mismatched = sorted(region for region in set(json_regions) | set(db_regions)
+                        if json_regions.get(region, (None,))[0] != db_regions.get(region, (None,))[0])
+    json_systems, db_systems = {}, {}
+    for region in mismatched:
+        json_systems.update(json_tree.systems(region))
+        db_systems.update(db_tree.systems(region))
+    matched = json_count - sum(json_regions[region][1] for region in mismatched if region in json_regions)
+
+    only_in_json = sorted(set(json_systems) - set(db_systems))
+    only_in_db = sorted(set(db_systems) - set(json_systems))
+    in_both = set(json_systems) & set(db_systems)
+    differences = sorted(system_id for system_id in in_both if json_systems[system_id] != db_systems[system_id])
+
+    status.update({
+        "in_sync": not (only_in_json or only_in_db or differences),
+        "only_in_json": len(only_in_json),
+        "only_in_db": len(only_in_db),
+        "in_both": matched + len(in_both),
+        "differences": len(differences),
+        "only_in_json_ids": only_in_json[:MAX_EXAMPLES],
+        "only_in_db_ids": only_in_db[:MAX_EXAMPLES],
+        "difference_details": [(system_id, 'content', json_systems[system_id], db_systems[system_id])
+                               for system_id in differences[:MAX_EXAMPLES]],
+        "regions_checked": len(mismatched),
+    })
+    return status
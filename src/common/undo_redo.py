@@ -0,0 +1,472 @@
+"""
+Undo/redo operation log for Haven system edits
+
+Edits to a system tree (system, planets, moons, space station) are applied
+as a diff against what is stored: only changed columns are UPDATEd, and
+rows are inserted or deleted only when a planet, moon or station was
+actually added or removed. Every row change is recorded in a compact log:
+
+    _edit_groups      one row per logical edit (e.g. one wizard save)
+    _edit_operations  one row per changed row: action plus a JSON diff
+                      ({column: [old, new]} for updates, the full row for
+                      inserts and deletes)
+
+Undo replays a group's inverse operations newest-first; redo replays the
+group again. A new edit discards any undone groups (the redo branch).
+
+The diff itself lives in SystemTreeDiff, which HavenDatabase.update_system
+also uses (without the log) to patch systems in place.
+
+Usage:
+    with HavenDatabase(db_path) as db:
+        log = OperationLog(db.conn)
+        system_id, group_id = log.save_system(system_data, label="Wizard save")
+        log.undo()
+        log.redo()
+"""
+import json
+import sqlite3
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Groups kept before the oldest are dropped
+MAX_UNDO_GROUPS = 200
+
+# Columns never diffed: row keys, parent links and bookkeeping timestamps
+IGNORED_COLUMNS = frozenset({'id', 'system_id', 'planet_id', 'created_at', 'modified_at'})
+
+# Discovery columns that point at planets and moons (kept in sync on deletes)
+DISCOVERY_LINKS = {'planets': 'planet_id', 'moons': 'moon_id'}
+
+# Values for child columns a new row leaves out (matches HavenDatabase._add_*)
+CHILD_DEFAULTS = {
+    'moons': {'orbit_radius': 0.5, 'orbit_speed': 0.05},
+    # Stations don't have their own coordinates in the editors
+    'space_stations': {'x': 0.0, 'y': 0.0, 'z': 0.0},
+}
+
+
+class EditConflictError(RuntimeError):
+    """A logged edit no longer matches the database (changed since it was made)"""
+
+
+def _encode(changes: Dict) -> str:
+    return json.dumps(changes, separators=(',', ':'))
+
+
+class SystemTreeDiff:
+    """
+    Applies a system tree as minimal row changes against what is stored
+
+    Planets, moons and the space station are matched to stored rows by name
+    (per system/planet); matched rows keep their IDs. Every row change made
+    is collected in operations as (table, row_id, action, changes). Nothing
+    is committed; the caller owns the transaction.
+
+    With complete_rows, each planet/moon/station passed in is the whole row:
+    fields it leaves out are reset to their defaults and a planet without
+    'moons' has none. Otherwise only the fields present are compared.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, complete_rows: bool = False):
+        self.conn = conn
+        self.complete_rows = complete_rows
+        self._columns: Dict[str, List[str]] = {}
+        self._ops: List[Tuple] = []
+
+    @property
+    def operations(self) -> List[Tuple]:
+        return self._ops
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Row changes so far as {table: {'insert'|'update'|'delete': count}}"""
+        summary: Dict[str, Dict[str, int]] = {}
+        for table, _, action, _ in self._ops:
+            counts = summary.setdefault(table, {})
+            counts[action] = counts.get(action, 0) + 1
+        return summary
+
+    def _table_columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            self._columns[table] = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        return self._columns[table]
+
+    def _row(self, table: str, row_id) -> Optional[Dict]:
+        columns = self._table_columns(table)
+        row = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def _rows(self, table: str, parent_column: str, parent_id) -> List[Dict]:
+        columns = self._table_columns(table)
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE {parent_column} = ? ORDER BY id",
+            (parent_id,))
+        return [dict(zip(columns, row)) for row in rows]
+
+    # ========== ROW OPERATIONS ==========
+
+    def _insert(self, table: str, values: Dict):
+        columns = list(values)
+        cursor = self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [values[column] for column in columns])
+        return values.get('id', cursor.lastrowid)
+
+    def _update(self, table: str, row_id, values: Dict):
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        if table == 'systems':
+            assignments += ", modified_at = CURRENT_TIMESTAMP"
+        self.conn.execute(f"UPDATE {table} SET {assignments} WHERE id = ?",
+                          [*values.values(), row_id])
+
+    def _delete(self, table: str, row_id):
+        self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+
+    def _insert_logged(self, table: str, values: Dict):
+        row_id = self._insert(table, values)
+        self._ops.append((table, row_id, 'insert', self._row(table, row_id)))
+        return row_id
+
+    def _update_logged(self, table: str, row: Dict, new: Dict) -> bool:
+        changes = {column: [row[column], new[column]]
+                   for column in self._table_columns(table)
+                   if column in new and column not in IGNORED_COLUMNS and new[column] != row[column]}
+        if not changes:
+            return False
+        self._update(table, row['id'], {column: values[1] for column, values in changes.items()})
+        self._ops.append((table, row['id'], 'update', changes))
+        return True
+
+    def _delete_logged(self, table: str, row: Dict):
+        """Delete a row and its children explicitly, so undo can restore them all"""
+        if table == 'planets':
+            for moon in self._rows('moons', 'planet_id', row['id']):
+                self._delete_logged('moons', moon)
+
+        link = DISCOVERY_LINKS.get(table)
+        if link and link in self._table_columns('discoveries'):
+            for (discovery_id,) in self.conn.execute(
+                    f"SELECT id FROM discoveries WHERE {link} = ?", (row['id'],)).fetchall():
+                self._update('discoveries', discovery_id, {link: None})
+                self._ops.append(('discoveries', discovery_id, 'update', {link: [row['id'], None]}))
+
+        self._delete(table, row['id'])
+        self._ops.append((table, row['id'], 'delete', row))
+
+    # ========== DIFFING ==========
+
+    def _complete(self, table: str, new: Dict) -> Dict:
+        """A child row with every column (and a planet's moons) filled in"""
+        defaults = CHILD_DEFAULTS.get(table, {})
+        row = {column: new.get(column, defaults.get(column))
+               for column in self._table_columns(table) if column not in IGNORED_COLUMNS}
+        if table == 'planets':
+            row['moons'] = new.get('moons') or []
+        return row
+
+    def _diff_children(self, table: str, parent_column: str, parent_id, new_rows: List[Dict],
+                       pair_unmatched: bool = False):
+        """Match new rows to stored ones by name; update, insert or delete as needed"""
+        if self.complete_rows:
+            new_rows = [self._complete(table, new) for new in new_rows]
+        existing = self._rows(table, parent_column, parent_id)
+        by_name: Dict[str, List[Dict]] = {}
+        for row in existing:
+            by_name.setdefault(row['name'], []).append(row)
+
+        matched = []
+        unmatched_new = []
+        for new in new_rows:
+            candidates = by_name.get(new.get('name'))
+            if candidates:
+                matched.append((candidates.pop(0), new))
+            else:
+                unmatched_new.append(new)
+        leftovers = [row for rows in by_name.values() for row in rows]
+
+        if pair_unmatched:
+            # Single-row children (space stations) are edited in place even when renamed
+            while leftovers and unmatched_new:
+                matched.append((leftovers.pop(0), unmatched_new.pop(0)))
+
+        for row in leftovers:
+            self._delete_logged(table, row)
+
+        for row, new in matched:
+            self._update_logged(table, row, new)
+            if table == 'planets' and 'moons' in new:
+                self._diff_children('moons', 'planet_id', row['id'], new['moons'] or [])
+
+        columns = self._table_columns(table)
+        for new in unmatched_new:
+            values = {column: new[column] for column in columns
+                      if column in new and column not in IGNORED_COLUMNS}
+            values[parent_column] = parent_id
+            for column, default in CHILD_DEFAULTS.get(table, {}).items():
+                if values.get(column) is None:
+                    values[column] = default
+            row_id = self._insert_logged(table, values)
+            if table == 'planets':
+                self._diff_children('moons', 'planet_id', row_id, new.get('moons') or [])
+
+    def diff_system(self, system_id: str, updates: Dict) -> bool:
+        """
+        Apply updates to an existing system tree
+
+        Args:
+            system_id: System ID
+            updates: System fields, 'planets' (with nested 'moons') and/or
+                     'space_station' (None removes it); absent keys are left alone
+
+        Returns:
+            True if the system exists
+        """
+        row = self._row('systems', system_id)
+        if row is None:
+            return False
+
+        self._update_logged('systems', row, updates)
+        if 'planets' in updates:
+            self._diff_children('planets', 'system_id', system_id, updates['planets'] or [])
+        if 'space_station' in updates:
+            station = updates['space_station']
+            self._diff_children('space_stations', 'system_id', system_id,
+                                [station] if station else [], pair_unmatched=True)
+        return True
+
+
+class OperationLog(SystemTreeDiff):
+    """
+    Applies system edits as minimal row changes and undoes/redoes them
+
+    The caller owns the connection; each edit, undo and redo is committed
+    as one transaction.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, max_groups: int = MAX_UNDO_GROUPS):
+        super().__init__(conn)
+        self.max_groups = max_groups
+        self.ensure_tables()
+
+    def ensure_tables(self):
+        """Create the log tables if missing"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_edit_operations'"
+        ).fetchone()
+        if exists:
+            return
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS _edit_groups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                label TEXT,
+                system_id TEXT,
+                undone INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS _edit_operations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_id INTEGER NOT NULL REFERENCES _edit_groups(id) ON DELETE CASCADE,
+                table_name TEXT NOT NULL,
+                row_id NOT NULL,
+                action TEXT NOT NULL CHECK (action IN ('insert', 'update', 'delete')),
+                changes TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_edit_operations_group ON _edit_operations(group_id);
+        """)
+
+    # ========== EDITS ==========
+
+    def _commit_group(self, label: Optional[str], system_id: Optional[str]) -> Optional[int]:
+        """Record the pending operations as one group and commit"""
+        ops, self._ops = self._ops, []
+        if not ops:
+            self.conn.commit()
+            return None
+
+        # A new edit replaces the redo branch
+        self.conn.execute("DELETE FROM _edit_operations WHERE group_id IN "
+                          "(SELECT id FROM _edit_groups WHERE undone = 1)")
+        self.conn.execute("DELETE FROM _edit_groups WHERE undone = 1")
+
+        group_id = self.conn.execute(
+            "INSERT INTO _edit_groups (label, system_id) VALUES (?, ?)", (label, system_id)
+        ).lastrowid
+        self.conn.executemany(
+            "INSERT INTO _edit_operations (group_id, table_name, row_id, action, changes) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(group_id, table, row_id, action, _encode(changes)) for table, row_id, action, changes in ops])
+
+        oldest_kept = group_id - self.max_groups
+        if oldest_kept > 0:
+            self.conn.execute("DELETE FROM _edit_operations WHERE group_id <= ?", (oldest_kept,))
+            self.conn.execute("DELETE FROM _edit_groups WHERE id <= ?", (oldest_kept,))
+
+        self.conn.commit()
+        logger.info(f"Logged edit #{group_id} ({label or 'edit'}): {len(ops)} row change(s)")
+        return group_id
+
+    def _run(self, apply, label: Optional[str], system_id: Optional[str]) -> Optional[int]:
+        self._ops = []
+        try:
+            apply()
+            return self._commit_group(label, system_id)
+        except Exception:
+            self._ops = []
+            self.conn.rollback()
+            raise
+
+    def edit_system(self, system_id: str, updates: Dict, label: Optional[str] = None) -> Optional[int]:
+        """
+        Apply field-level edits to a stored system tree
+
+        Only keys present in updates are compared. 'planets' (with nested
+        'moons') and 'space_station' are matched to stored rows by name.
+
+        Args:
+            system_id: System ID
+            updates: System fields, planets and/or space_station
+            label: Description shown in the undo history
+
+        Returns:
+            Group ID of the logged edit, or None if nothing changed
+
+        Raises:
+            KeyError: If the system does not exist
+        """
+        def apply():
+            if not self.diff_system(system_id, updates):
+                raise KeyError(f"System not found: {system_id}")
+        return self._run(apply, label, system_id)
+
+    def save_system(self, system_data: Dict, label: Optional[str] = None) -> Tuple[str, Optional[int]]:
+        """
+        Create a system, or edit the stored one with the same name
+
+        An existing system keeps its ID; fields missing from system_data are
+        left as stored, except space_station, whose absence removes it.
+
+        Args:
+            system_data: System dictionary (same format as JSON), with 'id' for new systems
+            label: Description shown in the undo history
+
+        Returns:
+            (system_id, group ID or None if nothing changed)
+        """
+        existing = self.conn.execute(
+            "SELECT id FROM systems WHERE name = ?", (system_data['name'],)).fetchone()
+        system_id = existing[0] if existing else system_data.get('id')
+        if not system_id:
+            raise ValueError("New systems need an 'id'")
+
+        updates = {'space_station': None, **system_data}
+
+        def apply():
+            if existing:
+                self.diff_system(system_id, updates)
+                return
+            columns = self._table_columns('systems')
+            values = {column: updates[column] for column in columns
+                      if column in updates and column not in IGNORED_COLUMNS}
+            values['id'] = system_id
+            self._insert_logged('systems', values)
+            self._diff_children('planets', 'system_id', system_id, updates.get('planets') or [])
+            station = updates['space_station']
+            self._diff_children('space_stations', 'system_id', system_id, [station] if station else [])
+
+        return system_id, self._run(apply, label or f"Save {system_data['name']}", system_id)
+
+    # ========== UNDO / REDO ==========
+
+    def _group(self, undone: int, newest: bool) -> Optional[Dict]:
+        order = 'DESC' if newest else 'ASC'
+        row = self.conn.execute(
+            f"SELECT id, label, system_id FROM _edit_groups WHERE undone = ? ORDER BY id {order} LIMIT 1",
+            (undone,)).fetchone()
+        return {'id': row[0], 'label': row[1], 'system_id': row[2]} if row else None
+
+    def _operations(self, group_id: int) -> List[Tuple]:
+        rows = self.conn.execute(
+            "SELECT table_name, row_id, action, changes FROM _edit_operations "
+            "WHERE group_id = ? ORDER BY id", (group_id,)).fetchall()
+        return [(table, row_id, action, json.loads(changes)) for table, row_id, action, changes in rows]
+
+    def _replay(self, table: str, row_id, action: str, changes: Dict, forward: bool):
+        """Apply one logged operation (forward) or its inverse, checking the row still matches"""
+        current = self._row(table, row_id)
+        if action == 'update':
+            expected, target = (0, 1) if forward else (1, 0)
+            if current is None or any(current.get(column) != values[expected]
+                                      for column, values in changes.items()):
+                raise EditConflictError(f"{table} #{row_id} was changed since this edit")
+            self._update(table, row_id, {column: values[target] for column, values in changes.items()})
+            return
+
+        inserting = (action == 'insert') == forward
+        if inserting:
+            if current is not None:
+                raise EditConflictError(f"{table} #{row_id} already exists")
+            self._insert(table, changes)
+        else:
+            if current is None:
+                raise EditConflictError(f"{table} #{row_id} no longer exists")
+            self._delete(table, row_id)
+
+    def _step(self, undo: bool) -> Optional[Dict]:
+        group = self._group(undone=0 if undo else 1, newest=undo)
+        if group is None:
+            return None
+
+        operations = self._operations(group['id'])
+        if undo:
+            operations.reverse()
+        try:
+            for table, row_id, action, changes in operations:
+                self._replay(table, row_id, action, changes, forward=not undo)
+            self.conn.execute("UPDATE _edit_groups SET undone = ? WHERE id = ?",
+                              (1 if undo else 0, group['id']))
+            self.conn.commit()
+        except sqlite3.IntegrityError as e:
+            # e.g. discoveries recorded against a system this would remove
+            self.conn.rollback()
+            raise EditConflictError(f"Edit #{group['id']} conflicts with later changes: {e}") from e
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        logger.info(f"{'Undid' if undo else 'Redid'} edit #{group['id']} ({group['label']})")
+        return group
+
+    def undo(self) -> Optional[Dict]:
+        """
+        Undo the most recent edit
+
+        Returns:
+            The undone group ({'id', 'label', 'system_id'}), or None if nothing to undo
+
+        Raises:
+            EditConflictError: If the rows were changed since (nothing is applied)
+        """
+        return self._step(undo=True)
+
+    def redo(self) -> Optional[Dict]:
+        """Redo the most recently undone edit (see undo)"""
+        return self._step(undo=False)
+
+    def can_undo(self) -> bool:
+        return self._group(undone=0, newest=True) is not None
+
+    def can_redo(self) -> bool:
+        return self._group(undone=1, newest=False) is not None
+
+    def history(self, limit: int = 20) -> List[Dict]:
+        """Most recent edits first: [{'id', 'label', 'system_id', 'undone', 'created_at', 'operations'}]"""
+        rows = self.conn.execute("""
+            SELECT g.id, g.label, g.system_id, g.undone, g.created_at, COUNT(o.id)
+            FROM _edit_groups g LEFT JOIN _edit_operations o ON o.group_id = g.id
+            GROUP BY g.id ORDER BY g.id DESC LIMIT ?
+        """, (limit,)).fetchall()
+        keys = ('id', 'label', 'system_id', 'undone', 'created_at', 'operations')
+        return [dict(zip(keys, row)) for row in rows]
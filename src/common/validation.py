@@ -17,18 +17,40 @@ Usage:
     if not is_valid:
         for error in errors:
             print(f"Error: {error}")
+
+Large files are validated by SchemaValidator, which compiles the schema once
+into a specialized checker and validates systems independently (in a process
+pool above PARALLEL_THRESHOLD systems), collecting every error in a single
+pass. jsonschema is only consulted to describe systems that fail.
 """
 
+import os
+import re
 import json
-import jsonschema
+import logging
 import sys
 from pathlib import Path
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Callable, Optional
+
+from .startup import lazy_import
 
+# jsonschema is slow to import and only needed once a validator is built
+jsonschema = lazy_import("jsonschema")
+
+logger = logging.getLogger(__name__)
 
 # Cache the schema to avoid reloading
 _SCHEMA_CACHE = None
 
+# Key of the per-system entry in the schema's patternProperties
+SYSTEM_PATTERN = "^(?!_meta$).*$"
+
+# Files with at least this many systems are validated in a process pool
+PARALLEL_THRESHOLD = 2000
+
+# Systems sent to a worker per task
+CHUNK_SIZE = 500
+
 
 def load_schema() -> dict:
     """Load JSON schema from config directory.
@@ -66,6 +88,198 @@ def load_schema() -> dict:
     return _SCHEMA_CACHE
 
 
+# ============================================================================
+# COMPILED VALIDATION ENGINE
+# ============================================================================
+
+# Keywords that never affect validity (jsonschema does not assert "format" by default)
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples", "format"}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def compile_checker(schema: Any) -> Optional[Callable[[Any], bool]]:
+    """Compile a schema into a fast is-valid predicate.
+
+    Covers the keywords used by config/data_schema.json (type, required,
+    properties, items, enum, pattern, minimum/maximum, minLength/maxLength).
+    Returns None when the schema uses anything else, so callers fall back to
+    jsonschema rather than risk accepting invalid data.
+    """
+    if schema is True or schema == {}:
+        return lambda v: True
+    if not isinstance(schema, dict):
+        return None
+
+    checks: List[Callable[[Any], bool]] = []
+    is_number = _TYPE_CHECKS["number"]
+
+    for keyword, value in schema.items():
+        if keyword in _ANNOTATIONS:
+            continue
+        if keyword == "type":
+            types = [value] if isinstance(value, str) else value
+            if not all(t in _TYPE_CHECKS for t in types):
+                return None
+            type_checks = [_TYPE_CHECKS[t] for t in types]
+            checks.append(lambda v, tc=type_checks: any(c(v) for c in tc))
+        elif keyword == "required":
+            checks.append(lambda v, req=tuple(value): not isinstance(v, dict) or all(k in v for k in req))
+        elif keyword == "properties":
+            props = {}
+            for name, sub in value.items():
+                props[name] = compile_checker(sub)
+                if props[name] is None:
+                    return None
+            checks.append(lambda v, props=props: not isinstance(v, dict) or all(
+                check(v[name]) for name, check in props.items() if name in v))
+        elif keyword == "items":
+            item_check = compile_checker(value)
+            if item_check is None:
+                return None
+            checks.append(lambda v, c=item_check: not isinstance(v, list) or all(c(i) for i in v))
+        elif keyword == "enum":
+            if not all(isinstance(e, str) for e in value):
+                return None
+            checks.append(lambda v, allowed=frozenset(value): isinstance(v, str) and v in allowed)
+        elif keyword == "pattern":
+            checks.append(lambda v, rx=re.compile(value): not isinstance(v, str) or rx.search(v) is not None)
+        elif keyword == "minLength":
+            checks.append(lambda v, n=value: not isinstance(v, str) or len(v) >= n)
+        elif keyword == "maxLength":
+            checks.append(lambda v, n=value: not isinstance(v, str) or len(v) <= n)
+        elif keyword == "minimum":
+            checks.append(lambda v, n=value: not is_number(v) or v >= n)
+        elif keyword == "maximum":
+            checks.append(lambda v, n=value: not is_number(v) or v <= n)
+        else:
+            return None
+
+    return lambda v: all(check(v) for check in checks)
+
+
+def _format_error(error: 'jsonschema.ValidationError', prefix: Tuple = ()) -> str:
+    """Format an error as "Validation error at 'a -> b': message"."""
+    path = [*prefix, *error.path]
+    error_path = " -> ".join(str(p) for p in path) if path else "root"
+    return f"Validation error at '{error_path}': {error.message}"
+
+
+class SchemaValidator:
+    """JSON schema compiled once and applied system by system.
+
+    The data file schema is split into the file envelope (``_meta`` and
+    required keys) and the per-system schema, each checked once when the
+    validator is built. The system schema is also compiled into a plain
+    Python predicate; only systems it rejects are walked by jsonschema to
+    produce error messages. Systems are independent, so large files are
+    validated in chunks across a process pool.
+    """
+
+    def __init__(self, schema: Optional[dict] = None):
+        schema = schema if schema is not None else load_schema()
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+
+        self.schema = schema
+        self.system_schema = schema["patternProperties"][SYSTEM_PATTERN]
+        envelope = {k: v for k, v in schema.items()
+                    if k not in ("patternProperties", "additionalProperties")}
+        self._envelope = validator_class(envelope)
+        self._system = validator_class(self.system_schema)
+        self._is_valid_system = compile_checker(self.system_schema) or self._system.is_valid
+
+    def system_errors(self, key: str, system: Any) -> List[str]:
+        """All errors for one system entry, paths prefixed with its key."""
+        if self._is_valid_system(system):
+            return []
+        return [_format_error(e, (key,)) for e in self._system.iter_errors(system)]
+
+    def first_system_error(self, system: Any) -> Optional[str]:
+        """The most relevant error for one system (as jsonschema.validate reports it)."""
+        if self._is_valid_system(system):
+            return None
+        error = jsonschema.exceptions.best_match(self._system.iter_errors(system))
+        return _format_error(error) if error is not None else None
+
+    def validate_systems(self, systems: List[Tuple[str, Any]],
+                         workers: Optional[int] = None) -> List[str]:
+        """Validate (key, system) pairs, in parallel for large inputs.
+
+        Args:
+            systems: (key, system) pairs
+            workers: Worker processes; None picks automatically (serial below
+                     PARALLEL_THRESHOLD), 1 forces serial validation
+
+        Returns:
+            Errors in input order
+        """
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(systems) >= PARALLEL_THRESHOLD else 1
+        # Frozen builds can't spawn workers without freeze_support() in every entry point
+        if workers > 1 and not getattr(sys, 'frozen', False):
+            from concurrent.futures import ProcessPoolExecutor
+            chunks = [systems[i:i + CHUNK_SIZE] for i in range(0, len(systems), CHUNK_SIZE)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.schema,)) as pool:
+                    return [error for chunk_errors in pool.map(_validate_chunk, chunks)
+                            for error in chunk_errors]
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Parallel validation unavailable, validating serially: {e}")
+        return [error for key, system in systems for error in self.system_errors(key, system)]
+
+    def validate(self, data: Any, workers: Optional[int] = None) -> Tuple[bool, List[str]]:
+        """Validate a whole data file.
+
+        Returns:
+            Tuple of (is_valid, error_list), errors deduplicated in order
+        """
+        errors = [_format_error(e) for e in self._envelope.iter_errors(data)]
+        if isinstance(data, dict):
+            systems = [(k, v) for k, v in data.items() if k != "_meta"]
+            errors.extend(self.validate_systems(systems, workers))
+        errors = list(dict.fromkeys(errors))
+        return not errors, errors
+
+
+_VALIDATOR: Optional[SchemaValidator] = None
+
+
+def get_validator() -> SchemaValidator:
+    """Shared SchemaValidator for the bundled schema (built on first use)."""
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        _VALIDATOR = SchemaValidator()
+    return _VALIDATOR
+
+
+# Per-process validator for pool workers
+_WORKER_VALIDATOR: Optional[SchemaValidator] = None
+
+
+def _init_worker(schema: dict):
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = SchemaValidator(schema)
+
+
+def _validate_chunk(chunk: List[Tuple[str, Any]]) -> List[str]:
+    return [error for key, system in chunk for error in _WORKER_VALIDATOR.system_errors(key, system)]
+
+
+# ============================================================================
+# VALIDATION FUNCTIONS
+# ============================================================================
+
 def validate_system_data(system_data: Dict[str, Any]) -> Tuple[bool, str]:
     """Validate a single system's data against the system schema.
 
@@ -84,21 +298,11 @@ def validate_system_data(system_data: Dict[str, Any]) -> Tuple[bool, str]:
         True
     """
     try:
-        schema = load_schema()
-
-        # Get the system schema from patternProperties
-        system_schema = schema["patternProperties"]["^(?!_meta$).*$"]
-
-        # Validate
-        jsonschema.validate(system_data, system_schema)
+        error_msg = get_validator().first_system_error(system_data)
+        if error_msg:
+            return False, error_msg
         return True, ""
 
-    except jsonschema.ValidationError as e:
-        # Extract a clean error message
-        error_path = " -> ".join(str(p) for p in e.path) if e.path else "root"
-        error_msg = f"Validation error at '{error_path}': {e.message}"
-        return False, error_msg
-
     except jsonschema.SchemaError as e:
         return False, f"Schema error: {e.message}"
 
@@ -109,12 +313,13 @@ def validate_system_data(system_data: Dict[str, Any]) -> Tuple[bool, str]:
         return False, f"Unexpected error during validation: {str(e)}"
 
 
-def validate_data_file(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+def validate_data_file(data: Dict[str, Any], workers: Optional[int] = None) -> Tuple[bool, List[str]]:
     """Validate an entire data file against the complete schema.
 
     Args:
         data: Dictionary containing the entire data file
               (with _meta and system entries)
+        workers: Worker processes for system validation (None: automatic)
 
     Returns:
         Tuple of (is_valid, error_list)
@@ -131,26 +336,7 @@ def validate_data_file(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     errors = []
 
     try:
-        schema = load_schema()
-
-        # Validate entire file structure
-        jsonschema.validate(data, schema)
-        return True, []
-
-    except jsonschema.ValidationError as e:
-        # Collect all validation errors
-        error_path = " -> ".join(str(p) for p in e.path) if e.path else "root"
-        errors.append(f"Validation error at '{error_path}': {e.message}")
-
-        # Check for additional validation errors
-        validator = jsonschema.Draft7Validator(schema)
-        for error in validator.iter_errors(data):
-            error_path = " -> ".join(str(p) for p in error.path) if error.path else "root"
-            error_msg = f"Error at '{error_path}': {error.message}"
-            if error_msg not in errors:
-                errors.append(error_msg)
-
-        return False, errors
+        return get_validator().validate(data, workers)
 
     except jsonschema.SchemaError as e:
         errors.append(f"Schema error: {e.message}")
@@ -284,11 +470,12 @@ def validate_planet_data(planet: Dict[str, Any]) -> Tuple[bool, str]:
 # VALIDATION REPORT
 # ============================================================================
 
-def generate_validation_report(data: Dict[str, Any]) -> Dict[str, Any]:
+def generate_validation_report(data: Dict[str, Any], workers: Optional[int] = None) -> Dict[str, Any]:
     """Generate a detailed validation report for a data file.
 
     Args:
         data: Dictionary containing the entire data file
+        workers: Worker processes for system validation (None: automatic)
 
     Returns:
         Dictionary containing validation results and statistics:
@@ -322,7 +509,7 @@ def generate_validation_report(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     # Validate overall structure
-    is_valid, errors = validate_data_file(data)
+    is_valid, errors = validate_data_file(data, workers)
     report["valid"] = is_valid
     report["errors"].extend(errors)  # type: ignore[attr-defined]
 
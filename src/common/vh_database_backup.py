@@ -2,30 +2,248 @@
 VH-Database Backup Manager
 
 Provides automatic backup and restore functionality for VH-Database.db
+
+Two backup formats are supported:
+- Full backups: one VH-Database_backup_<timestamp>.db copy per backup
+- Incremental backups: backups/incremental/ holds content-addressed chunks
+  of the database file (chunks/<hash>) plus one JSON manifest per snapshot
+  (manifests/VH-Database_<timestamp>.json) listing the chunks in order.
+  Chunks unchanged since an earlier snapshot are stored only once, so each
+  snapshot costs roughly the pages that changed.
+
+Each backup records a fingerprint of the database files in
+backups/backup_state.json, so scheduled backups (start_background_backup)
+can be skipped when the database is unchanged since the last backup or the
+last one is more recent than a minimum interval.
+
+Backups and cleanups take a FileLock on the backup directory
+(backups/backup_state.json.lock), so one process never prunes chunks that
+a backup in another process is writing or reusing.
 """
 
+import json
+import zlib
 import shutil
 import sqlite3
+import hashlib
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
+from .file_lock import FileLock
+
 logger = logging.getLogger(__name__)
 
+# Default VH-Database location (project data directory)
+DEFAULT_DATABASE_PATH = Path(__file__).resolve().parents[2] / "data" / "VH-Database.db"
+
+# Bytes per content-addressed chunk (a whole number of pages for any page size)
+CHUNK_SIZE = 256 * 1024
+
+# Pages copied per backup API step; the source lock is released between steps
+BACKUP_STEP_PAGES = 1024
+
+# Seconds to sleep between backup API steps so live writers get the lock
+BACKUP_STEP_SLEEP = 0.005
+
+MANIFEST_FORMAT = 1
+
+# Records the last successful backup (time, fingerprint, path) per backup directory
+STATE_FILE = "backup_state.json"
+
+# Seconds a backup or cleanup waits for another process's lock on the backup directory
+BACKUP_LOCK_TIMEOUT = 300
+
+# Header bytes holding SQLite's file change counter and page count
+_HEADER_COUNTERS = slice(24, 32)
+
+# progress(stage, done, total) with stage 'copy' (pages) or 'chunks' (chunks)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def _copy_database(source_path: Path, target_path: Path,
+                   progress: Optional[ProgressCallback] = None):
+    """Consistent copy via the backup API, in steps so writers are not blocked"""
+    def report(status, remaining, total):
+        if progress:
+            progress('copy', total - remaining, total)
+
+    source_conn = sqlite3.connect(str(source_path))
+    target_conn = sqlite3.connect(str(target_path))
+    try:
+        source_conn.backup(target_conn, pages=BACKUP_STEP_PAGES, progress=report,
+                           sleep=BACKUP_STEP_SLEEP)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
 
-def backup_vh_database(source_path: Path = None, backup_dir: Path = None) -> Path:
+def _incremental_dirs(backup_dir: Path):
+    root = backup_dir / "incremental"
+    return root, root / "chunks", root / "manifests"
+
+
+def _chunk_path(chunks_dir: Path, digest: str) -> Path:
+    return chunks_dir / digest[:2] / digest
+
+
+def _write_incremental_snapshot(snapshot_path: Path, source_path: Path, backup_dir: Path,
+                                timestamp: str, progress: Optional[ProgressCallback] = None) -> Path:
+    """Split a consistent snapshot into chunks, storing new ones, and write its manifest"""
+    _, chunks_dir, manifests_dir = _incremental_dirs(backup_dir)
+    manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    with sqlite3.connect(str(snapshot_path)) as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+
+    size = snapshot_path.stat().st_size
+    total_chunks = (size + CHUNK_SIZE - 1) // CHUNK_SIZE
+    chunks = []
+    new_chunks = 0
+    new_bytes = 0
+
+    with open(snapshot_path, 'rb') as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            digest = hashlib.sha256(data).hexdigest()
+            chunk_path = _chunk_path(chunks_dir, digest)
+            if not chunk_path.exists():
+                chunk_path.parent.mkdir(parents=True, exist_ok=True)
+                compressed = zlib.compress(data, 1)
+                temp_path = chunk_path.with_suffix('.tmp')
+                temp_path.write_bytes(compressed)
+                temp_path.replace(chunk_path)
+                new_chunks += 1
+                new_bytes += len(compressed)
+            chunks.append(digest)
+            if progress:
+                progress('chunks', len(chunks), total_chunks)
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'created': timestamp,
+        'source': str(source_path),
+        'page_size': page_size,
+        'size': size,
+        'chunk_size': CHUNK_SIZE,
+        'chunks': chunks,
+        'new_chunks': new_chunks,
+        'new_bytes': new_bytes,
+    }
+    manifest_path = manifests_dir / f"VH-Database_{timestamp}.json"
+    temp_path = manifest_path.with_suffix('.tmp')
+    temp_path.write_text(json.dumps(manifest), encoding='utf-8')
+    temp_path.replace(manifest_path)
+
+    logger.info(f"[OK] Incremental backup: {manifest_path.name} "
+                f"({new_chunks}/{len(chunks)} new chunks, {new_bytes / (1024*1024):.2f} MB stored)")
+    return manifest_path
+
+
+def database_fingerprint(source_path: Path) -> Optional[str]:
+    """
+    Cheap fingerprint of a database's current content
+
+    Combines the header's file change counter and page count with the size
+    and mtime of the database and its WAL. PRAGMA data_version only
+    compares changes within one open connection, so it cannot tell whether
+    the database changed since a backup made by an earlier run.
+
+    Returns:
+        Hex digest, or None if the database does not exist
+    """
+    try:
+        with open(source_path, 'rb') as f:
+            header = f.read(100)
+        parts = [header[_HEADER_COUNTERS].hex()]
+        for path in (source_path, source_path.with_name(source_path.name + "-wal")):
+            if path.exists():
+                stat = path.stat()
+                parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    except OSError:
+        return None
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _backup_dir_lock(backup_dir: Path) -> FileLock:
+    """Lock held while a backup writes to, or a cleanup prunes, backup_dir"""
+    return FileLock(backup_dir / STATE_FILE, timeout=BACKUP_LOCK_TIMEOUT)
+
+
+def _read_state(backup_dir: Path) -> Dict:
+    try:
+        return json.loads((backup_dir / STATE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(backup_dir: Path, state: Dict):
+    path = backup_dir / STATE_FILE
+    temp_path = path.with_suffix('.tmp')
+    try:
+        temp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        temp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not record backup state: {e}")
+
+
+def backup_skip_reason(source_path: Path = None, backup_dir: Path = None,
+                       min_interval: float = 0, skip_unchanged: bool = True) -> Optional[str]:
+    """
+    Why a scheduled backup should not run now
+
+    Args:
+        source_path: Path to VH-Database.db (default: data/VH-Database.db)
+        backup_dir: Backup directory (default: data/backups/)
+        min_interval: Seconds that must pass after the last backup
+        skip_unchanged: Skip if the database fingerprint matches the last backup's
+
+    Returns:
+        A reason to skip, or None if a backup is due
+    """
+    if source_path is None:
+        source_path = DEFAULT_DATABASE_PATH
+    if backup_dir is None:
+        backup_dir = source_path.parent / "backups"
+
+    if not source_path.exists():
+        return "database not found"
+
+    state = _read_state(backup_dir)
+    last_path = backup_dir / state['backup'] if state.get('backup') else None
+    if last_path is None or not last_path.exists() or state.get('source') != str(source_path):
+        return None
+
+    age = time.time() - state.get('time', 0)
+    if skip_unchanged and state.get('fingerprint') == database_fingerprint(source_path):
+        return f"unchanged since the last backup ({last_path.name})"
+    if 0 <= age < min_interval:
+        return f"last backup was {age / 60:.0f} min ago (minimum interval {min_interval / 60:.0f} min)"
+    return None
+
+
+def backup_vh_database(source_path: Path = None, backup_dir: Path = None,
+                       incremental: bool = False,
+                       progress: Optional[ProgressCallback] = None) -> Path:
     """
     Create a timestamped backup of VH-Database.db
     
     Args:
         source_path: Path to VH-Database.db (default: data/VH-Database.db)
         backup_dir: Backup destination (default: data/backups/)
+        incremental: Store a deduplicated chunk snapshot instead of a full copy
+        progress: Optional progress(stage, done, total) callback
     
     Returns:
-        Path to created backup file
+        Path to created backup file (the manifest for incremental backups)
     """
     if source_path is None:
-        source_path = Path(__file__).parent.parent / "data" / "VH-Database.db"
+        source_path = DEFAULT_DATABASE_PATH
     
     if backup_dir is None:
         backup_dir = source_path.parent / "backups"
@@ -38,56 +256,158 @@ def backup_vh_database(source_path: Path = None, backup_dir: Path = None) -> Pat
         logger.warning(f"VH-Database not found at {source_path}, skipping backup")
         return None
     
+    lock = _backup_dir_lock(backup_dir)
+    try:
+        with lock:
+            return _write_backup(source_path, backup_dir, incremental, progress, lock)
+    except TimeoutError as e:
+        logger.error(f"[ERROR] Backup skipped: {e}")
+        return None
+
+
+def _write_backup(source_path: Path, backup_dir: Path, incremental: bool,
+                  progress: Optional[ProgressCallback], lock: FileLock) -> Optional[Path]:
+    """backup_vh_database's work, run while holding the backup directory lock"""
+    def report(stage, done, total):
+        # FileLock treats old lock files as abandoned, so keep ours fresh
+        lock.lock_file.touch()
+        if progress:
+            progress(stage, done, total)
+
+    # Taken before copying: a change made during the copy triggers another backup
+    fingerprint = database_fingerprint(source_path)
+
     # Create timestamped backup filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = backup_dir / f"VH-Database_backup_{timestamp}.db"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    if incremental:
+        root, _, _ = _incremental_dirs(backup_dir)
+        root.mkdir(parents=True, exist_ok=True)
+        backup_path = root / f"snapshot_{timestamp}.db.tmp"
+    else:
+        backup_path = backup_dir / f"VH-Database_backup_{timestamp[:15]}.db"
     
     try:
         # Use SQLite backup API for consistent backup
-        with sqlite3.connect(str(source_path)) as source_conn:
-            with sqlite3.connect(str(backup_path)) as backup_conn:
-                source_conn.backup(backup_conn)
-        
-        logger.info(f"[OK] Backup created: {backup_path}")
-        logger.info(f"  Size: {backup_path.stat().st_size / (1024*1024):.2f} MB")
+        _copy_database(source_path, backup_path, report)
 
-        return backup_path
+        if incremental:
+            created = _write_incremental_snapshot(backup_path, source_path, backup_dir,
+                                                  timestamp, report)
+        else:
+            created = backup_path
+            logger.info(f"[OK] Backup created: {backup_path}")
+            logger.info(f"  Size: {backup_path.stat().st_size / (1024*1024):.2f} MB")
+
+        _write_state(backup_dir, {
+            'source': str(source_path),
+            'time': time.time(),
+            'fingerprint': fingerprint,
+            'backup': created.relative_to(backup_dir).as_posix(),
+        })
+        return created
 
     except Exception as e:
         logger.error(f"[ERROR] Backup failed: {e}")
         return None
 
+    finally:
+        if incremental and backup_path.exists():
+            backup_path.unlink()
+
+
+def list_incremental_backups(backup_dir: Path = None) -> List[Dict]:
+    """
+    List incremental snapshots, oldest first
+    
+    Args:
+        backup_dir: Backup directory (default: data/backups/)
+    
+    Returns:
+        [{'path': manifest Path, 'created': datetime, 'size': bytes}, ...]
+    """
+    if backup_dir is None:
+        backup_dir = DEFAULT_DATABASE_PATH.parent / "backups"
+    
+    _, _, manifests_dir = _incremental_dirs(backup_dir)
+    snapshots = []
+    for manifest_path in manifests_dir.glob("VH-Database_*.json"):
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            created = datetime.strptime(manifest['created'], "%Y%m%d_%H%M%S_%f")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable backup manifest {manifest_path.name}: {e}")
+            continue
+        snapshots.append({'path': manifest_path, 'created': created, 'size': manifest['size']})
+    
+    return sorted(snapshots, key=lambda snapshot: snapshot['created'])
+
+
+def _restore_incremental(manifest_path: Path, temp_path: Path):
+    """Reassemble a database file from a snapshot manifest and verify it"""
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    chunks_dir = manifest_path.parent.parent / "chunks"
+
+    with open(temp_path, 'wb') as f:
+        for digest in manifest['chunks']:
+            data = zlib.decompress(_chunk_path(chunks_dir, digest).read_bytes())
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise ValueError(f"Backup chunk {digest[:12]} is corrupt")
+            f.write(data)
+
+    if temp_path.stat().st_size != manifest['size']:
+        raise ValueError("Restored database size does not match the manifest")
+
+    with sqlite3.connect(str(temp_path)) as conn:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    if result != 'ok':
+        raise ValueError(f"Restored database failed integrity check: {result}")
 
-def restore_vh_database(backup_path: Path, target_path: Path = None) -> bool:
+
+def restore_vh_database(backup_path: Path = None, target_path: Path = None,
+                        at: datetime = None, backup_dir: Path = None) -> bool:
     """
     Restore VH-Database from a backup
     
     Args:
-        backup_path: Path to backup file
+        backup_path: Full backup (.db) or incremental manifest (.json)
         target_path: Where to restore (default: data/VH-Database.db)
+        at: Point-in-time restore - use the latest incremental snapshot taken
+            at or before this time (when backup_path is not given)
+        backup_dir: Backup directory searched for snapshots (default: data/backups/)
     
     Returns:
         True if successful, False otherwise
     """
     if target_path is None:
-        target_path = Path(__file__).parent.parent / "data" / "VH-Database.db"
+        target_path = DEFAULT_DATABASE_PATH
+    
+    if backup_path is None:
+        snapshots = [snapshot for snapshot in list_incremental_backups(backup_dir)
+                     if at is None or snapshot['created'] <= at]
+        if not snapshots:
+            logger.error(f"No incremental backup found{f' at or before {at}' if at else ''}")
+            return False
+        backup_path = snapshots[-1]['path']
     
     if not backup_path.exists():
         logger.error(f"Backup file not found: {backup_path}")
         return False
     
+    # Create temporary copy while restoring
+    temp_path = target_path.parent / f"{target_path.name}.tmp"
+
     try:
-        # Create temporary copy while restoring
-        temp_path = target_path.parent / f"{target_path.name}.tmp"
-        
-        with sqlite3.connect(str(backup_path)) as backup_conn:
-            with sqlite3.connect(str(temp_path)) as temp_conn:
-                backup_conn.backup(temp_conn)
+        if backup_path.suffix == '.json':
+            _restore_incremental(backup_path, temp_path)
+        else:
+            _copy_database(backup_path, temp_path)
         
-        # Replace original with restored
-        if target_path.exists():
-            target_path.unlink()
-        temp_path.rename(target_path)
+        # Replace original with restored (and drop its stale WAL)
+        for suffix in ('-wal', '-shm'):
+            sidecar = target_path.parent / f"{target_path.name}{suffix}"
+            if sidecar.exists():
+                sidecar.unlink()
+        temp_path.replace(target_path)
 
         logger.info(f"[OK] Restored from: {backup_path}")
         return True
@@ -99,10 +419,42 @@ def restore_vh_database(backup_path: Path, target_path: Path = None) -> bool:
         return False
 
 
+def _prune_incremental(backup_dir: Path, keep_count: int) -> int:
+    """Drop old snapshot manifests, then chunks no remaining manifest uses"""
+    _, chunks_dir, _ = _incremental_dirs(backup_dir)
+    snapshots = list_incremental_backups(backup_dir)
+    if not snapshots:
+        return 0
+
+    deleted_count = 0
+    for snapshot in snapshots[:-keep_count] if keep_count else snapshots:
+        try:
+            snapshot['path'].unlink()
+            deleted_count += 1
+        except OSError as e:
+            logger.warning(f"Failed to delete {snapshot['path'].name}: {e}")
+
+    if deleted_count:
+        referenced = set()
+        for snapshot in snapshots[-keep_count:] if keep_count else []:
+            manifest = json.loads(snapshot['path'].read_text(encoding='utf-8'))
+            referenced.update(manifest['chunks'])
+        for chunk_path in chunks_dir.glob("*/*"):
+            if chunk_path.name not in referenced:
+                chunk_path.unlink()
+        logger.info(f"Deleted {deleted_count} old incremental snapshots")
+
+    return deleted_count
+
+
 def cleanup_old_backups(backup_dir: Path = None, keep_count: int = 10) -> int:
     """
     Remove old backups, keeping only the most recent N
     
+    Full backups and incremental snapshots are each limited to keep_count;
+    chunks no longer referenced by any kept snapshot are removed. Waits for
+    a backup running in another process to finish first.
+    
     Args:
         backup_dir: Backup directory (default: data/backups/)
         keep_count: Number of backups to keep
@@ -111,11 +463,21 @@ def cleanup_old_backups(backup_dir: Path = None, keep_count: int = 10) -> int:
         Number of backups deleted
     """
     if backup_dir is None:
-        backup_dir = Path(__file__).parent.parent / "data" / "backups"
+        backup_dir = DEFAULT_DATABASE_PATH.parent / "backups"
     
     if not backup_dir.exists():
         return 0
     
+    try:
+        with _backup_dir_lock(backup_dir):
+            return _delete_old_backups(backup_dir, keep_count)
+    except TimeoutError as e:
+        logger.warning(f"Skipping backup cleanup: {e}")
+        return 0
+
+
+def _delete_old_backups(backup_dir: Path, keep_count: int) -> int:
+    """cleanup_old_backups' work, run while holding the backup directory lock"""
     # Find all VH-Database backups
     backups = sorted(
         backup_dir.glob("VH-Database_backup_*.db"),
@@ -133,7 +495,89 @@ def cleanup_old_backups(backup_dir: Path = None, keep_count: int = 10) -> int:
         except Exception as e:
             logger.warning(f"Failed to delete {backup.name}: {e}")
     
-    return deleted_count
+    return deleted_count + _prune_incremental(backup_dir, keep_count)
+
+
+# One background backup at a time per process
+_background_lock = threading.Lock()
+
+
+def run_scheduled_backup(source_path: Path = None, backup_dir: Path = None,
+                         incremental: bool = True, keep_count: int = 10,
+                         progress: Optional[ProgressCallback] = None,
+                         min_interval: float = 0, skip_unchanged: bool = False
+                         ) -> Tuple[Optional[Path], Optional[str]]:
+    """
+    Back up and clean up old backups unless the backup is not due
+
+    Blocking: run it on a worker thread (start_background_backup, or an
+    async_io executor so the callbacks reach the Tk thread).
+
+    Args:
+        source_path: Path to VH-Database.db (default: data/VH-Database.db)
+        backup_dir: Backup destination (default: data/backups/)
+        incremental: Store a deduplicated chunk snapshot instead of a full copy
+        keep_count: Number of backups to keep
+        progress: Optional progress(stage, done, total) callback
+        min_interval: Skip if the last backup is younger than this many seconds
+        skip_unchanged: Skip if the database is unchanged since the last backup
+
+    Returns:
+        (created backup path or None on failure, reason the backup was skipped or None)
+    """
+    if not _background_lock.acquire(blocking=False):
+        return None, "a backup is already running"
+    try:
+        reason = backup_skip_reason(source_path, backup_dir, min_interval, skip_unchanged) \
+            if (min_interval or skip_unchanged) else None
+        if reason is not None:
+            return None, reason
+        backup_path = backup_vh_database(source_path, backup_dir, incremental, progress)
+        if backup_path:
+            directory = backup_dir or (source_path or DEFAULT_DATABASE_PATH).parent / "backups"
+            deleted = cleanup_old_backups(directory, keep_count)
+            if deleted > 0:
+                logger.info(f"Cleaned up {deleted} old backups")
+        return backup_path, None
+    finally:
+        _background_lock.release()
+
+
+def start_background_backup(source_path: Path = None, backup_dir: Path = None,
+                            incremental: bool = True, keep_count: int = 10,
+                            progress: Optional[ProgressCallback] = None,
+                            on_done: Optional[Callable[[Optional[Path]], None]] = None,
+                            min_interval: float = 0, skip_unchanged: bool = False,
+                            on_skipped: Optional[Callable[[str], None]] = None
+                            ) -> threading.Thread:
+    """
+    Run run_scheduled_backup on a daemon thread
+    
+    Callbacks run on the backup thread; UI code should submit
+    run_scheduled_backup to an async_io executor instead.
+    
+    Args:
+        on_done: Optional callback with the created backup path (None on failure)
+        on_skipped: Optional callback with the reason when the backup is skipped
+            (on_done is not called then)
+        Others: as for run_scheduled_backup
+    
+    Returns:
+        The started thread
+    """
+    def run():
+        backup_path, reason = run_scheduled_backup(source_path, backup_dir, incremental, keep_count,
+                                                   progress, min_interval, skip_unchanged)
+        if reason is not None:
+            logger.info(f"Skipping VH-Database backup: {reason}")
+            if on_skipped:
+                on_skipped(reason)
+        elif on_done:
+            on_done(backup_path)
+
+    thread = threading.Thread(target=run, name="vh-database-backup", daemon=True)
+    thread.start()
+    return thread
 
 
 if __name__ == '__main__':
@@ -143,7 +587,7 @@ if __name__ == '__main__':
     print("VH-Database Backup Test")
     print("=" * 60)
     
-    backup_path = backup_vh_database()
+    backup_path = backup_vh_database(incremental=True)
     if backup_path:
         print(f"\nBackup location: {backup_path}")
         print(f"Backup exists: {backup_path.exists()}")
@@ -1,24 +1,27 @@
 from __future__ import annotations
 import sys
 import subprocess
-import threading
 import os
 from datetime import datetime
 from pathlib import Path
 import logging
 from logging.handlers import RotatingFileHandler
 
+# --profile-startup: time everything imported from here on
+from common.startup import start_profiling, startup_phase, finish_profiling
+start_profiling('control')
+
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 import runpy
 import argparse
 
+# Modules used only by individual actions (map worker, backups, test manager,
+# sync) are imported where they are used to keep startup fast
 from common.paths import project_root, data_dir, logs_dir, dist_dir, config_dir, docs_dir, src_dir
 from common.progress import ProgressDialog, IndeterminateProgressDialog
 from common.data_source_manager import get_data_source_manager
-from common.vh_database_backup import backup_vh_database, cleanup_old_backups
-from discoveries_window import DiscoveriesWindow
-from test_manager_window import TestManagerWindow
+from common.async_io import get_executor, shutdown_executors
 
 # Phase 2: Database integration imports
 # Ensure project root is in sys.path so config/ can be imported
@@ -85,6 +88,17 @@ COLORS = _load_theme_colors()
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Worker pool for Control Room actions (builds, map generation, launches),
+# kept apart from the shared I/O pool so long actions never delay data loads
+ACTIONS_EXECUTOR = 'control-room'
+
+# Delay after the window is built before the deferred startup work
+# (backups, system counts, sync check) is started
+DEFERRED_STARTUP_MS = 250
+
+# Startup backups of VH-Database: at most one per interval, none if unchanged
+BACKUP_MIN_INTERVAL = 30 * 60
+
 
 def _setup_logging():
     logger = logging.getLogger()
@@ -157,40 +171,96 @@ class ControlRoom(ctk.CTk):
             # Data source: 'production', 'testing', 'load_test', or 'yh_database'
             self.data_source = ctk.StringVar(value='production')
 
-            # Initialize VH-Database backups on startup
-            self._initialize_vh_database_backups()
-
             # Initialize data provider
             self.data_provider = None
             self.current_backend = 'json'
-            self._init_data_provider()
+            self.sync_status = None
+            with startup_phase("init data provider"):
+                self._init_data_provider()
 
             logging.info("Building UI...")
-            self._build_ui()
+            with startup_phase("build UI"):
+                self._build_ui()
+
+            # Backups, system counts and the sync check run once the window is up
+            self.after(DEFERRED_STARTUP_MS, self._deferred_startup)
             logging.info("ControlRoom initialization complete.")
         except Exception as e:
             logging.error(f"Error initializing ControlRoom: {e}", exc_info=True)
             raise
 
+    def _deferred_startup(self):
+        """Start the startup work that does not need to block the window"""
+        with startup_phase("deferred startup"):
+            # Initialize VH-Database backups on startup
+            self._initialize_vh_database_backups()
+            self._refresh_source_counts()
+            # Check data sync status on startup (hash-tree compare on a worker thread)
+            if self.data_provider is not None:
+                self._check_data_sync_status()
+        profile = finish_profiling()
+        if profile:
+            self._log(f"Startup profile written to {profile}")
+
+    def _refresh_source_counts(self):
+        """Count systems in every data source off the UI thread, then update the sidebar"""
+        def count():
+            get_data_source_manager().refresh_counts()
+            return self.data_provider.get_total_count() if self.data_provider else None
+
+        def show(total):
+            source_info = get_data_source_manager().get_source(self.data_source.get())
+            if source_info:
+                self.data_description.configure(text=source_info.description)
+            if total is not None and hasattr(self, 'count_indicator'):
+                self.count_indicator.configure(text=f"Systems: {total:,}")
+
+        get_executor(ACTIONS_EXECUTOR).submit(
+            count, widget=self, on_done=show,
+            on_error=lambda e: logging.warning(f"Failed to get system count: {e}"),
+            name="system counts", key="source-counts")
+
     def _initialize_vh_database_backups(self):
-        """Initialize VH-Database backups on startup"""
+        """Start an incremental VH-Database backup on the Control Room's worker pool"""
         try:
+            from common.vh_database_backup import run_scheduled_backup
             vh_db_path = project_root() / "data" / "VH-Database.db"
             
             # Only backup if YH-Database exists
             if vh_db_path.exists():
-                logging.info("Creating backup of VH-Database on startup...")
-                backup_path = backup_vh_database(vh_db_path)
-
-                if backup_path:
-                    logging.info(f"[OK] Backup created: {backup_path.name}")
-                    
-                    # Clean up old backups, keep last 10
-                    deleted = cleanup_old_backups(keep_count=10)
-                    if deleted > 0:
-                        logging.info(f"Cleaned up {deleted} old backups")
-                else:
-                    logging.warning("Failed to create backup of VH-Database")
+                logging.info("Checking for a VH-Database backup in the background...")
+                last_logged = {}
+                last_shown = {}
+
+                def progress(stage, done, total):
+                    percent = (done * 100 // total) if total else 100
+                    # Status bar every 5%, log every 25% of each stage rather than every step
+                    if percent // 5 > last_shown.get(stage, -1):
+                        last_shown[stage] = percent // 5
+                        label = "copying" if stage == 'copy' else "storing chunks"
+                        self.status_label.configure(text=f"Backing up VH-Database ({label}): {percent}%")
+                    if percent // 25 > last_logged.get(stage, -1):
+                        last_logged[stage] = percent // 25
+                        logging.info(f"VH-Database backup {stage}: {percent}% ({done}/{total})")
+
+                def done(result):
+                    backup_path, reason = result
+                    if reason is not None:
+                        logging.info(f"Skipping VH-Database backup: {reason}")
+                    elif backup_path:
+                        logging.info(f"[OK] Backup created: {backup_path.name}")
+                        self.status_label.configure(text="VH-Database backup complete.")
+                    else:
+                        logging.warning("Failed to create backup of VH-Database")
+                        self.status_label.configure(text="VH-Database backup failed (see logs).")
+
+                # Keep last 10 snapshots; unchanged chunks are shared between them
+                self._run_bg(
+                    run_scheduled_backup, vh_db_path, incremental=True, keep_count=10,
+                    min_interval=BACKUP_MIN_INTERVAL, skip_unchanged=True,
+                    widget=self, on_done=done, on_progress=progress,
+                    on_error=lambda e: logging.error(f"VH-Database backup failed: {e}"),
+                    name="VH-Database backup", key="vh-database-backup")
             else:
                 logging.debug("VH-Database not found, skipping backup")
         
@@ -203,44 +273,47 @@ class ControlRoom(ctk.CTk):
             self.data_provider = get_data_provider()
             self.current_backend = get_current_backend()
             logging.info(f"Data provider initialized: {self.current_backend}")
-            
-            # Check data sync status on startup
-            self._check_data_sync_status()
         except Exception as e:
             logging.error(f"Failed to initialize data provider: {e}")
             self.data_provider = None
             self.current_backend = 'json'
 
     def _check_data_sync_status(self):
-        """Check if JSON and database are in sync (Phase 2)"""
+        """Check if JSON and database are in sync (Phase 2), off the UI thread"""
         try:
             from src.migration.sync_data import DataSynchronizer
             syncer = DataSynchronizer()
-            status = syncer.check_sync_status()
-            
-            if "error" in status:
-                logging.warning(f"Could not check sync status: {status['error']}")
-                return
-            
-            if not status['in_sync']:
-                msg = f"Data sync issue detected: "
-                issues = []
-                if status['only_in_json'] > 0:
-                    issues.append(f"{status['only_in_json']} systems only in JSON")
-                if status['only_in_db'] > 0:
-                    issues.append(f"{status['only_in_db']} systems only in database")
-                if status['differences'] > 0:
-                    issues.append(f"{status['differences']} systems differ")
-                msg += ", ".join(issues)
-                logging.warning(msg)
-                
-                # Store sync status for UI to show if needed
-                self.sync_status = status
-            else:
-                logging.info(f"Data sync OK: JSON and database both have {status['json_count']} systems")
-                self.sync_status = None
         except Exception as e:
             logging.debug(f"Sync check failed (non-critical): {e}")
+            return
+        get_executor(ACTIONS_EXECUTOR).submit(
+            syncer.check_sync_status, widget=self, on_done=self._on_sync_status,
+            on_error=lambda e: logging.debug(f"Sync check failed (non-critical): {e}"),
+            name="sync status check", key="sync-status")
+
+    def _on_sync_status(self, status: dict):
+        """Log a finished sync check and keep it for the UI"""
+        if "error" in status:
+            logging.warning(f"Could not check sync status: {status['error']}")
+            return
+
+        if not status['in_sync']:
+            msg = f"Data sync issue detected: "
+            issues = []
+            if status['only_in_json'] > 0:
+                issues.append(f"{status['only_in_json']} systems only in JSON")
+            if status['only_in_db'] > 0:
+                issues.append(f"{status['only_in_db']} systems only in database")
+            if status['differences'] > 0:
+                issues.append(f"{status['differences']} systems differ")
+            msg += ", ".join(issues)
+            logging.warning(msg)
+
+            # Store sync status for UI to show if needed
+            self.sync_status = status
+        else:
+            logging.info(f"Data sync OK: JSON and database both have {status['json_count']} systems")
+            self.sync_status = None
 
     # -------------------------- UI --------------------------
     def _build_ui(self):
@@ -284,7 +357,8 @@ class ControlRoom(ctk.CTk):
         data_dropdown_frame.pack(padx=20, pady=(0, 4), fill="x")
 
         # Get available data sources dynamically from DataSourceManager
-        manager = get_data_source_manager()
+        # (system counts are filled in by _refresh_source_counts after startup)
+        manager = get_data_source_manager(defer_counts=True)
         available_sources = list(manager.get_all_sources().keys())
 
         self.data_dropdown = ctk.CTkOptionMenu(
@@ -343,17 +417,13 @@ class ControlRoom(ctk.CTk):
 
         # System count indicator
         if SHOW_SYSTEM_COUNT and self.data_provider:
-            try:
-                count = self.data_provider.get_total_count()
-                self.count_indicator = ctk.CTkLabel(
-                    self.data_indicator_frame,
-                    text=f"Systems: {count:,}",
-                    font=ctk.CTkFont(family="Segoe UI", size=9),
-                    text_color=COLORS['accent_cyan']
-                )
-                self.count_indicator.pack(anchor="w")
-            except Exception as e:
-                logging.warning(f"Failed to get system count: {e}")
+            self.count_indicator = ctk.CTkLabel(
+                self.data_indicator_frame,
+                text="Systems: counting…",
+                font=ctk.CTkFont(family="Segoe UI", size=9),
+                text_color=COLORS['accent_cyan']
+            )
+            self.count_indicator.pack(anchor="w")
 
         ctk.CTkFrame(sidebar, height=1, fg_color=COLORS['text_secondary']).pack(fill="x", padx=20, pady=(12, 12))
 
@@ -523,9 +593,8 @@ class ControlRoom(ctk.CTk):
             self._log(f"Failed to open path: {e}")
 
     def _run_bg(self, target, *args, **kwargs):
-        t = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
-        t.start()
-        return t
+        """Run an action on the Control Room's bounded worker pool (timed, cancellable)"""
+        return get_executor(ACTIONS_EXECUTOR).submit(target, *args, **kwargs)
 
     # ----------------------- Actions ------------------------
     def launch_gui(self):
@@ -602,30 +671,26 @@ cd "{project_root()}"
 
         def run():
             try:
-                ts = datetime.now().strftime('%Y-%m-%d_%H%M%S')
-                logs_dir().mkdir(exist_ok=True)
-
                 # Update progress message
                 self.after(100, lambda: progress.set_message("Generating 3D visualization..."))
 
-                if self._frozen:
-                    # Spawn same EXE to run the map generator entry
-                    with open(logs_dir() / f'map-gen-{ts}.log', 'w', encoding='utf-8') as lf:
-                        cmd = [sys.executable, '--entry', 'map', '--no-open', '--data-file', str(data_file)]
-                        proc = subprocess.run(cmd, cwd=str(project_root()), text=True, stdout=lf, stderr=lf)
-                else:
-                    map_script = src_dir() / 'Beta_VH_Map.py'
-                    with open(logs_dir() / f'map-gen-{ts}.log', 'w', encoding='utf-8') as lf:
-                        cmd = [sys.executable, str(map_script), '--no-open', '--data-file', str(data_file)]
-                        proc = subprocess.run(cmd, cwd=str(project_root()), text=True, stdout=lf, stderr=lf)
+                def on_progress(message):
+                    self.after(0, lambda: self._log(f"  {message}"))
+
+                # The long-lived map worker keeps templates and the galaxy warm between builds
+                from common.map_worker import get_map_worker
+                worker = get_map_worker()
+                if not worker.running:
+                    self.after(0, lambda: self._log("Starting map worker…"))
+                code = worker.generate(['--no-open', '--data-file', str(data_file)], on_progress=on_progress)
 
                 # Close progress dialog
                 self.after(0, progress.close_dialog)
 
-                if proc.returncode == 0:
+                if code == 0:
                     self._log("✓ Map generation complete.")
                 else:
-                    self._log(f"✗ Map generation failed (exit {proc.returncode}). See logs.")
+                    self._log(f"✗ Map generation failed (exit {code}). See logs.")
             except Exception as e:
                 self.after(0, progress.close_dialog)
                 self._log(f"Map generation error: {e}")
@@ -725,6 +790,7 @@ cd "{project_root()}"
                     '--distpath', str(output_dir),
                     '--hidden-import', 'system_entry_wizard',
                     '--hidden-import', 'Beta_VH_Map',
+                    '--hidden-import', 'jsonschema',
                     str(script)
                 ]
                 if icon.exists():
@@ -777,6 +843,7 @@ cd "{project_root()}"
                         "2) python3 -m pip install pyinstaller\n"
                         "3) python3 -m PyInstaller --noconfirm --clean --windowed --onefile \n"
                         "   --name HavenControlRoom --hidden-import system_entry_wizard --hidden-import Beta_VH_Map \n"
+                        "   --hidden-import jsonschema \n"
                         "   src/control_room.py\n\n"
                         "Output: dist/HavenControlRoom (macOS app).\n"
                     )
@@ -827,6 +894,7 @@ cd "{project_root()}"
                         '--distpath', str(output_dir),
                         '--hidden-import', 'system_entry_wizard',
                         '--hidden-import', 'Beta_VH_Map',
+                        '--hidden-import', 'jsonschema',
                         str(script)
                     ]
                     if icon.exists():
@@ -851,6 +919,7 @@ cd "{project_root()}"
     def open_test_manager(self):
         """Open the Test Manager window."""
         try:
+            from test_manager_window import TestManagerWindow
             TestManagerWindow(self)
             self._log("Test Manager opened.")
         except Exception as e:
@@ -902,6 +971,7 @@ Total Systems: {current.system_count:,}  ← From DataSourceManager
 Total Planets: {stats['total_planets']:,}
 Total Moons: {stats['total_moons']:,}
 Total Space Stations: {stats['total_stations']:,}
+Total Discoveries: {stats['total_discoveries']:,}
 
 Regions: {', '.join(stats['regions'])}
 
@@ -1404,8 +1474,10 @@ def main():
 
         # Support dispatching alternate entries when frozen
         parser = argparse.ArgumentParser(add_help=False)
-        parser.add_argument('--entry', choices=['control', 'system', 'map'])
+        parser.add_argument('--entry', choices=['control', 'system', 'map', 'map-worker'])
         parser.add_argument('--no-open', action='store_true')
+        parser.add_argument('--profile-startup', action='store_true',
+                            help="Write an import/init timing breakdown to logs/")
         args, unknown = parser.parse_known_args()
 
         entry = args.entry or 'control'
@@ -1423,12 +1495,23 @@ def main():
             sys.argv = ['Beta_VH_Map.py'] + (['--no-open'] if args.no_open else [])
             runpy.run_module('Beta_VH_Map', run_name='__main__')
             return
+        if entry == 'map-worker':
+            # Persistent map generator driven by the Control Room over stdin/stdout
+            logging.info("Starting map worker...")
+            from common.map_worker import serve as serve_map_worker
+            sys.exit(serve_map_worker())
 
         # Default: Control Room UI
         logging.info("Initializing Control Room UI...")
-        app = ControlRoom()
+        with startup_phase("create window"):
+            app = ControlRoom()
         logging.info("Starting main event loop...")
         app.mainloop()
+        # Drop queued background work; running actions finish before exit
+        shutdown_executors(wait=False)
+        if 'common.map_worker' in sys.modules:
+            from common.map_worker import shutdown_map_worker
+            shutdown_map_worker()
         logging.info("Control Room closed normally.")
 
     except Exception as e:
@@ -38,6 +38,7 @@ from config.settings_user import (
 )
 
 from common.progress import ProgressDialog, IndeterminateProgressDialog
+from common.map_worker import get_map_worker, shutdown_map_worker
 
 # Theme colors
 COLORS = {
@@ -325,8 +326,12 @@ class ControlRoom(ctk.CTk):
                         # Pass the user edition data file path and output path to the map generator
                         Beta_VH_Map.main(["--data-file", str(JSON_DATA_PATH), "--out", str(map_output_path)])
                     else:
-                        map_script = Path(__file__).parent / "Beta_VH_Map.py"
-                        subprocess.run([sys.executable, str(map_script), "--data-file", str(JSON_DATA_PATH), "--out", str(map_output_path)], check=True)
+                        # The long-lived map worker keeps templates and the galaxy warm between builds
+                        code = get_map_worker().generate(
+                            ["--data-file", str(JSON_DATA_PATH), "--out", str(map_output_path)],
+                            on_progress=lambda message: self.after(0, lambda: self._log(f"  {message}")))
+                        if code != 0:
+                            raise RuntimeError(f"map generator exited with code {code}")
 
                     self.after(0, lambda: progress.close_dialog())
                     self.after(0, lambda: self._log("Map generated successfully!"))
@@ -474,6 +479,7 @@ def main():
     try:
         app = ControlRoom()
         app.mainloop()
+        shutdown_map_worker()
     except Exception as e:
         logging.error(f"Error launching Control Room: {e}", exc_info=True)
         import tkinter as tk
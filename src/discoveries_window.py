@@ -7,6 +7,8 @@ from typing import Dict, List, Optional
 import logging
 from datetime import datetime
 
+from common.async_io import run_in_background
+
 logger = logging.getLogger(__name__)
 
 # Define color scheme locally to avoid circular import
@@ -25,6 +27,197 @@ COLORS = {
     'glow': '#00ffff'
 }
 
+# Discoveries fetched per page (and rendered per scroll step)
+PAGE_SIZE = 25
+
+# Fetch the next page once the view is this close to the bottom (fraction)
+LOAD_MORE_THRESHOLD = 0.9
+
+# Filter menu entries -> text the discovery type must contain
+TYPE_FILTERS = {
+    "Ruins": "ruins",
+    "Fossils": "bones",
+    "Logs": "logs",
+    "Technology": "technology",
+    "Flora/Fauna": "flora",
+    "Minerals": "minerals",
+    "Ships": "ships",
+    "Hazards": "hazards",
+    "Lore": "lore"
+}
+
+
+class DiscoveryCard(ctk.CTkFrame):
+    """
+    Card for one discovery, built once and re-bound to other discoveries
+
+    Optional sections are packed or hidden per discovery, and detail rows
+    are reused, so paging and filtering never rebuild the widget tree.
+    """
+
+    def __init__(self, parent, window: 'DiscoveriesWindow'):
+        super().__init__(
+            parent,
+            fg_color=COLORS['glass'],
+            corner_radius=12,
+            border_width=2,
+            border_color=COLORS['accent_purple']
+        )
+        self.window = window
+
+        # Header with type and date
+        self.header = ctk.CTkFrame(self, fg_color="transparent")
+        self.header.pack(fill="x", padx=15, pady=(15, 10))
+
+        self.type_label = ctk.CTkLabel(
+            self.header,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=16, weight="bold"),
+            text_color=COLORS['accent_cyan']
+        )
+        self.type_label.pack(side="left")
+
+        # Mystery tier badge (if applicable)
+        self.tier_badge = ctk.CTkLabel(
+            self.header,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            text_color=COLORS['accent_purple'],
+            fg_color=COLORS['bg_dark'],
+            corner_radius=8,
+            padx=10,
+            pady=3
+        )
+
+        self.date_label = ctk.CTkLabel(
+            self.header,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            text_color=COLORS['text_secondary']
+        )
+
+        # Description
+        self.desc_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=13),
+            text_color=COLORS['text_primary'],
+            wraplength=820,
+            justify="left"
+        )
+
+        # Type-specific details section
+        self.details_frame = ctk.CTkFrame(self, fg_color=COLORS['bg_card'], corner_radius=8)
+        self.detail_labels: List[ctk.CTkLabel] = []
+
+        # Generic details section (coordinates, condition, time period)
+        self.generic_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            text_color=COLORS['text_secondary'],
+            wraplength=820,
+            justify="left"
+        )
+
+        # Significance (if provided)
+        self.sig_frame = ctk.CTkFrame(self, fg_color=COLORS['bg_dark'], corner_radius=8)
+        self.sig_label = ctk.CTkLabel(
+            self.sig_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12, slant="italic"),
+            text_color=COLORS['accent_cyan'],
+            wraplength=800,
+            justify="left"
+        )
+        self.sig_label.pack(padx=10, pady=8, anchor="w")
+
+        # Footer with discoverer
+        self.footer_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            text_color=COLORS['text_secondary']
+        )
+
+    def bind_discovery(self, discovery: Dict):
+        """Show a discovery in this card"""
+        # Discovery type icon and name
+        discovery_type = discovery.get('discovery_type') or 'Unknown'
+        type_icon = self.window._get_type_icon(discovery_type)
+        self.type_label.configure(text=f"{type_icon} {discovery_type.replace('_', ' ').title()}")
+
+        self.tier_badge.pack_forget()
+        self.date_label.pack_forget()
+        mystery_tier = discovery.get('mystery_tier') or 0
+        if mystery_tier > 0:
+            tier_names = ["", "Surface Anomaly", "Deep Mystery", "Cosmic Enigma", "Cosmic Significance"]
+            tier_name = tier_names[min(mystery_tier, len(tier_names) - 1)]
+            self.tier_badge.configure(text=f"⭐ {tier_name}")
+            self.tier_badge.pack(side="right")
+
+        # Timestamp
+        timestamp = discovery.get('submission_timestamp', '')
+        if timestamp:
+            try:
+                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                time_str = dt.strftime('%Y-%m-%d %H:%M UTC')
+            except:
+                time_str = timestamp
+        else:
+            time_str = 'Unknown date'
+        self.date_label.configure(text=f"📅 {time_str}")
+        self.date_label.pack(side="right", padx=(0, 10))
+
+        # Sections below the header are re-packed in order
+        for widget in (self.desc_label, self.details_frame, self.generic_label,
+                       self.sig_frame, self.footer_label):
+            widget.pack_forget()
+
+        description = discovery.get('description') or 'No description provided'
+        self.desc_label.configure(text=description)
+        self.desc_label.pack(fill="x", padx=15, pady=(0, 10), anchor="w")
+
+        type_specific_details = self.window._get_type_specific_details(discovery)
+        if type_specific_details:
+            while len(self.detail_labels) < len(type_specific_details):
+                self.detail_labels.append(ctk.CTkLabel(
+                    self.details_frame,
+                    text="",
+                    font=ctk.CTkFont(family="Segoe UI", size=12),
+                    text_color=COLORS['text_secondary'],
+                    anchor="w"
+                ))
+            for label in self.detail_labels:
+                label.pack_forget()
+            for label, (label_text, value_text, icon) in zip(self.detail_labels, type_specific_details):
+                label.configure(text=f"{icon} {label_text}: {value_text}")
+                label.pack(fill="x", padx=10, pady=3)
+            self.details_frame.pack(fill="x", padx=15, pady=(0, 10))
+
+        generic_details = []
+        condition = discovery.get('condition')
+        if condition:
+            generic_details.append(f"🔧 Condition: {condition}")
+        time_period = discovery.get('time_period')
+        if time_period:
+            generic_details.append(f"⏳ Era: {time_period}")
+        coordinates = discovery.get('coordinates')
+        if coordinates:
+            generic_details.append(f"📍 Coordinates: {coordinates}")
+        if generic_details:
+            self.generic_label.configure(text=" • ".join(generic_details))
+            self.generic_label.pack(fill="x", padx=15, pady=(0, 10), anchor="w")
+
+        significance = discovery.get('significance')
+        if significance:
+            self.sig_label.configure(text=f"💡 Analysis: {significance}")
+            self.sig_frame.pack(fill="x", padx=15, pady=(0, 10))
+
+        discovered_by = discovery.get('discovered_by') or 'Unknown Explorer'
+        self.footer_label.configure(text=f"👤 Discovered by: {discovered_by}")
+        self.footer_label.pack(padx=15, pady=(0, 15), anchor="e")
+
 
 class DiscoveriesWindow(ctk.CTkToplevel):
     """Window to display discoveries for a planet or moon"""
@@ -43,6 +236,11 @@ class DiscoveriesWindow(ctk.CTkToplevel):
         self.db = db
         self.location_data = location_data
         self.discoveries = []
+        self._load_task = None
+        self._cards: List[DiscoveryCard] = []   # recycled across pages and filters
+        self._type_contains: Optional[str] = None
+        self._exhausted = True
+        self._loading = False
 
         # Window setup
         self.title(f"Discoveries - {location_data.get('name', 'Unknown')}")
@@ -139,6 +337,22 @@ class DiscoveriesWindow(ctk.CTkToplevel):
         )
         self.discoveries_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
 
+        # Load the next page as the view nears the bottom of the cards
+        canvas = self.discoveries_frame._parent_canvas
+        scrollbar_set = self.discoveries_frame._scrollbar.set
+        canvas.configure(yscrollcommand=lambda first, last: (scrollbar_set(first, last),
+                                                             self._on_scroll(float(last))))
+
+        # Status line kept below the cards (loading, empty, end of list)
+        self.message_label = ctk.CTkLabel(
+            self.discoveries_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=16),
+            text_color=COLORS['text_secondary'],
+            justify="center"
+        )
+        self.message_label.pack(pady=100)
+
         # Footer with close button
         footer_frame = ctk.CTkFrame(self, fg_color="transparent")
         footer_frame.pack(fill="x", padx=20, pady=(0, 20))
@@ -156,213 +370,123 @@ class DiscoveriesWindow(ctk.CTkToplevel):
         close_btn.pack(side="right")
 
     def _load_discoveries(self):
-        """Load discoveries from database"""
-        try:
-            # Clear existing discoveries
-            for widget in self.discoveries_frame.winfo_children():
-                widget.destroy()
-
-            # Get discoveries based on location type
-            system_id = self.location_data.get('system_id')
-            planet_id = self.location_data.get('planet_id')
-            moon_id = self.location_data.get('moon_id')
-
-            with self.db as database:
-                if moon_id:
-                    self.discoveries = database.get_discoveries(moon_id=moon_id, limit=1000)
-                elif planet_id:
-                    self.discoveries = database.get_discoveries(planet_id=planet_id, limit=1000)
-                elif system_id:
-                    self.discoveries = database.get_discoveries(system_id=system_id, limit=1000)
-                else:
-                    self.discoveries = []
-
-            if not self.discoveries:
-                self._show_no_discoveries()
+        """Load the first page of discoveries (off the Tk thread)"""
+        self.discoveries = []
+        self._exhausted = False
+        self._hide_cards()
+        self._show_message("⏳ Loading discoveries...")
+        self._request_page(after=None)
+
+    def _load_more(self):
+        """Fetch and append the next page, if there is one"""
+        if self._loading or self._exhausted or not self.discoveries:
+            return
+        last = self.discoveries[-1]
+        self._request_page(after=(last.get('submission_timestamp'), last['id']))
+
+    def _request_page(self, after):
+        self._loading = True
+        type_contains = self._type_contains
+        self._load_task = run_in_background(
+            self, self._fetch_discoveries, type_contains, after,
+            on_done=lambda page: self._on_page_loaded(page, first=after is None),
+            on_error=self._on_discoveries_failed,
+            name=f"discoveries for {self.location_data.get('name')}" + (" (more)" if after else ""),
+            key=f"discoveries:{id(self)}"
+        )
+
+    def _fetch_discoveries(self, type_contains: Optional[str], after) -> List[Dict]:
+        """Query one page of discoveries for this location (runs on a worker thread)"""
+        # Get discoveries based on location type
+        system_id = self.location_data.get('system_id')
+        planet_id = self.location_data.get('planet_id')
+        moon_id = self.location_data.get('moon_id')
+        if not (system_id or planet_id or moon_id):
+            return []
+
+        # A private instance per load, so an overlapping refresh never shares a connection
+        with type(self.db)(str(self.db.db_path)) as database:
+            if moon_id:
+                location = {'moon_id': moon_id}
+            elif planet_id:
+                location = {'planet_id': planet_id}
             else:
-                self._display_discoveries(self.discoveries)
+                location = {'system_id': system_id}
+            return database.get_discoveries_page(**location, type_contains=type_contains,
+                                                 after=after, limit=PAGE_SIZE)
+
+    def _on_page_loaded(self, page: List[Dict], first: bool):
+        """Render a loaded page into recycled cards (Tk thread)"""
+        self._loading = False
+        self._exhausted = len(page) < PAGE_SIZE
+        if first:
+            self._hide_cards()
+
+        start = len(self.discoveries)
+        self.discoveries.extend(page)
+        for index, discovery in enumerate(page, start):
+            self._card(index).bind_discovery(discovery)
+
+        if not self.discoveries:
+            if self._type_contains:
+                self._show_message(f"No discoveries found for filter: {self.filter_var.get()}")
+            else:
+                self._show_no_discoveries()
+        elif self._exhausted:
+            self._show_message(f"{len(self.discoveries)} discoveries", small=True)
+        else:
+            self._show_message("Scroll for more…", small=True)
 
-            logger.info(f"Loaded {len(self.discoveries)} discoveries for {self.location_data.get('name')}")
+        logger.info(f"Loaded {len(page)} discoveries for {self.location_data.get('name')} "
+                    f"({len(self.discoveries)} shown)")
 
-        except Exception as e:
-            logger.error(f"Failed to load discoveries: {e}")
+    def _on_discoveries_failed(self, error: BaseException):
+        self._loading = False
+        logger.error(f"Failed to load discoveries: {error}")
+        if self.discoveries:
+            self._show_message("⚠️ Error loading more discoveries", small=True)
+        else:
             self._show_error()
 
+    def _card(self, index: int) -> DiscoveryCard:
+        """The card at position index, created only the first time it is needed"""
+        if index == len(self._cards):
+            self._cards.append(DiscoveryCard(self.discoveries_frame, self))
+        card = self._cards[index]
+        card.pack(fill="x", pady=8, padx=5, before=self.message_label)
+        return card
+
+    def _hide_cards(self):
+        for card in self._cards:
+            card.pack_forget()
+        self.discoveries_frame._parent_canvas.yview_moveto(0)
+
+    def _on_scroll(self, last_visible: float):
+        """Fetch the next page as the bottom of the list comes into view"""
+        if last_visible >= LOAD_MORE_THRESHOLD:
+            self._load_more()
+
+    def destroy(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+        super().destroy()
+
+    def _show_message(self, text: str, small: bool = False):
+        """Status line below the cards (loading, empty, end of list)"""
+        self.message_label.configure(
+            text=text,
+            font=ctk.CTkFont(family="Segoe UI", size=12 if small else 16)
+        )
+        self.message_label.pack_forget()
+        self.message_label.pack(pady=10 if small else 100)
+
     def _show_no_discoveries(self):
         """Display message when no discoveries found"""
-        no_data_label = ctk.CTkLabel(
-            self.discoveries_frame,
-            text="🔭 No discoveries yet\n\nBe the first to report a discovery here using\nThe Keeper Discord bot!",
-            font=ctk.CTkFont(family="Segoe UI", size=16),
-            text_color=COLORS['text_secondary'],
-            justify="center"
-        )
-        no_data_label.pack(pady=100)
+        self._show_message("🔭 No discoveries yet\n\nBe the first to report a discovery here using\nThe Keeper Discord bot!")
 
     def _show_error(self):
         """Display error message"""
-        error_label = ctk.CTkLabel(
-            self.discoveries_frame,
-            text="⚠️ Error loading discoveries\n\nPlease try again",
-            font=ctk.CTkFont(family="Segoe UI", size=16),
-            text_color=COLORS['text_secondary'],
-            justify="center"
-        )
-        error_label.pack(pady=100)
-
-    def _display_discoveries(self, discoveries: List[Dict]):
-        """Display list of discoveries"""
-        for discovery in discoveries:
-            self._create_discovery_card(discovery)
-
-    def _create_discovery_card(self, discovery: Dict):
-        """Create a card for a single discovery"""
-        # Card frame
-        card = ctk.CTkFrame(
-            self.discoveries_frame,
-            fg_color=COLORS['glass'],
-            corner_radius=12,
-            border_width=2,
-            border_color=COLORS['accent_purple']
-        )
-        card.pack(fill="x", pady=8, padx=5)
-
-        # Header with type and date
-        header = ctk.CTkFrame(card, fg_color="transparent")
-        header.pack(fill="x", padx=15, pady=(15, 10))
-
-        # Discovery type icon and name
-        discovery_type = discovery.get('discovery_type', 'Unknown')
-        type_icon = self._get_type_icon(discovery_type)
-
-        type_label = ctk.CTkLabel(
-            header,
-            text=f"{type_icon} {discovery_type.replace('_', ' ').title()}",
-            font=ctk.CTkFont(family="Segoe UI", size=16, weight="bold"),
-            text_color=COLORS['accent_cyan']
-        )
-        type_label.pack(side="left")
-
-        # Mystery tier badge (if applicable)
-        mystery_tier = discovery.get('mystery_tier', 0)
-        if mystery_tier > 0:
-            tier_names = ["", "Surface Anomaly", "Deep Mystery", "Cosmic Enigma", "Cosmic Significance"]
-            tier_name = tier_names[min(mystery_tier, len(tier_names) - 1)]
-
-            tier_badge = ctk.CTkLabel(
-                header,
-                text=f"⭐ {tier_name}",
-                font=ctk.CTkFont(family="Segoe UI", size=11),
-                text_color=COLORS['accent_purple'],
-                fg_color=COLORS['bg_dark'],
-                corner_radius=8,
-                padx=10,
-                pady=3
-            )
-            tier_badge.pack(side="right")
-
-        # Timestamp
-        timestamp = discovery.get('submission_timestamp', '')
-        if timestamp:
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%Y-%m-%d %H:%M UTC')
-            except:
-                time_str = timestamp
-        else:
-            time_str = 'Unknown date'
-
-        date_label = ctk.CTkLabel(
-            header,
-            text=f"📅 {time_str}",
-            font=ctk.CTkFont(family="Segoe UI", size=11),
-            text_color=COLORS['text_secondary']
-        )
-        date_label.pack(side="right", padx=(0, 10))
-
-        # Description
-        description = discovery.get('description', 'No description provided')
-        desc_label = ctk.CTkLabel(
-            card,
-            text=description,
-            font=ctk.CTkFont(family="Segoe UI", size=13),
-            text_color=COLORS['text_primary'],
-            wraplength=820,
-            justify="left"
-        )
-        desc_label.pack(fill="x", padx=15, pady=(0, 10), anchor="w")
-
-        # Type-specific details section
-        type_specific_details = self._get_type_specific_details(discovery)
-        if type_specific_details:
-            details_frame = ctk.CTkFrame(card, fg_color=COLORS['bg_card'], corner_radius=8)
-            details_frame.pack(fill="x", padx=15, pady=(0, 10))
-
-            for label_text, value_text, icon in type_specific_details:
-                detail_row = ctk.CTkFrame(details_frame, fg_color="transparent")
-                detail_row.pack(fill="x", padx=10, pady=3)
-
-                detail_label = ctk.CTkLabel(
-                    detail_row,
-                    text=f"{icon} {label_text}: {value_text}",
-                    font=ctk.CTkFont(family="Segoe UI", size=12),
-                    text_color=COLORS['text_secondary'],
-                    anchor="w"
-                )
-                detail_label.pack(side="left", fill="x", expand=True)
-
-        # Generic details section (coordinates, condition, time period)
-        generic_details = []
-
-        condition = discovery.get('condition')
-        if condition:
-            generic_details.append(f"🔧 Condition: {condition}")
-
-        time_period = discovery.get('time_period')
-        if time_period:
-            generic_details.append(f"⏳ Era: {time_period}")
-
-        coordinates = discovery.get('coordinates')
-        if coordinates:
-            generic_details.append(f"📍 Coordinates: {coordinates}")
-
-        if generic_details:
-            generic_text = " • ".join(generic_details)
-            generic_label = ctk.CTkLabel(
-                card,
-                text=generic_text,
-                font=ctk.CTkFont(family="Segoe UI", size=11),
-                text_color=COLORS['text_secondary'],
-                wraplength=820,
-                justify="left"
-            )
-            generic_label.pack(fill="x", padx=15, pady=(0, 10), anchor="w")
-
-        # Significance (if provided)
-        significance = discovery.get('significance')
-        if significance:
-            sig_frame = ctk.CTkFrame(card, fg_color=COLORS['bg_dark'], corner_radius=8)
-            sig_frame.pack(fill="x", padx=15, pady=(0, 10))
-
-            sig_label = ctk.CTkLabel(
-                sig_frame,
-                text=f"💡 Analysis: {significance}",
-                font=ctk.CTkFont(family="Segoe UI", size=12, slant="italic"),
-                text_color=COLORS['accent_cyan'],
-                wraplength=800,
-                justify="left"
-            )
-            sig_label.pack(padx=10, pady=8, anchor="w")
-
-        # Footer with discoverer
-        discovered_by = discovery.get('discovered_by', 'Unknown Explorer')
-        footer_label = ctk.CTkLabel(
-            card,
-            text=f"👤 Discovered by: {discovered_by}",
-            font=ctk.CTkFont(family="Segoe UI", size=11),
-            text_color=COLORS['text_secondary']
-        )
-        footer_label.pack(padx=15, pady=(0, 15), anchor="e")
+        self._show_message("⚠️ Error loading discoveries\n\nPlease try again")
 
     def _get_type_specific_details(self, discovery: Dict) -> List[tuple]:
         """
@@ -507,36 +631,6 @@ class DiscoveriesWindow(ctk.CTkToplevel):
         return icons.get(type_lower, '🔍')
 
     def _filter_discoveries(self, selected_filter: str):
-        """Filter discoveries by type"""
-        if selected_filter == "All":
-            filtered = self.discoveries
-        else:
-            # Map filter names to discovery types
-            type_map = {
-                "Ruins": "ruins",
-                "Fossils": "bones",
-                "Logs": "logs",
-                "Technology": "technology",
-                "Flora/Fauna": "flora",
-                "Minerals": "minerals",
-                "Ships": "ships",
-                "Hazards": "hazards",
-                "Lore": "lore"
-            }
-            filter_type = type_map.get(selected_filter, "").lower()
-            filtered = [d for d in self.discoveries if filter_type in d.get('discovery_type', '').lower()]
-
-        # Clear and redisplay
-        for widget in self.discoveries_frame.winfo_children():
-            widget.destroy()
-
-        if not filtered:
-            no_results_label = ctk.CTkLabel(
-                self.discoveries_frame,
-                text=f"No discoveries found for filter: {selected_filter}",
-                font=ctk.CTkFont(family="Segoe UI", size=14),
-                text_color=COLORS['text_secondary']
-            )
-            no_results_label.pack(pady=50)
-        else:
-            self._display_discoveries(filtered)
+        """Filter discoveries by type (in SQL, reloading from the first page)"""
+        self._type_contains = TYPE_FILTERS.get(selected_filter) if selected_filter != "All" else None
+        self._load_discoveries()
@@ -5,7 +5,7 @@ Imports JSON files from public EXE version into master database.
 This is how the master aggregates data collected by public users.
 
 Features:
-- Import single JSON file
+- Import single JSON file (or a compact columnar .hvcol export)
 - Import multiple JSON files from directory
 - Handle duplicate systems (skip or update)
 - Validate data before import
@@ -20,39 +20,84 @@ Usage:
 
     # Update existing systems
     python src/migration/import_json.py path/to/export.json --update
+
+    # Columnar export (see src/common/columnar.py), read block by block
+    python src/migration/import_json.py path/to/export.hvcol
+
+Directory imports are pipelined: worker processes parse, validate and
+normalize files while a single writer applies the systems to the database
+in batched transactions (--workers 1 imports serially).
+
+Database imports are checkpointed per file in _metadata (see
+src/common/checkpoints.py): an interrupted import resumes after its last
+committed batch, and files imported before are skipped while their
+content is unchanged (--restart imports everything again).
 """
+import os
 import json
 import sys
+import time
+import hashlib
 import logging
 import sqlite3
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 import argparse
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.common.database import HavenDatabase
 from src.common.data_provider import get_data_provider
+from src.common.validation import get_validator
+from src.common.discovery_writer import discovery_missing_fields
+from src.common.checkpoints import (ImportCheckpoint, checkpoint_key, commit_batch, completed_hashes,
+                                    file_content_hash)
+from src.common.columnar import ColumnarReader, ColumnarFormatError, COLUMNAR_SUFFIX, is_columnar_file
 from config.settings import USE_DATABASE, JSON_DATA_PATH, DATABASE_PATH
 
+# Systems written per transaction by the directory import writer
+IMPORT_BATCH_SIZE = 500
+
+# Prepared files waiting for the writer, per worker; bounds memory when
+# parsing runs ahead of the database
+PENDING_FILES_PER_WORKER = 2
+
+# Pipeline stages, in order, as reported by ImportStats
+IMPORT_STAGES = ('parse', 'validate', 'normalize', 'write')
+
+# Checkpoint job name for imports (see src/common/checkpoints.py)
+IMPORT_JOB = "import"
+
 
 class ImportStats:
     """Track import statistics"""
     def __init__(self):
         self.files_processed = 0
+        self.files_unchanged = 0
         self.systems_found = 0
         self.systems_imported = 0
         self.systems_updated = 0
         self.systems_skipped = 0
         self.systems_failed = 0
         self.errors = []
+        # Seconds spent per stage, summed over files (and worker processes)
+        self.stage_seconds = {stage: 0.0 for stage in IMPORT_STAGES}
+        self.elapsed_seconds = 0.0
+
+    def add_timings(self, timings: Dict[str, float]):
+        """Add one file's per-stage seconds"""
+        for stage, seconds in timings.items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
 
     def __str__(self):
-        return f"""
+        text = f"""
 Import Statistics:
   Files Processed: {self.files_processed}
+  Files Unchanged (skipped): {self.files_unchanged}
   Systems Found: {self.systems_found}
   Systems Imported: {self.systems_imported}
   Systems Updated: {self.systems_updated}
@@ -60,6 +105,79 @@ Import Statistics:
   Systems Failed: {self.systems_failed}
   Errors: {len(self.errors)}
 """
+        if self.elapsed_seconds:
+            text += "Stage Timings (parse/validate/normalize summed over workers):\n"
+            for stage in IMPORT_STAGES:
+                text += f"  {stage.capitalize()}: {self.stage_seconds.get(stage, 0.0):.2f}s\n"
+            text += f"  Elapsed: {self.elapsed_seconds:.2f}s\n"
+        return text
+
+
+def _stripped(value):
+    """Strip strings, leave anything else as is"""
+    return value.strip() if isinstance(value, str) else value
+
+
+def _prepare_file(file_path: str, skip_validation: bool, unchanged_hash: Optional[str] = None) -> dict:
+    """
+    Parse, validate and normalize one import file (runs in a worker process)
+
+    Args:
+        file_path: File to prepare
+        skip_validation: Skip schema validation
+        unchanged_hash: Content hash of the last complete import of this
+                        file; if it still matches, the file is not parsed
+
+    Returns:
+        {'file', 'path', 'hash', 'kind': 'systems'|'keeper'|'unchanged'|'error',
+         'systems': [(key, system)], 'problems', 'error',
+         'data' (Keeper files only), 'timings'}
+    """
+    path = Path(file_path)
+    result = {'file': path.name, 'path': str(path), 'hash': None, 'kind': 'systems',
+              'systems': [], 'problems': [], 'error': None, 'data': None, 'timings': {}}
+    timings = result['timings']
+
+    started = time.perf_counter()
+    try:
+        if is_columnar_file(path):
+            result['hash'] = file_content_hash(path)
+            if result['hash'] == unchanged_hash:
+                result['kind'] = 'unchanged'
+                return result
+            with ColumnarReader(path) as reader:
+                pairs = [pair for block in reader.blocks() for pair in block]
+        else:
+            raw = path.read_bytes()
+            result['hash'] = hashlib.sha256(raw).hexdigest()
+            if result['hash'] == unchanged_hash:
+                result['kind'] = 'unchanged'
+                return result
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("Invalid JSON structure (expected dict)")
+            if JSONImporter._is_keeper_format(data):
+                result.update(kind='keeper', data=data)
+                return result
+            pairs = [(k, v) for k, v in data.items() if k != "_meta"]
+    except (OSError, ValueError, ColumnarFormatError) as e:
+        result.update(kind='error', error=f"Failed to load - {e}")
+        return result
+    finally:
+        timings['parse'] = time.perf_counter() - started
+
+    pairs = [(key, value) for key, value in pairs if isinstance(value, dict)]
+
+    started = time.perf_counter()
+    if not skip_validation:
+        # Already in a worker process: validate serially
+        result['problems'] = get_validator().validate_systems(pairs, workers=1)
+    timings['validate'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result['systems'] = [(key, JSONImporter._normalize_system_data(value)) for key, value in pairs]
+    timings['normalize'] = time.perf_counter() - started
+    return result
 
 
 class JSONImporter:
@@ -80,7 +198,8 @@ class JSONImporter:
             db_path=str(DATABASE_PATH)
         )
 
-    def _normalize_system_data(self, system_data: dict) -> dict:
+    @staticmethod
+    def _normalize_system_data(system_data: dict) -> dict:
         """
         Normalize system data to ensure consistent structure.
         Handles mixed planet formats (strings vs objects).
@@ -129,7 +248,8 @@ class JSONImporter:
 
         return normalized
 
-    def _is_keeper_format(self, data: dict) -> bool:
+    @staticmethod
+    def _is_keeper_format(data: dict) -> bool:
         """
         Check if JSON is in Keeper bot discoveries format
         
@@ -154,23 +274,36 @@ class JSONImporter:
         
         return not has_systems and len(data) > 1
 
-    def _import_keeper_discoveries(self, data: dict, file_path: Path) -> bool:
+    def _database_path(self) -> Optional[str]:
+        """The database the provider writes to (None for the JSON backend)"""
+        db_path = getattr(self.provider, 'db_path', None)
+        return str(db_path) if db_path is not None else None
+
+    def _open_database(self):
+        """Context manager for the provider's database (None for the JSON backend)"""
+        db_path = self._database_path()
+        return HavenDatabase(db_path) if db_path is not None else nullcontext()
+
+    def _import_keeper_discoveries(self, data: dict, file_path: Path,
+                                   db: Optional[HavenDatabase] = None,
+                                   checkpoint: Optional[ImportCheckpoint] = None) -> bool:
         """
         Import discoveries from Keeper bot format
         
         Keeper bot exports discoveries as a list with associated metadata.
-        Converts Keeper format to database schema format.
+        Converts Keeper format to database schema format. System and planet
+        names are resolved up front and discoveries are inserted
+        IMPORT_BATCH_SIZE per transaction, on db when given. With a
+        checkpoint (on db), the import starts after its committed batches.
         """
         print(f"Detected Keeper discoveries format")
         
-        if not self.use_database:
+        db_path = self._database_path()
+        if db_path is None:
             print(f"⚠️  Keeper discoveries require database backend")
             return False
         
         try:
-            from src.common.database import HavenDatabase
-            import time
-            
             discoveries_list = data.get('discoveries', [])
             if not discoveries_list:
                 print(f"⚠️  No discoveries found in {file_path.name}")
@@ -178,8 +311,8 @@ class JSONImporter:
             
             print(f"✓ Found {len(discoveries_list)} discoveries to import")
             
-            imported_count = 0
-            failed_count = 0
+            # Batches committed so far survive a retry
+            progress = {'next': checkpoint.position if checkpoint else 0, 'imported': 0, 'failed': 0}
             
             # Retry logic for database locks (Control Room might be using it)
             max_retries = 3
@@ -187,23 +320,11 @@ class JSONImporter:
             
             while retry_count < max_retries:
                 try:
-                    with HavenDatabase(str(DATABASE_PATH)) as db:
-                        for idx, disc_data in enumerate(discoveries_list):
-                            if not isinstance(disc_data, dict):
-                                continue
-                            
-                            try:
-                                # Convert Keeper format to database schema
-                                converted = self._convert_keeper_discovery(disc_data, db)
-                                
-                                # Add to database
-                                db.add_discovery(converted)
-                                imported_count += 1
-                                
-                            except Exception as e:
-                                print(f"  ❌ Discovery {idx+1} failed: {str(e)[:100]}")
-                                logging.error(f"Failed to import discovery {idx+1}: {e}", exc_info=True)
-                                failed_count += 1
+                    if db is not None:
+                        self._write_keeper_discoveries(db, discoveries_list, progress, checkpoint)
+                    else:
+                        with HavenDatabase(db_path) as own_db:
+                            self._write_keeper_discoveries(own_db, discoveries_list, progress)
                     
                     # Success - break out of retry loop
                     break
@@ -223,11 +344,13 @@ class JSONImporter:
                     else:
                         raise
                         
-            print(f"✓ Keeper discoveries imported: {imported_count}")
-            if failed_count > 0:
-                print(f"⚠️  Failed: {failed_count}")
+            print(f"✓ Keeper discoveries imported: {progress['imported']}")
+            if progress['failed'] > 0:
+                print(f"⚠️  Failed: {progress['failed']}")
+            if checkpoint is not None:
+                self._finish_checkpoint(checkpoint, progress['failed'] == 0)
             
-            self.stats.systems_imported += imported_count
+            self.stats.systems_imported += progress['imported']
             return True
             
         except Exception as e:
@@ -235,7 +358,70 @@ class JSONImporter:
             self.stats.errors.append(f"{file_path.name}: Keeper import failed - {e}")
             return False
 
-    def _convert_keeper_discovery(self, keeper_disc: dict, db) -> dict:
+    def _write_keeper_discoveries(self, db: HavenDatabase, discoveries_list: list, progress: dict,
+                                  checkpoint: Optional[ImportCheckpoint] = None):
+        """Insert Keeper discoveries from progress['next'] on, one transaction per batch"""
+        system_ids, planet_ids = self._keeper_locations(db.conn, discoveries_list)
+        while progress['next'] < len(discoveries_list):
+            first = progress['next']
+            last = min(first + IMPORT_BATCH_SIZE, len(discoveries_list))
+            rows = []
+            for idx, disc_data in enumerate(discoveries_list[first:last], first):
+                if not isinstance(disc_data, dict):
+                    continue
+                try:
+                    # Convert Keeper format to database schema
+                    rows.append((idx, self._convert_keeper_discovery(disc_data, system_ids, planet_ids)))
+                except Exception as e:
+                    print(f"  ❌ Discovery {idx+1} failed: {str(e)[:100]}")
+                    logging.error(f"Failed to import discovery {idx+1}: {e}", exc_info=True)
+                    progress['failed'] += 1
+
+            # The batch, its failing rows isolated, and the checkpoint commit together
+            try:
+                count, failures = self._insert_discoveries(db, [converted for _, converted in rows])
+                if checkpoint is not None:
+                    checkpoint.advance(last)
+                db.conn.commit()
+            except Exception:
+                db.conn.rollback()
+                raise
+            progress['imported'] += count
+            for position, row_error in failures:
+                idx = rows[position][0]
+                print(f"  ❌ Discovery {idx+1} failed: {str(row_error)[:100]}")
+                logging.error(f"Failed to import discovery {idx+1}: {row_error}")
+                progress['failed'] += 1
+            progress['next'] = last
+
+    @staticmethod
+    def _keeper_locations(conn, discoveries_list: list) -> Tuple[Dict[str, str], Dict[Tuple[str, str], int]]:
+        """
+        Resolve the system names Keeper discoveries mention, in a few queries
+
+        Returns:
+            ({system name: system id}, {(system id, planet name): planet id})
+        """
+        names = list({_stripped(disc.get('system_name')) for disc in discoveries_list
+                      if isinstance(disc, dict) and disc.get('system_name')})
+        system_ids = {}
+        for start in range(0, len(names), IMPORT_BATCH_SIZE):
+            chunk = names[start:start + IMPORT_BATCH_SIZE]
+            system_ids.update(conn.execute(
+                f"SELECT name, id FROM systems WHERE name IN ({', '.join('?' * len(chunk))})",
+                chunk).fetchall())
+
+        ids = list(set(system_ids.values()))
+        planet_ids = {}
+        for start in range(0, len(ids), IMPORT_BATCH_SIZE):
+            chunk = ids[start:start + IMPORT_BATCH_SIZE]
+            planet_ids.update(((row[0], row[1]), row[2]) for row in conn.execute(
+                f"SELECT system_id, name, id FROM planets WHERE system_id IN ({', '.join('?' * len(chunk))})",
+                chunk))
+        return system_ids, planet_ids
+
+    def _convert_keeper_discovery(self, keeper_disc: dict, system_ids: Dict[str, str],
+                                  planet_ids: Dict[Tuple[str, str], int]) -> dict:
         """
         Convert Keeper bot discovery format to Haven database format
         
@@ -243,10 +429,9 @@ class JSONImporter:
         - keeper fields → database fields
         - Lists → JSON strings
         - None → appropriate defaults
-        - Finds planet_id from planet_name
+        - Finds system_id/planet_id from system_name/planet_name
+          (lookups from _keeper_locations)
         """
-        import json
-        
         converted = {}
         
         # Required fields - handle None values
@@ -269,30 +454,17 @@ class JSONImporter:
         system_name = keeper_disc.get('system_name')
         if system_name:
             # Find system by name
-            try:
-                cursor = db.conn.cursor()
-                cursor.execute("SELECT id FROM systems WHERE name = ?", (system_name.strip() if isinstance(system_name, str) else system_name,))
-                sys_row = cursor.fetchone()
-                if sys_row:
-                    converted['system_id'] = sys_row[0]
-            except:
-                pass
+            system_id = system_ids.get(_stripped(system_name))
+            if system_id:
+                converted['system_id'] = system_id
         
         # Planet info - handle None
         planet_name = keeper_disc.get('planet_name')
         if planet_name and 'system_id' in converted:
             # Find planet by name in this system
-            try:
-                cursor = db.conn.cursor()
-                cursor.execute(
-                    "SELECT id FROM planets WHERE system_id = ? AND name = ?",
-                    (converted['system_id'], planet_name.strip() if isinstance(planet_name, str) else planet_name)
-                )
-                planet_row = cursor.fetchone()
-                if planet_row:
-                    converted['planet_id'] = planet_row[0]
-            except:
-                pass
+            planet_id = planet_ids.get((converted['system_id'], _stripped(planet_name)))
+            if planet_id is not None:
+                converted['planet_id'] = planet_id
         
         # Optional fields with None-safe type conversion
         coords = keeper_disc.get('coordinates')
@@ -351,7 +523,7 @@ class JSONImporter:
         return converted
 
     def import_file(self, file_path: Path, allow_updates: bool = False,
-                   skip_validation: bool = False) -> bool:
+                   skip_validation: bool = False, resume: bool = True) -> bool:
         """
         Import single JSON file
 
@@ -359,6 +531,8 @@ class JSONImporter:
             file_path: Path to JSON file
             allow_updates: If True, update existing systems; if False, skip
             skip_validation: Skip validation (not recommended)
+            resume: Resume from the file's checkpoint and skip it if it was
+                    imported unchanged before; False imports it from the start
 
         Returns:
             True if successful, False otherwise
@@ -367,32 +541,37 @@ class JSONImporter:
         print(f"IMPORTING: {file_path.name}")
         print(f"{'='*70}")
 
-        # Load JSON
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            print(f"✓ JSON loaded successfully")
-        except Exception as e:
-            print(f"❌ ERROR: Failed to load JSON: {e}")
-            self.stats.errors.append(f"{file_path.name}: Failed to load - {e}")
-            return False
-
-        # Check if this is Keeper bot discoveries format
-        if self._is_keeper_format(data):
-            return self._import_keeper_discoveries(data, file_path)
+        with self._open_database() as db:
+            if is_columnar_file(file_path):
+                return self._import_columnar(file_path, allow_updates, skip_validation, db, resume)
 
-        # Validate standard format
-        if not skip_validation:
-            if not self._validate_data(data, file_path.name):
+            # Load JSON
+            try:
+                raw = file_path.read_bytes()
+                checkpoint = self._open_checkpoint(db, file_path, hashlib.sha256(raw).hexdigest(), resume)
+                if checkpoint is not None and checkpoint.complete:
+                    return self._skip_unchanged(file_path.name)
+                data = json.loads(raw)
+                print(f"✓ JSON loaded successfully")
+            except Exception as e:
+                print(f"❌ ERROR: Failed to load JSON: {e}")
+                self.stats.errors.append(f"{file_path.name}: Failed to load - {e}")
                 return False
 
-        # Import systems (standard format)
-        for key, value in data.items():
-            if key == "_meta" or not isinstance(value, dict):
-                continue
+            # Check if this is Keeper bot discoveries format
+            if self._is_keeper_format(data):
+                return self._import_keeper_discoveries(data, file_path, db, checkpoint)
 
-            self.stats.systems_found += 1
-            self._import_system(key, value, allow_updates)
+            # Validate standard format
+            if not skip_validation:
+                if not self._validate_data(data, file_path.name):
+                    return False
+
+            # Import systems (standard format)
+            systems = [(key, self._normalize_system_data(value)) for key, value in data.items()
+                       if key != "_meta" and isinstance(value, dict)]
+            self.stats.systems_found += len(systems)
+            self._write_checkpointed(systems, allow_updates, db, checkpoint)
 
         self.stats.files_processed += 1
         print(f"\n✓ Import complete for {file_path.name}")
@@ -403,15 +582,76 @@ class JSONImporter:
 
         return True
 
+    def _import_columnar(self, file_path: Path, allow_updates: bool, skip_validation: bool,
+                         db: Optional[HavenDatabase], resume: bool) -> bool:
+        """Import a columnar export one block at a time (validated per block)"""
+        problems = []
+        try:
+            checkpoint = self._open_checkpoint(db, file_path, None, resume)
+            if checkpoint is not None and checkpoint.complete:
+                return self._skip_unchanged(file_path.name)
+            failed_before = self.stats.systems_failed
+            with ColumnarReader(file_path) as reader:
+                print(f"✓ Columnar file opened (version {reader.meta.get('version', '?')})")
+                seen = 0
+                for block in reader.blocks():
+                    systems = [(key, value) for key, value in block if isinstance(value, dict)]
+                    self.stats.systems_found += len(systems)
+                    # Blocks committed by an interrupted import
+                    done = min(max(checkpoint.position - seen, 0), len(systems)) if checkpoint else 0
+                    systems = systems[done:]
+                    if systems and not skip_validation:
+                        problems.extend(get_validator().validate_systems(systems))
+                    systems = [(key, self._normalize_system_data(value)) for key, value in systems]
+                    self._write_systems(systems, allow_updates, db, checkpoint=checkpoint,
+                                        offset=seen + done)
+                    seen += done + len(systems)
+            if checkpoint is not None:
+                self._finish_checkpoint(checkpoint, self.stats.systems_failed == failed_before)
+        except (OSError, ColumnarFormatError) as e:
+            print(f"❌ ERROR: Failed to read columnar file: {e}")
+            self.stats.errors.append(f"{file_path.name}: Failed to load - {e}")
+            return False
+
+        if problems:
+            print(f"⚠️  WARNING: {len(problems)} schema problems in {file_path.name}:")
+            for error in problems[:10]:
+                print(f"   {error}")
+            if len(problems) > 10:
+                print(f"   ... and {len(problems) - 10} more")
+
+        self.stats.files_processed += 1
+        print(f"\n✓ Import complete for {file_path.name}")
+        print(f"  Imported: {self.stats.systems_imported}")
+        print(f"  Updated: {self.stats.systems_updated}")
+        print(f"  Skipped: {self.stats.systems_skipped}")
+        print(f"  Failed: {self.stats.systems_failed}")
+        return True
+
     def import_directory(self, dir_path: Path, allow_updates: bool = False,
-                        skip_validation: bool = False) -> bool:
+                        skip_validation: bool = False, workers: Optional[int] = None,
+                        batch_size: int = IMPORT_BATCH_SIZE, resume: bool = True) -> bool:
         """
         Import all JSON files from directory
 
+        Files are parsed, validated and normalized in worker processes while
+        a single writer applies the results in file order, batch_size
+        systems per transaction. At most PENDING_FILES_PER_WORKER prepared
+        files per worker wait for the writer. A batch that fails is rolled
+        back and retried system by system.
+
+        Each file's progress is checkpointed (database backend): a file
+        imported before is skipped if its content is unchanged, and an
+        interrupted one resumes after its last committed batch.
+
         Args:
             dir_path: Path to directory containing JSON files
             allow_updates: If True, update existing systems
             skip_validation: Skip validation
+            workers: Worker processes; None uses one per CPU (up to the
+                     number of files), 1 prepares files in this process
+            batch_size: Systems written per transaction
+            resume: Use checkpoints; False imports every file from the start
 
         Returns:
             True if successful, False otherwise
@@ -420,18 +660,28 @@ class JSONImporter:
         print(f"BATCH IMPORT FROM: {dir_path}")
         print(f"{'='*70}")
 
-        # Find all JSON files
-        json_files = list(dir_path.glob("*.json"))
+        # Find all JSON files (and columnar exports)
+        json_files = sorted([*dir_path.glob("*.json"), *dir_path.glob(f"*{COLUMNAR_SUFFIX}")])
 
         if not json_files:
             print(f"❌ ERROR: No JSON files found in {dir_path}")
             return False
 
-        print(f"Found {len(json_files)} JSON files")
-
-        # Import each file
-        for json_file in json_files:
-            self.import_file(json_file, allow_updates, skip_validation)
+        if workers is None:
+            workers = min(os.cpu_count() or 1, len(json_files))
+        # Frozen builds can't spawn workers without freeze_support() in every entry point
+        if getattr(sys, 'frozen', False):
+            workers = 1
+        print(f"Found {len(json_files)} JSON files ({workers} worker{'s' if workers != 1 else ''})")
+
+        started = time.perf_counter()
+        # The writer keeps one connection for the whole import
+        with self._open_database() as db:
+            completed = completed_hashes(db, IMPORT_JOB) if db is not None and resume else {}
+            unchanged = {str(path): completed.get(checkpoint_key(IMPORT_JOB, path)) for path in json_files}
+            for prepared in self._prepared_files(json_files, skip_validation, workers, unchanged):
+                self._write_prepared(prepared, db, allow_updates, batch_size, resume)
+        self.stats.elapsed_seconds += time.perf_counter() - started
 
         # Summary
         print(f"\n{'='*70}")
@@ -441,6 +691,216 @@ class JSONImporter:
 
         return self.stats.systems_failed == 0
 
+    def _prepared_files(self, files: List[Path], skip_validation: bool, workers: int,
+                        unchanged: Dict[str, Optional[str]]):
+        """
+        Yield _prepare_file results in file order
+
+        With workers > 1 the files are prepared in a process pool, keeping
+        at most workers * PENDING_FILES_PER_WORKER results in flight so a
+        slow writer holds back parsing instead of buffering the directory.
+        unchanged maps each file to the hash of its last complete import.
+        """
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, RuntimeError) as e:
+                logging.warning(f"Parallel import unavailable, importing serially: {e}")
+            else:
+                with pool:
+                    remaining = iter(files)
+                    pending = deque()
+                    for path in remaining:
+                        pending.append(pool.submit(_prepare_file, str(path), skip_validation,
+                                                 unchanged.get(str(path))))
+                        if len(pending) >= workers * PENDING_FILES_PER_WORKER:
+                            break
+                    while pending:
+                        prepared = pending.popleft().result()
+                        next_path = next(remaining, None)
+                        if next_path is not None:
+                            pending.append(pool.submit(_prepare_file, str(next_path), skip_validation,
+                                                     unchanged.get(str(next_path))))
+                        yield prepared
+                return
+
+        for path in files:
+            yield _prepare_file(str(path), skip_validation, unchanged.get(str(path)))
+
+    def _write_prepared(self, prepared: dict, db: Optional[HavenDatabase],
+                        allow_updates: bool, batch_size: int, resume: bool):
+        """Apply one prepared file (the writer stage)"""
+        name = prepared['file']
+        print(f"\n{'='*70}")
+        print(f"IMPORTING: {name}")
+        print(f"{'='*70}")
+        self.stats.add_timings(prepared['timings'])
+
+        if prepared['kind'] == 'error':
+            print(f"❌ ERROR: {prepared['error']}")
+            self.stats.errors.append(f"{name}: {prepared['error']}")
+            return
+        if prepared['kind'] == 'unchanged':
+            self._skip_unchanged(name)
+            return
+        checkpoint = self._open_checkpoint(db, prepared['path'], prepared['hash'], resume)
+        if checkpoint is not None and checkpoint.complete:
+            self._skip_unchanged(name)
+            return
+        if prepared['kind'] == 'keeper':
+            self._import_keeper_discoveries(prepared['data'], Path(name), db, checkpoint)
+            return
+
+        problems = prepared['problems']
+        if problems:
+            print(f"⚠️  WARNING: {len(problems)} schema problems in {name}:")
+            for error in problems[:10]:
+                print(f"   {error}")
+            if len(problems) > 10:
+                print(f"   ... and {len(problems) - 10} more")
+            print(f"   Affected systems may fail to import")
+
+        systems = prepared['systems']
+        before = (self.stats.systems_imported, self.stats.systems_updated,
+                  self.stats.systems_skipped, self.stats.systems_failed)
+        self.stats.systems_found += len(systems)
+        started = time.perf_counter()
+        self._write_checkpointed(systems, allow_updates, db, checkpoint, batch_size)
+        self.stats.add_timings({'write': time.perf_counter() - started})
+
+        self.stats.files_processed += 1
+        imported, updated, skipped, failed = (
+            now - then for now, then in zip((self.stats.systems_imported, self.stats.systems_updated,
+                                             self.stats.systems_skipped, self.stats.systems_failed),
+                                            before))
+        print(f"✓ {len(systems)} systems: {imported} imported, {updated} updated, "
+              f"{skipped} skipped, {failed} failed")
+
+    def _open_checkpoint(self, db: Optional[HavenDatabase], path, content_hash: Optional[str],
+                         resume: bool) -> Optional[ImportCheckpoint]:
+        """The file's import checkpoint (None for the JSON backend)"""
+        if db is None:
+            return None
+        checkpoint = ImportCheckpoint(db, IMPORT_JOB, path, content_hash)
+        if not resume:
+            checkpoint.reset()
+        elif checkpoint.resuming:
+            print(f"↻ Resuming after {checkpoint.position} records "
+                  f"({checkpoint.batches} batches committed)")
+        return checkpoint
+
+    def _finish_checkpoint(self, checkpoint: ImportCheckpoint, succeeded: bool):
+        """Mark a file done, or forget its checkpoint so failures are retried next time"""
+        if succeeded:
+            checkpoint.finish()
+        else:
+            checkpoint.reset()
+
+    def _skip_unchanged(self, name: str) -> bool:
+        self.stats.files_unchanged += 1
+        print(f"⊘ {name} is unchanged since its last import, skipped (--restart re-imports it)")
+        return True
+
+    def _write_checkpointed(self, systems: List[Tuple[str, dict]], allow_updates: bool,
+                            db: Optional[HavenDatabase], checkpoint: Optional[ImportCheckpoint],
+                            batch_size: int = IMPORT_BATCH_SIZE):
+        """Write a whole file's systems, starting after its committed batches"""
+        failed_before = self.stats.systems_failed
+        offset = checkpoint.position if checkpoint is not None else 0
+        self._write_systems(systems[offset:], allow_updates, db, batch_size, checkpoint, offset)
+        if checkpoint is not None:
+            self._finish_checkpoint(checkpoint, self.stats.systems_failed == failed_before)
+
+    def _write_systems(self, systems: List[Tuple[str, dict]], allow_updates: bool,
+                       db: Optional[HavenDatabase], batch_size: int = IMPORT_BATCH_SIZE,
+                       checkpoint: Optional[ImportCheckpoint] = None, offset: int = 0):
+        """
+        Write normalized systems: batched on db, else one by one through the provider
+
+        offset is the position of systems[0] in its file, for the checkpoint.
+        """
+        if db is None:
+            for key, system in systems:
+                self._import_system(key, system, allow_updates)
+            return
+        for start in range(0, len(systems), batch_size):
+            self._write_batch(db, systems[start:start + batch_size], allow_updates,
+                              checkpoint, offset + start)
+
+    def _write_batch(self, db: HavenDatabase, batch: List[Tuple[str, dict]], allow_updates: bool,
+                     checkpoint: Optional[ImportCheckpoint] = None, position: int = 0):
+        """
+        Write a batch of normalized systems in one transaction
+
+        Same rules as _import_system: systems are matched by name, existing
+        ones are updated (allow_updates) or skipped, and a new system whose
+        ID is taken gets a generated one. The checkpoint (if any) moves past
+        the batch in the same transaction; position is the batch's offset
+        in its file.
+        """
+        results = commit_batch(db.conn, batch, lambda items: self._apply_batch(db, items, allow_updates),
+                               checkpoint, position, self._record_failure)
+        for outcome, _, _ in results:
+            if outcome == 'updated':
+                self.stats.systems_updated += 1
+            elif outcome == 'skipped':
+                self.stats.systems_skipped += 1
+            else:
+                self.stats.systems_imported += 1
+
+    def _apply_batch(self, db: HavenDatabase, batch: List[Tuple[str, dict]],
+                     allow_updates: bool) -> List[Tuple[str, str, dict]]:
+        """Write a batch without committing; returns (outcome, system_id, system) per system"""
+        conn = db.conn
+        names = [system.get('name', key) for key, system in batch]
+        ids = [system['id'] for _, system in batch if system.get('id')]
+        existing = dict(conn.execute(
+            f"SELECT name, id FROM systems WHERE name IN ({', '.join('?' * len(names))})",
+            names).fetchall())
+        taken = {row[0] for row in conn.execute(
+            f"SELECT id FROM systems WHERE id IN ({', '.join('?' * len(ids))})", ids)}
+
+        results = []
+        for (key, system), name in zip(batch, names):
+            if name in existing:
+                if allow_updates:
+                    db.update_system(existing[name], system, commit=False)
+                    results.append(('updated', existing[name], system))
+                else:
+                    results.append(('skipped', existing[name], system))
+                continue
+
+            row = dict(system)
+            if not row.get('id') or row['id'] in taken:
+                if row.get('id'):
+                    print(f"    ⚠ Warning: System ID conflict for {name}, generating new ID")
+                row['id'] = self._free_system_id(conn, row, taken)
+            system_id = db.add_system(row, commit=False)
+            taken.add(system_id)
+            existing[name] = system_id
+            self._extract_and_import_discoveries(db, system_id, system)
+            results.append(('imported', system_id, system))
+        return results
+
+    @staticmethod
+    def _free_system_id(conn, system: dict, taken: set) -> str:
+        """A generated ID (as HavenDatabase.add_system makes them) not yet used"""
+        base = f"SYS_{system['region'].upper()}_{int(time.time())}"
+        system_id, suffix = base, 1
+        while system_id in taken or conn.execute(
+                "SELECT 1 FROM systems WHERE id = ?", (system_id,)).fetchone():
+            suffix += 1
+            system_id = f"{base}_{suffix}"
+        return system_id
+
+    def _record_failure(self, item: Tuple[str, dict], error: Exception):
+        key, system = item
+        self.stats.systems_failed += 1
+        error_msg = f"Failed to import '{system.get('name', key)}': {error}"
+        self.stats.errors.append(error_msg)
+        print(f"  ❌ ERROR: {error_msg}")
+
     def _validate_data(self, data: dict, filename: str) -> bool:
         """
         Validate JSON data structure
@@ -459,8 +919,8 @@ class JSONImporter:
             return False
 
         # Count systems
-        system_count = sum(1 for k, v in data.items()
-                          if k != "_meta" and isinstance(v, dict))
+        systems = [(k, v) for k, v in data.items() if k != "_meta" and isinstance(v, dict)]
+        system_count = len(systems)
 
         if system_count == 0:
             print(f"⚠️  WARNING: No systems found in {filename}")
@@ -468,25 +928,21 @@ class JSONImporter:
 
         print(f"✓ Found {system_count} systems to import")
 
-        # Validate required fields in first system
-        for key, value in data.items():
-            if key == "_meta" or not isinstance(value, dict):
-                continue
-
-            system = value
-            required_fields = ['name', 'x', 'y', 'z', 'region']
-            missing_fields = [f for f in required_fields if f not in system]
+        # Schema-check every system in one pass (process pool for large files)
+        errors = get_validator().validate_systems(systems)
 
-            if missing_fields:
-                print(f"⚠️  WARNING: System '{key}' missing fields: {missing_fields}")
-                print(f"   This system may fail to import")
-
-            # Only check first system
-            break
+        if errors:
+            print(f"⚠️  WARNING: {len(errors)} schema problems in {filename}:")
+            for error in errors[:10]:
+                print(f"   {error}")
+            if len(errors) > 10:
+                print(f"   ... and {len(errors) - 10} more")
+            print(f"   Affected systems may fail to import")
 
         return True
 
-    def _extract_and_import_discoveries(self, system_id: str, system_data: dict):
+    def _extract_and_import_discoveries(self, db: HavenDatabase, system_id: str,
+                                        system_data: dict) -> int:
         """
         Extract discoveries from system data and import them to database
         
@@ -495,68 +951,100 @@ class JSONImporter:
         - discoveries: [{...}, {...}] at system level, or
         - discoveries: [{...}] under each planet
         
+        Runs inside the transaction that added the system, on its
+        connection: planet IDs come from one query and the discoveries go
+        in with one executemany. Savepoints keep a failing discovery from
+        rolling back the system or its other discoveries.
+        
         Args:
+            db: The writer's database (transaction open, not committed)
             system_id: ID of the system being imported
             system_data: System data dictionary
+
+        Returns:
+            Number of discoveries imported
         """
-        if not self.use_database:
-            return  # Only import discoveries to database
-        
+        discoveries = []
+
+        # Check for system-level discoveries
+        system_discoveries = system_data.get('discoveries', [])
+        if system_discoveries and isinstance(system_discoveries, list):
+            discoveries.extend(dict(disc_data, system_id=system_id)
+                               for disc_data in system_discoveries if isinstance(disc_data, dict))
+
+        # Check for discoveries under planets
+        planets = [planet for planet in system_data.get('planets', [])
+                   if isinstance(planet, dict) and isinstance(planet.get('discoveries'), list)
+                   and planet['discoveries']]
+        if planets:
+            planet_ids = dict(db.conn.execute(
+                "SELECT name, id FROM planets WHERE system_id = ?", (system_id,)).fetchall())
+            for planet in planets:
+                planet_id = planet_ids.get(planet.get('name'))
+                if planet_id is None:
+                    continue
+                # Set both system and planet IDs
+                discoveries.extend(dict(disc_data, system_id=system_id, planet_id=planet_id)
+                                   for disc_data in planet['discoveries'] if isinstance(disc_data, dict))
+
+        valid = []
+        for disc_data in discoveries:
+            missing = discovery_missing_fields(disc_data)
+            if missing:
+                logging.warning(f"Failed to import discovery for {system_id}: "
+                                f"Missing required field: {missing[0]}")
+            else:
+                valid.append(disc_data)
+        if not valid:
+            return 0
+
+        count, failures = self._insert_discoveries(db, valid)
+        for _, error in failures:
+            logging.error(f"Error importing discovery for system {system_id}: {error}")
+        return count
+
+    @staticmethod
+    def _insert_discoveries(db: HavenDatabase, discoveries: list) -> Tuple[int, List[Tuple[int, Exception]]]:
+        """
+        Insert discoveries in the caller's open transaction (not committed)
+
+        They go in with one executemany under a savepoint. If that fails,
+        the savepoint is rolled back and the rows are retried one by one,
+        each under its own savepoint, so a bad row only loses itself.
+        A locked database is not a bad row: it is raised.
+
+        Returns:
+            (rows inserted, [(index into discoveries, error), ...])
+        """
+        db.conn.execute("SAVEPOINT discoveries")
         try:
-            # Get database connection
-            from src.common.database import HavenDatabase
-            
-            with HavenDatabase(str(DATABASE_PATH)) as db:
-                # Check for system-level discoveries
-                system_discoveries = system_data.get('discoveries', [])
-                if system_discoveries and isinstance(system_discoveries, list):
-                    for disc_data in system_discoveries:
-                        if not isinstance(disc_data, dict):
-                            continue
-                        # Ensure system_id is set
-                        disc_data['system_id'] = system_id
-                        try:
-                            db.add_discovery(disc_data)
-                        except Exception as e:
-                            logging.warning(f"Failed to import system-level discovery: {e}")
-                
-                # Check for discoveries under planets
-                planets = system_data.get('planets', [])
-                for planet in planets:
-                    if not isinstance(planet, dict):
-                        continue
-                    
-                    planet_name = planet.get('name')
-                    planet_discoveries = planet.get('discoveries', [])
-                    
-                    if planet_discoveries and isinstance(planet_discoveries, list):
-                        # Get planet ID from database
-                        cursor = db.conn.cursor()
-                        cursor.execute(
-                            "SELECT id FROM planets WHERE system_id = ? AND name = ?",
-                            (system_id, planet_name)
-                        )
-                        planet_row = cursor.fetchone()
-                        
-                        if planet_row:
-                            planet_id = planet_row[0]
-                            for disc_data in planet_discoveries:
-                                if not isinstance(disc_data, dict):
-                                    continue
-                                # Set both system and planet IDs
-                                disc_data['system_id'] = system_id
-                                disc_data['planet_id'] = planet_id
-                                try:
-                                    db.add_discovery(disc_data)
-                                except Exception as e:
-                                    logging.warning(f"Failed to import discovery for {planet_name}: {e}")
-                
-        except Exception as e:
-            logging.error(f"Error importing discoveries for system {system_id}: {e}")
+            db.add_discoveries(discoveries, commit=False)
+            return len(discoveries), []
+        except (sqlite3.Error, ValueError) as e:
+            db.conn.execute("ROLLBACK TO discoveries")
+            if isinstance(e, sqlite3.OperationalError) and "locked" in str(e).lower():
+                raise
+        finally:
+            db.conn.execute("RELEASE discoveries")
+
+        failures = []
+        for idx, discovery in enumerate(discoveries):
+            db.conn.execute("SAVEPOINT discovery")
+            try:
+                db.add_discoveries([discovery], commit=False)
+            except (sqlite3.Error, ValueError) as e:
+                db.conn.execute("ROLLBACK TO discovery")
+                if isinstance(e, sqlite3.OperationalError) and "locked" in str(e).lower():
+                    raise
+                failures.append((idx, e))
+            finally:
+                db.conn.execute("RELEASE discovery")
+        return len(discoveries) - len(failures), failures
 
     def _import_system(self, key: str, system_data: dict, allow_updates: bool):
         """
-        Import single system
+        Import single system through the provider (JSON backend; database
+        imports go through _write_systems, which also imports discoveries)
 
         Args:
             key: System key from JSON
@@ -610,10 +1098,6 @@ class JSONImporter:
                     returned_id = self.provider.add_system(system_copy)
                     system_id = returned_id
                 
-                # After system is added, import any discoveries
-                if system_id:
-                    self._extract_and_import_discoveries(system_id, system_data)
-                
                 self.stats.systems_imported += 1
                 print(f"  + Imported: {system_name}")
 
@@ -663,7 +1147,7 @@ def main():
     parser = argparse.ArgumentParser(
         description="Import JSON files from public EXE version into master database"
     )
-    parser.add_argument('path', help='Path to JSON file or directory')
+    parser.add_argument('path', help='Path to JSON/.hvcol file or directory')
     parser.add_argument('--batch', action='store_true',
                        help='Import all JSON files from directory')
     parser.add_argument('--update', action='store_true',
@@ -673,6 +1157,11 @@ def main():
     parser.add_argument('--use-json', action='store_true',
                        help='Import to JSON instead of database')
     parser.add_argument('--report', help='Path to save import report')
+    parser.add_argument('--restart', action='store_true',
+                       help='Ignore import checkpoints: re-import unchanged files and start '
+                            'interrupted ones over')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for directory imports (default: one per CPU)')
 
     args = parser.parse_args()
 
@@ -705,7 +1194,9 @@ def main():
         success = importer.import_directory(
             path,
             allow_updates=args.update,
-            skip_validation=args.skip_validation
+            skip_validation=args.skip_validation,
+            workers=args.workers,
+            resume=not args.restart
         )
     else:
         if not path.is_file():
@@ -714,7 +1205,8 @@ def main():
         success = importer.import_file(
             path,
             allow_updates=args.update,
-            skip_validation=args.skip_validation
+            skip_validation=args.skip_validation,
+            resume=not args.restart
         )
 
     # Generate report if requested
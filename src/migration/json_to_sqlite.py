@@ -12,10 +12,17 @@ Options:
     --db-path: Path to destination database (default: data/haven.db)
     --backup: Create backup of existing database (default: True)
     --verify: Verify migration after completion (default: True)
+    --restart: Start over instead of resuming an interrupted migration
+
+Systems are written in batched transactions and each batch records a
+checkpoint in the database's _metadata (see src/common/checkpoints.py).
+If a migration is interrupted, running it again on the same data.json
+resumes after the last committed batch instead of deleting the database.
 """
 import json
 import sys
 import os
+import hashlib
 from pathlib import Path
 from datetime import datetime
 import argparse
@@ -32,6 +39,13 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.common.database import HavenDatabase
+from src.common.checkpoints import ImportCheckpoint, commit_batch
+
+# Checkpoint job name (see src/common/checkpoints.py)
+MIGRATION_JOB = "migration"
+
+# Systems written per transaction
+MIGRATION_BATCH_SIZE = 500
 
 
 class MigrationStats:
@@ -71,6 +85,10 @@ class JSONToSQLiteMigrator:
         self.db_path = Path(db_path)
         self.stats = MigrationStats()
         self.force_overwrite = False  # Can be set externally
+        self.resume = True  # Resume an interrupted migration of the same JSON
+        self.batch_size = MIGRATION_BATCH_SIZE
+        self.json_hash = None
+        self.resume_position = 0  # Systems committed by an interrupted run
 
     def migrate(self, backup: bool = True, verify: bool = True) -> bool:
         """
@@ -148,11 +166,12 @@ class JSONToSQLiteMigrator:
 
         # Check JSON is readable
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.stats.systems_total = sum(1 for k, v in data.items()
-                                              if k != "_meta" and isinstance(v, dict))
-                print(f"    Systems: {self.stats.systems_total}")
+            raw = self.json_path.read_bytes()
+            self.json_hash = hashlib.sha256(raw).hexdigest()
+            data = json.loads(raw)
+            self.stats.systems_total = sum(1 for k, v in data.items()
+                                          if k != "_meta" and isinstance(v, dict))
+            print(f"    Systems: {self.stats.systems_total}")
         except json.JSONDecodeError as e:
             print(f"❌ ERROR: Invalid JSON: {e}")
             return False
@@ -161,7 +180,12 @@ class JSONToSQLiteMigrator:
             return False
 
         # Check database path
-        if self.db_path.exists():
+        if self.db_path.exists() and self.resume:
+            self.resume_position = self._committed_position()
+        if self.resume_position:
+            print(f"  ↻ Resuming interrupted migration into {self.db_path}")
+            print(f"    {self.resume_position}/{self.stats.systems_total} systems already committed")
+        elif self.db_path.exists():
             print(f"  ⚠️  Database already exists: {self.db_path}")
             print(f"    Size: {self.db_path.stat().st_size / (1024*1024):.1f} MB")
             if not self.force_overwrite:
@@ -176,6 +200,16 @@ class JSONToSQLiteMigrator:
 
         return True
 
+    def _committed_position(self) -> int:
+        """Systems committed by an interrupted migration of this JSON (0 if none)"""
+        try:
+            with HavenDatabase(str(self.db_path)) as db:
+                checkpoint = ImportCheckpoint(db, MIGRATION_JOB, self.json_path, self.json_hash)
+                return checkpoint.position if checkpoint.resuming else 0
+        except Exception as e:
+            print(f"  ⚠️  Could not read migration checkpoint: {e}")
+            return 0
+
     def _backup_database(self) -> bool:
         """Create backup of existing database"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -203,32 +237,30 @@ class JSONToSQLiteMigrator:
             return None
 
     def _migrate_data(self, json_data: dict) -> bool:
-        """Migrate JSON data to database"""
+        """
+        Migrate JSON data to database
+
+        Starts from an empty database unless an interrupted migration is
+        being resumed, in which case the systems before the checkpoint are
+        already in the database and are not written again.
+        """
         try:
             # Delete existing database to start fresh
-            if self.db_path.exists():
+            if not self.resume_position and self.db_path.exists():
                 self.db_path.unlink()
 
+            systems = [(key, value) for key, value in json_data.items()
+                       if key != "_meta" and isinstance(value, dict)]
+            self.stats.systems_migrated = self.resume_position
+
             # Create new database connection
             with HavenDatabase(str(self.db_path)) as db:
-                # Migrate each system
-                for key, value in json_data.items():
-                    if key == "_meta" or not isinstance(value, dict):
-                        continue
-
-                    try:
-                        self._migrate_system(db, key, value)
-                        self.stats.systems_migrated += 1
-
-                        # Progress indicator
-                        if self.stats.systems_migrated % 100 == 0:
-                            print(f"    Migrated {self.stats.systems_migrated}/{self.stats.systems_total} systems...")
-
-                    except Exception as e:
-                        self.stats.systems_failed += 1
-                        error_msg = f"Failed to migrate system '{key}': {e}"
-                        self.stats.errors.append(error_msg)
-                        print(f"    ⚠️  {error_msg}")
+                checkpoint = ImportCheckpoint(db, MIGRATION_JOB, self.json_path, self.json_hash)
+                # Migrate systems batch by batch
+                for start in range(self.resume_position, len(systems), self.batch_size):
+                    self._migrate_batch(db, systems[start:start + self.batch_size], checkpoint, start)
+                    print(f"    Migrated {self.stats.systems_migrated}/{self.stats.systems_total} systems...")
+                checkpoint.finish()
 
             print(f"  ✓ Data migration complete")
             return True
@@ -237,7 +269,29 @@ class JSONToSQLiteMigrator:
             print(f"  ❌ ERROR: Migration failed: {e}")
             return False
 
-    def _migrate_system(self, db: HavenDatabase, key: str, system_data: dict):
+    def _migrate_batch(self, db: HavenDatabase, batch: list, checkpoint: ImportCheckpoint, position: int):
+        """
+        Migrate a batch of systems in one transaction, checkpoint included
+
+        A batch that fails is rolled back and retried system by system.
+        """
+        def migrate(items):
+            return [self._migrate_system(db, key, value, commit=False) for key, value in items]
+
+        counts = commit_batch(db.conn, batch, migrate, checkpoint, position, self._record_failure)
+        self.stats.systems_migrated += len(counts)
+        for planets, moons, stations in counts:
+            self.stats.planets_migrated += planets
+            self.stats.moons_migrated += moons
+            self.stats.stations_migrated += stations
+
+    def _record_failure(self, item: tuple, error: Exception):
+        self.stats.systems_failed += 1
+        error_msg = f"Failed to migrate system '{item[0]}': {error}"
+        self.stats.errors.append(error_msg)
+        print(f"    ⚠️  {error_msg}")
+
+    def _migrate_system(self, db: HavenDatabase, key: str, system_data: dict, commit: bool = True):
         """
         Migrate single system to database
 
@@ -245,6 +299,10 @@ class JSONToSQLiteMigrator:
             db: Database connection
             key: System key from JSON
             system_data: System data dictionary
+            commit: If False, leave the transaction open (batched migration)
+
+        Returns:
+            (planets, moons, space stations) written with the system
         """
         # Prepare system data
         system = {
@@ -266,16 +324,12 @@ class JSONToSQLiteMigrator:
         }
 
         # Add system to database
-        db.add_system(system)
-
-        # Count planets and moons
-        for planet in system.get('planets', []):
-            self.stats.planets_migrated += 1
-            self.stats.moons_migrated += len(planet.get('moons', []))
+        db.add_system(system, commit=commit)
 
-        # Count space station
-        if system.get('space_station'):
-            self.stats.stations_migrated += 1
+        # Count planets, moons and the space station
+        planets = system.get('planets') or []
+        moons = sum(len(planet.get('moons', [])) for planet in planets)
+        return len(planets), moons, 1 if system.get('space_station') else 0
 
     def _verify_migration(self, json_data: dict) -> bool:
         """
@@ -346,6 +400,8 @@ def main():
                        help='Skip verification after migration')
     parser.add_argument('--force', action='store_true',
                        help='Force overwrite existing database without prompting')
+    parser.add_argument('--restart', action='store_true',
+                       help='Start over instead of resuming an interrupted migration')
 
     args = parser.parse_args()
 
@@ -355,6 +411,7 @@ def main():
         db_path=args.db_path
     )
     migrator.force_overwrite = args.force  # Set force flag
+    migrator.resume = not args.restart
 
     # Run migration
     success = migrator.migrate(
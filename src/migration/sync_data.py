@@ -6,14 +6,17 @@ Can be used to:
 1. Sync database from JSON (database = JSON)
 2. Sync JSON from database (JSON = database)
 3. Bidirectional sync (merge changes from both)
+4. Export the database as a compact columnar file (.hvcol)
 
 Usage:
     python src/migration/sync_data.py --mode json-to-db
     python src/migration/sync_data.py --mode db-to-json
+    python src/migration/sync_data.py --mode db-to-columnar --output data/export.hvcol
     python src/migration/sync_data.py --mode check
 """
 import json
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 import argparse
@@ -22,9 +25,94 @@ import argparse
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.common.data_provider import DatabaseDataProvider, JSONDataProvider
+from src.common.database import HavenDatabase
+from src.common.sync_hashes import (DatabaseHashTree, compare_hash_trees, json_hash_tree,
+                                   load_system_trees, system_hash)
+from src.common.atomic_write import atomic_write_stream
+from src.common.checkpoints import commit_batch
+from src.common.columnar import write_columnar, COLUMNAR_SUFFIX
+from src.common.undo_redo import SystemTreeDiff
 from config.settings import JSON_DATA_PATH, DATABASE_PATH
 
 
+# Systems written per transaction / loaded per query batch
+SYNC_BATCH_SIZE = 1000
+
+# System columns staged and upserted by sync_json_to_db (id first)
+STAGE_COLUMNS = ('id', 'name', 'x', 'y', 'z', 'region', 'fauna', 'flora', 'sentinel',
+                 'materials', 'base_location', 'photo', 'attributes')
+REQUIRED_FIELDS = ('name', 'x', 'y', 'z', 'region')
+
+# Errors listed individually in a sync report
+MAX_REPORTED_ERRORS = 20
+
+
+def _column_value(value):
+    # Lists/dicts (e.g. attributes) are stored as JSON text
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _indented(value) -> str:
+    """value as json.dump(indent=2) writes it one level deep (JSON strings have no raw newlines)"""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+
+
+class SyncReport:
+    """Counts and throughput of one sync run"""
+
+    def __init__(self, direction: str):
+        self.direction = direction
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.errors = 0
+        self.error_details = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def count(self, batch: list):
+        for _, action in batch:
+            setattr(self, action, getattr(self, action) + 1)
+
+    def error(self, name: str, reason):
+        self.errors += 1
+        if len(self.error_details) < MAX_REPORTED_ERRORS:
+            self.error_details.append((name, str(reason)))
+        print(f"  ✗ Error with {name}: {reason}")
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def written(self) -> int:
+        return self.added + self.updated
+
+    @property
+    def systems_per_second(self) -> float:
+        return self.written / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"Sync complete: {self.written} written ({self.added} added, {self.updated} updated), "
+                f"{self.unchanged} unchanged, {self.skipped} skipped, {self.errors} errors "
+                f"in {self.seconds:.2f}s ({self.systems_per_second:,.0f} systems/s)")
+
+    def to_dict(self) -> dict:
+        return {
+            "direction": self.direction,
+            "added": self.added,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "error_details": self.error_details,
+            "seconds": self.seconds,
+            "systems_per_second": self.systems_per_second,
+        }
+
+
 class DataSynchronizer:
     """Synchronize data between JSON and database"""
 
@@ -40,6 +128,7 @@ class DataSynchronizer:
         self.db_path = Path(db_path or DATABASE_PATH)
         self.json_provider = None
         self.db_provider = None
+        self.last_report = None
 
     def initialize_providers(self):
         """Initialize data providers"""
@@ -55,6 +144,11 @@ class DataSynchronizer:
         """
         Check if JSON and database are in sync
 
+        Compares the hash trees of both backends (see common.sync_hashes):
+        equal roots mean in sync; otherwise only regions whose hashes differ
+        are compared system by system. Unchanged data is not re-hashed, so
+        repeated checks are cheap.
+
         Returns:
             dict with sync status information
         """
@@ -62,119 +156,194 @@ class DataSynchronizer:
             return {"error": "Failed to initialize providers"}
 
         try:
-            json_systems = self.json_provider.get_all_systems()
-            db_systems = self.db_provider.get_all_systems()
-
-            json_ids = {s['id']: s for s in json_systems}
-            db_ids = {s['id']: s for s in db_systems}
-
-            only_in_json = set(json_ids.keys()) - set(db_ids.keys())
-            only_in_db = set(db_ids.keys()) - set(json_ids.keys())
-            in_both = set(json_ids.keys()) & set(db_ids.keys())
-
-            # Check for differences in systems that exist in both
-            differences = []
-            for sys_id in in_both:
-                json_sys = json_ids[sys_id]
-                db_sys = db_ids[sys_id]
-                
-                # Compare key fields
-                if json_sys['name'] != db_sys['name']:
-                    differences.append((sys_id, 'name', json_sys['name'], db_sys['name']))
-                if json_sys.get('x') != db_sys.get('x') or \
-                   json_sys.get('y') != db_sys.get('y') or \
-                   json_sys.get('z') != db_sys.get('z'):
-                    differences.append((sys_id, 'coordinates', 
-                                      f"({json_sys.get('x')},{json_sys.get('y')},{json_sys.get('z')})",
-                                      f"({db_sys.get('x')},{db_sys.get('y')},{db_sys.get('z')})"))
-
-            return {
-                "in_sync": len(only_in_json) == 0 and len(only_in_db) == 0 and len(differences) == 0,
-                "json_count": len(json_systems),
-                "db_count": len(db_systems),
-                "only_in_json": len(only_in_json),
-                "only_in_db": len(only_in_db),
-                "in_both": len(in_both),
-                "differences": len(differences),
-                "only_in_json_ids": list(only_in_json)[:5],  # Show first 5
-                "only_in_db_ids": list(only_in_db)[:5],
-                "difference_details": differences[:5]
-            }
+            json_tree = json_hash_tree(self.json_path)
+            with HavenDatabase(str(self.db_path)) as db:
+                db_tree = DatabaseHashTree(db.conn)
+                status = compare_hash_trees(json_tree, db_tree)
+            status["rehashed"] = db_tree.rehashed
+            return status
 
         except Exception as e:
             return {"error": f"Failed to check sync status: {e}"}
 
-    def sync_json_to_db(self, overwrite: bool = False) -> bool:
+    def _load_json_systems(self) -> list:
+        """Systems from data.json, keyed by name where they have no 'name'"""
+        if not self.json_path.exists():
+            return []
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [value if 'name' in value else dict(value, name=key)
+                for key, value in data.items() if key != '_meta' and isinstance(value, dict)]
+
+    def _plan_json_to_db(self, conn, json_systems: list, overwrite: bool, report: SyncReport) -> list:
+        """
+        Compute the JSON -> database delta once
+
+        New systems are added; existing ones are updated only with overwrite
+        and only when their content hash differs. Rows that cannot be
+        written (missing required fields, a name taken by another system)
+        are reported as errors up front.
+
+        Returns:
+            (system, action) pairs to apply
+        """
+        db_tree = DatabaseHashTree(conn)
+        db_hashes = {}
+        for region in db_tree.regions():
+            db_hashes.update(db_tree.systems(region))
+        ids_by_name = dict(conn.execute("SELECT name, id FROM systems").fetchall())
+
+        plan = []
+        for system in json_systems:
+            system_id = system.get('id')
+            missing = [field for field in REQUIRED_FIELDS if system.get(field) in (None, '')]
+            if not system_id or missing:
+                report.error(system.get('name', 'unknown'), f"missing {', '.join(missing) or 'id'}")
+                continue
+            owner = ids_by_name.get(system['name'], system_id)
+            if owner != system_id:
+                report.error(system['name'], f"name already used by {owner}")
+                continue
+
+            if system_id not in db_hashes:
+                plan.append((system, 'added'))
+            elif not overwrite:
+                report.skipped += 1
+            elif system_hash(system) == db_hashes[system_id]:
+                report.unchanged += 1
+            else:
+                plan.append((system, 'updated'))
+        return plan
+
+    def _apply_batch(self, conn, batch: list):
+        """
+        Write a batch of systems in one transaction (not committed)
+
+        System rows go through a temp staging table and one set-based
+        upsert; planets, moons and stations are then diffed per system, so
+        updated systems keep their child row ids. Returns the batch.
+        """
+        conn.execute("DELETE FROM temp.sync_stage")
+        conn.executemany(
+            f"INSERT INTO temp.sync_stage ({', '.join(STAGE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(STAGE_COLUMNS))})",
+            [[_column_value(system.get(column)) for column in STAGE_COLUMNS] for system, _ in batch])
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in STAGE_COLUMNS[1:])
+        conn.execute(f"""
+            INSERT INTO systems ({', '.join(STAGE_COLUMNS)})
+            SELECT {', '.join(STAGE_COLUMNS)} FROM temp.sync_stage WHERE true
+            ON CONFLICT(id) DO UPDATE SET {assignments}, modified_at = CURRENT_TIMESTAMP
+        """)
+
+        diff = SystemTreeDiff(conn, complete_rows=True)
+        for system, _ in batch:
+            diff.diff_system(system['id'], {'planets': system.get('planets') or [],
+                                            'space_station': system.get('space_station')})
+        return batch
+
+    def sync_json_to_db(self, overwrite: bool = False, batch_size: int = SYNC_BATCH_SIZE) -> bool:
         """
         Sync database from JSON (database = JSON)
 
+        The delta is computed once from content hashes and applied in
+        batched transactions; a batch that fails is rolled back and retried
+        system by system, so one bad system does not block the rest.
+
         Args:
             overwrite: If True, overwrite existing systems in DB
+            batch_size: Systems written per transaction
 
         Returns:
-            True if successful
+            True if successful (details in self.last_report)
         """
         if not self.initialize_providers():
             return False
 
+        report = self.last_report = SyncReport("JSON → Database")
         try:
-            print("\n[SYNC] JSON → Database")
+            print(f"\n[SYNC] {report.direction}")
             print("=" * 60)
 
-            json_systems = self.json_provider.get_all_systems()
+            json_systems = self._load_json_systems()
             print(f"Found {len(json_systems)} systems in JSON")
 
-            synced = 0
-            skipped = 0
-            errors = 0
-
-            for system in json_systems:
-                try:
-                    # Check if system exists in database
-                    existing = self.db_provider.get_system_by_id(system['id'])
-                    
-                    if existing:
-                        if overwrite:
-                            # Update existing system
-                            self.db_provider.update_system(system['id'], system)
-                            synced += 1
-                            print(f"  ✓ Updated: {system['name']}")
-                        else:
-                            skipped += 1
-                            print(f"  - Skipped: {system['name']} (already exists)")
-                    else:
-                        # Add new system
-                        self.db_provider.add_system(system)
-                        synced += 1
-                        print(f"  ✓ Added: {system['name']}")
-
-                except Exception as e:
-                    errors += 1
-                    print(f"  ✗ Error with {system.get('name', 'unknown')}: {e}")
-
+            with HavenDatabase(str(self.db_path)) as db:
+                conn = db.conn
+                plan = self._plan_json_to_db(conn, json_systems, overwrite, report)
+                print(f"Delta: {len(plan)} systems to write")
+
+                conn.execute(f"""
+                    CREATE TEMP TABLE IF NOT EXISTS sync_stage (
+                        {', '.join(STAGE_COLUMNS)}
+                    )
+                """)
+                for start in range(0, len(plan), batch_size):
+                    batch = plan[start:start + batch_size]
+                    written = commit_batch(conn, batch, lambda items: self._apply_batch(conn, items),
+                                           on_failure=lambda item, e: report.error(item[0].get('name', 'unknown'), e))
+                    report.count(written)
+
+            report.finish()
             print("\n" + "=" * 60)
-            print(f"Sync complete: {synced} synced, {skipped} skipped, {errors} errors")
-            return errors == 0
+            print(report.summary())
+            return report.errors == 0
 
         except Exception as e:
             print(f"Sync failed: {e}")
             return False
 
-    def sync_db_to_json(self, backup: bool = True) -> bool:
+    def _db_systems(self, conn, report: SyncReport, batch_size: int):
+        """Full system trees in name order, loaded a batch at a time (keyset paging)"""
+        after = None
+        while True:
+            if after is None:
+                rows = conn.execute("SELECT id, name FROM systems ORDER BY name LIMIT ?", (batch_size,))
+            else:
+                rows = conn.execute("SELECT id, name FROM systems WHERE name > ? ORDER BY name LIMIT ?",
+                                    (after, batch_size))
+            rows = rows.fetchall()
+            if not rows:
+                return
+            after = rows[-1][1]
+            for system in load_system_trees(conn, [row[0] for row in rows]):
+                report.added += 1
+                yield system
+
+    @staticmethod
+    def _export_meta() -> dict:
+        return {
+            "version": "1.0.0",
+            "last_modified": datetime.now().isoformat(),
+            "synced_from_database": True
+        }
+
+    def _db_to_json_chunks(self, conn, report: SyncReport, batch_size: int):
+        """data.json text, one system at a time (same layout as json.dump(indent=2))"""
+        yield '{\n  "_meta": ' + _indented(self._export_meta())
+        for system in self._db_systems(conn, report, batch_size):
+            yield ',\n  ' + json.dumps(system['name'], ensure_ascii=False) + ': ' + _indented(system)
+        yield '\n}'
+
+    def sync_db_to_json(self, backup: bool = True, batch_size: int = SYNC_BATCH_SIZE) -> bool:
         """
         Sync JSON from database (JSON = database)
 
+        Systems are streamed in name order, a batch at a time, into a
+        temporary file that atomically replaces data.json once complete.
+
         Args:
             backup: Create backup of JSON before overwriting
+            batch_size: Systems loaded per query batch
 
         Returns:
-            True if successful
+            True if successful (details in self.last_report)
         """
         if not self.initialize_providers():
             return False
 
+        report = self.last_report = SyncReport("Database → JSON")
         try:
-            print("\n[SYNC] Database → JSON")
+            print(f"\n[SYNC] {report.direction}")
             print("=" * 60)
 
             # Backup JSON if requested
@@ -184,30 +353,57 @@ class DataSynchronizer:
                 shutil.copy2(self.json_path, backup_path)
                 print(f"✓ Backup created: {backup_path}")
 
-            # Get all systems INCLUDING planets and moons
-            db_systems = self.db_provider.get_all_systems(include_planets=True)
-            print(f"Found {len(db_systems)} systems in database")
+            with HavenDatabase(str(self.db_path)) as db:
+                atomic_write_stream(self._db_to_json_chunks(db.conn, report, batch_size), self.json_path)
+
+            report.finish()
+            print(f"✓ Synced {report.added} systems to JSON")
+            print(report.summary())
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"Sync failed: {e}")
+            return False
+
+    def sync_db_to_columnar(self, output_path: str = None, compression: str = "gzip",
+                            batch_size: int = SYNC_BATCH_SIZE) -> bool:
+        """
+        Export the database as a columnar file (see common.columnar)
+
+        Streams the same systems sync_db_to_json writes, but as a compact
+        compressed file; JSONImporter reads it back.
+
+        Args:
+            output_path: Target file (default: data.json's path with .hvcol)
+            compression: 'gzip' or 'zstd' (needs the zstandard package)
+            batch_size: Systems loaded per query batch
 
-            # Build JSON structure
-            json_data = {"_meta": {
-                "version": "1.0.0",
-                "last_modified": datetime.now().isoformat(),
-                "synced_from_database": True
-            }}
+        Returns:
+            True if successful (details in self.last_report)
+        """
+        if not self.initialize_providers():
+            return False
 
-            for system in db_systems:
-                json_data[system['name']] = system
+        output_path = Path(output_path) if output_path else self.json_path.with_suffix(COLUMNAR_SUFFIX)
+        report = self.last_report = SyncReport("Database → columnar")
+        try:
+            print(f"\n[SYNC] {report.direction}")
+            print("=" * 60)
 
-            # Write to JSON
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+            with HavenDatabase(str(self.db_path)) as db:
+                systems = ((system['name'], system)
+                           for system in self._db_systems(db.conn, report, batch_size))
+                size = write_columnar(output_path, systems, self._export_meta(), compression)
 
-            print(f"✓ Synced {len(db_systems)} systems to JSON")
+            report.finish()
+            print(f"✓ Exported {report.added} systems to {output_path} ({size / (1024*1024):.2f} MB)")
+            print(report.summary())
             print("=" * 60)
             return True
 
         except Exception as e:
-            print(f"Sync failed: {e}")
+            print(f"Export failed: {e}")
             return False
 
 
@@ -218,7 +414,7 @@ def main():
     )
     parser.add_argument(
         '--mode',
-        choices=['check', 'json-to-db', 'db-to-json'],
+        choices=['check', 'json-to-db', 'db-to-json', 'db-to-columnar'],
         default='check',
         help='Sync mode'
     )
@@ -232,6 +428,16 @@ def main():
         action='store_true',
         help='Skip backup (db-to-json mode only)'
     )
+    parser.add_argument(
+        '--output',
+        help='Output file (db-to-columnar mode only; default: JSON path with .hvcol)'
+    )
+    parser.add_argument(
+        '--compression',
+        choices=['gzip', 'zstd'],
+        default='gzip',
+        help='Compression (db-to-columnar mode only; zstd needs the zstandard package)'
+    )
     parser.add_argument(
         '--json-path',
         help='Path to JSON file (default from settings)'
@@ -292,6 +498,10 @@ def main():
         success = syncer.sync_db_to_json(backup=not args.no_backup)
         return 0 if success else 1
 
+    elif args.mode == 'db-to-columnar':
+        success = syncer.sync_db_to_columnar(args.output, compression=args.compression)
+        return 0 if success else 1
+
     return 0
 
 
@@ -72,6 +72,11 @@
     const VIEW_MODE = window.VIEW_MODE || 'galaxy';  // 'galaxy' or 'system'
     const REGION_NAME = window.REGION_NAME || '';
     const SYSTEM_META = window.SYSTEM_META || {};
+    // Progressive maps: galaxy view holds region markers, systems come from local_sync_api
+    const MAP_API = window.MAP_API || null;
+    const PROGRESSIVE = !!(MAP_API && MAP_API.progressive);
+    // Large galaxies: systems are streamed from octree LOD tiles instead of SYSTEMS_DATA
+    const MAP_TILES = window.MAP_TILES || null;
 
 // ========== Settings Management ==========
 const SETTINGS_KEY = 'havenMapSettings';
@@ -418,7 +423,9 @@ if (VIEW_MODE === 'system' && REGION_NAME) {
     });
 } else {
     document.getElementById('view-title').textContent = 'GALAXY OVERVIEW';
-    document.getElementById('info-content').textContent = 'Click on a system to view its solar layout';
+    document.getElementById('info-content').textContent = PROGRESSIVE
+        ? 'Click on a region to load its systems'
+        : 'Click on a system to view its solar layout';
 }
 
 // Create objects from data
@@ -520,7 +527,7 @@ if (VIEW_MODE === 'system' && VISUAL_CONFIG.sun) {
 }
 
 // Create objects from data - fully data-driven based on JSON type field
-SYSTEM_DATA.forEach(item => {
+function addMapObject(item) {
     const x = item.x || 0;
     const y = item.y || 0;
     const z = item.z || 0;
@@ -533,7 +540,7 @@ SYSTEM_DATA.forEach(item => {
     }
     
     // Skip rendering in wrong view mode
-    if (VIEW_MODE === 'galaxy' && itemType !== 'system') return;
+    if (VIEW_MODE === 'galaxy' && itemType !== 'system' && !(PROGRESSIVE && itemType === 'region')) return;
     if (VIEW_MODE === 'system' && (itemType === 'region' || itemType === 'system')) return; // in system view, use 'planet' for planets
     
     // Skip system markers too close to origin (avoid overlapping sun)
@@ -643,7 +650,23 @@ SYSTEM_DATA.forEach(item => {
         sprite.position.set(x, y + 3.5, z);
         scene.add(sprite);
     }
-});
+    return mesh;
+}
+
+SYSTEM_DATA.forEach(addMapObject);
+
+// ========== Octree LOD Tiles (Galaxy View) ==========
+let octreeTiles = null;
+if (VIEW_MODE === 'galaxy' && MAP_TILES && typeof OctreeTiles !== 'undefined') {
+    octreeTiles = new OctreeTiles(scene, camera, MAP_TILES);
+}
+
+// Raycast meshes and, when present, the displayed LOD tiles (nearest first)
+function pickObjects() {
+    const hits = raycaster.intersectObjects(objects, true);
+    if (!octreeTiles) return hits;
+    return hits.concat(octreeTiles.pick(raycaster)).sort((a, b) => a.distance - b.distance);
+}
 
 // ========== Moon Visualization (System View Only) ==========
 let moonRenderer = null;
@@ -862,7 +885,7 @@ renderer.domElement.addEventListener('mousemove', (e) => {
         mouse.x = (e.clientX / window.innerWidth) * 2 - 1;
         mouse.y = -(e.clientY / window.innerHeight) * 2 + 1;
         raycaster.setFromCamera(mouse, camera);
-        const intersects = raycaster.intersectObjects(objects, true);
+        const intersects = pickObjects();
         if (intersects.length > 0) {
             let object = intersects[0].object;
             while (object.parent && !object.userData.type) {
@@ -883,7 +906,11 @@ renderer.domElement.addEventListener('mousemove', (e) => {
                 // Count planets and moons
                 let planetCount = 0;
                 let moonCount = 0;
-                if (data.planets && Array.isArray(data.planets)) {
+                if (typeof data.planet_count === 'number') {
+                    // LOD tile systems carry counts instead of planet lists
+                    planetCount = data.planet_count;
+                    moonCount = data.moon_count || 0;
+                } else if (data.planets && Array.isArray(data.planets)) {
                     planetCount = data.planets.length;
                     data.planets.forEach(p => {
                         if (p.moons && Array.isArray(p.moons)) {
@@ -1003,6 +1030,124 @@ renderer.domElement.addEventListener('wheel', (e) => {
 
 renderer.domElement.addEventListener('contextmenu', (e) => e.preventDefault());
 
+// ========== Progressive Loading (Galaxy View) ==========
+// Region markers are built from SQL aggregates. Clicking one fetches that
+// region's systems from local_sync_api; once MAP_API.maxRegions regions are
+// resident the oldest is unloaded so scene size stays bounded.
+const loadedRegions = new Map();  // region name -> { marker, meshes }
+
+// The read-only map token (HAVEN_MAP_TOKEN on the server) is asked for once
+// per browser session; it is never part of the generated page
+const MAP_TOKEN_STORAGE_KEY = 'havenMapToken';
+
+function mapApiToken() {
+    let token = sessionStorage.getItem(MAP_TOKEN_STORAGE_KEY);
+    if (!token) {
+        token = (window.prompt('Map access token (HAVEN_MAP_TOKEN):') || '').trim();
+        if (token) sessionStorage.setItem(MAP_TOKEN_STORAGE_KEY, token);
+    }
+    return token || '';
+}
+
+function mapApiFetch(path) {
+    return fetch(`${MAP_API.url}${path}`, { headers: { 'X-Map-Token': mapApiToken() } })
+        .then(resp => {
+            // A rejected token is asked for again on the next request
+            if (resp.status === 401) sessionStorage.removeItem(MAP_TOKEN_STORAGE_KEY);
+            if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+            return resp.json();
+        });
+}
+
+// Add or remove a mesh (and its invisible hit area) from click/hover picking
+function setPickable(mesh, pickable) {
+    const targets = [mesh, ...mesh.children.filter(c => c.userData && c.userData.target === mesh)];
+    targets.forEach(t => {
+        const i = objects.indexOf(t);
+        if (pickable && i === -1) objects.push(t);
+        if (!pickable && i !== -1) objects.splice(i, 1);
+    });
+}
+
+function removeMapObject(mesh) {
+    setPickable(mesh, false);
+    scene.remove(mesh);
+    mesh.traverse(child => {
+        if (child.geometry) child.geometry.dispose();
+        if (child.material) child.material.dispose();
+    });
+}
+
+function unloadRegion(name) {
+    const entry = loadedRegions.get(name);
+    if (!entry) return;
+    entry.meshes.forEach(removeMapObject);
+    entry.marker.visible = true;
+    setPickable(entry.marker, true);
+    loadedRegions.delete(name);
+}
+
+async function loadRegion(marker) {
+    const name = marker.userData.name;
+    if (loadedRegions.has(name)) return;
+    const entry = { marker, meshes: [] };
+    loadedRegions.set(name, entry);  // reserve so repeated clicks don't refetch
+    const info = document.getElementById('info-content');
+    info.textContent = `Loading ${name}...`;
+    try {
+        const result = await mapApiFetch(`/map/systems?region=${encodeURIComponent(name)}`);
+        result.systems.forEach(system => {
+            // Swap y and z for Three.js coordinate system (as the generator does)
+            const mesh = addMapObject({ ...system, type: 'system', x: system.x || 0, y: system.z || 0, z: system.y || 0 });
+            if (mesh) entry.meshes.push(mesh);
+        });
+        marker.visible = false;
+        setPickable(marker, false);
+        buildSystemLabels();
+
+        const delta = marker.position.clone().sub(cameraTarget);
+        cameraTarget.add(delta);
+        camera.position.add(delta);
+        camera.lookAt(cameraTarget);
+
+        const maxRegions = MAP_API.maxRegions || 8;
+        for (const oldest of loadedRegions.keys()) {
+            if (loadedRegions.size <= maxRegions) break;
+            if (oldest !== name) unloadRegion(oldest);
+        }
+        info.textContent = `${name}: ${entry.meshes.length} systems loaded` +
+            (result.truncated ? ' (showing the first batch only)' : '');
+        console.log(`[PROGRESSIVE] Loaded ${entry.meshes.length} systems for ${name}`);
+    } catch (err) {
+        loadedRegions.delete(name);
+        info.textContent = `Could not load ${name}: ${err.message}`;
+        console.error('[PROGRESSIVE] Region load failed', err);
+    }
+}
+
+async function showProgressiveSystem(object) {
+    const info = document.getElementById('info-content');
+    const name = object.userData.name;
+    info.textContent = `Loading ${name}...`;
+    try {
+        const { system } = await mapApiFetch(`/systems/${encodeURIComponent(name)}`);
+        const planets = system.planets || [];
+        let html = `<h3>System Details</h3>`;
+        html += `<p><strong>Name:</strong> ${system.name}</p>`;
+        html += `<p><strong>Region:</strong> ${system.region || 'Unknown'}</p>`;
+        html += `<p><strong>Coords:</strong> (${system.x}, ${system.y}, ${system.z})</p>`;
+        if (system.attributes) html += `<p><strong>Attributes:</strong> ${system.attributes}</p>`;
+        html += `<p><strong>Planets:</strong> ${planets.length}</p>`;
+        planets.forEach(p => {
+            const moons = (p.moons || []).length;
+            html += `<p>&nbsp;&nbsp;${p.name}${moons ? ` (${moons} moon${moons === 1 ? '' : 's'})` : ''}</p>`;
+        });
+        info.innerHTML = html;
+    } catch (err) {
+        info.textContent = `Could not load ${name}: ${err.message}`;
+    }
+}
+
 // Click selection
 renderer.domElement.addEventListener('click', (e) => {
     if (isDragging) return;
@@ -1011,7 +1156,7 @@ renderer.domElement.addEventListener('click', (e) => {
     mouse.y = -(e.clientY / window.innerHeight) * 2 + 1;
     
     raycaster.setFromCamera(mouse, camera);
-    const intersects = raycaster.intersectObjects(objects, true);
+    const intersects = pickObjects();
     
     if (intersects.length > 0) {
         // Find the parent object with userData
@@ -1021,7 +1166,11 @@ renderer.domElement.addEventListener('click', (e) => {
         }
         
         // In galaxy view, clicking a system navigates to system view
-        if (VIEW_MODE === 'galaxy' && object.userData.type === 'system') {
+        if (VIEW_MODE === 'galaxy' && PROGRESSIVE && object.userData.type === 'region') {
+            loadRegion(object.userData.target ? object.userData.target : object);
+        } else if (VIEW_MODE === 'galaxy' && PROGRESSIVE && object.userData.type === 'system') {
+            showProgressiveSystem(object);
+        } else if (VIEW_MODE === 'galaxy' && object.userData.type === 'system') {
             const systemName = object.userData.name || 'system';
             // Match Python safe_filename: preserve case, allow alphanumeric/space/dash/underscore, replace spaces with underscore
             const safeName = systemName.split('').map(c => /[a-zA-Z0-9 \-_]/.test(c) ? c : '_').join('').trim().replace(/ /g, '_');
@@ -1475,6 +1624,11 @@ function animate() {
         }
     });
 
+    // Pick octree tiles for the current camera
+    if (octreeTiles) {
+        octreeTiles.update();
+    }
+
     // Update moon positions and orbits
     if (moonRenderer) {
         moonRenderer.update();
@@ -0,0 +1,193 @@
+/**
+ * Octree LOD tiles for the Galaxy View
+ *
+ * Beta_VH_Map.py writes the galaxy as an octree of binary tiles. Each tile
+ * holds Float32 xyz positions followed by uint32 system ids, plus the
+ * [name, region, planets, moons] of each of its points for picking; interior
+ * nodes carry a representative sample of their points, leaves carry every point.
+ *
+ * Tiles are wrapped in tiny scripts (<map>_tiles/<key>.js calling HavenTiles.tile)
+ * so they load from file:// pages, where fetch() of local files is blocked.
+ *
+ * OctreeTiles renders each tile as one THREE.Points object, refines into
+ * child tiles as the camera gets closer, skips nodes outside the frustum,
+ * and picks against displayed tiles only.
+ */
+
+// Script-tag loader registry: tile scripts call into this as they arrive
+const HavenTiles = {
+    _index: null,
+    _onIndex: [],
+    _pending: new Map(),  // key -> resolve callbacks
+
+    index(data) {
+        this._index = data;
+        this._onIndex.splice(0).forEach(cb => cb(data));
+    },
+
+    tile(key, base64, meta) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        const callbacks = this._pending.get(key) || [];
+        this._pending.delete(key);
+        callbacks.forEach(cb => cb(bytes.buffer, meta || []));
+    },
+
+    _script(src) {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onerror = () => console.error(`[LOD] Failed to load ${src}`);
+        document.head.appendChild(script);
+    },
+
+    loadIndex(src, callback) {
+        if (this._index) return callback(this._index);
+        this._onIndex.push(callback);
+        if (this._onIndex.length === 1) this._script(src);
+    },
+
+    loadTile(baseUrl, key, callback) {
+        if (!this._pending.has(key)) {
+            this._pending.set(key, []);
+            this._script(`${baseUrl}/${key}.js`);
+        }
+        this._pending.get(key).push(callback);
+    }
+};
+
+class OctreeTiles {
+    /**
+     * @param {THREE.Scene} scene
+     * @param {THREE.Camera} camera
+     * @param {Object} options - { index: 'VH-Map_tiles/index.js', pointSize, color, refine }
+     */
+    constructor(scene, camera, options = {}) {
+        this.scene = scene;
+        this.camera = camera;
+        this.indexUrl = options.index || 'tiles/index.js';
+        this.baseUrl = this.indexUrl.substring(0, this.indexUrl.lastIndexOf('/')) || '.';
+        this.pointSize = options.pointSize || 1.2;
+        this.color = options.color !== undefined ? options.color : 0x00ced1;
+        // Refine a node while the camera is closer than refine * node size
+        this.refine = options.refine || 2.5;
+
+        this.nodes = new Map();     // key -> index node (+ bounding box)
+        this.points = new Map();    // key -> THREE.Points once loaded
+        this.displayed = [];        // THREE.Points currently shown
+        this.ready = false;
+
+        this.material = new THREE.PointsMaterial({
+            color: this.color,
+            size: this.pointSize,
+            sizeAttenuation: true,
+            transparent: true,
+            opacity: 0.9,
+            depthWrite: false
+        });
+        this._frustum = new THREE.Frustum();
+        this._matrix = new THREE.Matrix4();
+
+        HavenTiles.loadIndex(this.indexUrl, index => this._init(index));
+    }
+
+    _init(index) {
+        index.nodes.forEach(node => {
+            node.box = new THREE.Box3(
+                new THREE.Vector3(...node.min),
+                new THREE.Vector3(...node.max)
+            );
+            node.size = node.box.getSize(new THREE.Vector3()).length();
+            this.nodes.set(node.key, node);
+        });
+        this.root = this.nodes.get(index.root);
+        this.ready = true;
+        console.log(`[LOD] ${this.nodes.size} octree nodes, ${index.count || 0} systems`);
+    }
+
+    _load(node) {
+        if (node.loading) return;
+        node.loading = true;
+        HavenTiles.loadTile(this.baseUrl, node.key, (buffer, meta) => {
+            const n = node.points;
+            const positions = new Float32Array(buffer, 0, n * 3);
+            const ids = new Uint32Array(buffer, n * 12, n);
+            const geometry = new THREE.BufferGeometry();
+            geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+            geometry.computeBoundingSphere();
+            const pts = new THREE.Points(geometry, this.material);
+            pts.visible = false;
+            pts.userData = { type: 'tile', key: node.key, ids, meta };
+            this.scene.add(pts);
+            this.points.set(node.key, pts);
+        });
+    }
+
+    /** Choose which tiles to show for the current camera. Call once per frame. */
+    update() {
+        if (!this.ready) return;
+        this.camera.updateMatrixWorld();
+        this.camera.matrixWorldInverse.copy(this.camera.matrixWorld).invert();
+        this._matrix.multiplyMatrices(this.camera.projectionMatrix, this.camera.matrixWorldInverse);
+        this._frustum.setFromProjectionMatrix(this._matrix);
+
+        const show = new Set();
+        const visit = node => {
+            if (!this._frustum.intersectsBox(node.box)) return;
+            const own = this.points.get(node.key);
+            if (!own) {
+                this._load(node);
+                return;
+            }
+            const distance = node.box.distanceToPoint(this.camera.position);
+            const wantChildren = node.children.length > 0 && distance < node.size * this.refine;
+            if (wantChildren) {
+                const children = node.children.map(key => this.nodes.get(key));
+                const inView = children.filter(child => this._frustum.intersectsBox(child.box));
+                // Keep showing this node's sample until every visible child has arrived
+                if (inView.every(child => this.points.has(child.key))) {
+                    inView.forEach(visit);
+                    return;
+                }
+                inView.forEach(child => this._load(child));
+            }
+            show.add(own);
+        };
+        visit(this.root);
+
+        this.displayed.forEach(pts => { if (!show.has(pts)) pts.visible = false; });
+        show.forEach(pts => { pts.visible = true; });
+        this.displayed = Array.from(show);
+    }
+
+    /**
+     * Raycast against displayed tiles only.
+     * Returns intersections whose object is a proxy carrying system userData,
+     * so callers can treat them like regular system meshes.
+     */
+    pick(raycaster) {
+        if (!this.displayed.length) return [];
+        raycaster.params.Points = raycaster.params.Points || {};
+        raycaster.params.Points.threshold = this.pointSize;
+        return raycaster.intersectObjects(this.displayed, false).map(hit => {
+            const [name, region, planets, moons] =
+                hit.object.userData.meta[hit.index] || ['Unknown System', '', 0, 0];
+            const pos = hit.object.geometry.attributes.position;
+            const x = pos.getX(hit.index), y = pos.getY(hit.index), z = pos.getZ(hit.index);
+            hit.object = {
+                userData: {
+                    type: 'system',
+                    name,
+                    region,
+                    data: { name, region, x, y, z, planet_count: planets, moon_count: moons }
+                }
+            };
+            return hit;
+        });
+    }
+}
+
+// Export for use in map generation
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { HavenTiles, OctreeTiles };
+}
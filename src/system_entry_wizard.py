@@ -3,12 +3,18 @@ Haven System Entry - Two-Page Wizard with Planet/Moon Editors
 Complete star system entry with nested planets and moons
 """
 
+# --profile-startup: time everything imported from here on
+from common.startup import start_profiling, startup_phase, finish_profiling
+start_profiling('wizard')
+
 import json
+from collections import OrderedDict
 import shutil
 from pathlib import Path
 from datetime import datetime
 import subprocess
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import messagebox, StringVar, filedialog
 import threading
 import time
@@ -24,6 +30,9 @@ ctk.set_default_color_theme("blue")
 from common.paths import data_path, logs_dir, project_root
 from common.file_lock import FileLock
 from common.validation import validate_system_data, validate_coordinates
+from common.undo_redo import OperationLog, EditConflictError
+from common.async_io import run_in_background
+from common.name_index import SystemNameIndex
 import os
 
 # Check if running in User Edition mode
@@ -228,6 +237,150 @@ class ModernTextbox(ctk.CTkFrame):
         self.textbox.insert("1.0", value)
 
 
+class SystemPicker(ctk.CTkFrame):
+    """Type-ahead system picker that loads names a page at a time
+
+    Typing fetches the first page of names with that prefix in the
+    background; scrolling near the end of the list fetches the next page
+    (keyset continuation from the last name shown). Recent prefixes are
+    cached, so backspacing redisplays instantly. Return runs a full-text
+    search instead.
+    """
+    PAGE_SIZE = 100
+    CACHE_SIZE = 32
+    TYPING_DELAY_MS = 150
+
+    def __init__(self, parent, fetch, on_select, search=None, placeholder="🔍 Type a system name"):
+        """
+        Args:
+            fetch: fetch(prefix, after, limit) -> names (called on a worker thread)
+            on_select: Called with the chosen name (Tk thread)
+            search: search(query) -> names for Return (worker thread)
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.fetch = fetch
+        self.on_select = on_select
+        self.search = search
+        self._cache = OrderedDict()  # prefix -> [names, exhausted]
+        self._prefix = None
+        self._names = []
+        self._exhausted = True
+        self._loading = False
+        self._typing_job = None
+
+        self.entry = ctk.CTkEntry(self, placeholder_text=placeholder,
+                                  fg_color=COLORS['bg_card'], border_color=COLORS['accent_cyan'])
+        self.entry.pack(fill="x")
+        self.entry.bind('<KeyRelease>', self._on_typing)
+        self.entry.bind('<Return>', self._on_search)
+
+        list_frame = ctk.CTkFrame(self, fg_color=COLORS['bg_card'], corner_radius=8)
+        list_frame.pack(fill="x", pady=(6, 0))
+        self.listbox = tk.Listbox(list_frame, height=8, activestyle="none", exportselection=False,
+                                  bg=COLORS['bg_card'], fg=COLORS['text_primary'], borderwidth=0,
+                                  highlightthickness=0, selectbackground=COLORS['accent_cyan'],
+                                  font=("Segoe UI", 12))
+        scrollbar = ctk.CTkScrollbar(list_frame, command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=lambda first, last: (scrollbar.set(first, last),
+                                                                   self._on_scroll(float(last))))
+        self.listbox.pack(side="left", fill="both", expand=True, padx=(8, 0), pady=6)
+        scrollbar.pack(side="right", fill="y")
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+
+        self.status_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(family="Segoe UI", size=11),
+                                         text_color=COLORS['text_secondary'])
+        self.status_label.pack(anchor="w")
+
+    def refresh(self):
+        """Forget cached pages and reload the current prefix (after data changes)"""
+        self._cache.clear()
+        self._load(self.entry.get().strip(), force=True)
+
+    def _on_typing(self, event=None):
+        if event is not None and event.keysym in ('Return', 'Up', 'Down'):
+            return
+        if self._typing_job is not None:
+            self.after_cancel(self._typing_job)
+        self._typing_job = self.after(self.TYPING_DELAY_MS, lambda: self._load(self.entry.get().strip()))
+
+    def _load(self, prefix, force=False):
+        self._typing_job = None
+        if prefix == self._prefix and not force:
+            return
+        self._prefix = prefix
+        cached = self._cache.get(prefix)
+        if cached is not None:
+            self._cache.move_to_end(prefix)
+            self._show(list(cached[0]), cached[1])
+            return
+        self._show([], False, status="Loading…")
+        self._request(prefix, None)
+
+    def _request(self, prefix, after):
+        self._loading = True
+
+        def loaded(names):
+            if prefix != self._prefix:
+                return  # superseded while loading
+            self._loading = False
+            exhausted = len(names) < self.PAGE_SIZE
+            self._show(self._names + names if after is not None else names, exhausted)
+            self._remember(prefix)
+
+        def failed(e):
+            self._loading = False
+            logging.warning(f"Failed to load system names: {e}")
+            self.status_label.configure(text="⚠️ Could not load systems")
+
+        run_in_background(self, self.fetch, prefix, after, self.PAGE_SIZE,
+                          on_done=loaded, on_error=failed,
+                          name=f"system names '{prefix}'" + (" (more)" if after else ""),
+                          key=f"picker:{id(self)}")
+
+    def _remember(self, prefix):
+        self._cache[prefix] = [list(self._names), self._exhausted]
+        self._cache.move_to_end(prefix)
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _show(self, names, exhausted, status=None):
+        # Extend in place when a page is appended so the scroll position holds
+        if names[:len(self._names)] == self._names and self._names:
+            self.listbox.insert("end", *names[len(self._names):])
+        else:
+            self.listbox.delete(0, "end")
+            if names:
+                self.listbox.insert("end", *names)
+        self._names = names
+        self._exhausted = exhausted
+        if status is None:
+            status = f"{len(names)}{'' if exhausted else '+'} systems"
+        self.status_label.configure(text=status)
+
+    def _on_scroll(self, last_visible):
+        # Fetch the next page when the bottom of the list comes into view
+        if last_visible >= 0.9 and not self._exhausted and not self._loading and self._names:
+            self._request(self._prefix, self._names[-1])
+
+    def _on_search(self, event=None):
+        query = self.entry.get().strip()
+        if not query or self.search is None:
+            return
+        self._prefix = None  # results are not a prefix page
+        self._show([], False, status="Searching…")
+
+        def found(names):
+            self._show(names, True, status=f"{len(names)} search matches")
+
+        run_in_background(self, self.search, query, on_done=found,
+                          name=f"system search '{query}'", key=f"picker:{id(self)}")
+
+    def _on_listbox_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self.on_select(self.listbox.get(selection[0]))
+
+
 class PlanetMoonEditor(ctk.CTkToplevel):
     """Editor for planet or moon with all fields"""
     def __init__(self, parent, is_moon=False, planet_data=None):
@@ -611,6 +764,7 @@ class SystemEntryWizard(ctk.CTk):
         self.planets = []
         self.space_station = None  # Space station data
         self.current_page = 1
+        self._name_index_lock = threading.Lock()
         self.data_source = ctk.StringVar(value='production')  # Data source: production, testing, load_test
 
         # Phase 3: Initialize data provider
@@ -618,7 +772,8 @@ class SystemEntryWizard(ctk.CTk):
         self.current_backend = 'json'
         # For user edition, NEVER use database - always use JSON only
         if not IS_USER_EDITION:
-            self._init_data_provider()
+            with startup_phase("init data provider"):
+                self._init_data_provider()
 
         # System fields (Page 1)
         self.system_name = ""
@@ -629,7 +784,8 @@ class SystemEntryWizard(ctk.CTk):
         # System-level simplified metadata
         self.attributes = ""
 
-        self.build_ui()
+        with startup_phase("build UI"):
+            self.build_ui()
         
         # Show confirmation of which database is being edited
         self._show_database_confirmation()
@@ -663,22 +819,20 @@ class SystemEntryWizard(ctk.CTk):
     def _update_data_source_ui(self):
         """Update data source badge and count - DEPRECATED (badge is now read-only)"""
         # Update count (still useful for refreshing display)
-        try:
-            systems = self.get_existing_systems()
-            count = len(systems)
+        def show_count(count):
             self.data_count_label.configure(text=f"{count} systems")
-        except Exception as e:
+
+        def failed(e):
             logging.warning(f"Failed to get system count: {e}")
             self.data_count_label.configure(text="")
 
+        run_in_background(self, self.count_existing_systems, on_done=show_count, on_error=failed,
+                          name="wizard system count", key="wizard:system-count")
+
     def _reload_system_list(self):
-        """Reload the system list dropdown with current data source"""
-        try:
-            systems = self.get_existing_systems()
-            self.edit_system_menu.configure(values=["(New System)"] + systems)
-            self.edit_system_var.set("(New System)")
-        except Exception as e:
-            logging.error(f"Failed to reload system list: {e}")
+        """Reload the system picker with current data source (loaded in the background)"""
+        self.edit_system_var.set("(New System)")
+        self.system_picker.refresh()
 
     def build_ui(self):
         # Header
@@ -790,6 +944,20 @@ class SystemEntryWizard(ctk.CTk):
                                       hover_color=COLORS['accent_purple'],
                                       font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold"))
         self.back_btn.pack(side="left", padx=30, pady=17)
+
+        # Undo/redo of database saves (the operation log lives in the database)
+        self.undo_btn = self.redo_btn = None
+        if not IS_USER_EDITION:
+            self.undo_btn = ctk.CTkButton(footer, text="↶ Undo Save", command=self.undo_last_edit,
+                                          height=45, width=130, corner_radius=10,
+                                          fg_color=COLORS['bg_card'], hover_color=COLORS['accent_purple'],
+                                          font=ctk.CTkFont(family="Segoe UI", size=13), state="disabled")
+            self.undo_btn.pack(side="left", padx=(0, 10), pady=17)
+            self.redo_btn = ctk.CTkButton(footer, text="↷ Redo Save", command=self.redo_last_edit,
+                                          height=45, width=130, corner_radius=10,
+                                          fg_color=COLORS['bg_card'], hover_color=COLORS['accent_purple'],
+                                          font=ctk.CTkFont(family="Segoe UI", size=13), state="disabled")
+            self.redo_btn.pack(side="left", pady=17)
         
         self.next_btn = ctk.CTkButton(footer, text="Next ➡", command=self.go_next, height=45, width=150,
                                       corner_radius=10, fg_color=COLORS['accent_cyan'],
@@ -802,6 +970,14 @@ class SystemEntryWizard(ctk.CTk):
 
         # Initialize data source visual indicators
         self._update_data_source_ui()
+
+        # Undo history persists in the database across sessions
+        if self.undo_btn is not None and self.current_backend == 'database':
+            try:
+                with HavenDatabase(self._current_database_path()) as db:
+                    self._update_undo_buttons(OperationLog(db.conn))
+            except Exception as e:
+                logging.warning(f"Could not read edit history: {e}")
     
     def build_page1(self):
         # Scrollable form
@@ -818,11 +994,18 @@ class SystemEntryWizard(ctk.CTk):
         ctk.CTkLabel(edit_row, text="Edit existing:", text_color=COLORS['text_secondary']).pack(side="left", padx=(0, 10))
         
         self.edit_system_var = ctk.StringVar(value="(New System)")
-        systems = self.get_existing_systems()
-        self.edit_system_menu = ctk.CTkOptionMenu(edit_row, values=["(New System)"] + systems,
-                                                   variable=self.edit_system_var, command=self.load_existing_system,
-                                                   fg_color=COLORS['bg_card'], button_color=COLORS['accent_cyan'])
-        self.edit_system_menu.pack(side="left", fill="x", expand=True)
+        ctk.CTkLabel(edit_row, textvariable=self.edit_system_var, text_color=COLORS['accent_cyan'],
+                     font=ctk.CTkFont(family="Segoe UI", size=13, weight="bold")).pack(side="left")
+        ctk.CTkButton(edit_row, text="➕ New System", width=120,
+                      command=lambda: self._choose_system("(New System)"),
+                      fg_color=COLORS['bg_card'], hover_color=COLORS['accent_purple']).pack(side="right")
+
+        # Type-ahead picker: prefix pages as you type, full-text search on Return
+        self.system_picker = SystemPicker(edit_card, fetch=self.fetch_system_names,
+                                          on_select=self._choose_system, search=self.search_existing_systems,
+                                          placeholder="🔍 Type a system name (Enter searches planets and moons too)")
+        self.system_picker.pack(fill="x", padx=20, pady=(0, 15))
+        self.system_picker.refresh()
 
         # Basic info
         basic_card = GlassCard(scroll, title="📝 System Information")
@@ -1006,122 +1189,162 @@ class SystemEntryWizard(ctk.CTk):
                           fg_color=COLORS['error'], hover_color="#cc0055").pack(side="left")
     
     def get_existing_systems(self):
+        """All system names, sorted (name-only; prefer fetch_system_names for UI lists)"""
         try:
             # If database backend is enabled, query from database
             if get_current_backend() == "database":
                 with HavenDatabase(str(DATABASE_PATH)) as db:
-                    systems = db.get_all_systems()
-                    system_names = [s.get('name') for s in systems if s.get('name')]
-                    return sorted(system_names)
+                    return db.get_system_names(limit=None)
 
             # Otherwise, read from JSON file
-            if self.data_file.exists():
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    obj = json.load(f)
-                    systems = []
-                    # New schema: { systems: { name: {...} } }
-                    if isinstance(obj, dict) and isinstance(obj.get('systems'), dict):
-                        systems = [k for k in obj['systems'].keys()]
-                        return sorted(systems)
-                    # Legacy wrapper: { _meta, data: [...] }
-                    data = obj.get('data')
-                    if isinstance(data, list):
-                        systems = [item.get('name') for item in data if isinstance(item, dict) and item.get('type') != 'region']
-                        return sorted([s for s in systems if s])
-                    # Heuristic map: { name: {x,y,z,...} }
-                    if isinstance(obj, dict):
-                        vals = list(obj.values())
-                        if vals and all(isinstance(v, dict) for v in vals) and any(('x' in v or 'y' in v or 'z' in v or 'planets' in v) for v in vals):
-                            return sorted(list(obj.keys()))
+            return self._json_name_index().names
         except Exception:
             logging.exception("Failed to load systems")
         return []
-    
-    def load_existing_system(self, choice):
-        if choice == "(New System)":
-            self.clear_page1()
-            return
 
+    def fetch_system_names(self, prefix='', after=None, limit=SystemPicker.PAGE_SIZE):
+        """One page of system names starting with prefix (runs on a worker thread)"""
+        if get_current_backend() == "database":
+            with HavenDatabase(str(DATABASE_PATH)) as db:
+                return db.get_system_names(prefix, after, limit)
+        return self._json_name_index().page(prefix, after, limit)
+
+    def count_existing_systems(self):
+        """Number of systems in the active backend"""
+        if get_current_backend() == "database":
+            with HavenDatabase(str(DATABASE_PATH)) as db:
+                return db.get_total_count()
+        return len(self._json_name_index())
+
+    def _json_name_index(self):
+        """Sorted name index of the JSON data file, rebuilt only when the file changes"""
+        try:
+            stat = self.data_file.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return SystemNameIndex([])
+
+        with self._name_index_lock:
+            cached = getattr(self, '_name_index', None)
+            if cached is None or cached[0] != stamp:
+                cached = self._name_index = (stamp, SystemNameIndex(self._read_json_system_names()))
+            return cached[1]
+
+    def _read_json_system_names(self):
+        with open(self.data_file, 'r', encoding='utf-8') as f:
+            obj = json.load(f)
+        # New schema: { systems: { name: {...} } }
+        if isinstance(obj, dict) and isinstance(obj.get('systems'), dict):
+            return list(obj['systems'].keys())
+        # Legacy wrapper: { _meta, data: [...] }
+        data = obj.get('data')
+        if isinstance(data, list):
+            return [item.get('name') for item in data if isinstance(item, dict) and item.get('type') != 'region']
+        # Heuristic map: { name: {x,y,z,...} }
+        if isinstance(obj, dict):
+            vals = [v for k, v in obj.items() if k != '_meta']
+            if vals and all(isinstance(v, dict) for v in vals) and any(('x' in v or 'y' in v or 'z' in v or 'planets' in v) for v in vals):
+                return [k for k in obj.keys() if k != '_meta']
+        return []
+
+    def search_existing_systems(self, query, limit=100):
+        """Return system names matching query, best match first"""
         try:
-            # If database backend is enabled, load from database
             if get_current_backend() == "database":
                 with HavenDatabase(str(DATABASE_PATH)) as db:
-                    sys_obj = db.get_system_by_name(choice)
-                    if not sys_obj:
-                        messagebox.showwarning("Not Found", f"System '{choice}' not found in database")
-                        return
+                    return [s['name'] for s in db.search_systems(query, limit=limit)]
 
-                    # Load fields
-                    self.name_entry.set(sys_obj.get('name', choice))
-                    self.region_entry.set(sys_obj.get('region', ''))
-                    self.x_entry.set(str(sys_obj.get('x', '')))
-                    self.y_entry.set(str(sys_obj.get('y', '')))
-                    self.z_entry.set(str(sys_obj.get('z', '')))
-                    self.attributes_textbox.set(sys_obj.get('attributes', ''))
-
-                    # Load planets with moons
-                    planets_data = sys_obj.get('planets', [])
-                    self.planets = []
-                    if planets_data and isinstance(planets_data, list):
-                        self.planets = list(planets_data)
-
-                    # Load space station if present
-                    station_data = sys_obj.get('space_station')
-                    if station_data and isinstance(station_data, dict):
-                        self.space_station = station_data
-                    else:
-                        self.space_station = None
-                    self.update_station_ui()
-                    return
-
-            # Otherwise, load from JSON file
-            if self.data_file.exists():
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    obj = json.load(f)
-                    sys_obj = None
-                    # New schema
-                    if isinstance(obj, dict) and isinstance(obj.get('systems'), dict):
-                        sys_obj = obj['systems'].get(choice)
-                    # Legacy wrapper
-                    if sys_obj is None and isinstance(obj, dict) and isinstance(obj.get('data'), list):
-                        for item in obj['data']:
-                            if isinstance(item, dict) and item.get('name') == choice and item.get('type') != 'region':
-                                sys_obj = item; break
-                    # Heuristic map
-                    if sys_obj is None and isinstance(obj, dict):
-                        v = obj.get(choice)
-                        if isinstance(v, dict):
-                            sys_obj = v
-                    if not sys_obj:
-                        return
-                    # Load fields
-                    item = sys_obj
-                    self.name_entry.set(item.get('name', choice))
-                    self.region_entry.set(item.get('region', ''))
-                    self.x_entry.set(str(item.get('x', '')))
-                    self.y_entry.set(str(item.get('y', '')))
-                    self.z_entry.set(str(item.get('z', '')))
-                    self.attributes_textbox.set(item.get('attributes', ''))
-                    planets_data = item.get('planets', [])
-                    self.planets = []
-                    if planets_data and isinstance(planets_data, list):
-                        if planets_data and isinstance(planets_data[0], dict):
-                            self.planets = list(planets_data)
-                        elif planets_data and isinstance(planets_data[0], str):
-                            self.planets = [{'name': name, 'sentinel': 'N/A', 'fauna': 'N/A', 'flora': 'N/A',
-                                            'properties': 'N/A', 'materials': 'N/A', 'base_location': 'N/A',
-                                            'photo': 'N/A', 'notes': 'N/A', 'moons': []} for name in planets_data]
-                    # Load space station if present
-                    station_data = item.get('space_station')
-                    if station_data and isinstance(station_data, dict):
-                        self.space_station = station_data
-                    else:
-                        self.space_station = None
-                    self.update_station_ui()
+            query_lower = query.lower()
+            return [name for name in self.get_existing_systems() if query_lower in name.lower()][:limit]
         except Exception:
-            logging.exception("Failed to load system")
+            logging.exception("Failed to search systems")
+        return []
+
+    def _choose_system(self, choice):
+        """Picker selection: load the system (or clear the form for a new one)"""
+        self.edit_system_var.set(choice)
+        self.load_existing_system(choice)
+
+    def load_existing_system(self, choice):
+        if choice == "(New System)":
+            self.clear_page1()
+            return
+
+        def failed(e):
+            logging.error("Failed to load system", exc_info=e)
             messagebox.showerror("Error", "Failed to load system")
-    
+
+        run_in_background(self, self._fetch_existing_system, choice,
+                          on_done=lambda found: self._show_existing_system(choice, *found),
+                          on_error=failed, name=f"wizard load '{choice}'", key="wizard:load-system")
+
+    def _fetch_existing_system(self, choice):
+        """Read a system from the active backend (runs on a worker thread)
+
+        Returns:
+            (backend, system dict or None)
+        """
+        # If database backend is enabled, load from database
+        if get_current_backend() == "database":
+            with HavenDatabase(str(DATABASE_PATH)) as db:
+                return "database", db.get_system_by_name(choice)
+
+        # Otherwise, load from JSON file
+        sys_obj = None
+        if self.data_file.exists():
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                obj = json.load(f)
+            # New schema
+            if isinstance(obj, dict) and isinstance(obj.get('systems'), dict):
+                sys_obj = obj['systems'].get(choice)
+            # Legacy wrapper
+            if sys_obj is None and isinstance(obj, dict) and isinstance(obj.get('data'), list):
+                for item in obj['data']:
+                    if isinstance(item, dict) and item.get('name') == choice and item.get('type') != 'region':
+                        sys_obj = item; break
+            # Heuristic map
+            if sys_obj is None and isinstance(obj, dict):
+                v = obj.get(choice)
+                if isinstance(v, dict):
+                    sys_obj = v
+        return "json", sys_obj
+
+    def _show_existing_system(self, choice, backend, sys_obj):
+        """Fill page 1 from a loaded system (Tk thread)"""
+        if not sys_obj:
+            if backend == "database":
+                messagebox.showwarning("Not Found", f"System '{choice}' not found in database")
+            return
+
+        # Load fields
+        item = sys_obj
+        self.name_entry.set(item.get('name', choice))
+        self.region_entry.set(item.get('region', ''))
+        self.x_entry.set(str(item.get('x', '')))
+        self.y_entry.set(str(item.get('y', '')))
+        self.z_entry.set(str(item.get('z', '')))
+        self.attributes_textbox.set(item.get('attributes', ''))
+
+        # Load planets with moons
+        planets_data = item.get('planets', [])
+        self.planets = []
+        if planets_data and isinstance(planets_data, list):
+            if isinstance(planets_data[0], dict):
+                self.planets = list(planets_data)
+            elif isinstance(planets_data[0], str):
+                # Legacy JSON lists planet names only
+                self.planets = [{'name': name, 'sentinel': 'N/A', 'fauna': 'N/A', 'flora': 'N/A',
+                                'properties': 'N/A', 'materials': 'N/A', 'base_location': 'N/A',
+                                'photo': 'N/A', 'notes': 'N/A', 'moons': []} for name in planets_data]
+
+        # Load space station if present
+        station_data = item.get('space_station')
+        if station_data and isinstance(station_data, dict):
+            self.space_station = station_data
+        else:
+            self.space_station = None
+        self.update_station_ui()
+
     def clear_page1(self):
         self.name_entry.set('')
         self.region_entry.set('')
@@ -1249,20 +1472,16 @@ class SystemEntryWizard(ctk.CTk):
             logging.info(f"Saving system to: {current_source.display_name} ({db_path})")
 
             with HavenDatabase(db_path) as db:
-                # Check if system already exists
-                try:
-                    existing = db.get_system_by_name(system_data['name'])
-                    if existing:
-                        confirm = messagebox.askyesno("Overwrite", f"System '{system_data['name']}' exists. Overwrite?")
-                        if not confirm:
-                            return
-                        # Delete existing before adding new
-                        db.delete_system(existing['id'])
-                except Exception:
-                    pass  # System doesn't exist, which is fine
-                
-                # Add system to the selected database
-                db.add_system(system_data)
+                existing = db.get_system_by_name(system_data['name'])
+                if existing:
+                    confirm = messagebox.askyesno("Overwrite", f"System '{system_data['name']}' exists. Overwrite?")
+                    if not confirm:
+                        return
+
+                # Apply only what changed (keeps planet/moon ids and discovery links) and log it for undo
+                log = OperationLog(db.conn)
+                log.save_system(system_data, label=f"{'Edit' if existing else 'Add'} {system_data['name']}")
+                self._update_undo_buttons(log)
 
             messagebox.showinfo("Success", f"System '{self.system_name}' saved to {current_source.display_name} with {len(self.planets)} planet(s)!")
 
@@ -1276,6 +1495,39 @@ class SystemEntryWizard(ctk.CTk):
             logging.exception(f"Failed to save to database: {e}")
             messagebox.showerror("Error", f"Failed to save system: {e}")
 
+    def _current_database_path(self) -> str:
+        from common.data_source_manager import get_data_source_manager
+        return str(get_data_source_manager().get_current().path)
+
+    def _update_undo_buttons(self, log: OperationLog):
+        if self.undo_btn is None:
+            return
+        self.undo_btn.configure(state="normal" if log.can_undo() else "disabled")
+        self.redo_btn.configure(state="normal" if log.can_redo() else "disabled")
+
+    def _step_edit_history(self, undo: bool):
+        """Undo or redo the last database save"""
+        try:
+            with HavenDatabase(self._current_database_path()) as db:
+                log = OperationLog(db.conn)
+                group = log.undo() if undo else log.redo()
+                self._update_undo_buttons(log)
+            if group:
+                self._reload_system_list()
+                messagebox.showinfo("Undo" if undo else "Redo",
+                                    f"{'Undid' if undo else 'Redid'}: {group['label']}")
+        except EditConflictError as e:
+            messagebox.showwarning("Undo" if undo else "Redo", f"Cannot {'undo' if undo else 'redo'}: {e}")
+        except Exception as e:
+            logging.exception("Undo/redo failed")
+            messagebox.showerror("Error", f"Failed to {'undo' if undo else 'redo'}: {e}")
+
+    def undo_last_edit(self):
+        self._step_edit_history(undo=True)
+
+    def redo_last_edit(self):
+        self._step_edit_history(undo=False)
+
     def _save_system_via_json(self, system_data: dict):
         """Save system using JSON file (backward compatibility)"""
         try:
@@ -1348,15 +1600,17 @@ def main():
     # Get data source from environment variable (set by control_room)
     data_source = os.environ.get('HAVEN_DATA_SOURCE', 'production')
     
-    # Register data source with manager
+    # Register data source with manager (the wizard counts its own source in the background)
     from common.data_source_manager import get_data_source_manager
-    manager = get_data_source_manager()
+    manager = get_data_source_manager(defer_counts=True)
     manager.set_current(data_source)
     
     logging.info(f"System Entry Wizard initialized with data source: {data_source}")
     
     # Launch the wizard
-    app = SystemEntryWizard()
+    with startup_phase("create window"):
+        app = SystemEntryWizard()
+    app.after_idle(finish_profiling)
     app.mainloop()
 
 
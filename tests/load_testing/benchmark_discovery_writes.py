@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Discovery Write Throughput Benchmark
+
+Compares the old per-request write path (fresh name lookups and a
+62-column INSERT assembled on every call) with the shared DiscoveryWriter
+(cached name resolution, one reused prepared statement), both committing
+per discovery and in batches, on a private copy of a load-test database.
+
+Usage:
+    python tests/load_testing/benchmark_discovery_writes.py
+    python tests/load_testing/benchmark_discovery_writes.py --db data/haven_load_test.db --writes 5000
+"""
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from common.database import HavenDatabase
+from common.discovery_writer import DISCOVERY_FIELDS, DiscoveryWriter, field_value
+from migration.add_discovery_type_fields import migrate_discovery_fields
+
+DISCOVERY_TYPES = ['Relic', 'Fauna', 'Ruins', 'Flora', 'Mineral', 'Technology']
+
+
+def build_payloads(db_path: Path, count: int, seed: int = 0):
+    """Sync-API style payloads naming real planets and moons in db_path"""
+    conn = sqlite3.connect(str(db_path))
+    locations = conn.execute("""
+        SELECT s.name, 'planet', p.name FROM planets p JOIN systems s ON s.id = p.system_id LIMIT 500
+    """).fetchall() + conn.execute("""
+        SELECT s.name, 'moon', m.name FROM moons m
+        JOIN planets p ON p.id = m.planet_id JOIN systems s ON s.id = p.system_id LIMIT 250
+    """).fetchall()
+    conn.close()
+
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        system_name, location_type, location_name = rng.choice(locations)
+        payloads.append({
+            'type': rng.choice(DISCOVERY_TYPES), 'description': f"Benchmark discovery {i}",
+            'system_name': system_name, 'location_type': location_type,
+            'location_name': location_name, 'username': f"Explorer {i % 25}",
+        })
+    return payloads
+
+
+def legacy_write(conn, data):
+    """The pre-DiscoveryWriter write path: uncached lookups, statement rebuilt per call"""
+    cursor = conn.cursor()
+    system_id = planet_id = moon_id = None
+    cursor.execute("SELECT id FROM systems WHERE name = ?", (data.get('system_name'),))
+    row = cursor.fetchone()
+    if row:
+        system_id = row[0]
+    if data.get('location_type') == 'planet' and system_id:
+        cursor.execute("SELECT id FROM planets WHERE system_id = ? AND name = ?",
+                       (system_id, data.get('location_name')))
+        row = cursor.fetchone()
+        planet_id = row[0] if row else None
+    elif data.get('location_type') == 'moon' and system_id:
+        cursor.execute("""
+            SELECT m.id, m.planet_id FROM moons m JOIN planets p ON m.planet_id = p.id
+            WHERE p.system_id = ? AND m.name = ?
+        """, (system_id, data.get('location_name')))
+        row = cursor.fetchone()
+        if row:
+            moon_id, planet_id = row
+
+    location = {'system_id': system_id, 'planet_id': planet_id, 'moon_id': moon_id}
+    columns = [field[0] for field in DISCOVERY_FIELDS]
+    values = [location[c] if c in location else field_value(data, keys, default)
+              for c, keys, default in DISCOVERY_FIELDS]
+    # Vary whitespace like separately written call sites so the statement cache can't help
+    cursor.execute(f"INSERT INTO discoveries ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                   + ' ' * (len(values) % 7), values)
+    conn.commit()
+
+
+def run(db_source: Path, writes: int, batch: int) -> dict:
+    """Time each write path against its own copy of db_source (writes/second)"""
+    workdir = Path(tempfile.mkdtemp(prefix='discovery_writes_'))
+    results = {}
+    try:
+        template = workdir / 'template.db'
+        shutil.copy(db_source, template)
+        migrate_discovery_fields(template)
+        with HavenDatabase(str(template)):
+            pass  # install derived tables and location_version triggers once
+        payloads = build_payloads(template, writes)
+
+        def timed(name, write):
+            db_path = workdir / f'{name}.db'
+            shutil.copy(template, db_path)
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            started = time.perf_counter()
+            write(conn, DiscoveryWriter(str(db_path)))
+            elapsed = time.perf_counter() - started
+            conn.close()
+            results[name] = writes / elapsed if elapsed else 0.0
+
+        timed('legacy', lambda conn, writer: [legacy_write(conn, p) for p in payloads])
+        timed('writer', lambda conn, writer: [writer.write(conn, p) for p in payloads])
+        timed(f'writer_batch_{batch}', lambda conn, writer: [
+            writer.write_many(conn, payloads[i:i + batch]) for i in range(0, writes, batch)])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark discovery write throughput")
+    parser.add_argument('--db', default=str(PROJECT_ROOT / 'data' / 'haven_load_test.db'),
+                        help="Load-test database to copy (default: data/haven_load_test.db)")
+    parser.add_argument('--writes', type=int, default=2000, help="Discoveries per run (default: 2000)")
+    parser.add_argument('--batch', type=int, default=100, help="Batch size for write_many (default: 100)")
+    args = parser.parse_args(argv)
+
+    source = Path(args.db)
+    if not source.exists():
+        print(f"Database not found: {source}")
+        print("Generate one with: python tests/load_testing/generate_load_test_db.py")
+        return 1
+
+    print(f"Writing {args.writes} discoveries ({', '.join(DISCOVERY_TYPES)}) against copies of {source}...")
+    results = run(source, args.writes, args.batch)
+
+    baseline = results['legacy']
+    print(f"\n{'='*60}")
+    print("DISCOVERY WRITE THROUGHPUT")
+    print(f"{'='*60}")
+    for name, rate in results.items():
+        print(f"  {name:<20} {rate:>10,.0f} writes/s  ({rate / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,25 +6,38 @@ Designed to test billion-scale architecture with realistic data
 This generator creates a SQLite database following the billion-scale architecture
 with configurable numbers of systems, planets, moons, and space stations.
 
+Each batch of systems is drawn as whole NumPy arrays from its own seeded
+random stream, so the same --seed (and --batch-size) always gives the same
+database, however many workers built it. Rows go in with executemany, one
+transaction per batch, with journaling and fsync off and the secondary
+indexes and search index dropped; indexes, statistics counters and the
+search index are built once at the end. With --workers N the batches are
+split into shard databases built in parallel and merged into the output
+with ATTACH.
+
 Usage:
     python generate_load_test_db.py --systems 10000 --output data/haven_load_test.db
     python generate_load_test_db.py --systems 100000  # Stress test
     python generate_load_test_db.py --systems 1000000 # Million scale
+    python generate_load_test_db.py --systems 10000000 --workers 8  # ~140M rows
 
 Default: 10,000 systems with ~5 planets each, ~2 moons per planet, ~50% space stations
 """
 import sqlite3
 import argparse
-import random
+import multiprocessing
 import sys
+import tempfile
 from pathlib import Path
-from datetime import datetime
 import time
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 # Add src to path for database imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from common.database import HavenDatabase
+from common.database import HavenDatabase, INDEXES
 
 
 # ============================================================================
@@ -53,12 +66,26 @@ PREFIXES = [
 # Planet/Moon attributes
 SENTINELS = ["None", "Low", "Moderate", "Aggressive", "Hostile", "Extreme"]
 SENTINEL_WEIGHTS = [40, 30, 15, 10, 3, 2]  # Most systems are safe
+MOON_SENTINEL_WEIGHTS = [60, 25, 10, 3, 1, 1]  # Moons are mostly safe
 
 FAUNA_LEVELS = ["None", "Sparse", "Low", "Moderate", "Abundant", "Rich", "Extreme diversity"]
 FAUNA_WEIGHTS = [15, 20, 25, 20, 10, 7, 3]
+MOON_FAUNA_WEIGHTS = [40, 25, 15, 10, 5, 3, 2]  # Less fauna
 
 FLORA_LEVELS = ["None", "Sparse", "Moderate", "Dense", "Abundant", "Lush vegetation"]
 FLORA_WEIGHTS = [10, 20, 30, 20, 15, 5]
+MOON_FLORA_WEIGHTS = [35, 25, 20, 10, 7, 3]  # Less flora
+
+# Planets per system (1-10, weighted toward 4-6)
+PLANET_COUNTS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+PLANET_COUNT_WEIGHTS = [5, 8, 12, 18, 20, 18, 10, 5, 3, 1]
+
+# Moons per planet (0-5, weighted toward 0-2)
+MOON_COUNTS = [0, 1, 2, 3, 4, 5]
+MOON_COUNT_WEIGHTS = [30, 25, 20, 15, 7, 3]
+
+# Share of systems with a space station
+STATION_CHANCE = 0.5
 
 PLANET_PROPERTIES = [
     "Terrestrial, breathable atmosphere",
@@ -76,6 +103,19 @@ PLANET_PROPERTIES = [
     "Exotic biome, anomalous features"
 ]
 
+PLANET_NOTES = [
+    "Colonization candidate",
+    "Resource rich extraction site",
+    "Scientific research ongoing",
+    "Hostile environment - extreme caution",
+    "Exploration in progress",
+    "Ancient ruins detected",
+    "Anomalous readings present",
+    "Paradise world - recommended",
+    "High sentinel activity",
+    "Rare materials detected"
+]
+
 MOON_PROPERTIES = [
     "Rocky, airless",
     "Ice world",
@@ -89,6 +129,8 @@ MOON_PROPERTIES = [
     "Geologically active"
 ]
 
+MOON_NOTES = "Natural satellite in stable orbit"
+
 MATERIALS = [
     "Iron, Carbon, Silicon",
     "Gold, Platinum, Silver",
@@ -111,6 +153,241 @@ STATION_NAMES = [
     "Science Station", "Colonial Hub", "Sentinel Watchtower", "Freighter Dock"
 ]
 
+# Planet name suffixes (A, B, C, ...) and moon names (Greek letters: α, β, γ, ...)
+PLANET_SUFFIXES = np.array([f"-{chr(65 + p)}" for p in range(max(PLANET_COUNTS))], dtype=object)
+MOON_NAMES = np.array([f"Moon-{chr(945 + m)}" for m in range(max(MOON_COUNTS))], dtype=object)
+
+
+# ============================================================================
+# BULK LOAD SETTINGS
+# ============================================================================
+
+DEFAULT_SEED = 42
+
+# Systems generated and committed per transaction (~14 rows per system)
+DEFAULT_BATCH_SIZE = 10_000
+
+# Shards per worker: more, smaller shards let merging overlap generation
+SHARDS_PER_WORKER = 2
+
+# The output is throwaway until the build finishes, so skip the rollback
+# journal and fsync; a crashed build is simply generated again
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",   # 256 MB
+)
+
+# Columns written per table, in generate_batch's row order
+TABLE_COLUMNS = {
+    'systems': ('id', 'name', 'x', 'y', 'z', 'region', 'fauna', 'flora', 'sentinel', 'materials'),
+    'planets': ('id', 'system_id', 'name', 'sentinel', 'fauna', 'flora',
+                'properties', 'materials', 'base_location', 'notes'),
+    'moons': ('planet_id', 'name', 'sentinel', 'fauna', 'flora', 'properties', 'materials',
+              'base_location', 'notes', 'orbit_radius', 'orbit_speed'),
+    'space_stations': ('system_id', 'name', 'x', 'y', 'z'),
+}
+
+# Search index tables, rebuilt from the loaded rows by build_search_index
+SEARCH_TABLES = ('systems_fts', 'systems_fts_keys', 'discoveries_fts')
+
+# Planet IDs are numbered from 1 in every shard and shifted by the rows
+# already merged, which is what they would have been in a serial build
+MERGE_OFFSETS = {'planets': 'id', 'moons': 'planet_id'}
+
+
+def _insert_sql(table: str) -> str:
+    columns = TABLE_COLUMNS[table]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def _merge_sql(table: str) -> str:
+    columns = TABLE_COLUMNS[table]
+    selected = [f"{c} + ?" if c == MERGE_OFFSETS.get(table) else c for c in columns]
+    return (f"INSERT INTO main.{table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(selected)} FROM shard.{table} ORDER BY rowid")
+
+
+# ============================================================================
+# VECTORIZED BATCH GENERATION
+# ============================================================================
+
+def _pick(rng: np.random.Generator, values: list, size: int, weights: list = None) -> np.ndarray:
+    """size values drawn from values, uniformly or by weight (object array)"""
+    p = None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
+
+
+def _children(rng: np.random.Generator, parents: int, counts: list, weights: list):
+    """
+    Draw a child count for each parent
+
+    Returns:
+        (owner, ordinal): for each child, its parent's index and its
+        position among that parent's children
+    """
+    per_parent = _pick(rng, counts, parents, weights).astype(np.int64)
+    owner = np.repeat(np.arange(parents), per_parent)
+    ordinal = np.arange(len(owner)) - np.repeat(np.cumsum(per_parent) - per_parent, per_parent)
+    return owner, ordinal
+
+
+def _locations(label, latitudes: np.ndarray, longitudes: np.ndarray) -> List[str]:
+    """'<label>: lat, lon' strings; label is one string or one per row"""
+    labels = [label] * len(latitudes) if isinstance(label, str) else label
+    return [f"{name}: {lat:.2f}, {lon:.2f}"
+            for name, lat, lon in zip(labels, latitudes.tolist(), longitudes.tolist())]
+
+
+def generate_batch(seed: int, start: int, end: int, first_planet_id: int = 1) -> Dict[str, list]:
+    """
+    Generate systems start..end-1 with their planets, moons and stations
+
+    The batch draws from its own random stream, keyed by (seed, start), so
+    it comes out the same whichever process generates it and in whatever
+    order.
+
+    Args:
+        seed: Database seed
+        start: Index of the batch's first system
+        end: One past the index of its last system
+        first_planet_id: ID of the batch's first planet (moons reference planets by ID)
+
+    Returns:
+        {table: [row tuple, ...]} in TABLE_COLUMNS order
+    """
+    rng = np.random.default_rng([seed, start])
+    count = end - start
+
+    # Systems: unique names from the index, e.g. ALPHA-0000123
+    prefixes = _pick(rng, PREFIXES, count).tolist()
+    indexes = range(start, end)
+    names = np.array([f"{p}-{i:07d}" for p, i in zip(prefixes, indexes)], dtype=object)
+    ids = np.array([f"SYS_{p}_{i}" for p, i in zip(prefixes, indexes)], dtype=object)
+    # Distribute in 3D space: -500 to +500 for x/y, -100 to +100 for z
+    xy = rng.uniform(-500, 500, size=(2, count))
+    z = rng.uniform(-100, 100, size=count)
+    systems = list(zip(
+        ids.tolist(), names.tolist(), xy[0].tolist(), xy[1].tolist(), z.tolist(),
+        _pick(rng, REGIONS, count).tolist(),
+        _pick(rng, FAUNA_LEVELS, count, FAUNA_WEIGHTS).tolist(),
+        _pick(rng, FLORA_LEVELS, count, FLORA_WEIGHTS).tolist(),
+        _pick(rng, SENTINELS, count, SENTINEL_WEIGHTS).tolist(),
+        _pick(rng, MATERIALS, count).tolist(),
+    ))
+
+    # Planets: named after their system (A, B, C, ...), IDs assigned here
+    owner, ordinal = _children(rng, count, PLANET_COUNTS, PLANET_COUNT_WEIGHTS)
+    planet_count = len(owner)
+    planet_ids = np.arange(first_planet_id, first_planet_id + planet_count)
+    settlements = [f"Settlement-{n}" for n in (ordinal + 1).tolist()]
+    planets = list(zip(
+        planet_ids.tolist(), ids[owner].tolist(), (names[owner] + PLANET_SUFFIXES[ordinal]).tolist(),
+        _pick(rng, SENTINELS, planet_count, SENTINEL_WEIGHTS).tolist(),
+        _pick(rng, FAUNA_LEVELS, planet_count, FAUNA_WEIGHTS).tolist(),
+        _pick(rng, FLORA_LEVELS, planet_count, FLORA_WEIGHTS).tolist(),
+        _pick(rng, PLANET_PROPERTIES, planet_count).tolist(),
+        _pick(rng, MATERIALS, planet_count).tolist(),
+        _locations(settlements, rng.uniform(-90, 90, planet_count), rng.uniform(-180, 180, planet_count)),
+        _pick(rng, PLANET_NOTES, planet_count).tolist(),
+    ))
+
+    # Moons (generally less diverse than planets)
+    moon_owner, moon_ordinal = _children(rng, planet_count, MOON_COUNTS, MOON_COUNT_WEIGHTS)
+    moon_count = len(moon_owner)
+    moons = list(zip(
+        planet_ids[moon_owner].tolist(), MOON_NAMES[moon_ordinal].tolist(),
+        _pick(rng, SENTINELS, moon_count, MOON_SENTINEL_WEIGHTS).tolist(),
+        _pick(rng, FAUNA_LEVELS, moon_count, MOON_FAUNA_WEIGHTS).tolist(),
+        _pick(rng, FLORA_LEVELS, moon_count, MOON_FLORA_WEIGHTS).tolist(),
+        _pick(rng, MOON_PROPERTIES, moon_count).tolist(),
+        _pick(rng, MATERIALS, moon_count).tolist(),
+        _locations("Outpost", rng.uniform(-90, 90, moon_count), rng.uniform(-180, 180, moon_count)),
+        [MOON_NOTES] * moon_count,
+        rng.uniform(0.3, 1.5, moon_count).tolist(),    # Orbit radius (scaled units)
+        rng.uniform(0.02, 0.1, moon_count).tolist(),   # Angular velocity
+    ))
+
+    # Space stations in the inner to mid system, relative to the star
+    has_station = rng.random(count) < STATION_CHANCE
+    station_count = int(has_station.sum())
+    station_names = names[has_station] + " " + _pick(rng, STATION_NAMES, station_count)
+    stations = list(zip(
+        ids[has_station].tolist(), station_names.tolist(),
+        rng.uniform(-5, 5, station_count).tolist(),
+        rng.uniform(-5, 5, station_count).tolist(),
+        rng.uniform(-2, 2, station_count).tolist(),
+    ))
+
+    return {'systems': systems, 'planets': planets, 'moons': moons, 'space_stations': stations}
+
+
+# ============================================================================
+# BULK WRITING
+# ============================================================================
+
+def open_bulk_database(db_path: Path) -> sqlite3.Connection:
+    """
+    Create a database with the Haven schema and open it for a bulk load
+
+    Only the tables are kept: the secondary indexes and the search index
+    (with its per-row sync triggers) are dropped until the load is done,
+    and the statistics triggers are not installed until the database is
+    first opened with HavenDatabase.
+    """
+    HavenDatabase(str(db_path))   # Creates the schema; statistics wait for the first open
+    conn = sqlite3.connect(str(db_path))
+    for pragma in BULK_PRAGMAS:
+        conn.execute(pragma)
+    for name, _, _ in INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        if name.startswith('trg_fts_'):
+            conn.execute(f"DROP TRIGGER {name}")
+    for table in SEARCH_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.commit()
+    return conn
+
+
+def write_batch(conn: sqlite3.Connection, rows: Dict[str, list]):
+    """Insert one generated batch in a single transaction"""
+    for table in TABLE_COLUMNS:
+        conn.executemany(_insert_sql(table), rows[table])
+    conn.commit()
+
+
+def build_shard(task: Tuple[str, int, list]) -> Tuple[str, Dict[str, int], Dict[str, float]]:
+    """
+    Generate a run of batches into a shard database (pool worker)
+
+    Args:
+        task: (shard path, seed, [(start, end), ...])
+
+    Returns:
+        (shard path, rows per table, {'generate': s, 'insert': s})
+    """
+    shard_path, seed, batches = task
+    counts = dict.fromkeys(TABLE_COLUMNS, 0)
+    seconds = {'generate': 0.0, 'insert': 0.0}
+
+    conn = open_bulk_database(Path(shard_path))
+    try:
+        for start, end in batches:
+            began = time.perf_counter()
+            rows = generate_batch(seed, start, end, counts['planets'] + 1)
+            generated = time.perf_counter()
+            write_batch(conn, rows)
+            seconds['generate'] += generated - began
+            seconds['insert'] += time.perf_counter() - generated
+            for table in TABLE_COLUMNS:
+                counts[table] += len(rows[table])
+    finally:
+        conn.close()
+    return shard_path, counts, seconds
+
 
 # ============================================================================
 # DATABASE GENERATOR
@@ -118,19 +395,25 @@ STATION_NAMES = [
 
 class LoadTestGenerator:
     """Generate comprehensive load test database"""
-    
-    def __init__(self, db_path: str, num_systems: int = 10000):
+
+    def __init__(self, db_path: str, num_systems: int = 10000, seed: int = DEFAULT_SEED,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1):
         """
         Initialize generator
-        
+
         Args:
             db_path: Path to output database file
             num_systems: Number of star systems to generate
+            seed: Random seed; the same seed and batch size give the same database
+            batch_size: Systems generated and committed at a time
+            workers: Processes building shard databases (1 = build in place)
         """
         self.db_path = Path(db_path)
         self.num_systems = num_systems
-        self.db = None
-        
+        self.seed = seed
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+
         # Statistics
         self.stats = {
             'systems': 0,
@@ -138,9 +421,15 @@ class LoadTestGenerator:
             'moons': 0,
             'space_stations': 0,
             'start_time': None,
-            'end_time': None
+            'end_time': None,
+            # Seconds per stage; generate/insert are summed over workers
+            'seconds': {'generate': 0.0, 'insert': 0.0, 'merge': 0.0, 'load': 0.0, 'index': 0.0},
         }
-    
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.stats[table] for table in TABLE_COLUMNS)
+
     def generate(self):
         """Main generation process"""
         print(f"\n{'='*70}")
@@ -148,205 +437,123 @@ class LoadTestGenerator:
         print(f"{'='*70}")
         print(f"  Target: {self.num_systems:,} star systems")
         print(f"  Output: {self.db_path}")
+        print(f"  Seed:   {self.seed} (batches of {self.batch_size:,}, {self.workers} worker(s))")
         print(f"{'='*70}\n")
-        
+
         self.stats['start_time'] = time.time()
-        
+
         # Remove existing database
         if self.db_path.exists():
             print(f"⚠️  Removing existing database: {self.db_path}")
             self.db_path.unlink()
-        
+
         # Create database with schema
         print("📊 Creating database schema...")
-        self.db = HavenDatabase(str(self.db_path))
-        
-        # Generate data in batches for performance
-        batch_size = 100
-        with self.db as database:
-            conn = database.conn
-            cursor = conn.cursor()
-            
-            print(f"\n🌟 Generating {self.num_systems:,} star systems...")
-            
-            for batch_start in range(0, self.num_systems, batch_size):
-                batch_end = min(batch_start + batch_size, self.num_systems)
-                self._generate_batch(cursor, batch_start, batch_end)
-                
-                # Progress indicator
-                progress = (batch_end / self.num_systems) * 100
-                elapsed = time.time() - self.stats['start_time']
-                rate = batch_end / elapsed if elapsed > 0 else 0
-                eta = (self.num_systems - batch_end) / rate if rate > 0 else 0
-                
-                print(f"  Progress: {progress:5.1f}% | "
-                      f"Systems: {batch_end:7,}/{self.num_systems:,} | "
-                      f"Rate: {rate:6.1f}/s | "
-                      f"ETA: {eta:5.1f}s", end='\r')
-            
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = open_bulk_database(self.db_path)
+
+        batches = [(start, min(start + self.batch_size, self.num_systems))
+                   for start in range(0, self.num_systems, self.batch_size)]
+
+        print(f"\n🌟 Generating {self.num_systems:,} star systems...")
+        load_began = time.perf_counter()
+        try:
+            if self.workers > 1 and len(batches) > 1:
+                self._generate_sharded(conn, batches)
+            else:
+                self._generate_serial(conn, batches)
             print()  # New line after progress
+            self.stats['seconds']['load'] = time.perf_counter() - load_began
+
+            print("🗂️  Building indexes...")
+            index_began = time.perf_counter()
+            for name, table, columns in INDEXES:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
             conn.commit()
-        
+        finally:
+            conn.close()
+
+        # The first open seeds the statistics counters; the search index is built in one pass
+        print("🔎 Building statistics and search index...")
+        with HavenDatabase(str(self.db_path)) as db:
+            db.build_search_index()
+        self.stats['seconds']['index'] = time.perf_counter() - index_began
+
         self.stats['end_time'] = time.time()
         self._print_summary()
-    
-    def _generate_batch(self, cursor: sqlite3.Cursor, start_idx: int, end_idx: int):
-        """Generate a batch of systems with all related data"""
-        for i in range(start_idx, end_idx):
-            # Generate system
-            system_id, system_name = self._generate_system(cursor, i)
-            self.stats['systems'] += 1
-            
-            # Generate planets (1-10 per system, weighted toward 4-6)
-            num_planets = random.choices([1,2,3,4,5,6,7,8,9,10], 
-                                        weights=[5,8,12,18,20,18,10,5,3,1])[0]
-            
-            planet_ids = []
-            for p in range(num_planets):
-                planet_id = self._generate_planet(cursor, system_id, system_name, p)
-                planet_ids.append(planet_id)
-                self.stats['planets'] += 1
-                
-                # Generate moons (0-5 per planet, weighted toward 0-2)
-                num_moons = random.choices([0,1,2,3,4,5], 
-                                          weights=[30,25,20,15,7,3])[0]
-                
-                for m in range(num_moons):
-                    self._generate_moon(cursor, planet_id, p, m)
-                    self.stats['moons'] += 1
-            
-            # Generate space station (50% chance)
-            if random.random() < 0.5:
-                self._generate_space_station(cursor, system_id, system_name)
-                self.stats['space_stations'] += 1
-    
-    def _generate_system(self, cursor: sqlite3.Cursor, index: int) -> tuple:
-        """Generate a star system"""
-        # Generate unique name (using index ensures uniqueness)
-        prefix = random.choice(PREFIXES)
-        system_name = f"{prefix}-{index:07d}"  # e.g., ALPHA-0000123
-        system_id = f"SYS_{prefix}_{index}"
-        
-        # Spatial coordinates (large galactic space)
-        # Distribute in 3D space: -500 to +500 for x/y, -100 to +100 for z
-        x = random.uniform(-500, 500)
-        y = random.uniform(-500, 500)
-        z = random.uniform(-100, 100)
-        
-        # Region assignment (spatial partitioning for efficient queries)
-        region = random.choice(REGIONS)
-        
-        # System-level attributes
-        fauna = random.choices(FAUNA_LEVELS, weights=FAUNA_WEIGHTS)[0]
-        flora = random.choices(FLORA_LEVELS, weights=FLORA_WEIGHTS)[0]
-        sentinel = random.choices(SENTINELS, weights=SENTINEL_WEIGHTS)[0]
-        materials = random.choice(MATERIALS)
-        
-        # Insert system
-        cursor.execute("""
-            INSERT INTO systems (id, name, x, y, z, region, fauna, flora, sentinel, materials)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (system_id, system_name, x, y, z, region, fauna, flora, sentinel, materials))
-        
-        return system_id, system_name
-    
-    def _generate_planet(self, cursor: sqlite3.Cursor, system_id: str, 
-                        system_name: str, planet_idx: int) -> int:
-        """Generate a planet"""
-        planet_name = f"{system_name}-{chr(65 + planet_idx)}"  # A, B, C, etc.
-        
-        # Planet attributes
-        sentinel = random.choices(SENTINELS, weights=SENTINEL_WEIGHTS)[0]
-        fauna = random.choices(FAUNA_LEVELS, weights=FAUNA_WEIGHTS)[0]
-        flora = random.choices(FLORA_LEVELS, weights=FLORA_WEIGHTS)[0]
-        properties = random.choice(PLANET_PROPERTIES)
-        materials = random.choice(MATERIALS)
-        
-        # Generate coordinates for base location
-        base_lat = random.uniform(-90, 90)
-        base_lon = random.uniform(-180, 180)
-        base_location = f"Settlement-{planet_idx+1}: {base_lat:.2f}, {base_lon:.2f}"
-        
-        # Notes
-        notes_options = [
-            "Colonization candidate",
-            "Resource rich extraction site",
-            "Scientific research ongoing",
-            "Hostile environment - extreme caution",
-            "Exploration in progress",
-            "Ancient ruins detected",
-            "Anomalous readings present",
-            "Paradise world - recommended",
-            "High sentinel activity",
-            "Rare materials detected"
-        ]
-        notes = random.choice(notes_options)
-        
-        # Insert planet
-        cursor.execute("""
-            INSERT INTO planets (system_id, name, sentinel, fauna, flora, 
-                               properties, materials, base_location, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (system_id, planet_name, sentinel, fauna, flora, 
-              properties, materials, base_location, notes))
-        
-        return cursor.lastrowid
-    
-    def _generate_moon(self, cursor: sqlite3.Cursor, planet_id: int, 
-                      planet_idx: int, moon_idx: int):
-        """Generate a moon"""
-        moon_name = f"Moon-{chr(945 + moon_idx)}"  # Greek letters: α, β, γ, etc.
-        
-        # Moon attributes (generally less diverse than planets)
-        sentinel = random.choices(SENTINELS, weights=[60,25,10,3,1,1])[0]  # Mostly safe
-        fauna = random.choices(FAUNA_LEVELS, weights=[40,25,15,10,5,3,2])[0]  # Less fauna
-        flora = random.choices(FLORA_LEVELS, weights=[35,25,20,10,7,3])[0]  # Less flora
-        properties = random.choice(MOON_PROPERTIES)
-        materials = random.choice(MATERIALS)
-        
-        # Orbit parameters (realistic ranges)
-        orbit_radius = random.uniform(0.3, 1.5)  # Scaled units
-        orbit_speed = random.uniform(0.02, 0.1)  # Angular velocity
-        
-        # Base location
-        base_lat = random.uniform(-90, 90)
-        base_lon = random.uniform(-180, 180)
-        base_location = f"Outpost: {base_lat:.2f}, {base_lon:.2f}"
-        
-        # Notes
-        notes = f"Natural satellite in stable orbit"
-        
-        # Insert moon
-        cursor.execute("""
-            INSERT INTO moons (planet_id, name, sentinel, fauna, flora, 
-                             properties, materials, base_location, notes,
-                             orbit_radius, orbit_speed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (planet_id, moon_name, sentinel, fauna, flora, 
-              properties, materials, base_location, notes,
-              orbit_radius, orbit_speed))
-    
-    def _generate_space_station(self, cursor: sqlite3.Cursor, 
-                               system_id: str, system_name: str):
-        """Generate a space station"""
-        station_name = f"{system_name} {random.choice(STATION_NAMES)}"
-        
-        # Position in system (relative to star at origin)
-        # Stations typically in inner to mid system
-        x = random.uniform(-5, 5)
-        y = random.uniform(-5, 5)
-        z = random.uniform(-2, 2)
-        
-        # Insert space station
-        cursor.execute("""
-            INSERT INTO space_stations (system_id, name, x, y, z)
-            VALUES (?, ?, ?, ?, ?)
-        """, (system_id, station_name, x, y, z))
-    
+
+    def _generate_serial(self, conn: sqlite3.Connection, batches: list):
+        """Generate every batch in this process, straight into the output"""
+        seconds = self.stats['seconds']
+        for start, end in batches:
+            began = time.perf_counter()
+            rows = generate_batch(self.seed, start, end, self.stats['planets'] + 1)
+            generated = time.perf_counter()
+            write_batch(conn, rows)
+            seconds['generate'] += generated - began
+            seconds['insert'] += time.perf_counter() - generated
+
+            for table in TABLE_COLUMNS:
+                self.stats[table] += len(rows[table])
+            self._print_progress()
+
+    def _generate_sharded(self, conn: sqlite3.Connection, batches: list):
+        """
+        Build runs of consecutive batches into shard databases in a process
+        pool, and merge each shard into the output, in order, as it finishes
+        """
+        shard_count = min(len(batches), self.workers * SHARDS_PER_WORKER)
+        seconds = self.stats['seconds']
+
+        with tempfile.TemporaryDirectory(prefix=f"{self.db_path.stem}_shards_",
+                                         dir=self.db_path.parent) as shard_dir:
+            tasks = [(str(Path(shard_dir) / f"shard_{n:04d}.db"), self.seed,
+                      batches[n * len(batches) // shard_count:(n + 1) * len(batches) // shard_count])
+                     for n in range(shard_count)]
+
+            with multiprocessing.Pool(self.workers) as pool:
+                for shard_path, counts, shard_seconds in pool.imap(build_shard, tasks):
+                    began = time.perf_counter()
+                    self._merge_shard(conn, shard_path)
+                    seconds['merge'] += time.perf_counter() - began
+                    seconds['generate'] += shard_seconds['generate']
+                    seconds['insert'] += shard_seconds['insert']
+                    Path(shard_path).unlink()
+
+                    for table in TABLE_COLUMNS:
+                        self.stats[table] += counts[table]
+                    self._print_progress()
+
+    def _merge_shard(self, conn: sqlite3.Connection, shard_path: str):
+        """Append a shard's rows to the output, renumbering its planets after those already merged"""
+        offset = conn.execute("SELECT COALESCE(MAX(id), 0) FROM planets").fetchone()[0]
+        conn.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+        try:
+            for table in TABLE_COLUMNS:
+                conn.execute(_merge_sql(table), (offset,) if table in MERGE_OFFSETS else ())
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE shard")
+
+    def _print_progress(self):
+        """Progress indicator"""
+        done = self.stats['systems']
+        progress = (done / self.num_systems) * 100
+        elapsed = time.time() - self.stats['start_time']
+        rate = self.total_rows / elapsed if elapsed > 0 else 0
+        eta = (self.num_systems - done) * elapsed / done if done else 0
+
+        print(f"  Progress: {progress:5.1f}% | "
+              f"Systems: {done:11,}/{self.num_systems:,} | "
+              f"Rate: {rate:11,.0f} rows/s | "
+              f"ETA: {eta:6.1f}s", end='\r')
+
     def _print_summary(self):
         """Print generation summary"""
         elapsed = self.stats['end_time'] - self.stats['start_time']
-        
+        seconds = self.stats['seconds']
+        rows = self.total_rows
+
         print(f"\n{'='*70}")
         print(f"  Generation Complete!")
         print(f"{'='*70}")
@@ -354,60 +561,66 @@ class LoadTestGenerator:
         print(f"  Planets:        {self.stats['planets']:,}")
         print(f"  Moons:          {self.stats['moons']:,}")
         print(f"  Space Stations: {self.stats['space_stations']:,}")
-        print(f"  Total Objects:  {sum([self.stats['systems'], self.stats['planets'], self.stats['moons'], self.stats['space_stations']]):,}")
+        print(f"  Total Objects:  {rows:,}")
         print(f"{'='*70}")
         print(f"  Time Elapsed:   {elapsed:.2f} seconds")
-        print(f"  Systems/sec:    {self.stats['systems']/elapsed:.1f}")
+        print(f"    Load:         {seconds['load']:.2f}s "
+              f"(generate {seconds['generate']:.2f}s, insert {seconds['insert']:.2f}s, "
+              f"merge {seconds['merge']:.2f}s)")
+        print(f"    Indexes:      {seconds['index']:.2f}s")
+        print(f"  Rows/sec:       {rows / elapsed:,.0f} overall, "
+              f"{rows / max(seconds['load'], 1e-9):,.0f} loading")
+        print(f"  Systems/sec:    {self.stats['systems']/elapsed:,.1f}")
         print(f"  Database Size:  {self.db_path.stat().st_size / (1024*1024):.2f} MB")
         print(f"{'='*70}")
         print(f"  Database: {self.db_path}")
         print(f"{'='*70}\n")
-        
+
         # Query performance test
         print("🔍 Testing query performance...")
         with HavenDatabase(str(self.db_path)) as db:
             cursor = db.conn.cursor()
-            
+
             # Test 1: Count systems
             start = time.time()
             cursor.execute("SELECT COUNT(*) FROM systems")
             count = cursor.fetchone()[0]
             t1 = time.time() - start
             print(f"  ✓ Count systems:     {count:,} in {t1*1000:.2f}ms")
-            
+
             # Test 2: Count planets
             start = time.time()
             cursor.execute("SELECT COUNT(*) FROM planets")
             count = cursor.fetchone()[0]
             t2 = time.time() - start
             print(f"  ✓ Count planets:     {count:,} in {t2*1000:.2f}ms")
-            
+
             # Test 3: Count moons
             start = time.time()
             cursor.execute("SELECT COUNT(*) FROM moons")
             count = cursor.fetchone()[0]
             t3 = time.time() - start
             print(f"  ✓ Count moons:       {count:,} in {t3*1000:.2f}ms")
-            
+
             # Test 4: Spatial query (indexed)
             start = time.time()
             cursor.execute("""
-                SELECT COUNT(*) FROM systems 
-                WHERE x BETWEEN -10 AND 10 
-                AND y BETWEEN -10 AND 10 
+                SELECT COUNT(*) FROM systems
+                WHERE x BETWEEN -10 AND 10
+                AND y BETWEEN -10 AND 10
                 AND z BETWEEN -10 AND 10
             """)
             count = cursor.fetchone()[0]
             t4 = time.time() - start
             print(f"  ✓ Spatial query:     {count:,} systems in {t4*1000:.2f}ms")
-            
+
             # Test 5: Region query (indexed)
             start = time.time()
             cursor.execute("SELECT COUNT(*) FROM systems WHERE region = ?", (REGIONS[0],))
             count = cursor.fetchone()[0]
             t5 = time.time() - start
             print(f"  ✓ Region query:      {count:,} systems in {t5*1000:.2f}ms")
-            
+
             # Test 6: Complex join (get system with all planets and moons)
             start = time.time()
             cursor.execute("""
@@ -420,7 +633,7 @@ class LoadTestGenerator:
             results = cursor.fetchall()
             t6 = time.time() - start
             print(f"  ✓ Complex join:      {len(results)} results in {t6*1000:.2f}ms")
-        
+
         print(f"\n{'='*70}")
         print("  ✅ Database ready for load testing!")
         print(f"{'='*70}\n")
@@ -439,16 +652,22 @@ def main():
 Examples:
   # Generate 10K systems (default) - Good for basic testing
   python generate_load_test_db.py
-  
+
   # Generate 100K systems - Stress test
   python generate_load_test_db.py --systems 100000
-  
+
   # Generate 1M systems - Million-scale test
   python generate_load_test_db.py --systems 1000000 --output data/haven_1M.db
-  
+
+  # Generate 10M systems (~140M rows) on 8 cores
+  python generate_load_test_db.py --systems 10000000 --workers 8 --output data/haven_10M.db
+
   # Quick test with 1K systems
   python generate_load_test_db.py --systems 1000 --output data/haven_quick_test.db
 
+  # A different (but equally reproducible) galaxy
+  python generate_load_test_db.py --seed 7
+
 Recommended Test Scales:
   - 1,000 systems   = ~10 MB    (Quick validation)
   - 10,000 systems  = ~100 MB   (Standard load test)
@@ -456,39 +675,65 @@ Recommended Test Scales:
   - 1,000,000 systems = ~10 GB  (Million-scale test)
         """
     )
-    
+
     parser.add_argument(
         '--systems',
         type=int,
         default=10000,
         help='Number of star systems to generate (default: 10,000)'
     )
-    
+
     parser.add_argument(
         '--output',
         type=str,
         default='data/haven_load_test.db',
         help='Output database file path (default: data/haven_load_test.db)'
     )
-    
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=DEFAULT_SEED,
+        help=f'Random seed; the same seed and batch size give the same database (default: {DEFAULT_SEED})'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes building shard databases that are merged into the output (default: 1)'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Systems generated and committed per transaction (default: {DEFAULT_BATCH_SIZE:,})'
+    )
+
     args = parser.parse_args()
-    
+
     # Validate
     if args.systems < 1:
         print("❌ Error: Number of systems must be at least 1")
         return 1
-    
+
+    if args.seed < 0 or args.workers < 1 or args.batch_size < 1:
+        print("❌ Error: --seed must be non-negative, --workers and --batch-size at least 1")
+        return 1
+
     if args.systems > 10_000_000:
         print(f"⚠️  Warning: {args.systems:,} systems will create a very large database!")
         response = input("Continue? (yes/no): ")
         if response.lower() != 'yes':
             print("Cancelled.")
             return 0
-    
+
     # Generate
-    generator = LoadTestGenerator(args.output, args.systems)
+    generator = LoadTestGenerator(args.output, args.systems, seed=args.seed,
+                                  batch_size=args.batch_size, workers=args.workers)
     generator.generate()
-    
+
     return 0
 
 
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Local Sync API Load Test
+
+Replays N concurrent POST /api/discoveries requests (the Keeper bot's sync
+worker draining a backlog) against the production server in local_sync_api,
+running in-process on a private copy of VH-Database.db so the real database
+is never written.
+
+Usage:
+    python tests/load_testing/load_test_sync_api.py
+    python tests/load_testing/load_test_sync_api.py --requests 2000 --concurrency 32
+    python tests/load_testing/load_test_sync_api.py --db data/haven_load_test.db --threads 4
+"""
+import sys
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import local_sync_api
+from src.migration.add_discovery_type_fields import migrate_discovery_fields
+
+DISCOVERY_TYPES = ['Relic', 'Fauna', 'Ruins', 'Flora', 'Mineral', 'Technology']
+
+
+def copy_database(source: Path, target: Path):
+    """Consistent copy of a live database using the SQLite backup API."""
+    src = sqlite3.connect(str(source))
+    dst = sqlite3.connect(str(target))
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def build_payloads(db_path: Path, count: int, seed: int = 0):
+    """Discovery payloads aimed at real systems, planets and moons in the copy."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        planets = conn.execute("""
+            SELECT s.name, p.name FROM planets p JOIN systems s ON s.id = p.system_id LIMIT 500
+        """).fetchall()
+        moons = conn.execute("""
+            SELECT s.name, m.name FROM moons m
+            JOIN planets p ON p.id = m.planet_id JOIN systems s ON s.id = p.system_id LIMIT 500
+        """).fetchall()
+    finally:
+        conn.close()
+
+    if not planets:
+        raise SystemExit(f"No planets in {db_path}; generate a load-test database first")
+
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        if moons and i % 3 == 0:
+            (system_name, location_name), location_type = rng.choice(moons), 'moon'
+        else:
+            (system_name, location_name), location_type = rng.choice(planets), 'planet'
+        payloads.append({
+            'type': rng.choice(DISCOVERY_TYPES),
+            'description': f"Load test discovery {i}",
+            'system_name': system_name,
+            'location_type': location_type,
+            'location_name': location_name,
+            'username': f"Explorer {i % 25}",
+            'user_id': str(1000 + i % 25),
+            'guild_id': 'load-test',
+        })
+    return payloads
+
+
+def post(url: str, payload: dict):
+    """POST one discovery; returns (status, seconds)."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'X-API-Key': local_sync_api.API_KEY},
+        method='POST',
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception as e:
+        status = type(e).__name__
+    return status, time.perf_counter() - started
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(db_source: Path, requests: int, concurrency: int, threads: int) -> dict:
+    """Replay discoveries against a temporary copy of db_source and report results."""
+    workdir = Path(tempfile.mkdtemp(prefix='sync_api_load_'))
+    db_copy = workdir / 'VH-Database.db'
+    copy_database(db_source, db_copy)
+    # Load-test databases predate the type-specific discovery columns
+    migrate_discovery_fields(db_copy)
+    payloads = build_payloads(db_copy, requests)
+
+    local_sync_api.VH_DATABASE_PATH = str(db_copy)
+    server = local_sync_api.create_server('127.0.0.1', 0, threads)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/api/discoveries"
+
+    conn = sqlite3.connect(str(db_copy))
+    before = conn.execute("SELECT COUNT(*) FROM discoveries").fetchone()[0]
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda p: post(url, p), payloads))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    written = conn.execute("SELECT COUNT(*) FROM discoveries").fetchone()[0] - before
+    conn.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies_ms = [seconds * 1000 for _, seconds in results]
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'server_threads': threads,
+        'seconds': elapsed,
+        'requests_per_second': requests / elapsed if elapsed else 0.0,
+        'statuses': dict(Counter(status for status, _ in results)),
+        'rows_written': written,
+        'p50_ms': percentile(latencies_ms, 50),
+        'p95_ms': percentile(latencies_ms, 95),
+        'p99_ms': percentile(latencies_ms, 99),
+        'max_ms': max(latencies_ms),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay concurrent discovery writes against local_sync_api")
+    parser.add_argument('--db', default=local_sync_api.VH_DATABASE_PATH,
+                        help="Database to copy (default: data/VH-Database.db)")
+    parser.add_argument('--requests', type=int, default=500, help="Discoveries to POST (default: 500)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument('--threads', type=int, default=local_sync_api.DEFAULT_THREADS,
+                        help="Server worker threads")
+    args = parser.parse_args(argv)
+
+    source = Path(args.db)
+    if not source.exists():
+        print(f"Database not found: {source}")
+        return 1
+
+    print(f"Replaying {args.requests} discoveries with {args.concurrency} clients "
+          f"against a copy of {source} ({args.threads} server threads)...")
+    report = run(source, args.requests, args.concurrency, args.threads)
+
+    print(f"\n{'='*60}")
+    print("LOAD TEST RESULTS")
+    print(f"{'='*60}")
+    print(f"  Duration:      {report['seconds']:.2f} s")
+    print(f"  Throughput:    {report['requests_per_second']:.1f} requests/s")
+    print(f"  Latency p50:   {report['p50_ms']:.1f} ms")
+    print(f"  Latency p95:   {report['p95_ms']:.1f} ms")
+    print(f"  Latency p99:   {report['p99_ms']:.1f} ms")
+    print(f"  Latency max:   {report['max_ms']:.1f} ms")
+    print(f"  Statuses:      {report['statuses']}")
+    print(f"  Rows written:  {report['rows_written']} / {report['requests']}")
+
+    ok = report['statuses'].get(201, 0) == report['requests'] == report['rows_written']
+    print(f"\n{'✅ All discoveries written' if ok else '❌ Some discoveries were lost'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Query Plan Regression Suite
+
+Runs every HavenDatabase and local_sync_api read path against a load-test
+database, captures the SQL it actually executes, and checks each statement
+with EXPLAIN QUERY PLAN. A test fails when a query falls back to a full
+table SCAN that the index design in common.database is meant to prevent.
+
+By default a small load-test database is generated with LoadTestGenerator.
+Point HAVEN_LOAD_TEST_DB at a real one (e.g. data/haven_load_test.db) to
+check plans against production-sized statistics.
+"""
+
+import os
+import re
+import sys
+import shutil
+import sqlite3
+import contextlib
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from common.database import HavenDatabase
+from migration.add_discovery_type_fields import migrate_discovery_fields
+
+# Small bookkeeping tables that are always read in full
+ALWAYS_SCANNED = {'_statistics', '_region_statistics', '_metadata', 'sqlite_master'}
+
+# "SCAN <table>" with no index is a full table scan; "SCAN t USING INDEX"
+# and virtual table (FTS) scans are not
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+# Keeper bot leaderboard queries against VH-Database.db (cogs/community_features.py)
+KEEPER_LEADERBOARD_QUERIES = [
+    ("""
+        SELECT discord_user_id as user_id, discovered_by as username,
+               COUNT(*) as count, discovery_type as latest_type
+        FROM discoveries
+        WHERE discord_guild_id = ?
+        GROUP BY discord_user_id
+        ORDER BY count DESC
+        LIMIT 10
+    """, ('guild-1',)),
+    ("""
+        SELECT discord_user_id as user_id, discovered_by as username, COUNT(*) as count
+        FROM discoveries
+        WHERE discord_guild_id = ? AND submission_timestamp >= ?
+        GROUP BY discord_user_id
+        ORDER BY count DESC
+        LIMIT 5
+    """, ('guild-1', '2025-01-01')),
+]
+
+
+@pytest.fixture(scope='module')
+def load_test_db(tmp_path_factory):
+    """A load-test database with discoveries and planner statistics."""
+    target = tmp_path_factory.mktemp('plans') / 'haven_load_test.db'
+
+    source = os.environ.get('HAVEN_LOAD_TEST_DB')
+    if source:
+        shutil.copy(source, target)
+    else:
+        from generate_load_test_db import LoadTestGenerator
+        LoadTestGenerator(str(target), num_systems=500).generate()
+
+    migrate_discovery_fields(target)
+
+    with HavenDatabase(str(target)) as db:
+        system_ids = [row[0] for row in db.conn.execute("SELECT id FROM systems LIMIT 200")]
+        for i, system_id in enumerate(system_ids):
+            db.conn.execute("""
+                INSERT INTO discoveries (discovery_type, system_id, location_type, description,
+                                         discord_guild_id, discord_user_id, discovered_by)
+                VALUES (?, ?, 'planet', ?, ?, ?, ?)
+            """, (['Relic', 'Fauna', 'Ruins'][i % 3], system_id, f"Discovery {i}",
+                  f"guild-{i % 2}", f"user-{i % 17}", f"Explorer {i % 17}"))
+        db.conn.commit()
+        db.conn.execute("ANALYZE")
+        db.conn.commit()
+
+    return target
+
+
+@contextlib.contextmanager
+def capture_sql(conn):
+    """Record every statement executed on conn (with parameters expanded)."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
+
+
+def full_scans(conn, sql, params=()):
+    """Return tables that EXPLAIN QUERY PLAN reports as full scans."""
+    scans = set()
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+        match = FULL_SCAN.match(row[-1])
+        if match:
+            scans.add(match.group(1))
+    return scans - ALWAYS_SCANNED
+
+
+def assert_no_full_scans(conn, statements, allowed=frozenset()):
+    """Check the plan of every captured SELECT statement."""
+    selects = [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+    assert selects, "no SELECT statements were captured"
+    for sql in selects:
+        scans = full_scans(conn, sql) - set(allowed)
+        assert not scans, f"full table scan of {sorted(scans)} in:\n{sql}"
+
+
+def _sample(db):
+    row = db.conn.execute("""
+        SELECT s.id, s.name, s.region, p.id, p.name, m.id, m.name
+        FROM moons m JOIN planets p ON m.planet_id = p.id JOIN systems s ON s.id = p.system_id
+        LIMIT 1
+    """).fetchone()
+    return dict(zip(('system_id', 'system_name', 'region', 'planet_id',
+                     'planet_name', 'moon_id', 'moon_name'), row))
+
+
+HAVEN_DATABASE_CALLS = {
+    'get_all_systems(region)': lambda db, s: db.get_all_systems(region=s['region']),
+    'get_all_systems(region, planets)': lambda db, s: db.get_all_systems(region=s['region'],
+                                                                        include_planets=True),
+    'get_systems_paginated': lambda db, s: db.get_systems_paginated(page=3, per_page=20),
+    'get_systems_paginated(region)': lambda db, s: db.get_systems_paginated(region=s['region']),
+    'get_systems_in_region_sphere': lambda db, s: db.get_systems_in_region_sphere(0, 0, 0, 50),
+    'get_systems_in_region_sphere(region)': lambda db, s: db.get_systems_in_region_sphere(
+        0, 0, 0, 50, region=s['region']),
+    'get_region_aggregates': lambda db, s: db.get_region_aggregates(),
+    'get_system_by_name': lambda db, s: db.get_system_by_name(s['system_name']),
+    'get_system_by_id': lambda db, s: db.get_system_by_id(s['system_id']),
+    'search_systems': lambda db, s: db.search_systems(s['system_name'][:4]),
+    'get_system_names(prefix)': lambda db, s: db.get_system_names(s['system_name'][:3], limit=50),
+    'get_system_names(after)': lambda db, s: db.get_system_names(after=s['system_name'], limit=50),
+    'search_discoveries': lambda db, s: db.search_discoveries('discovery', discovery_type='Relic'),
+    'get_regions': lambda db, s: db.get_regions(),
+    'get_region_counts': lambda db, s: db.get_region_counts(),
+    'get_total_count': lambda db, s: db.get_total_count(),
+    'get_statistics': lambda db, s: db.get_statistics(),
+    'system_exists': lambda db, s: db.system_exists(s['system_name']),
+    'get_discoveries(system)': lambda db, s: db.get_discoveries(system_id=s['system_id']),
+    'get_discoveries(type)': lambda db, s: db.get_discoveries(discovery_type='Relic'),
+    'get_discoveries(planet)': lambda db, s: db.get_discoveries(planet_id=s['planet_id']),
+    'get_discoveries(moon)': lambda db, s: db.get_discoveries(moon_id=s['moon_id']),
+    'get_discoveries()': lambda db, s: db.get_discoveries(),
+    'get_discoveries_page(planet)': lambda db, s: db.get_discoveries_page(
+        planet_id=s['planet_id'], type_contains='relic', after=('2030-01-01', 1 << 40)),
+    'get_discoveries_page(system)': lambda db, s: db.get_discoveries_page(system_id=s['system_id']),
+    'get_discovery_by_id': lambda db, s: db.get_discovery_by_id(1),
+    'get_discovery_count(system)': lambda db, s: db.get_discovery_count(system_id=s['system_id']),
+    'get_metadata': lambda db, s: db.get_metadata('version'),
+}
+
+
+@pytest.mark.parametrize('name', sorted(HAVEN_DATABASE_CALLS))
+def test_haven_database_query_plans(load_test_db, name):
+    """HavenDatabase read methods never fall back to full table scans."""
+    with HavenDatabase(str(load_test_db)) as db:
+        sample = _sample(db)
+        with capture_sql(db.conn) as statements:
+            HAVEN_DATABASE_CALLS[name](db, sample)
+        assert_no_full_scans(db.conn, statements)
+
+
+@pytest.mark.parametrize('sql, params', KEEPER_LEADERBOARD_QUERIES)
+def test_keeper_leaderboard_uses_covering_index(load_test_db, sql, params):
+    """Leaderboards are answered from idx_discoveries_guild_user without a table lookup."""
+    conn = sqlite3.connect(str(load_test_db))
+    try:
+        details = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        assert any('COVERING INDEX idx_discoveries_guild_user' in d for d in details), details
+        assert not any(d.startswith('USE TEMP B-TREE FOR GROUP BY') for d in details), details
+    finally:
+        conn.close()
+
+
+# (method, url, json body, tables that may legitimately be read in full)
+SYNC_API_REQUESTS = [
+    # The full dump may read whole tables when one batch covers most of the galaxy
+    ('get', '/api/systems', None, {'systems', 'planets', 'moons'}),
+    ('get', '/api/systems?format=ndjson&region={region}&limit=50', None, set()),
+    ('get', '/api/systems?fields=name,region,x,y,z&after={system_name}&limit=50', None, set()),
+    ('get', '/api/systems/{system_name}', None, set()),
+    ('get', '/api/discoveries/1', None, set()),
+    ('get', '/api/stats', None, set()),
+    ('post', '/api/discoveries', 'planet', set()),
+    ('post', '/api/discoveries', 'moon', set()),
+]
+
+
+@pytest.mark.parametrize('method, url, body, allowed', SYNC_API_REQUESTS)
+def test_local_sync_api_query_plans(load_test_db, monkeypatch, method, url, body, allowed):
+    """local_sync_api endpoints stay on indexes (except the full /api/systems dump)."""
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    pytest.importorskip('dotenv')
+    import local_sync_api
+
+    statements = []
+
+    def traced_connection():
+        conn = sqlite3.connect(str(load_test_db))
+        conn.row_factory = sqlite3.Row
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(local_sync_api, 'get_db_connection', traced_connection)
+    monkeypatch.setattr(local_sync_api, 'VH_DATABASE_PATH', str(load_test_db))
+    client = local_sync_api.app.test_client()
+    headers = {'X-API-Key': local_sync_api.API_KEY}
+
+    with HavenDatabase(str(load_test_db)) as db:
+        sample = _sample(db)
+
+    if body:
+        payload = {
+            'type': 'Relic',
+            'description': 'Query plan probe',
+            'system_name': sample['system_name'],
+            'location_type': body,
+            'location_name': sample[f'{body}_name'],
+        }
+        response = client.post(url, json=payload, headers=headers)
+    else:
+        response = client.get(url.format(**sample), headers=headers)
+        response.get_data()  # drain streamed responses so their queries run
+    assert response.status_code < 500, response.get_json()
+
+    checker = sqlite3.connect(str(load_test_db))
+    try:
+        assert_no_full_scans(checker, statements, allowed)
+    finally:
+        checker.close()
@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the unit tests
+
+- make_system: one system dict in the data.json layout, numbered i
+- make_galaxy: a data.json-style dict of consecutive systems
+- haven_db: an open HavenDatabase in the test's temporary directory
+"""
+
+import pytest
+
+from common.database import HavenDatabase
+
+
+def _make_system(i, planets=1, moons=1, **overrides):
+    """
+    System number i: SYS_<i> "System <i>" in Euclid
+
+    Args:
+        i: Number used in the id, the names and x (kept inside the schema's bounds)
+        planets: Number of planets ("Planet <i>-<p>"), or a list used as is
+        moons: Moons per planet ("Moon <i>-<p>-<m>")
+        **overrides: Fields replacing (or added to) the defaults
+
+    Returns:
+        System dict
+    """
+    if isinstance(planets, int):
+        planets = [{"name": f"Planet {i}-{p}",
+                    "moons": [{"name": f"Moon {i}-{p}-{m}"} for m in range(moons)]}
+                   for p in range(planets)]
+    system = {"id": f"SYS_{i}", "name": f"System {i}", "region": "Euclid",
+              "x": float(i % 100), "y": 0.0, "z": 0.0, "planets": planets}
+    system.update(overrides)
+    return system
+
+
+def _make_galaxy(count, start=0, regions=None, meta=False, **system_kwargs):
+    """
+    Systems start .. start + count - 1 keyed by name, as in data.json
+
+    Args:
+        regions: Regions assigned round-robin by number (default: Euclid)
+        meta: Put a "_meta" envelope first
+        **system_kwargs: Passed to make_system for every system
+    """
+    galaxy = {"_meta": {"version": "1.0.0"}} if meta else {}
+    for i in range(start, start + count):
+        if regions:
+            system_kwargs["region"] = regions[i % len(regions)]
+        system = _make_system(i, **system_kwargs)
+        galaxy[system["name"]] = system
+    return galaxy
+
+
+@pytest.fixture
+def make_system():
+    """Factory for system dicts (see _make_system)."""
+    return _make_system
+
+
+@pytest.fixture
+def make_galaxy():
+    """Factory for data.json-style galaxies (see _make_galaxy)."""
+    return _make_galaxy
+
+
+@pytest.fixture
+def haven_db(tmp_path):
+    """An open HavenDatabase at tmp_path / "haven.db", closed after the test."""
+    with HavenDatabase(str(tmp_path / "haven.db")) as db:
+        yield db
@@ -0,0 +1,135 @@
+"""
+Test Background I/O Executor
+
+Tests the bounded worker pool in common.async_io: results and timings,
+cancelling queued and superseded (keyed) tasks, and delivery of callbacks
+on the Tk thread through the after() poll.
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.async_io import BackgroundExecutor
+
+
+class FakeRoot:
+    """Stands in for a Tk root: after() callbacks run when pump() is called."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.alive = True
+
+    def _root(self):
+        return self
+
+    def winfo_exists(self):
+        return self.alive
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, timeout=5.0):
+        deadline = time.time() + timeout
+        while self.scheduled and time.time() < deadline:
+            callback = self.scheduled.pop(0)
+            callback()
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def executor():
+    pool = BackgroundExecutor('test', max_workers=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_results_callbacks_and_timing(executor):
+    """Results reach on_done, errors reach on_error, and each task is timed."""
+    results, errors = [], []
+    ok = executor.submit(lambda a, b: a + b, 2, 3, on_done=results.append, name="add")
+    bad = executor.submit(lambda: 1 / 0, on_error=errors.append)
+
+    assert ok.result(timeout=5) == 5
+    with pytest.raises(ZeroDivisionError):
+        bad.result(timeout=5)
+    assert results == [5] and isinstance(errors[0], ZeroDivisionError)
+    assert ok.run_ms is not None and ok.queued_ms is not None
+
+
+def test_cancel_queued_and_superseded_tasks(executor):
+    """A queued task never runs once cancelled; a new keyed submit cancels the old one."""
+    release = threading.Event()
+    ran = []
+    blocker = executor.submit(release.wait)
+    queued = executor.submit(ran.append, 'queued', on_done=ran.append)
+    first = executor.submit(ran.append, 'first', key='list')
+    latest = executor.submit(lambda: 'latest', key='list', on_done=ran.append)
+
+    assert queued.cancel() is True
+    assert first.cancelled()
+    release.set()
+    assert latest.result(timeout=5) == 'latest'
+    blocker.result(timeout=5)
+
+    assert ran == ['latest']
+
+
+def test_callbacks_run_on_tk_thread(executor):
+    """Callbacks wait for the after() poll and are dropped for destroyed widgets."""
+    root = FakeRoot()
+    delivered = []
+    executor.submit(lambda: 'rows', widget=root,
+                    on_done=lambda value: delivered.append((value, threading.current_thread())))
+    time.sleep(0.05)
+    assert delivered == []  # nothing touches Tk from the worker
+
+    root.pump()
+    assert delivered == [('rows', threading.current_thread())]
+    assert not root.scheduled  # polling stops when idle
+
+    root.alive = False
+    executor.submit(lambda: 'late', widget=root, on_done=delivered.append)
+    root.pump()
+    assert len(delivered) == 1
+
+
+def test_finished_task_superseded_before_delivery(executor):
+    """A finished keyed task whose callback is still queued is dropped by a newer submit."""
+    root = FakeRoot()
+    delivered = []
+    first = executor.submit(lambda: 'stale page', widget=root, key='page', on_done=delivered.append)
+    first.result(timeout=5)
+    assert delivered == []  # callback waiting for the after() poll
+
+    latest = executor.submit(lambda: 'fresh list', widget=root, key='page', on_done=delivered.append)
+    latest.result(timeout=5)
+    root.pump()
+    assert delivered == ['fresh list']
+
+
+def test_progress_reaches_tk_thread_before_result(executor):
+    """progress= reports are queued for the after() poll ahead of the result."""
+    root = FakeRoot()
+    seen = []
+
+    def work(progress):
+        for step in range(3):
+            progress(step, 3)
+        return 'done'
+
+    executor.submit(work, widget=root, on_done=seen.append,
+                    on_progress=lambda done, total: seen.append((done, total, threading.current_thread())))
+    time.sleep(0.05)
+    assert seen == []
+
+    root.pump()
+    me = threading.current_thread()
+    assert seen == [(0, 3, me), (1, 3, me), (2, 3, me), 'done']
+    assert not root.scheduled
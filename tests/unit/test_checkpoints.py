@@ -0,0 +1,135 @@
+"""
+Test Import Checkpoints
+
+Tests that an import or JSON -> SQLite migration interrupted part way
+through resumes after its last committed batch (nothing written twice,
+nothing lost), that unchanged files are skipped on re-import, and that a
+changed file is imported again.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.checkpoints import ImportCheckpoint, commit_batch
+from common.database import HavenDatabase
+from src.common.data_provider import DatabaseDataProvider
+from src.migration.import_json import JSONImporter
+from src.migration.json_to_sqlite import JSONToSQLiteMigrator, MIGRATION_JOB
+
+
+def _crash_after(monkeypatch, cls, method, calls):
+    """Make cls.method raise KeyboardInterrupt (not caught by the writers) on call number calls + 1"""
+    original = getattr(cls, method)
+    seen = []
+
+    def crashing(self, *args, **kwargs):
+        seen.append(1)
+        if len(seen) > calls:
+            raise KeyboardInterrupt
+        return original(self, *args, **kwargs)
+    monkeypatch.setattr(cls, method, crashing)
+
+
+def _count(db_path, table="systems"):
+    with HavenDatabase(str(db_path)) as db:
+        return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _importer(db_path):
+    importer = JSONImporter(use_database=False)
+    importer.provider = DatabaseDataProvider(str(db_path))
+    return importer
+
+
+def test_directory_import_resumes_and_skips_unchanged(tmp_path, monkeypatch, make_galaxy):
+    """A crashed import picks up after its committed batches; unchanged files are skipped."""
+    source = tmp_path / "imports"
+    source.mkdir()
+    (source / "a.json").write_text(json.dumps(make_galaxy(10)), encoding="utf-8")
+    (source / "b.json").write_text(json.dumps(make_galaxy(25, start=10)), encoding="utf-8")
+    db_path = tmp_path / "haven.db"
+
+    # a.json (2 batches) and 3 batches of b.json commit, then the writer dies
+    with monkeypatch.context() as patch:
+        _crash_after(patch, JSONImporter, "_apply_batch", 5)
+        with pytest.raises(KeyboardInterrupt):
+            _importer(db_path).import_directory(source, workers=1, batch_size=5)
+    assert _count(db_path) == 25
+    with HavenDatabase(str(db_path)) as db:
+        checkpoint = ImportCheckpoint(db, "import", source / "b.json")
+        assert (checkpoint.position, checkpoint.system_key, checkpoint.batches) == (15, "System 24", 3)
+
+    importer = _importer(db_path)
+    assert importer.import_directory(source, workers=1, batch_size=5)
+    stats = importer.stats
+    assert (stats.files_unchanged, stats.systems_imported, stats.systems_skipped) == (1, 10, 0)
+    assert _count(db_path) == 35 and _count(db_path, "planets") == 35
+
+    # Nothing changed: both files skipped without being parsed
+    importer = _importer(db_path)
+    assert importer.import_directory(source, workers=2)
+    assert (importer.stats.files_unchanged, importer.stats.systems_found) == (2, 0)
+
+    # A changed file is imported again; --restart re-imports unchanged ones
+    (source / "a.json").write_text(json.dumps({**make_galaxy(10), **make_galaxy(2, start=40)}), encoding="utf-8")
+    importer = _importer(db_path)
+    assert importer.import_directory(source, workers=1)
+    assert (importer.stats.files_unchanged, importer.stats.systems_imported,
+            importer.stats.systems_skipped) == (1, 2, 10)
+    importer = _importer(db_path)
+    assert importer.import_file(source / "b.json", resume=False)
+    assert (importer.stats.files_unchanged, importer.stats.systems_skipped) == (0, 25)
+
+
+def test_migration_resumes_after_crash(tmp_path, monkeypatch, make_galaxy):
+    """An interrupted migration resumes instead of deleting the database."""
+    json_path = tmp_path / "data.json"
+    json_path.write_text(json.dumps(make_galaxy(23, meta=True)), encoding="utf-8")
+    db_path = tmp_path / "haven.db"
+
+    migrator = JSONToSQLiteMigrator(str(json_path), str(db_path))
+    migrator.batch_size = 5
+    with monkeypatch.context() as patch:
+        _crash_after(patch, JSONToSQLiteMigrator, "_migrate_system", 12)
+        with pytest.raises(KeyboardInterrupt):
+            migrator.migrate(backup=False, verify=False)
+    assert _count(db_path) == 10
+
+    # No overwrite prompt: input() would fail under pytest
+    migrator = JSONToSQLiteMigrator(str(json_path), str(db_path))
+    migrator.batch_size = 5
+    assert migrator.migrate(backup=False, verify=True)
+    assert migrator.resume_position == 10
+    assert migrator.stats.systems_migrated == 23 and migrator.stats.planets_migrated == 13
+    assert _count(db_path) == 23 and _count(db_path, "planets") == 23
+    with HavenDatabase(str(db_path)) as db:
+        assert ImportCheckpoint(db, MIGRATION_JOB, json_path).complete
+
+
+def test_commit_batch_isolates_failing_items(tmp_path):
+    """A failing batch is retried item by item; only committed items are returned and checkpointed."""
+    failures = []
+    with HavenDatabase(str(tmp_path / "haven.db")) as db:
+        db.conn.execute("CREATE TABLE items (key TEXT PRIMARY KEY)")
+        checkpoint = ImportCheckpoint(db, "test", tmp_path / "haven.db", "hash")
+
+        def apply(items):
+            for key, bad in items:
+                db.conn.execute("INSERT INTO items VALUES (?)", (key,))
+                if bad:
+                    raise ValueError(key)
+            return [key for key, _ in items]
+
+        batch = [("a", False), ("b", True), ("c", False)]
+        written = commit_batch(db.conn, batch, apply, checkpoint, 10,
+                               lambda item, e: failures.append(item[0]))
+        assert written == ["a", "c"] and failures == ["b"]
+        assert [row[0] for row in db.conn.execute("SELECT key FROM items ORDER BY key")] == ["a", "c"]
+        assert (checkpoint.position, checkpoint.system_key) == (13, "c")
@@ -0,0 +1,107 @@
+"""
+Test Columnar Galaxy Format
+
+Tests that .hvcol files round-trip exactly to the data.json dict (across
+block boundaries, mixed value types, missing fields and nested planets),
+that truncated files are rejected, and that sync_data exports and
+JSONImporter imports them like their JSON counterparts.
+"""
+
+import sys
+import json
+import gzip
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.columnar import (ColumnarFormatError, is_columnar_file, iter_columnar,
+                             read_columnar, write_columnar)
+from common.database import HavenDatabase
+
+
+def _galaxy(make_system, count):
+    data = {"_meta": {"version": "1.0.0", "description": "Columnar test"}}
+    for i in range(count):
+        system = make_system(i, region=["Euclid", "Hilbert"][i % 2], x=i * 1.5, y=i, z=2 if i % 3 else 2.25,
+                             fauna=["Rich", None][i % 2],
+                             planets=[{"name": f"Planet {i}-{j}", "sentinel": "Low",
+                                       "moons": [{"name": f"Moon {i}-{j}"}] if j else []}
+                                      for j in range(i % 3)])
+        if i % 4 == 0:
+            system["space_station"] = {"name": "Hub", "race": "Gek"}
+        if i % 5 == 0:
+            del system["fauna"]
+        data[system["name"]] = system
+    # Keys that are not the name, legacy string planets, odd numbers
+    data["legacy"] = {"name": "Legacy", "x": "4.0", "y": None, "z": 2 ** 60, "flag": True,
+                      "planets": ["Old Planet"]}
+    return data
+
+
+def _pairs(data):
+    return ((key, value) for key, value in data.items() if key != "_meta")
+
+
+def test_round_trip_matches_json(tmp_path, make_system):
+    """Reading a columnar file gives exactly the dict json.load gives."""
+    data = _galaxy(make_system, 250)
+    path = tmp_path / "galaxy.hvcol"
+    write_columnar(path, _pairs(data), meta=data["_meta"], block_size=64)
+
+    assert is_columnar_file(path)
+    assert read_columnar(path) == json.loads(json.dumps(data))
+    assert [key for key, _ in iter_columnar(path)] == list(data)[1:]
+    assert path.stat().st_size < len(json.dumps(data, indent=2)) / 4
+
+    # Detected by content too, whatever the suffix
+    renamed = path.rename(tmp_path / "galaxy.bin")
+    assert is_columnar_file(renamed)
+    assert not is_columnar_file(tmp_path / "missing.json")
+
+
+def test_truncated_file_is_rejected(tmp_path, make_system):
+    """A file cut short (no end frame) raises instead of returning part of the galaxy."""
+    data = _galaxy(make_system, 50)
+    path = tmp_path / "galaxy.hvcol"
+    write_columnar(path, _pairs(data), meta=data["_meta"], block_size=10)
+
+    raw = gzip.decompress(path.read_bytes())
+    path.write_bytes(gzip.compress(raw[:len(raw) // 2]))
+    with pytest.raises(ColumnarFormatError):
+        read_columnar(path)
+
+
+def test_sync_export_and_import(tmp_path, haven_db, make_system):
+    """sync_data's columnar export matches its JSON export and imports back."""
+    from src.migration.sync_data import DataSynchronizer
+    from src.migration.import_json import JSONImporter
+    from src.common.data_provider import DatabaseDataProvider
+
+    for key, system in _pairs(_galaxy(make_system, 40)):
+        if key != "legacy":
+            haven_db.add_system(system)
+
+    syncer = DataSynchronizer(str(tmp_path / "data.json"), str(haven_db.db_path))
+    assert syncer.sync_db_to_json(backup=False, batch_size=7)
+    assert syncer.sync_db_to_columnar(batch_size=7)
+    assert syncer.last_report.added == 40
+
+    exported = json.loads((tmp_path / "data.json").read_text(encoding="utf-8"))
+    columnar = read_columnar(tmp_path / "data.hvcol")
+    assert columnar["_meta"]["synced_from_database"]
+    assert {k: v for k, v in columnar.items() if k != "_meta"} == \
+        {k: v for k, v in exported.items() if k != "_meta"}
+
+    target = tmp_path / "imported.db"
+    importer = JSONImporter(use_database=False)
+    importer.provider = DatabaseDataProvider(str(target))
+    assert importer.import_file(tmp_path / "data.hvcol")
+    assert (importer.stats.systems_found, importer.stats.systems_imported) == (40, 40)
+    with HavenDatabase(str(target)) as db:
+        imported = db.get_system_by_id("SYS_2")
+    assert [p["name"] for p in imported["planets"]] == ["Planet 2-0", "Planet 2-1"]
+    assert imported["planets"][1]["moons"][0]["name"] == "Moon 2-1"
@@ -0,0 +1,130 @@
+"""
+Test Full-Text Search
+
+Tests the FTS5 indexes behind HavenDatabase.search_systems and
+search_discoveries: prefix matching, planet/moon names, trigger sync on
+edits and deletes, safe handling of FTS operator characters, building the
+index as an explicit step, and keys that survive VACUUM.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase, build_fts_query
+
+
+def _populate(db):
+    db.add_system({
+        "id": "SYS_OOT", "name": "OOTLEFAR V", "region": "Euclid",
+        "x": 0, "y": 0, "z": 0, "materials": "Gold, Cadmium",
+        "planets": [{"name": "Brightwater", "moons": [{"name": "Palemoon"}]}],
+    })
+    db.add_system({
+        "id": "SYS_ZEN", "name": "Zenith Prime", "region": "Euclid",
+        "x": 1, "y": 1, "z": 1, "attributes": "Trade hub; near OOTLEFAR",
+        "planets": [{"name": "Ashfall"}],
+    })
+
+
+def test_build_fts_query_quotes_user_text():
+    """Operators and punctuation in user text can't break the MATCH syntax."""
+    assert build_fts_query("ootle gold") == '"ootle"* "gold"*'
+    assert build_fts_query('Tenex[VH] OR "x') == '"Tenex"* "VH"* "OR"* "x"*'
+    assert build_fts_query("  --  ") is None
+    assert build_fts_query("ash", ("name",)) == '{name} : ("ash"*)'
+
+
+def test_search_systems_ranks_and_prefix_matches(tmp_path):
+    """Name matches outrank attribute matches; planets and moons are searchable."""
+    with HavenDatabase(str(tmp_path / "search.db")) as db:
+        _populate(db)
+
+        names = [s["name"] for s in db.search_systems("ootle")]
+        assert names == ["OOTLEFAR V", "Zenith Prime"]
+
+        assert [s["name"] for s in db.search_systems("cadm")] == ["OOTLEFAR V"]
+        assert [s["name"] for s in db.search_systems("palemoon")] == ["OOTLEFAR V"]
+        assert [s["name"] for s in db.search_systems("ashf")] == ["Zenith Prime"]
+        assert db.search_systems('"') == []
+
+
+def test_search_index_follows_edits(tmp_path):
+    """Renames, planet replacement and deletes are reflected immediately."""
+    with HavenDatabase(str(tmp_path / "sync.db")) as db:
+        _populate(db)
+
+        db.update_system("SYS_ZEN", {"name": "Nadir Secundus", "planets": [{"name": "Cinderfield"}]})
+        assert db.search_systems("zenith") == []
+        assert [s["name"] for s in db.search_systems("nadir")] == ["Nadir Secundus"]
+        assert [s["name"] for s in db.search_systems("cinder")] == ["Nadir Secundus"]
+        assert db.search_systems("ashfall") == []
+
+        db.delete_system("SYS_OOT")
+        assert db.search_systems("brightwater") == []
+
+
+def test_search_discoveries(tmp_path):
+    """Discovery text is searchable and filters combine with the match."""
+    with HavenDatabase(str(tmp_path / "disc.db")) as db:
+        _populate(db)
+        first = db.add_discovery({
+            "discovery_type": "Relic", "description": "Monolith covered in glyphs",
+            "location_type": "planet", "location_name": "Brightwater", "system_id": "SYS_OOT",
+        })
+        db.add_discovery({
+            "discovery_type": "Fauna", "description": "Glowing grazer herd",
+            "location_type": "planet", "location_name": "Ashfall", "system_id": "SYS_ZEN",
+        })
+
+        assert [d["id"] for d in db.search_discoveries("glyph")] == [first]
+        assert len(db.search_discoveries("gl")) == 2
+        assert len(db.search_discoveries("gl", discovery_type="Fauna")) == 1
+
+        db.update_discovery(first, {"description": "Weathered obelisk"})
+        assert [d["id"] for d in db.search_discoveries("obelisk")] == [first]
+        assert db.search_discoveries("monolith") == []
+
+
+def test_search_index_is_built_explicitly(tmp_path):
+    """Opening a database without the index only detects it; building is a separate step."""
+    path = tmp_path / "legacy.db"
+    with HavenDatabase(str(path)) as db:
+        _populate(db)
+        for (name,) in db.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_fts%'").fetchall():
+            db.conn.execute(f"DROP TRIGGER {name}")
+        for table in ("systems_fts", "systems_fts_keys", "discoveries_fts"):
+            db.conn.execute(f"DROP TABLE {table}")
+        db.conn.commit()
+
+    with HavenDatabase(str(path)) as db:
+        assert not db._fts_enabled
+        assert db.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name LIKE '%_fts%'").fetchone()[0] == 0
+        assert [s["name"] for s in db.search_systems("Cadmium")] == ["OOTLEFAR V"]   # LIKE fallback
+
+        assert db.build_search_index()
+        assert [s["name"] for s in db.search_systems("palemoon")] == ["OOTLEFAR V"]
+
+    with HavenDatabase(str(path)) as db:
+        assert db._fts_enabled
+
+
+def test_search_index_survives_vacuum(tmp_path):
+    """The index is keyed on system IDs, so VACUUM renumbering rowids can't mismatch it."""
+    with HavenDatabase(str(tmp_path / "vacuum.db")) as db:
+        db.add_system({"id": "SYS_GONE", "name": "Gone", "region": "Euclid", "x": 0, "y": 0, "z": 0})
+        _populate(db)
+        db.delete_system("SYS_GONE")
+        db.conn.execute("VACUUM")
+
+        assert [s["name"] for s in db.search_systems("cadm")] == ["OOTLEFAR V"]
+        assert [s["name"] for s in db.search_systems("ashf")] == ["Zenith Prime"]
+
+        db.add_system({"id": "SYS_LONE", "name": "Lone", "region": "Euclid", "x": 2, "y": 2, "z": 2})
+        db.conn.execute("UPDATE systems SET id = 'SYS_LONE_2' WHERE id = 'SYS_LONE'")
+        db.conn.execute("UPDATE systems SET name = 'Lone Tertius' WHERE id = 'SYS_LONE_2'")
+        assert [s["id"] for s in db.search_systems("tertius")] == ["SYS_LONE_2"]
@@ -0,0 +1,118 @@
+"""
+Test Trigger-Maintained Database Statistics
+
+Tests that the _statistics and _region_statistics counters stay in step with
+the real tables across inserts, cascading deletes and region changes, and
+that recompute_statistics() detects and repairs drift.
+"""
+
+import sys
+import sqlite3
+import subprocess
+from pathlib import Path
+
+# Add src to path
+SRC = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(SRC))
+
+from common.database import HavenDatabase, read_table_counts
+
+
+# Every test system has a space station
+STATION = {"name": "Hub"}
+
+
+def _live_counts(db):
+    return {
+        table: db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("systems", "planets", "moons", "space_stations", "discoveries")
+    }
+
+
+def test_counters_follow_writes(haven_db, make_system):
+    """Counters match COUNT(*) after adds, updates and cascading deletes."""
+    db = haven_db
+    db.add_system(make_system(1, planets=2, region="Adam", space_station=STATION))
+    db.add_system(make_system(2, planets=3, region="Adam", space_station=STATION))
+    db.add_system(make_system(3, planets=2, region="Star", space_station=STATION))
+    db.add_discovery({
+        "discovery_type": "Relic",
+        "description": "Old ruins",
+        "location_type": "planet",
+        "system_id": "SYS_1",
+    })
+
+    stats = db.get_statistics()
+    live = _live_counts(db)
+    assert stats["total_systems"] == live["systems"] == 3
+    assert stats["total_planets"] == live["planets"] == 7
+    assert stats["total_moons"] == live["moons"] == 7
+    assert stats["total_stations"] == live["space_stations"] == 3
+    assert stats["total_discoveries"] == live["discoveries"] == 1
+    assert stats["regions"] == ["Adam", "Star"]
+
+    # Cascade delete through planets -> moons must decrement every counter
+    db.delete_system("SYS_2")
+    assert read_table_counts(db.conn) == _live_counts(db)
+
+    # Moving the last system out of a region removes that region
+    db.update_system("SYS_3", {"region": "Euclid"})
+    assert db.get_region_counts() == {"Adam": 1, "Euclid": 1}
+    assert db.get_regions() == ["Adam", "Euclid"]
+
+
+def test_existing_database_is_seeded(tmp_path, make_system):
+    """Databases created before the counters existed are seeded on open."""
+    db_path = tmp_path / "legacy.db"
+    with HavenDatabase(str(db_path)) as db:
+        db.add_system(make_system(1, planets=2, region="Adam", space_station=STATION))
+
+    # Simulate a pre-statistics database
+    conn = sqlite3.connect(str(db_path))
+    for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_stats_%'").fetchall():
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("DROP TABLE _statistics")
+    conn.execute("DROP TABLE _region_statistics")
+    conn.commit()
+    conn.close()
+
+    with HavenDatabase(str(db_path)) as db:
+        assert db.get_total_count() == 1
+        assert db.get_statistics()["total_planets"] == 2
+        assert db.get_regions() == ["Adam"]
+
+
+def test_recompute_statistics_repairs_drift(haven_db, make_system):
+    """recompute_statistics() reports and fixes drifted counters."""
+    db = haven_db
+    db.add_system(make_system(1, planets=2, region="Adam", space_station=STATION))
+    db.conn.execute("UPDATE _statistics SET row_count = 99 WHERE table_name = 'planets'")
+    db.conn.execute("UPDATE _region_statistics SET system_count = 5 WHERE region = 'Adam'")
+    db.conn.commit()
+
+    result = db.recompute_statistics()
+    assert result["tables"] == {"planets": {"stored": 99, "actual": 2}}
+    assert result["regions"] == {"Adam": {"stored": 5, "actual": 1}}
+    assert result["repaired"]
+
+    assert db.recompute_statistics() == {"tables": {}, "regions": {}, "repaired": False}
+    assert db.get_statistics()["total_planets"] == 2
+
+
+def test_recompute_stats_from_the_command_line(tmp_path, make_system):
+    """python src/common/database.py --recompute-stats DB repairs the counters."""
+    path = tmp_path / "haven.db"
+    with HavenDatabase(str(path)) as db:
+        db.add_system(make_system(1, planets=2, space_station=STATION))
+        db.conn.execute("UPDATE _statistics SET row_count = 99 WHERE table_name = 'planets'")
+        db.conn.commit()
+
+    out = subprocess.run([sys.executable, str(SRC / "common" / "database.py"),
+                          "--recompute-stats", str(path)],
+                         capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert "planets: stored 99, actual 2" in out.stdout
+
+    with HavenDatabase(str(path)) as db:
+        assert db.recompute_statistics()["tables"] == {}
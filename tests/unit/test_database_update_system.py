@@ -0,0 +1,99 @@
+"""
+Test Diff-Based System Updates
+
+Tests that HavenDatabase.update_system patches planets, moons and space
+stations in place: unchanged rows are untouched, matched rows keep their
+IDs (so discovery links survive), and the row changes are reported.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+
+PLANETS = [
+    {"name": "Alpha Prime", "fauna": "Rich", "moons": [{"name": "Alpha Moon", "flora": "Lush"}]},
+    {"name": "Alpha Minor", "sentinel": "Low"},
+]
+
+
+def _populate(db):
+    db.add_system({
+        "id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 1, "y": 2, "z": 3,
+        "planets": PLANETS,
+        "space_station": {"name": "Alpha Hub", "race": "Gek"},
+    })
+    prime = db.get_system_by_id("SYS_A")["planets"][0]
+    discovery_id = db.add_discovery({
+        "discovery_type": "Relic", "description": "Obelisk", "location_type": "moon",
+        "system_id": "SYS_A", "planet_id": prime["id"], "moon_id": prime["moons"][0]["id"],
+    })
+    return prime, discovery_id
+
+
+def test_unchanged_tree_issues_no_writes(tmp_path):
+    """Re-saving the same tree writes nothing and reports no changes."""
+    with HavenDatabase(str(tmp_path / "same.db")) as db:
+        _populate(db)
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        changes = db.update_system("SYS_A", {"name": "Alpha", "planets": PLANETS,
+                                             "space_station": {"name": "Alpha Hub", "race": "Gek"}})
+        db.conn.set_trace_callback(None)
+
+        assert changes == {}
+        assert not [s for s in statements if s.split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+
+
+def test_update_patches_rows_and_keeps_discovery_links(tmp_path):
+    """Only changed rows are written; matched planets and moons keep their ids."""
+    with HavenDatabase(str(tmp_path / "patch.db")) as db:
+        prime, discovery_id = _populate(db)
+
+        changes = db.update_system("SYS_A", {
+            "attributes": "Trade hub",
+            "planets": [
+                {"name": "Alpha Prime", "fauna": "Sparse",
+                 "moons": [{"name": "Alpha Moon", "flora": "Lush"}, {"name": "Alpha Shard"}]},
+                {"name": "Alpha Nova"},
+            ],
+            "space_station": {"name": "Alpha Exchange", "race": "Gek"},
+        })
+
+        assert changes == {
+            "systems": {"update": 1},
+            "planets": {"delete": 1, "update": 1, "insert": 1},
+            "moons": {"insert": 1},
+            "space_stations": {"update": 1},
+        }
+
+        system = db.get_system_by_id("SYS_A")
+        assert system["attributes"] == "Trade hub"
+        assert [p["name"] for p in system["planets"]] == ["Alpha Prime", "Alpha Nova"]
+        kept = system["planets"][0]
+        assert kept["id"] == prime["id"] and kept["fauna"] == "Sparse"
+        assert kept["moons"][0]["id"] == prime["moons"][0]["id"]
+        assert system["space_station"]["name"] == "Alpha Exchange"
+
+        discovery = db.get_discovery_by_id(discovery_id)
+        assert (discovery["planet_id"], discovery["moon_id"]) == (prime["id"], prime["moons"][0]["id"])
+
+
+def test_planets_replace_stored_rows(tmp_path):
+    """Fields and moons left out of a planet are cleared, like a full replacement."""
+    with HavenDatabase(str(tmp_path / "replace.db")) as db:
+        prime, discovery_id = _populate(db)
+
+        changes = db.update_system("SYS_A", {"planets": [{"name": "Alpha Prime"}], "space_station": None})
+
+        assert changes["moons"] == {"delete": 1}
+        assert changes["discoveries"] == {"update": 1}  # moon link cleared
+        system = db.get_system_by_id("SYS_A")
+        assert [(p["name"], p["fauna"], p["moons"]) for p in system["planets"]] == [("Alpha Prime", None, [])]
+        assert "space_station" not in system
+
+        discovery = db.get_discovery_by_id(discovery_id)
+        assert (discovery["planet_id"], discovery["moon_id"]) == (prime["id"], None)
@@ -0,0 +1,69 @@
+"""
+Test Discovery Paging
+
+Tests HavenDatabase.get_discoveries_page, which backs the discoveries
+window: newest-first keyset pages that never skip or repeat rows (even
+with equal or missing timestamps) and discovery type filtering in SQL.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+
+TYPES = ['ancient_bones', 'Ruins', 'Flora/Fauna', 'text_logs', 'ruins_structures', '100%_tech']
+
+
+def _populate(db):
+    db.add_system({"id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 0, "y": 0, "z": 0,
+                   "planets": [{"name": "Alpha Prime"}]})
+    planet_id = db.get_system_by_id("SYS_A")["planets"][0]["id"]
+    for i in range(23):
+        db.add_discovery({"discovery_type": TYPES[i % len(TYPES)], "description": f"Find {i}",
+                          "location_type": "planet", "system_id": "SYS_A", "planet_id": planet_id})
+    # Equal and missing timestamps must still page deterministically
+    db.conn.execute("UPDATE discoveries SET submission_timestamp = '2025-01-0' || (id % 3 + 1) || ' 00:00:00'")
+    db.conn.execute("UPDATE discoveries SET submission_timestamp = NULL WHERE id % 5 = 0")
+    db.conn.commit()
+    return planet_id
+
+
+def _all_pages(db, size, **filters):
+    rows, after = [], None
+    while True:
+        page = db.get_discoveries_page(**filters, after=after, limit=size)
+        rows.extend(page)
+        if len(page) < size:
+            return rows
+        after = (page[-1]['submission_timestamp'], page[-1]['id'])
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path):
+    """Pages concatenate to the full newest-first ordering, undated rows last."""
+    with HavenDatabase(str(tmp_path / "pages.db")) as db:
+        planet_id = _populate(db)
+
+        expected = [row[0] for row in db.conn.execute("""
+            SELECT id FROM discoveries
+            ORDER BY submission_timestamp IS NULL, submission_timestamp DESC, id DESC
+        """)]
+        for size in (1, 4, 7, 50):
+            assert [row['id'] for row in _all_pages(db, size, planet_id=planet_id)] == expected
+        assert [row['id'] for row in _all_pages(db, 5, system_id="SYS_A")] == expected
+
+
+def test_type_filter_runs_in_sql(tmp_path):
+    """type_contains matches case-insensitively and treats % and _ literally."""
+    with HavenDatabase(str(tmp_path / "filter.db")) as db:
+        planet_id = _populate(db)
+
+        ruins = _all_pages(db, 3, planet_id=planet_id, type_contains="ruins")
+        assert ruins and {row['discovery_type'] for row in ruins} == {'Ruins', 'ruins_structures'}
+
+        assert {row['discovery_type'] for row in
+                db.get_discoveries_page(planet_id=planet_id, type_contains="100%")} == {'100%_tech'}
+        assert db.get_discoveries_page(planet_id=planet_id, type_contains="ru_ns") == []
+        assert db.get_discoveries_page(planet_id=planet_id + 1) == []
@@ -0,0 +1,104 @@
+"""
+Test Discovery Writer
+
+Tests the shared discovery writer: the declarative field spec, column
+matching against older schemas, and the name-resolution cache with its
+trigger-based invalidation.
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+from common.discovery_writer import DiscoveryWriter, field_value, get_discovery_writer
+from migration.add_discovery_type_fields import migrate_discovery_fields
+
+
+def _populate(db_path):
+    with HavenDatabase(str(db_path)) as db:
+        db.add_system({
+            "id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 0, "y": 0, "z": 0,
+            "planets": [{"name": "Alpha Prime", "moons": [{"name": "Alpha Moon"}]}],
+        })
+
+
+def test_field_value_aliases():
+    """The first truthy alias wins, otherwise the last key (or default) is used."""
+    keys = ('username', 'discovered_by')
+    assert field_value({'username': 'a', 'discovered_by': 'b'}, keys) == 'a'
+    assert field_value({'username': '', 'discovered_by': 'b'}, keys) == 'b'
+    assert field_value({}, ('analysis_status',), 'pending') == 'pending'
+    assert field_value({'mystery_tier': None}, ('mystery_tier',), 0) is None
+
+
+def test_add_discovery_matches_schema(tmp_path):
+    """Base schemas skip type-specific columns; migrated ones store them."""
+    db_path = tmp_path / "writer.db"
+    _populate(db_path)
+    discovery = {"discovery_type": "Fauna", "description": "Grazer", "location_type": "planet",
+                 "system_id": "SYS_A", "species_name": "Ridgeback"}
+
+    with HavenDatabase(str(db_path)) as db:
+        first = db.add_discovery(discovery)
+        assert db.get_discovery_by_id(first)["analysis_status"] == "pending"
+
+    migrate_discovery_fields(db_path)
+    get_discovery_writer(db_path).invalidate()
+
+    with HavenDatabase(str(db_path)) as db:
+        second = db.add_discovery(discovery)
+        assert db.get_discovery_by_id(second)["species_name"] == "Ridgeback"
+
+
+def test_resolution_cache_and_invalidation(tmp_path):
+    """Cached names skip lookups until a system, planet or moon changes."""
+    db_path = tmp_path / "cache.db"
+    _populate(db_path)
+    writer = DiscoveryWriter(str(db_path))
+    conn = sqlite3.connect(str(db_path))
+
+    system_id, planet_id, moon_id = writer.resolve_location(conn, "Alpha", "moon", "Alpha Moon")
+    assert system_id == "SYS_A" and planet_id and moon_id
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    assert writer.resolve_location(conn, "Alpha", "moon", "Alpha Moon") == (system_id, planet_id, moon_id)
+    assert all('_metadata' in sql for sql in statements)
+    conn.set_trace_callback(None)
+
+    # Another connection replaces the planet (new ids) and renames the system
+    with HavenDatabase(str(db_path)) as db:
+        db.update_system("SYS_A", {"name": "Alpha Renamed",
+                                   "planets": [{"name": "Alpha Novus", "moons": [{"name": "Alpha Moon"}]}]})
+
+    assert writer.resolve_location(conn, "Alpha", "planet", "Alpha Prime") == (None, None, None)
+    assert writer.resolve_location(conn, "Alpha Renamed", "planet", "Alpha Prime") == (system_id, None, None)
+    _, new_planet_id, new_moon_id = writer.resolve_location(conn, "Alpha Renamed", "moon", "Alpha Moon")
+    assert (new_planet_id, new_moon_id) != (planet_id, moon_id)
+    conn.close()
+
+
+def test_write_resolves_and_links(tmp_path):
+    """write() stores resolved ids and the payload's aliased fields."""
+    db_path = tmp_path / "write.db"
+    _populate(db_path)
+    migrate_discovery_fields(db_path)
+    writer = DiscoveryWriter(str(db_path))
+    conn = sqlite3.connect(str(db_path))
+
+    results = writer.write_many(conn, [
+        {"type": "Relic", "description": "Obelisk", "system_name": "Alpha",
+         "location_type": "planet", "location_name": "Alpha Prime", "username": "Explorer"},
+        {"type": "Flora", "description": "Lichen", "system_name": "Nowhere", "location_type": "space",
+         "location_name": "Void"},
+    ])
+    assert results[0]["planet_id"] and results[1]["system_id"] is None
+
+    row = conn.execute("SELECT discovery_type, discovered_by, planet_id FROM discoveries WHERE id = ?",
+                       (results[0]["discovery_id"],)).fetchone()
+    assert row == ("Relic", "Explorer", results[0]["planet_id"])
+    conn.close()
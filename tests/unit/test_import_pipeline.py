@@ -0,0 +1,144 @@
+"""
+Test Pipelined Directory Import
+
+Tests that JSONImporter.import_directory gives the same database with a
+process pool as serially (duplicates skipped across files, ID conflicts
+renamed, unreadable files reported), that a failing system does not take
+its batch down with it, and that per-stage timings are collected. Also
+tests that nested and Keeper-format discoveries are imported on the
+writer's connection.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.columnar import write_columnar
+from common.database import HavenDatabase
+from src.common.data_provider import DatabaseDataProvider
+from src.migration.import_json import JSONImporter, IMPORT_STAGES
+
+
+def _mixed_galaxy(make_galaxy, count, start=0, meta=False):
+    """Odd systems keep legacy string planets"""
+    galaxy = make_galaxy(count, start=start, meta=meta)
+    for i in range(start, start + count):
+        if i % 2:
+            galaxy[f"System {i}"]["planets"] = ["Old Planet"]
+    return galaxy
+
+
+def _write_imports(directory, make_system, make_galaxy):
+    directory.mkdir()
+    for n in range(3):
+        data = _mixed_galaxy(make_galaxy, 25, start=n * 20, meta=True)   # 5 systems overlap the next file
+        (directory / f"export_{n}.json").write_text(json.dumps(data), encoding="utf-8")
+    # Same ID as System 0 under another name
+    clash = {"Clash": make_system(0, name="Clash")}
+    write_columnar(directory / "export_3.hvcol", clash.items())
+    (directory / "broken.json").write_text("{not json", encoding="utf-8")
+
+
+def _import(tmp_path, source, workers, **kwargs):
+    target = tmp_path / f"haven_{workers}.db"
+    importer = JSONImporter(use_database=False)
+    importer.provider = DatabaseDataProvider(str(target))
+    importer.import_directory(source, workers=workers, batch_size=8, **kwargs)
+    with HavenDatabase(str(target)) as db:
+        rows = db.conn.execute("""
+            SELECT s.id, s.name, p.name, p.sentinel, m.name FROM systems s
+            LEFT JOIN planets p ON p.system_id = s.id
+            LEFT JOIN moons m ON m.planet_id = p.id ORDER BY s.name
+        """).fetchall()
+    return importer.stats, [tuple(row) for row in rows]
+
+
+def _renamed(rows):
+    """Rows with the clash's new ID (it carries a timestamp) masked"""
+    return [("<renamed>",) + row[1:] if row[1] == "Clash" else row for row in rows]
+
+
+def test_parallel_matches_serial(tmp_path, make_system, make_galaxy):
+    """A pooled import writes exactly what a serial one does."""
+    source = tmp_path / "imports"
+    _write_imports(source, make_system, make_galaxy)
+
+    _, serial_rows = _import(tmp_path, source, workers=1)
+    stats, rows = _import(tmp_path, source, workers=2)
+
+    assert _renamed(rows) == _renamed(serial_rows)
+    assert (stats.files_processed, stats.systems_found) == (4, 76)
+    assert (stats.systems_imported, stats.systems_skipped, stats.systems_failed) == (66, 10, 0)
+    assert any("broken.json" in error for error in stats.errors)
+
+    clash = [row for row in rows if row[1] == "Clash"][0]
+    assert clash[0] != "SYS_0" and clash[0].startswith("SYS_EUCLID_")
+    assert ("SYS_1", "System 1", "Old Planet", "Unknown", None) in rows
+    assert ("SYS_2", "System 2", "Planet 2-0", "Unknown", "Moon 2-0-0") in rows
+
+    assert set(stats.stage_seconds) == set(IMPORT_STAGES)
+    assert stats.stage_seconds["write"] > 0 and stats.elapsed_seconds > 0
+    assert "Stage Timings" in str(stats)
+
+
+def test_failed_system_does_not_fail_batch(tmp_path, make_galaxy):
+    """A system the database rejects is reported; the rest of its batch is written."""
+    source = tmp_path / "imports"
+    source.mkdir()
+    data = _mixed_galaxy(make_galaxy, 10)
+    del data["System 4"]["region"]
+    (source / "export.json").write_text(json.dumps(data), encoding="utf-8")
+
+    stats, rows = _import(tmp_path, source, workers=1, skip_validation=True)
+    assert (stats.systems_imported, stats.systems_failed) == (9, 1)
+    assert "System 4" not in {row[1] for row in rows}
+    assert any("System 4" in error for error in stats.errors)
+
+    # Re-import with updates: matched by name, planets diffed in place
+    data["System 4"]["region"] = "Euclid"
+    data["System 3"]["planets"] = ["Old Planet", "New Planet"]
+    (source / "export.json").write_text(json.dumps(data), encoding="utf-8")
+    importer = JSONImporter(use_database=False)
+    importer.provider = DatabaseDataProvider(str(tmp_path / "haven_1.db"))
+    assert importer.import_directory(source, allow_updates=True, workers=1)
+    assert (importer.stats.systems_imported, importer.stats.systems_updated) == (1, 9)
+    with HavenDatabase(str(tmp_path / "haven_1.db")) as db:
+        planets = db.get_system_by_id("SYS_3")["planets"]
+    assert [p["name"] for p in planets] == ["Old Planet", "New Planet"]
+
+
+def test_discoveries_imported_with_systems(tmp_path, make_system):
+    """System and planet discoveries land with their system; Keeper files resolve names."""
+    source = tmp_path / "imports"
+    source.mkdir()
+    finding = {"discovery_type": "Fossil", "description": "Bones", "location_type": "planet"}
+    system = make_system(2, discoveries=[dict(finding, location_type="space"),
+                                     dict(finding, description="Dangling", moon_id=99999),   # FK fails
+                                     dict(finding, description="Kept", location_type="space")])
+    system["planets"][0]["discoveries"] = [finding, {"description": "no type"}]
+    system["planets"].append({"name": "Planet X", "discoveries": [dict(finding, description="X")]})
+    (source / "a_export.json").write_text(json.dumps({"System 2": system}), encoding="utf-8")
+    keeper = {"discoveries": [
+        {"type": "Ruin", "description": "Arch", "system_name": " System 2 ", "planet_name": "Planet X"},
+        {"type": "Ruin", "description": "Lost", "system_name": "Nowhere"},   # no location
+        "not a discovery",
+    ]}
+    (source / "b_keeper.json").write_text(json.dumps(keeper), encoding="utf-8")
+
+    _import(tmp_path, source, workers=1)
+    with HavenDatabase(str(tmp_path / "haven_1.db")) as db:
+        planet_ids = dict(db.conn.execute("SELECT name, id FROM planets").fetchall())
+        found = [tuple(row) for row in db.conn.execute(
+            "SELECT description, system_id, planet_id FROM discoveries ORDER BY id")]
+    # Invalid rows are reported and skipped without losing the rest of their batch
+    assert found == [
+        ("Bones", "SYS_2", None),
+        ("Kept", "SYS_2", None),
+        ("Bones", "SYS_2", planet_ids["Planet 2-0"]),
+        ("X", "SYS_2", planet_ids["Planet X"]),
+        ("Arch", "SYS_2", planet_ids["Planet X"]),
+    ]
@@ -0,0 +1,128 @@
+"""
+Test Octree LOD Tiles
+
+Tests the Galaxy View octree built by Beta_VH_Map: every system lands in
+exactly one leaf, interior nodes carry bounded samples of their subtree,
+the binary tile layout round-trips, large maps are written as tiles with
+per-tile metadata, and rewriting tiles only deletes the generator's own files.
+"""
+
+import re
+import sys
+import json
+import base64
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import Beta_VH_Map as vh_map
+
+
+def _subtree_points(nodes_by_key, tiles, key):
+    node = nodes_by_key[key]
+    if not node["children"]:
+        return set(tiles[key].tolist())
+    points = set()
+    for child in node["children"]:
+        points |= _subtree_points(nodes_by_key, tiles, child)
+    return points
+
+
+def test_build_octree_partitions_points():
+    """Leaves cover every point once; interior samples come from their subtree."""
+    rng = np.random.default_rng(7)
+    positions = rng.uniform(-500, 500, size=(5000, 3)).astype(np.float32)
+    nodes, tiles = vh_map.build_octree(positions, max_points=400, sample_points=64)
+    nodes_by_key = {n["key"]: n for n in nodes}
+
+    leaves = [n for n in nodes if not n["children"]]
+    leaf_points = np.concatenate([tiles[n["key"]] for n in leaves])
+    assert sorted(leaf_points.tolist()) == list(range(5000))
+    assert all(n["points"] <= 400 for n in leaves)
+
+    root = nodes_by_key["r"]
+    assert nodes[0] is root and root["count"] == 5000
+    for node in nodes:
+        lo, hi = np.array(node["min"]), np.array(node["max"])
+        inside = positions[tiles[node["key"]]]
+        assert ((inside >= lo - 1e-3) & (inside <= hi + 1e-3)).all()
+        if node["children"]:
+            assert node["points"] == 64
+            assert node["count"] == sum(nodes_by_key[c]["count"] for c in node["children"])
+            assert set(tiles[node["key"]].tolist()) <= _subtree_points(nodes_by_key, tiles, node["key"])
+
+
+def test_build_octree_depth_cap_and_duplicates():
+    """Identical coordinates stop splitting at max_depth instead of recursing forever."""
+    positions = np.zeros((50, 3), dtype=np.float32)
+    nodes, tiles = vh_map.build_octree(positions, max_points=10, sample_points=5, max_depth=3)
+    assert max(len(n["key"]) for n in nodes) == 4
+    assert sum(len(tiles[n["key"]]) for n in nodes if not n["children"]) == 50
+    assert vh_map.build_octree(np.zeros((0, 3))) == ([], {})
+
+
+def test_encode_tile_layout():
+    """Tiles are little-endian Float32 xyz triples followed by uint32 ids."""
+    positions = np.arange(12, dtype=np.float32).reshape(4, 3)
+    ids = np.array([1, 3])
+    data = vh_map.encode_tile(positions, ids)
+    assert np.frombuffer(data[:24], dtype="<f4").tolist() == [3, 4, 5, 9, 10, 11]
+    assert np.frombuffer(data[24:], dtype="<u4").tolist() == [1, 3]
+
+
+def test_galaxy_view_written_as_tiles(tmp_path, monkeypatch):
+    """With lod=True the Galaxy View embeds no systems and points at its own tiles."""
+    # load_discoveries() would open (and migrate) the tracked data/VH-Database.db
+    monkeypatch.setattr(vh_map, "load_discoveries", lambda: [])
+    df = pd.DataFrame([
+        {"name": f"SYS {i}", "region": "Euclid", "x": i, "y": -i, "z": 2 * i,
+         "planets": [{"name": "P", "moons": [{"name": "M"}]}]}
+        for i in range(30)
+    ])
+    out = tmp_path / "VH-Map.html"
+    vh_map.write_galaxy_and_system_views(df, out, lod=True)
+
+    html = out.read_text(encoding="utf-8")
+    assert 'window.MAP_TILES = {"index": "VH-Map_tiles/index.js"}' in html
+    assert "window.SYSTEMS_DATA = [];" in html
+
+    tiles_dir = tmp_path / "VH-Map_tiles"
+    index = (tiles_dir / "index.js").read_text(encoding="utf-8")
+    assert index.startswith("HavenTiles.index(")
+    assert '"count":30' in index and "SYS 5" not in index
+
+    # Metadata travels with the tile, aligned with its ids
+    key, payload, meta = re.match(r'HavenTiles\.tile\("(\w+)","([^"]+)",(.*)\);',
+                                  (tiles_dir / "r.js").read_text(encoding="utf-8")).groups()
+    data = base64.b64decode(payload)
+    xyz = np.frombuffer(data[:30 * 12], dtype="<f4").reshape(30, 3)
+    ids = np.frombuffer(data[30 * 12:], dtype="<u4").tolist()
+    # Three.js coordinates: y and z swapped
+    assert xyz[ids.index(5)].tolist() == [5.0, 10.0, -5.0]
+    assert json.loads(meta)[ids.index(5)] == ["SYS 5", "Euclid", 1, 1]
+
+
+def test_tiles_only_replace_own_files(tmp_path):
+    """Rewriting tiles removes only generator files; foreign directories are refused."""
+    df = pd.DataFrame([{"name": f"SYS {i}", "region": "Euclid", "x": i, "y": 0, "z": 0, "planets": []}
+                       for i in range(10)])
+    tiles_dir = tmp_path / "map_tiles"
+    vh_map.write_octree_tiles(df, tiles_dir)
+    (tiles_dir / "stale.js").write_text("keep me", encoding="utf-8")
+    (tiles_dir / "r.js").write_text("old", encoding="utf-8")
+
+    vh_map.write_octree_tiles(df, tiles_dir)
+    assert (tiles_dir / "stale.js").read_text(encoding="utf-8") == "keep me"
+    assert (tiles_dir / "r.js").read_text(encoding="utf-8").startswith("HavenTiles.tile(")
+
+    foreign = tmp_path / "tiles"
+    foreign.mkdir()
+    (foreign / "photo.png").write_bytes(b"png")
+    with pytest.raises(FileExistsError):
+        vh_map.write_octree_tiles(df, foreign)
+    assert (foreign / "photo.png").exists()
@@ -0,0 +1,52 @@
+"""
+Test Persistent Map Worker
+
+Tests that map jobs run in one long-lived worker process, that progress
+is streamed back, and that a worker which died is replaced on the next job.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+pytest.importorskip('pandas')
+
+from common.map_worker import MapWorker
+
+
+def test_jobs_share_one_worker_process(tmp_path, make_galaxy):
+    """Repeat builds reuse the worker; a dead worker is restarted."""
+    data = tmp_path / "data.json"
+    data.write_text(json.dumps(make_galaxy(20, regions=("R0", "R1", "R2"), meta=True)))
+    out = tmp_path / "dist" / "VH-Map.html"
+    # --no-discoveries: never open the tracked data/VH-Database.db
+    args = ["--no-open", "--no-discoveries", "--data-file", str(data), "--out", str(out)]
+
+    worker = MapWorker(log_dir=tmp_path / "logs")
+    try:
+        messages = []
+        assert worker.generate(args, on_progress=messages.append) == 0
+        pid = worker.pid
+        assert out.exists() and messages
+
+        out.unlink()
+        assert worker.generate(args) == 0
+        assert worker.pid == pid and out.exists()
+
+        # A bad job reports its exit code without taking the worker down
+        assert worker.generate(["--no-open", "--data-file", str(tmp_path / "missing.json")]) == 1
+        assert worker.pid == pid
+
+        worker._process.kill()
+        worker._process.wait()
+        assert worker.generate(args) == 0
+        assert worker.pid != pid
+        assert worker.jobs_run == 4
+    finally:
+        worker.stop()
+    assert not worker.running
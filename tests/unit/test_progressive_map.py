@@ -0,0 +1,109 @@
+"""
+Test Progressive Map Queries
+
+Tests the SQL region aggregates behind the progressive Galaxy Overview and
+the local_sync_api endpoints the viewer uses to load a region's systems.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src and project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.database import HavenDatabase
+
+
+def _populate(db):
+    for i in range(4):
+        db.add_system({"id": f"SYS_A{i}", "name": f"Adam {i}", "region": "Adam",
+                       "x": i * 2.0, "y": 10.0, "z": -i})
+    db.add_system({"id": "SYS_E0", "name": "Euclid 0", "region": "Euclid",
+                   "x": 100.0, "y": 0.0, "z": 0.0})
+
+
+def test_region_aggregates(tmp_path):
+    """Count, centroid and bounding box are computed per region."""
+    with HavenDatabase(str(tmp_path / "map.db")) as db:
+        _populate(db)
+        adam, euclid = db.get_region_aggregates()
+
+    assert adam["region"] == "Adam" and adam["count"] == 4
+    assert (adam["cx"], adam["cy"], adam["cz"]) == (3.0, 10.0, -1.5)
+    assert (adam["min_x"], adam["max_x"], adam["min_z"], adam["max_z"]) == (0.0, 6.0, -3.0, 0.0)
+    assert euclid["count"] == 1 and euclid["cx"] == 100.0
+
+
+def test_sphere_query_region_filter(tmp_path):
+    """The sphere query can be restricted to one region."""
+    with HavenDatabase(str(tmp_path / "map.db")) as db:
+        _populate(db)
+        assert len(db.get_systems_in_region_sphere(50, 0, 0, 200)) == 5
+        names = [s["name"] for s in db.get_systems_in_region_sphere(50, 0, 0, 200, region="Euclid")]
+        assert names == ["Euclid 0"]
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    pytest.importorskip('dotenv')
+    import local_sync_api
+
+    db_path = tmp_path / "VH-Database.db"
+    with HavenDatabase(str(db_path)) as db:
+        _populate(db)
+
+    monkeypatch.setattr(local_sync_api, 'VH_DATABASE_PATH', str(db_path))
+    client = local_sync_api.app.test_client()
+    client.environ_base['HTTP_X_API_KEY'] = local_sync_api.API_KEY
+    return client
+
+
+def test_map_endpoints(api_client):
+    """Regions come back as aggregates; systems load per region or sphere."""
+    regions = api_client.get('/api/map/regions').get_json()['regions']
+    assert [(r['region'], r['count']) for r in regions] == [('Adam', 4), ('Euclid', 1)]
+
+    result = api_client.get('/api/map/systems?region=Adam&limit=3').get_json()
+    assert len(result['systems']) == 3 and result['truncated']
+    assert set(result['systems'][0]) == {'id', 'name', 'region', 'x', 'y', 'z'}
+
+    result = api_client.get('/api/map/systems?x=100&y=0&z=0&radius=5').get_json()
+    assert [s['name'] for s in result['systems']] == ['Euclid 0'] and not result['truncated']
+
+    assert api_client.get('/api/map/systems').status_code == 400
+    assert api_client.get('/api/map/systems?radius=abc').status_code == 400
+
+
+def test_map_token_is_read_only(api_client, monkeypatch):
+    """The map token opens the map endpoints and nothing else."""
+    import local_sync_api
+    monkeypatch.setattr(local_sync_api, 'MAP_TOKEN', 'map-token')
+    del api_client.environ_base['HTTP_X_API_KEY']
+
+    assert api_client.get('/api/map/regions').status_code == 401
+    assert api_client.get('/api/map/regions', headers={'X-Map-Token': 'wrong'}).status_code == 401
+    assert api_client.get('/api/map/regions', headers={'X-Map-Token': 'map-token'}).status_code == 200
+    assert api_client.get('/api/systems/Adam 0', headers={'X-Map-Token': 'map-token'}).status_code == 401
+    assert api_client.get('/api/map/regions', headers={'X-API-Key': local_sync_api.API_KEY}).status_code == 200
+
+
+def test_progressive_view_embeds_no_key(tmp_path, monkeypatch):
+    """The generated page carries the API URL but no credential."""
+    pytest.importorskip('pandas')
+    import Beta_VH_Map as vh_map
+    monkeypatch.setenv('HAVEN_API_KEY', 'secret-write-key')
+
+    db_path = tmp_path / "map.db"
+    with HavenDatabase(str(db_path)) as db:
+        _populate(db)
+    output = tmp_path / "VH-Map.html"
+    vh_map.write_progressive_galaxy_view(db_path, output, api_url="http://localhost:5000/api/")
+
+    html = output.read_text(encoding="utf-8")
+    assert '"url": "http://localhost:5000/api"' in html
+    assert 'secret-write-key' not in html and '"key"' not in html
@@ -0,0 +1,145 @@
+"""
+Test Startup Time
+
+Cold-starts the modules the Control Room and System Entry Wizard import
+at the top of their files (read from their source; GUI toolkits are
+stubbed) in a fresh interpreter, and checks that this does not pull in
+modules that are meant to load lazily. The wall-clock check against
+STARTUP_BUDGET_SECONDS is marked slow. Also checks the --profile-startup
+report.
+"""
+
+import ast
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+SRC = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(SRC))
+
+from common.startup import StartupProfiler, lazy_import
+
+# Generous for slow CI machines; a warm local run takes a few tens of ms
+STARTUP_BUDGET_SECONDS = 1.5
+
+# Applications whose top-level imports make up the cold start
+APPS = ["control_room.py", "system_entry_wizard.py"]
+
+# Stubbed in the cold start: their import time is not ours to budget
+GUI_MODULES = ["customtkinter", "tkinter"]
+
+# Imported by actions, never at startup
+LAZY_MODULES = ["jsonschema", "concurrent.futures.process", "common.map_worker",
+                "common.vh_database_backup", "test_manager_window", "Beta_VH_Map", "pandas"]
+
+COLD_START = """
+import sys, json, time, types, importlib
+sys.path[:0] = [{src!r}, {root!r}]
+
+class _Stub(types.ModuleType):
+    def __getattr__(self, name):
+        return type(name, (), {{"__init__": lambda self, *args, **kwargs: None}})
+
+for name in {gui!r}:
+    sys.modules[name] = _Stub(name)
+
+from common.startup import start_profiling, startup_phase
+profiler = start_profiling("test", force=True)
+with startup_phase("imports"):
+    for name in {modules!r}:
+        importlib.import_module(name)
+from common.data_source_manager import get_data_source_manager
+with startup_phase("data sources"):
+    manager = get_data_source_manager(defer_counts=True)
+print(json.dumps({{
+    "seconds": time.perf_counter() - profiler.started,
+    "counts_loaded": manager.counts_loaded,
+    "loaded": [name for name in {lazy!r}
+               if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule"],
+    "phases": [name for name, _, _ in profiler.phases],
+}}))
+"""
+
+
+def _top_level_imports(path):
+    """Modules imported at module level (not inside functions or classes), in order"""
+    modules = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                modules.append(node.module)
+            elif isinstance(node, (ast.If, ast.Try, ast.With)):
+                for block in ("body", "orelse", "finalbody"):
+                    visit(getattr(node, block, []))
+                for handler in getattr(node, "handlers", []):
+                    visit(handler.body)
+
+    visit(ast.parse(path.read_text(encoding="utf-8")).body)
+    return modules
+
+
+def _startup_modules():
+    modules = []
+    for app in APPS:
+        for name in _top_level_imports(SRC / app):
+            if name != "__future__" and name.split(".")[0] not in GUI_MODULES and name not in modules:
+                modules.append(name)
+    return modules
+
+
+def _cold_start():
+    script = COLD_START.format(src=str(SRC), root=str(SRC.parent), gui=GUI_MODULES,
+                               modules=_startup_modules(), lazy=LAZY_MODULES)
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                         cwd=str(SRC.parent), timeout=60)
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_leaves_action_modules_unloaded():
+    """The applications' startup imports leave action-only modules unloaded."""
+    modules = _startup_modules()
+    assert {"common.data_source_manager", "common.name_index", "config.settings"} <= set(modules)
+
+    result = _cold_start()
+    assert result["loaded"] == []
+    assert not result["counts_loaded"]
+    assert result["phases"] == ["imports", "data sources"]
+
+
+@pytest.mark.slow
+def test_cold_start_within_budget():
+    """Startup imports stay under budget (wall clock, so not run in quick passes)."""
+    result = min((_cold_start() for _ in range(2)),   # best of two, to ride out a cold disk cache
+                 key=lambda r: r["seconds"])
+    assert result["seconds"] < STARTUP_BUDGET_SECONDS, \
+        f"Cold start took {result['seconds']:.2f}s (budget {STARTUP_BUDGET_SECONDS}s)"
+
+
+def test_lazy_import_and_profile_report(tmp_path):
+    """Lazy modules load on first use; the report lists phases and imports."""
+    profiler = StartupProfiler("test")
+    profiler.install()
+    try:
+        with profiler.phase("load colorsys"):
+            colorsys = lazy_import("colorsys") if "colorsys" not in sys.modules else None
+            if colorsys is not None:
+                assert colorsys.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1.0)
+        profiler.mark("done")
+    finally:
+        profiler.uninstall()
+
+    path = profiler.write(tmp_path)
+    assert path.name.startswith("startup-profile-test-")
+    report = path.read_text(encoding="utf-8")
+    assert "load colorsys" in report and "done" in report
+    if colorsys is not None:
+        assert "colorsys" in profiler.imports
+        assert "colorsys" in report
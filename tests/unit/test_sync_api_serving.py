@@ -0,0 +1,118 @@
+"""
+Test Local Sync API Serving Mode
+
+Tests the per-thread connection cache (WAL, busy_timeout), closing it after
+thread-per-request (--dev) requests, request timing, and concurrent
+discovery writes through the pooled production server's bounded queue.
+"""
+
+import sys
+import json
+import sqlite3
+import threading
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add src and project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.database import HavenDatabase
+from migration.add_discovery_type_fields import migrate_discovery_fields
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+pytest.importorskip('dotenv')
+import local_sync_api
+
+
+@pytest.fixture
+def vh_database(tmp_path, monkeypatch):
+    db_path = tmp_path / "VH-Database.db"
+    with HavenDatabase(str(db_path)) as db:
+        db.add_system({"id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 0, "y": 0, "z": 0,
+                       "planets": [{"name": "Alpha Prime", "moons": [{"name": "Alpha Moon"}]}]})
+    migrate_discovery_fields(db_path)
+    monkeypatch.setattr(local_sync_api, 'VH_DATABASE_PATH', str(db_path))
+    return db_path
+
+
+def test_connection_cached_per_thread(vh_database):
+    """Each thread reuses one connection configured for concurrent access."""
+    conn = local_sync_api.get_db_connection()
+    assert local_sync_api.get_db_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == local_sync_api.DB_BUSY_TIMEOUT_MS
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(local_sync_api.get_db_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_unpooled_request_closes_connection(vh_database, monkeypatch):
+    """Outside the pool (--dev) a connection is closed once its response is sent."""
+    opened = []
+    real_open = local_sync_api._open_db_connection
+    monkeypatch.setattr(local_sync_api, '_open_db_connection',
+                        lambda path: opened.append(real_open(path)) or opened[-1])
+
+    client = local_sync_api.app.test_client()
+    with client.get('/api/systems?format=ndjson', headers={'X-API-Key': local_sync_api.API_KEY}) as response:
+        assert response.status_code == 200
+        assert b'Alpha' in response.get_data()  # streamed after the view returned
+
+    assert local_sync_api._thread_local.conn is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_request_timing(vh_database):
+    """Responses carry Server-Timing and requests are aggregated per endpoint."""
+    client = local_sync_api.app.test_client()
+    headers = {'X-API-Key': local_sync_api.API_KEY}
+
+    response = client.get('/api/systems/Alpha', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].startswith('app;dur=')
+
+    metrics = client.get('/api/metrics', headers=headers).get_json()['endpoints']
+    assert metrics['GET /api/systems/<system_name>']['count'] >= 1
+
+
+def test_concurrent_discovery_writes(vh_database):
+    """Concurrent POSTs through the pooled server are all written."""
+    server = local_sync_api.create_server('127.0.0.1', 0, threads=4, max_queued=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/discoveries"
+
+    def post(i):
+        body = {'type': 'Relic', 'description': f'Probe {i}', 'system_name': 'Alpha',
+                'location_type': 'moon' if i % 2 else 'planet',
+                'location_name': 'Alpha Moon' if i % 2 else 'Alpha Prime'}
+        request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST',
+                                         headers={'Content-Type': 'application/json',
+                                                  'X-API-Key': local_sync_api.API_KEY})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+
+    try:
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            results = list(pool.map(post, range(40)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Every in-flight slot was given back
+    assert all(server._slots.acquire(blocking=False) for _ in range(6))
+    assert not server._slots.acquire(blocking=False)
+    assert [status for status, _ in results] == [201] * 40
+    assert all(body['planet_id'] for _, body in results)
+    conn = sqlite3.connect(str(vh_database))
+    assert conn.execute("SELECT COUNT(*) FROM discoveries").fetchone()[0] == 40
+    conn.close()
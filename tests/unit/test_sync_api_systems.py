@@ -0,0 +1,101 @@
+"""
+Test /api/systems Streaming
+
+Tests the streamed systems endpoint of local_sync_api: the default JSON
+shape, NDJSON output, field projection, keyset pagination, the region
+filter and gzip negotiation.
+"""
+
+import sys
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+# Add src and project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.database import HavenDatabase
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+pytest.importorskip('dotenv')
+import local_sync_api
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_path = tmp_path / "VH-Database.db"
+    with HavenDatabase(str(db_path)) as db:
+        for i in range(7):
+            db.add_system({
+                "id": f"SYS_{i}", "name": f"System {i}", "x": i, "y": 0, "z": 0,
+                "region": "Euclid" if i % 2 else "Calypso",
+                "planets": [{"name": f"Planet {i}", "moons": [{"name": f"Moon {i}"}]}],
+            })
+    monkeypatch.setattr(local_sync_api, 'VH_DATABASE_PATH', str(db_path))
+    monkeypatch.setattr(local_sync_api, 'SYSTEMS_STREAM_BATCH', 3)
+    return local_sync_api.app.test_client()
+
+
+HEADERS = {'X-API-Key': local_sync_api.API_KEY}
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_default_json_shape(client):
+    """Without options the full nested galaxy is keyed by system name."""
+    response = client.get('/api/systems', headers=HEADERS)
+    assert response.status_code == 200
+    systems = response.get_json()['systems']
+    assert sorted(systems) == [f"System {i}" for i in range(7)]
+    planet = systems['System 3']['planets'][0]
+    assert planet['name'] == 'Planet 3'
+    assert [moon['name'] for moon in planet['moons']] == ['Moon 3']
+    assert 'next_after' not in response.get_json()
+
+
+def test_ndjson_projection_and_region(client):
+    """fields= trims columns and skips planets; region filters rows."""
+    response = client.get('/api/systems?format=ndjson&fields=region,x&region=Euclid', headers=HEADERS)
+    assert response.mimetype == 'application/x-ndjson'
+    records = _ndjson(response)
+    assert records == [{'name': f"System {i}", 'x': i, 'region': 'Euclid'} for i in (1, 3, 5)]
+
+    response = client.get('/api/systems?fields=name,bogus', headers=HEADERS)
+    assert response.status_code == 400
+
+
+def test_keyset_pagination(client):
+    """Pages follow the next_after cursor until every system is served."""
+    names, after = [], None
+    while True:
+        url = '/api/systems?format=ndjson&fields=name&limit=3' + (f'&after={after}' if after else '')
+        records = _ndjson(client.get(url, headers=HEADERS))
+        after = None
+        for record in records:
+            if '_next_after' in record:
+                after = record['_next_after']
+            else:
+                names.append(record['name'])
+        if not after:
+            break
+    assert names == [f"System {i}" for i in range(7)]
+
+    page = client.get('/api/systems?fields=name&limit=4', headers=HEADERS).get_json()
+    assert page['next_after'] == 'System 3'
+    assert len(page['systems']) == 4
+
+
+def test_gzip_negotiation(client):
+    """Clients that accept gzip get a compressed stream."""
+    response = client.get('/api/systems', headers={**HEADERS, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    systems = json.loads(gzip.decompress(response.get_data()))['systems']
+    assert len(systems) == 7
+
+    assert 'Content-Encoding' not in client.get('/api/systems', headers=HEADERS).headers
@@ -0,0 +1,74 @@
+"""
+Test Set-Based Data Synchronization
+
+Tests that DataSynchronizer writes only the JSON -> database delta in
+batched transactions (isolating bad systems) and streams the database
+back to data.json in the same layout json.dump(indent=2) produced.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+from migration.sync_data import DataSynchronizer
+
+
+REGIONS = ("R0", "R1")
+
+
+def _write_json(path, systems):
+    path.write_text(json.dumps({"_meta": {"version": "1.0.0"}, **{s["name"]: s for s in systems}}))
+
+
+def test_json_to_db_writes_only_the_delta(tmp_path, make_galaxy):
+    """Unchanged systems are not rewritten, changed ones keep their planet ids."""
+    json_path, db_path = tmp_path / "data.json", tmp_path / "haven.db"
+    systems = list(make_galaxy(5, regions=REGIONS).values())
+    # A nameless planet fails its batch; the batch is retried without it
+    systems[2]["planets"].append({"fauna": "None"})
+    _write_json(json_path, systems)
+
+    syncer = DataSynchronizer(str(json_path), str(db_path))
+    assert not syncer.sync_json_to_db(batch_size=2)
+    report = syncer.last_report
+    assert (report.added, report.errors) == (4, 1)
+    assert report.error_details[0][0] == "System 2"
+
+    with HavenDatabase(str(db_path)) as db:
+        planet_id = db.get_system_by_id("SYS_3")["planets"][0]["id"]
+
+    systems[2]["planets"].pop()
+    systems[3]["planets"][0]["fauna"] = "Rich"
+    _write_json(json_path, systems)
+    assert syncer.sync_json_to_db(overwrite=True)
+    report = syncer.last_report
+    assert (report.added, report.updated, report.unchanged) == (1, 1, 3)
+
+    with HavenDatabase(str(db_path)) as db:
+        planet = db.get_system_by_id("SYS_3")["planets"][0]
+    assert (planet["id"], planet["fauna"]) == (planet_id, "Rich")
+    assert syncer.check_sync_status()["in_sync"]
+
+
+def test_db_to_json_streams_the_same_document(tmp_path, haven_db, make_galaxy):
+    """The streamed file matches what a full json.dump of the galaxy would write."""
+    json_path = tmp_path / "data.json"
+    station = {"name": "Hub", "race": "Vy'keen"}
+    for system in make_galaxy(7, regions=REGIONS, space_station=station).values():
+        haven_db.add_system(system)
+    expected = haven_db.get_all_systems(include_planets=True)
+
+    syncer = DataSynchronizer(str(json_path), str(haven_db.db_path))
+    assert syncer.sync_db_to_json(backup=False, batch_size=3)
+    assert syncer.last_report.added == 7
+
+    text = json_path.read_text(encoding="utf-8")
+    data = json.loads(text)
+    assert list(data)[1:] == [s["name"] for s in expected]
+    assert [data[s["name"]] for s in expected] == expected
+    assert text == json.dumps(data, indent=2, ensure_ascii=False)
+    assert not list(tmp_path.glob(".data.json.*.tmp"))
@@ -0,0 +1,101 @@
+"""
+Test Hash-Tree Sync Status
+
+Tests that data.json and the database are compared by hash-tree roots,
+that only changed systems are re-hashed and only mismatched regions are
+drilled into, and that an unchanged data.json is answered from its sidecar.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+from common.sync_hashes import DatabaseHashTree, compare_hash_trees, json_hash_tree
+
+SYSTEMS = [
+    {"id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 1, "y": 2, "z": 3,
+     "planets": [{"name": "Alpha Prime", "fauna": "Rich", "moons": [{"name": "Alpha Moon"}]},
+                 {"name": "Alpha Minor"}],
+     "space_station": {"name": "Alpha Hub", "race": "Gek"}},
+    {"id": "SYS_B", "name": "Beta", "region": "Euclid", "x": 4, "y": 5, "z": 6},
+    {"id": "SYS_C", "name": "Gamma", "region": "Hilbert", "x": 7.0, "y": 8.0, "z": 9.0,
+     "planets": [{"name": "Gamma I", "sentinel": "Low"}]},
+]
+
+
+def _setup(tmp_path):
+    json_path = tmp_path / "data.json"
+    # Same content as the database, in a different planet order and number format
+    json_systems = json.loads(json.dumps(SYSTEMS))
+    json_systems[0]["planets"].reverse()
+    json_systems[1].update(x="4.0", fauna="")
+    json_path.write_text(json.dumps({"_meta": {"version": "1.0.0"},
+                                     **{s["name"]: s for s in json_systems}}))
+
+    db_path = tmp_path / "haven.db"
+    with HavenDatabase(str(db_path)) as db:
+        for system in SYSTEMS:
+            db.add_system(system)
+    return json_path, db_path
+
+
+def _status(json_path, db):
+    tree = DatabaseHashTree(db.conn)
+    return compare_hash_trees(json_hash_tree(json_path), tree), tree
+
+
+def test_equal_content_is_in_sync(tmp_path):
+    """Equivalent content on both sides has equal roots."""
+    json_path, db_path = _setup(tmp_path)
+    with HavenDatabase(str(db_path)) as db:
+        status, tree = _status(json_path, db)
+        assert status["in_sync"]
+        assert (status["json_count"], status["db_count"], status["in_both"]) == (3, 3, 3)
+        assert status["regions_checked"] == 0
+        assert tree.rehashed == 3
+
+        # Nothing changed: nothing is re-hashed
+        status, tree = _status(json_path, db)
+        assert status["in_sync"] and tree.rehashed == 0
+
+
+def test_changes_rehash_and_drill_into_one_region(tmp_path):
+    """A moon edit re-hashes one system and only its region is compared."""
+    json_path, db_path = _setup(tmp_path)
+    with HavenDatabase(str(db_path)) as db:
+        _status(json_path, db)
+        db.conn.execute("UPDATE moons SET flora = 'Lush' WHERE name = 'Alpha Moon'")
+        db.conn.execute("DELETE FROM systems WHERE id = 'SYS_C'")
+        db.conn.commit()
+
+        status, tree = _status(json_path, db)
+        assert tree.rehashed == 1
+        assert not status["in_sync"]
+        assert status["regions_checked"] == 2
+        assert status["differences"] == 1 and status["difference_details"][0][0] == "SYS_A"
+        assert status["only_in_json_ids"] == ["SYS_C"] and status["only_in_db"] == 0
+        assert status["in_both"] == 2
+
+
+def test_unchanged_json_uses_sidecar(tmp_path):
+    """The JSON tree is read back from its sidecar until data.json changes."""
+    json_path, _ = _setup(tmp_path)
+    root = json_hash_tree(json_path).root()
+    sidecar = tmp_path / "data.json.hashes"
+    cached = json.loads(sidecar.read_text())
+    assert cached["root"] == root
+
+    # A tampered sidecar with a matching stamp is trusted...
+    cached["regions"]["Euclid"]["SYS_B"] = "0" * 32
+    sidecar.write_text(json.dumps(cached))
+    assert json_hash_tree(json_path).root() != root
+
+    # ...until data.json itself changes
+    data = json.loads(json_path.read_text())
+    data["_meta"]["version"] = "1.0.1"
+    json_path.write_text(json.dumps(data))
+    assert json_hash_tree(json_path).root() == root
@@ -0,0 +1,76 @@
+"""
+Test System Name Paging
+
+Tests the type-ahead name queries behind the wizard's system picker:
+HavenDatabase.get_system_names (case-insensitive prefix pages with keyset
+continuation from a covering index) and the JSON backend's sorted
+SystemNameIndex, which must page identically.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+from common.data_provider import JSONDataProvider
+from common.name_index import SystemNameIndex
+
+NAMES = ["Zenith", "alpha", "Alpha Prime", "ALPHA", "Alphard", "Beta", "alp", "Älpha", "Gamma"]
+
+
+def _pages(fetch, prefix, size):
+    pages, after = [], None
+    while True:
+        page = fetch(prefix, after, size)
+        if not page:
+            return pages
+        pages.append(page)
+        after = page[-1]
+
+
+def test_database_prefix_pages(tmp_path):
+    """Prefix pages are case-insensitive, ordered, and continue without gaps."""
+    with HavenDatabase(str(tmp_path / "names.db")) as db:
+        for i, name in enumerate(NAMES):
+            db.add_system({"id": f"SYS_{i}", "name": name, "region": "Euclid", "x": i, "y": 0, "z": 0})
+
+        assert db.get_system_names("alp", limit=None) == ["alp", "ALPHA", "alpha", "Alpha Prime", "Alphard"]
+        assert _pages(db.get_system_names, "AL", 2) == [["alp", "ALPHA"], ["alpha", "Alpha Prime"], ["Alphard"]]
+        assert db.get_system_names("", limit=3) == ["alp", "ALPHA", "alpha"]
+        assert db.get_system_names("zz") == []
+
+        plan = " ".join(row[-1] for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT name FROM systems WHERE name >= ? COLLATE NOCASE "
+            "AND name < ? COLLATE NOCASE AND (name COLLATE NOCASE, name) > (?, ?) "
+            "ORDER BY name COLLATE NOCASE, name LIMIT ?", ("al", "al\U0010ffff", "", "", 10)))
+        assert "COVERING INDEX idx_systems_name_nocase" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_json_index_matches_database_order(tmp_path):
+    """The in-memory index sorts and pages exactly like the database."""
+    index = SystemNameIndex(NAMES)
+    with HavenDatabase(str(tmp_path / "order.db")) as db:
+        for i, name in enumerate(NAMES):
+            db.add_system({"id": f"SYS_{i}", "name": name, "region": "Euclid", "x": i, "y": 0, "z": 0})
+
+        assert index.names == db.get_system_names(limit=None)
+        for prefix in ("", "a", "ALPHA", "älp", "b", "q"):
+            assert _pages(index.page, prefix, 2) == _pages(db.get_system_names, prefix, 2)
+
+
+def test_json_provider_rebuilds_index_on_change(tmp_path):
+    """JSONDataProvider pages names and picks up file changes."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"_meta": {}, "Beta": {"x": 0}, "alpha": {"x": 1}}), encoding="utf-8")
+    provider = JSONDataProvider(str(path))
+
+    assert provider.get_system_names() == ["alpha", "Beta"]
+    assert provider.get_system_names("b") == ["Beta"]
+
+    provider.add_system({"name": "Alpine", "x": 2})
+    assert provider.get_system_names("al") == ["alpha", "Alpine"]
+    assert provider.get_system_names("al", after="alpha") == ["Alpine"]
@@ -0,0 +1,131 @@
+"""
+Test Undo/Redo Operation Log
+
+Tests that system edits are applied as minimal row changes (ids and
+discovery links survive), recorded compactly, and can be undone and redone.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common.database import HavenDatabase
+from common.undo_redo import OperationLog, EditConflictError
+
+SYSTEM = {
+    "id": "SYS_A", "name": "Alpha", "region": "Euclid", "x": 1, "y": 2, "z": 3,
+    "planets": [
+        {"name": "Alpha Prime", "fauna": "Rich", "moons": [{"name": "Alpha Moon"}]},
+        {"name": "Alpha Minor"},
+    ],
+    "space_station": {"name": "Alpha Hub", "race": "Gek"},
+}
+
+
+def _snapshot(db):
+    system = json.loads(json.dumps(db.get_system_by_name("Alpha")))
+    # Every write (undo and redo too) stamps modified_at; the log ignores it
+    system.pop("modified_at", None)
+    return system
+
+
+def _edited():
+    return {
+        **SYSTEM, "id": "SYS_IGNORED", "attributes": "Trade hub",
+        "planets": [
+            {"name": "Alpha Prime", "fauna": "Sparse", "moons": [{"name": "Alpha Moon"}]},
+            {"name": "Alpha Nova"},
+        ],
+    }
+
+
+def test_edit_is_minimal_and_keeps_ids(tmp_path):
+    """Only changed rows are touched; matched planets and moons keep their ids."""
+    with HavenDatabase(str(tmp_path / "edit.db")) as db:
+        log = OperationLog(db.conn)
+        log.save_system(SYSTEM)
+        before = db.get_system_by_name("Alpha")
+        prime = before["planets"][0]
+        db.add_discovery({"discovery_type": "Relic", "description": "Obelisk", "location_type": "moon",
+                          "system_id": "SYS_A", "planet_id": prime["id"], "moon_id": prime["moons"][0]["id"]})
+
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        system_id, group_id = log.save_system(_edited())
+        db.conn.set_trace_callback(None)
+
+        assert system_id == "SYS_A" and group_id
+        # Trigger programs repeat the statement in the trace, so count distinct ones
+        writes = [s.split()[0] for s in dict.fromkeys(statements)
+                  if s.split()[0] in ('INSERT', 'UPDATE', 'DELETE') and '_edit_' not in s]
+        # attributes, Alpha Prime fauna, Alpha Minor out, Alpha Nova in (space station unchanged)
+        assert sorted(writes) == ['DELETE', 'INSERT', 'UPDATE', 'UPDATE']
+
+        after = db.get_system_by_name("Alpha")
+        assert after["planets"][0]["id"] == prime["id"]
+        assert after["planets"][0]["moons"][0]["id"] == prime["moons"][0]["id"]
+        discovery = db.get_discoveries(system_id="SYS_A")[0]
+        assert (discovery["planet_id"], discovery["moon_id"]) == (prime["id"], prime["moons"][0]["id"])
+
+        changes = dict(db.conn.execute("""
+            SELECT action || ':' || table_name, changes FROM _edit_operations
+            WHERE group_id = ? AND action = 'update' AND table_name = 'planets'
+        """, (group_id,)).fetchall())
+        assert json.loads(changes['update:planets']) == {"fauna": ["Rich", "Sparse"]}
+
+        assert log.save_system(_edited())[1] is None  # nothing changed, nothing logged
+
+
+def test_undo_redo_round_trip(tmp_path):
+    """Undo restores the exact previous tree (deleted rows keep their ids); redo reapplies."""
+    with HavenDatabase(str(tmp_path / "undo.db")) as db:
+        log = OperationLog(db.conn)
+        log.save_system(SYSTEM)
+        original = _snapshot(db)
+        minor = original["planets"][1]
+        discovery_id = db.add_discovery({"discovery_type": "Flora", "description": "Moss",
+                                         "location_type": "planet", "system_id": "SYS_A",
+                                         "planet_id": minor["id"]})
+
+        edited = {**_edited(), "space_station": None}
+        log.save_system(edited)
+        edited_state = _snapshot(db)
+        assert "space_station" not in edited_state
+        assert db.get_discovery_by_id(discovery_id)["planet_id"] is None
+
+        assert log.undo()["label"] == "Save Alpha"
+        assert _snapshot(db) == original
+        assert db.get_discovery_by_id(discovery_id)["planet_id"] == minor["id"]
+
+        assert log.can_redo()
+        log.redo()
+        assert _snapshot(db) == edited_state
+
+        log.undo()
+        with pytest.raises(EditConflictError):
+            log.undo()  # the creation itself, but a discovery now points at the system
+        db.delete_discovery(discovery_id)
+        log.undo()
+        assert db.get_system_by_name("Alpha") is None
+        assert not log.can_undo()
+
+
+def test_undo_refuses_conflicting_changes(tmp_path):
+    """Rows edited outside the log since the edit block its undo."""
+    with HavenDatabase(str(tmp_path / "conflict.db")) as db:
+        log = OperationLog(db.conn)
+        log.save_system(SYSTEM)
+        log.edit_system("SYS_A", {"attributes": "Outpost"}, label="Attributes")
+
+        db.conn.execute("UPDATE systems SET attributes = 'Changed elsewhere' WHERE id = 'SYS_A'")
+        db.conn.commit()
+
+        with pytest.raises(EditConflictError):
+            log.undo()
+        assert db.get_system_by_name("Alpha")["attributes"] == "Changed elsewhere"
+        assert log.history()[0]["label"] == "Attributes"
@@ -0,0 +1,80 @@
+"""
+Test Compiled Validation Engine
+
+Tests SchemaValidator: all errors collected in one pass with system-prefixed
+paths, envelope (_meta) errors, deduplication, and identical results from
+serial and process-pool validation.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import jsonschema
+
+from common.validation import (
+    SchemaValidator, compile_checker, get_validator, load_schema, validate_data_file
+)
+
+
+def test_collects_every_error_once(make_system):
+    """Every bad system is reported with its key in the path, and _meta is checked."""
+    data = {
+        "Good": make_system(1),
+        "Far": make_system(2, x=500),
+        "Broken": make_system(3, id="BAD", planets=[{"name": "P", "sentinel": "Extreme"}]),
+    }
+    is_valid, errors = validate_data_file(data, workers=1)
+
+    assert not is_valid
+    assert errors == [
+        "Validation error at 'root': '_meta' is a required property",
+        "Validation error at 'Far -> x': 500 is greater than the maximum of 100",
+        "Validation error at 'Broken -> id': 'BAD' does not match '^SYS_'",
+        "Validation error at 'Broken -> planets -> 0 -> sentinel': "
+        "'Extreme' is not one of ['None', 'Low', 'Medium', 'High', 'Aggressive']",
+    ]
+    assert validate_data_file({"_meta": {"version": "3.0.0"}, "Good": make_system(1)}) == (True, [])
+
+
+def test_parallel_matches_serial(make_system):
+    """The process pool returns the same errors, in the same order, as a serial pass."""
+    data = {"_meta": {"version": "3.0.0"}}
+    for i in range(1200):
+        data[f"S{i}"] = make_system(i, z=99) if i % 97 == 0 else make_system(i)
+
+    validator = SchemaValidator()
+    serial = validator.validate(data, workers=1)
+    parallel = validator.validate(data, workers=2)
+
+    assert serial == parallel
+    assert len(serial[1]) == 13
+    assert serial[1][0] == "Validation error at 'S0 -> z': 99 is greater than the maximum of 25"
+
+
+def test_compiled_checker_agrees_with_jsonschema(make_system):
+    """The specialized checker accepts exactly what jsonschema accepts."""
+    system_schema = SchemaValidator().system_schema
+    checker = compile_checker(system_schema)
+    reference = jsonschema.Draft7Validator(system_schema)
+
+    cases = [
+        make_system(1), make_system(2, x=True), make_system(3, z=25.0), make_system(4, z=25.5),
+        make_system(5, name=""), make_system(6, name="n" * 101), make_system(7, id="sys_1"),
+        make_system(8, planets=["Legacy Planet"]), make_system(9, planets=[{"name": "P", "sentinel": "Low"}]),
+        make_system(10, planets=[{"name": "P", "moons": [{}]}]), make_system(11, planets_names=["a", 1]),
+        make_system(12, attributes=None), {"name": "No id"}, [], "system", None,
+    ]
+    for case in cases:
+        assert checker(case) == reference.is_valid(case), case
+
+    # Unknown keywords disable the fast path instead of being ignored
+    assert compile_checker({"type": "string", "uniqueItems": True}) is None
+    assert compile_checker(load_schema()) is None
+
+
+def test_validator_is_shared():
+    """The bundled schema is compiled once per process."""
+    assert get_validator() is get_validator()
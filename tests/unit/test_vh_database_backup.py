@@ -0,0 +1,151 @@
+"""
+Test VH-Database Backups
+
+Tests incremental snapshots (chunk dedup across snapshots, manifests),
+point-in-time restore, pruning, the backup directory lock, and the
+background backup thread.
+"""
+
+import sys
+import json
+import time
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from common import vh_database_backup as backups
+from common.database import HavenDatabase
+from common.file_lock import FileLock
+
+
+@pytest.fixture
+def vh_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(backups, 'CHUNK_SIZE', 16 * 1024)
+    db_path = tmp_path / "VH-Database.db"
+    with HavenDatabase(str(db_path)) as db:
+        for i in range(300):
+            db.add_system({"id": f"SYS_{i}", "name": f"System {i}", "region": "Euclid",
+                           "x": i, "y": 0, "z": 0, "attributes": "x" * 200})
+    return db_path
+
+
+def _names(db_path):
+    with sqlite3.connect(str(db_path)) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM systems")}
+
+
+def _manifest_new_chunks(path):
+    return json.loads(path.read_text())['new_chunks']
+
+
+def test_incremental_snapshots_dedup_and_restore(vh_database, tmp_path):
+    """Unchanged chunks are stored once; each snapshot restores its own state."""
+    backup_dir = tmp_path / "backups"
+    first = backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    assert _manifest_new_chunks(first) > 4
+
+    unchanged = backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    assert _manifest_new_chunks(unchanged) == 0
+
+    checkpoint = datetime.now()
+    time.sleep(0.01)
+    with sqlite3.connect(str(vh_database)) as conn:
+        conn.execute("UPDATE systems SET name = 'Renamed' WHERE id = 'SYS_5'")
+    changed = backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    assert 0 < _manifest_new_chunks(changed) < _manifest_new_chunks(first)
+
+    restored = tmp_path / "restored.db"
+    assert backups.restore_vh_database(target_path=restored, at=checkpoint, backup_dir=backup_dir)
+    assert "System 5" in _names(restored)
+
+    assert backups.restore_vh_database(changed, restored)
+    assert "Renamed" in _names(restored)
+
+    assert len(backups.list_incremental_backups(backup_dir)) == 3
+
+
+def test_cleanup_prunes_unreferenced_chunks(vh_database, tmp_path):
+    """Dropping old snapshots removes chunks only they used."""
+    backup_dir = tmp_path / "backups"
+    backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    with sqlite3.connect(str(vh_database)) as conn:
+        conn.execute("UPDATE systems SET attributes = 'changed' WHERE id = 'SYS_0'")
+    latest = backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+
+    chunks_dir = backup_dir / "incremental" / "chunks"
+    before = len(list(chunks_dir.glob("*/*")))
+    assert backups.cleanup_old_backups(backup_dir, keep_count=1) == 1
+    assert len(list(chunks_dir.glob("*/*"))) < before
+
+    restored = tmp_path / "restored.db"
+    assert backups.restore_vh_database(latest, restored)
+    assert _names(restored) == _names(vh_database)
+
+
+def test_backup_and_cleanup_wait_for_directory_lock(vh_database, tmp_path, monkeypatch):
+    """While another process holds the backup directory, nothing is written or pruned."""
+    monkeypatch.setattr(backups, 'BACKUP_LOCK_TIMEOUT', 0.2)
+    backup_dir = tmp_path / "backups"
+    backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    backups.backup_vh_database(vh_database, backup_dir, incremental=True)
+    chunks = sorted((backup_dir / "incremental" / "chunks").glob("*/*"))
+
+    with FileLock(backup_dir / backups.STATE_FILE):
+        assert backups.backup_vh_database(vh_database, backup_dir, incremental=True) is None
+        assert backups.cleanup_old_backups(backup_dir, keep_count=0) == 0
+        assert sorted((backup_dir / "incremental" / "chunks").glob("*/*")) == chunks
+    assert len(backups.list_incremental_backups(backup_dir)) == 2
+
+    assert backups.cleanup_old_backups(backup_dir, keep_count=0) == 2
+    assert not list((backup_dir / "incremental" / "chunks").glob("*/*"))
+    assert not list(backup_dir.glob("*.lock"))
+
+
+def test_background_backup_reports_progress(vh_database, tmp_path, monkeypatch):
+    """The background thread copies in steps and reports both stages."""
+    monkeypatch.setattr(backups, 'BACKUP_STEP_PAGES', 16)
+    events, results = [], []
+    thread = backups.start_background_backup(
+        vh_database, tmp_path / "backups",
+        progress=lambda stage, done, total: events.append((stage, done, total)),
+        on_done=results.append)
+    thread.join(timeout=30)
+
+    assert results and results[0].suffix == '.json'
+    copy_steps = [event for event in events if event[0] == 'copy']
+    assert len(copy_steps) > 1 and copy_steps[-1][1] == copy_steps[-1][2]
+    assert events[-1][0] == 'chunks' and events[-1][1] == events[-1][2]
+
+
+def test_scheduled_backup_skips_unchanged_and_rate_limits(vh_database, tmp_path):
+    """Scheduled backups run only when the database changed and the interval passed."""
+    backup_dir = tmp_path / "backups"
+
+    def scheduled(min_interval=0):
+        done, skipped = [], []
+        backups.start_background_backup(
+            vh_database, backup_dir, on_done=done.append, on_skipped=skipped.append,
+            min_interval=min_interval, skip_unchanged=True).join(timeout=30)
+        return done, skipped
+
+    done, skipped = scheduled()
+    assert done and not skipped
+    state = json.loads((backup_dir / backups.STATE_FILE).read_text())
+    assert (backup_dir / state['backup']) == done[0]
+
+    done, skipped = scheduled()
+    assert not done and "unchanged" in skipped[0]
+
+    with sqlite3.connect(str(vh_database)) as conn:
+        conn.execute("UPDATE systems SET name = 'Renamed' WHERE id = 'SYS_1'")
+    done, skipped = scheduled(min_interval=3600)
+    assert not done and "minimum interval" in skipped[0]
+
+    done, skipped = scheduled()
+    assert done and not skipped
+    assert len(backups.list_incremental_backups(backup_dir)) == 2